@@ -1,58 +1,104 @@
 # app/api/v1/agents.py
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from ...db.session import get_db
 from ...schemas.agent import AgentCreate, AgentUpdate, AgentInDB
 from ...services.agent_service import AgentService
+from ...services.usage_service import UsageService
+from ...services.memory_service import MemoryService
+from ...schemas.usage import AgentUsage, AgentUsageReport
+from ...schemas.memory import AgentMemory, MemoryRebuild
+from ...utils.ag2_wrapper import AG2Wrapper, get_ag2_wrapper
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 
+def get_agent_service(
+    db: Session = Depends(get_db),
+    ag2_wrapper: AG2Wrapper = Depends(get_ag2_wrapper)
+) -> AgentService:
+    return AgentService(db, ag2_wrapper)
+
+def get_usage_service(db: Session = Depends(get_db)) -> UsageService:
+    return UsageService(db)
+
+def get_memory_service(db: Session = Depends(get_db)) -> MemoryService:
+    return MemoryService(db)
+
 @router.post("/", response_model=AgentInDB)
 def create_agent(
     agent_data: AgentCreate,
-    db: Session = Depends(get_db)
+    service: AgentService = Depends(get_agent_service)
 ) -> AgentInDB:
-    service = AgentService(db)
     return service.create_agent(agent_data)
 
 @router.get("/", response_model=List[AgentInDB])
 def get_agents(
-    db: Session = Depends(get_db)
+    service: AgentService = Depends(get_agent_service)
 ) -> List[AgentInDB]:
-    service = AgentService(db)
     return service.get_agents()
 
+@router.get("/usage", response_model=List[AgentUsage])
+def get_top_agents_by_usage(
+    order_by: str = "cost",
+    limit: int = 20,
+    service: UsageService = Depends(get_usage_service)
+) -> List[AgentUsage]:
+    """Rank agents and their model configs by cost, tokens or latency"""
+    return service.get_top_agents(order_by=order_by, limit=limit)
+
+@router.get("/{agent_id}/usage", response_model=AgentUsageReport)
+def get_agent_usage(
+    agent_id: UUID,
+    service: UsageService = Depends(get_usage_service)
+) -> AgentUsageReport:
+    """Get an agent's token, cost and latency totals across round tables"""
+    return service.get_agent_usage(agent_id)
+
+@router.get("/{agent_id}/memory", response_model=List[AgentMemory])
+def search_agent_memory(
+    agent_id: UUID,
+    q: str,
+    k: int = Query(5, ge=1, le=100),
+    service: MemoryService = Depends(get_memory_service)
+) -> List[AgentMemory]:
+    """Search what an agent said in earlier discussions, most similar to ``q`` first"""
+    return service.search(agent_id, q, k)
+
+@router.post("/{agent_id}/memory/rebuild", response_model=MemoryRebuild)
+def rebuild_agent_memory(
+    agent_id: UUID,
+    service: MemoryService = Depends(get_memory_service)
+) -> MemoryRebuild:
+    """Re-index an agent's memory from its stored messages"""
+    return service.rebuild(agent_id)
+
 @router.get("/{agent_id}", response_model=AgentInDB)
 def get_agent(
     agent_id: UUID,
-    db: Session = Depends(get_db)
+    service: AgentService = Depends(get_agent_service)
 ) -> AgentInDB:
-    service = AgentService(db)
     return service.get_agent(agent_id)
 
 @router.put("/{agent_id}", response_model=AgentInDB)
 def update_agent(
     agent_id: UUID,
     agent_data: AgentUpdate,
-    db: Session = Depends(get_db)
+    service: AgentService = Depends(get_agent_service)
 ) -> AgentInDB:
-    service = AgentService(db)
     return service.update_agent(agent_id, agent_data)
 
 @router.delete("/{agent_id}")
 def delete_agent(
     agent_id: UUID,
-    db: Session = Depends(get_db)
+    service: AgentService = Depends(get_agent_service)
 ) -> bool:
-    service = AgentService(db)
     return service.delete_agent(agent_id)
 
 @router.delete("/", response_model=bool)
 def delete_all_agents(
-    db: Session = Depends(get_db)
+    service: AgentService = Depends(get_agent_service)
 ) -> bool:
-    service = AgentService(db)
     return service.delete_all_agents()
\ No newline at end of file
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ...db.session import get_db
+from ...services.export_service import EXPORT_BATCH_SIZE, EXPORT_FORMATS, ExportService
+
+router = APIRouter(
+    prefix="/export",
+    tags=["export"]
+)
+
+def get_export_service(db: Session = Depends(get_db)) -> ExportService:
+    return ExportService(db)
+
+@router.get("/messages")
+def export_messages(
+    format: Literal["ndjson", "arrow", "parquet"] = "ndjson",
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = Query(None, description="Round tables created at or after"),
+    date_to: Optional[datetime] = Query(None, description="Round tables created before"),
+    round_table_id: Optional[List[UUID]] = Query(None),
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=100, le=50000),
+    service: ExportService = Depends(get_export_service)
+) -> StreamingResponse:
+    """Stream every message of the matching round tables with agent and round table metadata"""
+    chunks = service.stream(
+        format,
+        batch_size=batch_size,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+        round_table_ids=round_table_id
+    )
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"transcripts-{datetime.utcnow():%Y%m%dT%H%M%SZ}.{extension}"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,19 +1,63 @@
-from fastapi import APIRouter, Depends
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, Query, Response
+from typing import List, Dict, Any, Optional
+from sqlalchemy.orm import Session
 
-from ...services.kamiwaza_service import KamiwazaService
+from ...db.session import get_db
+from ...schemas.benchmark import BenchmarkRequest, ModelBenchmarkResult
+from ...services.benchmark_service import BenchmarkService
+from ...services.kamiwaza_service import KamiwazaService, get_kamiwaza_service
+from ...utils.load_balancer import get_kamiwaza_balancer
 
 router = APIRouter(
     prefix="/kamiwaza",
     tags=["kamiwaza"]
 )
 
-def get_kamiwaza_service() -> KamiwazaService:
-    return KamiwazaService()
+def get_benchmark_service(
+    db: Session = Depends(get_db),
+    kamiwaza_service: KamiwazaService = Depends(get_kamiwaza_service)
+) -> BenchmarkService:
+    return BenchmarkService(db, kamiwaza_service)
 
 @router.get("/models", response_model=List[Dict[str, Any]])
 async def get_available_models(
-    service: KamiwazaService = Depends(get_kamiwaza_service)
+    response: Response,
+    refresh: bool = False,
+    service: KamiwazaService = Depends(get_kamiwaza_service),
+    benchmark_service: BenchmarkService = Depends(get_benchmark_service)
 ) -> List[Dict[str, Any]]:
-    """Get list of available Kamiwaza models"""
-    return await service.get_available_models() 
\ No newline at end of file
+    """Get list of available Kamiwaza models with their latest benchmark, cached; ``refresh`` bypasses the cache"""
+    models, age = await service.get_models_with_age(refresh=refresh)
+    benchmarks = benchmark_service.get_latest()
+    response.headers["Age"] = str(int(age))
+    return [
+        {
+            **model,
+            "cache_age_seconds": round(age, 1),
+            "benchmark": benchmarks[model["model_name"]].model_dump(mode="json")
+            if model["model_name"] in benchmarks else None
+        }
+        for model in models
+    ]
+
+@router.get("/instances", response_model=List[Dict[str, Any]])
+async def get_instance_pools() -> List[Dict[str, Any]]:
+    """Load and health of the instances Kamiwaza completions are spread across"""
+    return get_kamiwaza_balancer().describe()
+
+@router.post("/benchmark", response_model=List[ModelBenchmarkResult])
+async def run_benchmark(
+    request: BenchmarkRequest,
+    service: BenchmarkService = Depends(get_benchmark_service)
+) -> List[ModelBenchmarkResult]:
+    """Probe deployed models with a standard completion at the given concurrency and store the results"""
+    return await service.run(request)
+
+@router.get("/benchmarks", response_model=List[ModelBenchmarkResult])
+def get_benchmarks(
+    model_name: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    service: BenchmarkService = Depends(get_benchmark_service)
+) -> List[ModelBenchmarkResult]:
+    """Past benchmark results, newest first"""
+    return service.get_history(model_name, limit)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends
+from typing import Dict, Any
+
+from ...utils.hedging import HedgingPolicy, get_hedging_policy
+from ...utils.llm_config import LLMConfigRegistry, get_llm_config_registry
+
+router = APIRouter(
+    prefix="/llm",
+    tags=["llm"]
+)
+
+@router.get("/hedging", response_model=Dict[str, Any])
+async def get_hedging_stats(
+    policy: HedgingPolicy = Depends(get_hedging_policy)
+) -> Dict[str, Any]:
+    """Get hedge rate and latency won by hedged LLM completions"""
+    return policy.stats()
+
+@router.get("/config", response_model=Dict[str, Any])
+def get_llm_config(
+    registry: LLMConfigRegistry = Depends(get_llm_config_registry)
+) -> Dict[str, Any]:
+    """Get the version and status of the loaded LLM configuration"""
+    return registry.describe()
+
+@router.post("/config/reload", response_model=Dict[str, Any])
+def reload_llm_config(
+    registry: LLMConfigRegistry = Depends(get_llm_config_registry)
+) -> Dict[str, Any]:
+    """Reload the LLM configuration from the .env file and environment"""
+    registry.reload()
+    return registry.describe()
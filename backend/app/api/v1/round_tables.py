@@ -1,118 +1,337 @@
 # app/api/v1/round_tables.py
-from typing import List, Dict
+from typing import List, Dict, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Request, UploadFile
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from ...db.session import get_db
-from ...schemas.round_table import RoundTableCreate, RoundTableUpdate, RoundTableInDB
+from ...schemas.round_table import RoundTableCreate, RoundTableFork, RoundTableUpdate, RoundTableInDB
 from ...services.round_table_service import RoundTableService
+from ...services.usage_service import UsageService
+from ...services.summary_service import SummaryService
+from ...services.document_service import DocumentService
+from ...services.idempotency_service import IdempotencyService, get_idempotency_service, request_hash
+from ...schemas.usage import RoundTableUsage
+from ...schemas.summary import RoundTableSummary
+from ...schemas.document import DocumentExcerpt, RoundTableDocumentInDB
+from .agents import get_usage_service
+from ...utils.ag2_wrapper import AG2Wrapper, get_ag2_wrapper
+from ...utils.serialization import ROUND_TABLE_LIST_ADAPTER, PreSerializedJSONResponse
 from ...models.round_table import RoundTable
 from ...models.round_table_participant import RoundTableParticipant
 
 router = APIRouter(prefix="/round-tables", tags=["round_tables"])
 
+def get_round_table_service(
+    db: Session = Depends(get_db),
+    ag2_wrapper: AG2Wrapper = Depends(get_ag2_wrapper)
+) -> RoundTableService:
+    return RoundTableService(db, ag2_wrapper)
+
 class DiscussionRequest(BaseModel):
     discussion_prompt: str
+    priority: int = 0  # Higher runs first when discussions are queued
+
+def get_summary_service(db: Session = Depends(get_db)) -> SummaryService:
+    return SummaryService(db)
+
+def get_document_service(db: Session = Depends(get_db)) -> DocumentService:
+    return DocumentService(db)
+
+def get_submitter(request: Request) -> str:
+    """Identify who submitted a discussion, for fair-share queueing"""
+    return request.headers.get("X-Submitter-Id") or (request.client.host if request.client else "anonymous")
 
 @router.post("/", response_model=RoundTableInDB)
 async def create_round_table(
     round_table_data: RoundTableCreate,
-    db: Session = Depends(get_db)
+    service: RoundTableService = Depends(get_round_table_service)
 ) -> RoundTableInDB:
-    service = RoundTableService(db)
     return await service.create_round_table(round_table_data)
 
+@router.post("/{round_table_id}/fork", response_model=RoundTableInDB)
+async def fork_round_table(
+    round_table_id: UUID,
+    fork_data: RoundTableFork,
+    service: RoundTableService = Depends(get_round_table_service)
+) -> RoundTableInDB:
+    """Branch a discussion at a message to explore a what-if
+    
+    The branch shares the history up to that message with the original
+    and starts paused; resume it to continue from the fork point.
+    
+    Args:
+        round_table_id: UUID of the round table to fork
+        fork_data: Where to fork and what to change in the branch
+        service: Round table service
+        
+    Returns:
+        The new round table, with its history
+    """
+    return await service.fork_round_table(round_table_id, fork_data)
+
 @router.post("/{round_table_id}/phase/{new_phase}", response_model=RoundTableInDB)
 async def transition_phase(
     round_table_id: UUID,
     new_phase: str,
-    db: Session = Depends(get_db)
+    service: RoundTableService = Depends(get_round_table_service)
 ) -> RoundTableInDB:
-    service = RoundTableService(db)
     return await service.handle_phase_transition(round_table_id, new_phase)
 
 @router.post("/{round_table_id}/discuss")
 async def run_discussion(
     round_table_id: UUID,
     request: DiscussionRequest,
-    db: Session = Depends(get_db)
+    submitter: str = Depends(get_submitter),
+    idempotency_key: Optional[str] = Header(None),
+    service: RoundTableService = Depends(get_round_table_service),
+    idempotency: IdempotencyService = Depends(get_idempotency_service)
 ):
     """Start and run a round table discussion
     
     Args:
         round_table_id: UUID of the round table
-        request: The discussion request containing the prompt
-        db: Database session
+        request: The discussion request containing the prompt and priority
+        submitter: Submitter identity used for fair-share queueing
+        idempotency_key: Retries with the same Idempotency-Key get the first request's result
+        service: Round table service
+        idempotency: Idempotency key store
         
     Returns:
         Dict containing status, round_table_id, and chat_history
     """
-    service = RoundTableService(db)
-    return await service.run_discussion(round_table_id, request.discussion_prompt)
+    def run():
+        return service.run_discussion(
+            round_table_id,
+            request.discussion_prompt,
+            submitter=submitter,
+            priority=request.priority
+        )
+
+    if idempotency_key is None:
+        return await run()
+    return await idempotency.execute(
+        idempotency_key,
+        round_table_id,
+        "discuss",
+        request_hash("discuss", round_table_id, request.model_dump()),
+        run
+    )
 
 @router.post("/{round_table_id}/pause")
 async def pause_discussion(
     round_table_id: UUID,
-    db: Session = Depends(get_db)
+    service: RoundTableService = Depends(get_round_table_service)
 ):
     """Pause a round table discussion
     
     Args:
         round_table_id: UUID of the round table
-        db: Database session
+        service: Round table service
         
     Returns:
         Dict containing status and round_table_id
     """
-    service = RoundTableService(db)
     return await service.pause_discussion(round_table_id)
 
+@router.post("/{round_table_id}/cancel")
+async def cancel_discussion(
+    round_table_id: UUID,
+    service: RoundTableService = Depends(get_round_table_service)
+):
+    """Cancel a running or queued discussion, on whichever worker runs it
+    
+    Args:
+        round_table_id: UUID of the round table
+        service: Round table service
+        
+    Returns:
+        Dict containing status and round_table_id
+    """
+    return await service.cancel_discussion(round_table_id)
+
 @router.post("/{round_table_id}/resume")
 async def resume_discussion(
     round_table_id: UUID,
-    db: Session = Depends(get_db)
+    priority: int = 0,
+    submitter: str = Depends(get_submitter),
+    idempotency_key: Optional[str] = Header(None),
+    service: RoundTableService = Depends(get_round_table_service),
+    idempotency: IdempotencyService = Depends(get_idempotency_service)
 ):
     """Resume a paused round table discussion
     
     Args:
         round_table_id: UUID of the round table
-        db: Database session
+        priority: Higher runs first when discussions are queued
+        submitter: Submitter identity used for fair-share queueing
+        idempotency_key: Retries with the same Idempotency-Key get the first request's result
+        service: Round table service
+        idempotency: Idempotency key store
         
     Returns:
         Dict containing status, round_table_id, and chat_history
     """
-    service = RoundTableService(db)
-    return await service.resume_discussion(round_table_id)
+    def run():
+        return service.resume_discussion(round_table_id, submitter=submitter, priority=priority)
+
+    if idempotency_key is None:
+        return await run()
+    return await idempotency.execute(
+        idempotency_key,
+        round_table_id,
+        "resume",
+        request_hash("resume", round_table_id, {"priority": priority}),
+        run
+    )
+
+@router.get("/{round_table_id}/queue")
+async def get_queue_status(
+    round_table_id: UUID,
+    service: RoundTableService = Depends(get_round_table_service)
+):
+    """Get a round table's position in the discussion queue
+    
+    Args:
+        round_table_id: UUID of the round table
+        service: Round table service
+        
+    Returns:
+        Dict containing status, queue_position and admission counters
+    """
+    return service.get_queue_status(round_table_id)
+
+@router.get("/{round_table_id}/usage", response_model=RoundTableUsage)
+def get_round_table_usage(
+    round_table_id: UUID,
+    service: UsageService = Depends(get_usage_service)
+) -> RoundTableUsage:
+    """Get token, cost and latency totals for a round table, per agent and model
+    
+    Args:
+        round_table_id: UUID of the round table
+        service: Usage service
+        
+    Returns:
+        Totals for the round table and a breakdown by agent
+    """
+    return service.get_round_table_usage(round_table_id)
+
+@router.get("/{round_table_id}/summary", response_model=RoundTableSummary)
+def get_round_table_summary(
+    round_table_id: UUID,
+    service: SummaryService = Depends(get_summary_service)
+) -> RoundTableSummary:
+    """Get the stored summary of a round table and whether it covers the latest messages
+    
+    Args:
+        round_table_id: UUID of the round table
+        service: Summary service
+        
+    Returns:
+        The summary, per-agent positions and status: ready, stale, running, failed or missing
+    """
+    return service.get_summary(round_table_id)
+
+@router.post("/{round_table_id}/summary", response_model=RoundTableSummary, status_code=202)
+async def summarize_round_table(
+    round_table_id: UUID,
+    force: bool = False,
+    service: SummaryService = Depends(get_summary_service)
+) -> RoundTableSummary:
+    """Summarize a round table in the background unless its summary is up to date
+    
+    Args:
+        round_table_id: UUID of the round table
+        force: Summarize again even if the summary covers every message
+        service: Summary service
+        
+    Returns:
+        The current summary; poll GET until its status is no longer running
+    """
+    return service.request_summary(round_table_id, force)
+
+@router.post("/{round_table_id}/documents", response_model=RoundTableDocumentInDB, status_code=201)
+async def upload_document(
+    round_table_id: UUID,
+    file: UploadFile = File(...),
+    service: DocumentService = Depends(get_document_service)
+) -> RoundTableDocumentInDB:
+    """Attach a document to a round table; its passages are retrieved into the discussion's turns
+    
+    Args:
+        round_table_id: UUID of the round table
+        file: Text, Markdown, CSV, JSON or PDF file
+        service: Document service
+        
+    Returns:
+        The attached document; deduplicated is true if the same file was already stored
+    """
+    return await service.upload(round_table_id, file)
+
+@router.get("/{round_table_id}/documents", response_model=List[RoundTableDocumentInDB])
+def get_documents(
+    round_table_id: UUID,
+    service: DocumentService = Depends(get_document_service)
+) -> List[RoundTableDocumentInDB]:
+    """Get the documents attached to a round table"""
+    return service.list_documents(round_table_id)
+
+@router.get("/{round_table_id}/documents/search", response_model=List[DocumentExcerpt])
+def search_documents(
+    round_table_id: UUID,
+    q: str,
+    k: Optional[int] = Query(None, ge=1, le=50),
+    service: DocumentService = Depends(get_document_service)
+) -> List[DocumentExcerpt]:
+    """Get the passages of a round table's documents a speaker would be given for a query
+    
+    Args:
+        round_table_id: UUID of the round table
+        q: Text to match, e.g. the latest messages
+        k: Passages to return, DOCUMENT_TOP_K by default
+        service: Document service
+        
+    Returns:
+        Passages scoring at least DOCUMENT_MIN_SCORE, best first
+    """
+    return service.search(round_table_id, q, k)
+
+@router.delete("/{round_table_id}/documents/{document_id}", response_model=bool)
+def delete_document(
+    round_table_id: UUID,
+    document_id: UUID,
+    service: DocumentService = Depends(get_document_service)
+) -> bool:
+    """Detach a document from a round table; its file is deleted once no round table has it"""
+    return service.detach(round_table_id, document_id)
 
 @router.get("/", response_model=List[RoundTableInDB])
 async def get_all_round_tables(
-    db: Session = Depends(get_db)
+    service: RoundTableService = Depends(get_round_table_service)
 ) -> List[RoundTableInDB]:
     """Get all round tables
     
     Args:
-        db: Database session
+        service: Round table service
         
     Returns:
         List of round tables
     """
-    service = RoundTableService(db)
-    return await service.get_all_round_tables()
+    return PreSerializedJSONResponse(service.get_all_round_table_rows(), ROUND_TABLE_LIST_ADAPTER)
 
 @router.delete("/", response_model=bool)
 async def delete_all_round_tables(
-    db: Session = Depends(get_db)
+    service: RoundTableService = Depends(get_round_table_service)
 ) -> bool:
     """Delete all round tables and their associated data.
     This will cascade delete all messages and participants.
     
     Args:
-        db: Database session
+        service: Round table service
         
     Returns:
         bool: True if successful
     """
-    service = RoundTableService(db)
     return await service.delete_all_round_tables()
\ No newline at end of file
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ...db.session import get_db
+from ...schemas.search import SearchResults
+from ...services.search_service import SearchService
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"]
+)
+
+def get_search_service(db: Session = Depends(get_db)) -> SearchService:
+    return SearchService(db)
+
+@router.get("/", response_model=SearchResults)
+def search_transcripts(
+    q: str = Query(..., min_length=1, max_length=500, description="Words, \"quoted phrases\", or, -excluded"),
+    agent_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    hits_per_round_table: int = Query(3, ge=1, le=20),
+    service: SearchService = Depends(get_search_service)
+) -> SearchResults:
+    """Search discussion transcripts; ranked, highlighted hits grouped by round table"""
+    return service.search(
+        q,
+        agent_id=agent_id,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+        offset=offset,
+        hits_per_round_table=hits_per_round_table
+    )
@@ -0,0 +1,56 @@
+import json
+from uuid import UUID
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ...db.session import get_db
+from ...schemas.sweep import SweepCreate, SweepResult
+from ...services.sweep_service import SweepService
+
+router = APIRouter(prefix="/sweeps", tags=["sweeps"])
+
+def get_sweep_service(db: Session = Depends(get_db)) -> SweepService:
+    return SweepService(db)
+
+@router.post("/", response_model=SweepResult)
+async def create_sweep(
+    sweep_data: SweepCreate,
+    service: SweepService = Depends(get_sweep_service)
+) -> SweepResult:
+    """Create one round table per combination of the grid's values and start running them.
+
+    Runs go through the discussion scheduler ``concurrency`` at a time;
+    follow them with ``GET /sweeps/{id}/events``.
+    """
+    return await service.create(sweep_data)
+
+@router.get("/{sweep_id}", response_model=SweepResult)
+def get_sweep(
+    sweep_id: UUID,
+    service: SweepService = Depends(get_sweep_service)
+) -> SweepResult:
+    """The sweep's result table: each run's parameters, status, messages, tokens, cost and duration"""
+    return service.get_result(sweep_id)
+
+@router.get("/{sweep_id}/events")
+async def stream_sweep_events(
+    sweep_id: UUID,
+    service: SweepService = Depends(get_sweep_service)
+) -> StreamingResponse:
+    """Stream a JSON line per finished run, then the result table once the sweep is done"""
+    service.get_result(sweep_id)  # 404 before the stream starts
+
+    async def lines():
+        async for event in service.runner.events(sweep_id):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.post("/{sweep_id}/cancel", response_model=SweepResult)
+async def cancel_sweep(
+    sweep_id: UUID,
+    service: SweepService = Depends(get_sweep_service)
+) -> SweepResult:
+    """Cancel the runs that are running and skip the ones that have not started"""
+    return await service.cancel(sweep_id)
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from ...utils.message_bus import get_message_bus
+from ...utils.serialization import MESSAGE_ADAPTER
+
+router = APIRouter(prefix="/ws", tags=["websocket"])
+
+# Close code for a subscriber that fell too far behind; it should reconnect with ?after=
+TRY_AGAIN_LATER = 1013
+
+@router.websocket("/round-tables/{round_table_id}")
+async def stream_messages(websocket: WebSocket, round_table_id: UUID, after: Optional[int] = None):
+    """Push a round table's new messages as they are stored, on whichever worker runs the discussion.
+
+    With ``after``, the round table's own messages with a higher ``sequence``
+    are sent first, so a client that read the history or lost its
+    connection misses nothing.
+    """
+    await websocket.accept()
+    bus = get_message_bus()
+    # Subscribe before catching up, so nothing stored in between is missed
+    queue = bus.subscribers.subscribe(round_table_id)
+
+    async def wait_for_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    disconnected = asyncio.create_task(wait_for_disconnect())
+    try:
+        last_sequence = after
+        if after is not None:
+            for message in await asyncio.to_thread(bus.load_messages_after, round_table_id, after):
+                await websocket.send_text(MESSAGE_ADAPTER.dump_json(message).decode())
+                last_sequence = message["sequence"]
+        while True:
+            received = asyncio.create_task(queue.get())
+            done, _ = await asyncio.wait({received, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if received not in done:
+                received.cancel()
+                return
+            message = received.result()
+            if message is None:
+                await websocket.close(code=TRY_AGAIN_LATER, reason="Fell behind; reconnect with ?after=")
+                return
+            # Messages already sent while catching up
+            if last_sequence is not None and message["sequence"] <= last_sequence:
+                continue
+            await websocket.send_text(MESSAGE_ADAPTER.dump_json(message).decode())
+            last_sequence = message["sequence"]
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        bus.subscribers.unsubscribe(round_table_id, queue)
@@ -4,5 +4,10 @@ from app.models.agent import Agent
 from app.models.round_table import RoundTable
 from app.models.round_table_participant import RoundTableParticipant
 from app.models.message import Message
+from app.models.round_table_archive import RoundTableArchive
+from app.models.model_benchmark import ModelBenchmark
+from app.models.idempotency_key import IdempotencyKey
+from app.models.sweep import Sweep, SweepRun
+from app.models.document import Document, DocumentChunk, RoundTableDocument
 
 # This allows Alembic to detect the models
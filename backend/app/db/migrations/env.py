@@ -16,6 +16,11 @@ from app.models.agent import Agent
 from app.models.round_table import RoundTable
 from app.models.round_table_participant import RoundTableParticipant
 from app.models.message import Message
+from app.models.round_table_archive import RoundTableArchive
+from app.models.model_benchmark import ModelBenchmark
+from app.models.idempotency_key import IdempotencyKey
+from app.models.sweep import Sweep, SweepRun
+from app.models.document import Document, DocumentChunk, RoundTableDocument
 from app.config import get_settings
 
 # this is the Alembic Config object, which provides
@@ -35,6 +40,16 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Database-maintained objects that are deliberately absent from the models,
+# so autogenerate must not try to drop them
+UNMAPPED_OBJECTS = {
+    ("column", "search_vector"),
+    ("index", "ix_messages_search_vector"),
+}
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and (type_, name) in UNMAPPED_OBJECTS)
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
@@ -43,6 +58,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -59,7 +75,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,46 @@
+"""add message search vector
+
+Revision ID: a41f6c7e2b58
+Revises: 3e7d9a1c5f20
+Create Date: 2026-10-19 12:20:05.337481
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f6c7e2b58'
+down_revision: Union[str, None] = '3e7d9a1c5f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Postgres keeps the stored generated column in sync on every insert and
+    # update. It is not mapped on the Message model (see app/services/search_service.py).
+    # Adding it rewrites the messages table once.
+    op.add_column(
+        'messages',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', content)", persisted=True),
+            nullable=True
+        )
+    )
+    op.create_index(
+        'ix_messages_search_vector',
+        'messages',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_search_vector', table_name='messages', postgresql_using='gin')
+    op.drop_column('messages', 'search_vector')
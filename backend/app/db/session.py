@@ -4,7 +4,14 @@ from ..config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.DATABASE_URL)
+# Size the pool for the admitted discussions plus regular API traffic
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=True
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
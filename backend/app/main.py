@@ -1,14 +1,58 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-from app.api.v1 import agents, round_tables, messages, kamiwaza
-from .utils.llm_config import LLMConfigManager, get_llm_config_manager
+from app.api.v1 import agents, round_tables, messages, kamiwaza, llm, search, export, sweeps, websocket
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.services.kamiwaza_service import shutdown_kamiwaza_service
+from app.services.recovery_service import get_recovery_sweeper
+from app.services.summary_service import get_summarizer
+from app.utils.load_balancer import get_kamiwaza_balancer
+from app.utils.metrics import CONTENT_TYPE_LATEST, instrument_db_commits, mark_worker_exited, render_metrics
+from app.utils.message_bus import get_message_bus
+from app.utils.ownership import get_control_bus, get_lease_manager
+from app.utils.pg_listener import get_pg_listener
+from app.utils.tools import get_tool_executor, get_tool_registry
+from app.utils.tracing import get_tracer
+
+logging.basicConfig(
+    level=get_settings().LOG_LEVEL.upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Import TOOL_MODULES now, so a broken one fails start-up rather than the first agent
+    get_tool_registry()
+    # Receive pause/cancel requests for the discussions this worker drives
+    await get_control_bus().start()
+    # Push messages stored on any worker to this worker's subscribers
+    await get_message_bus().start()
+    # Pick up discussions left running by workers that died, now and periodically
+    await get_recovery_sweeper().start()
+    yield
+    await get_recovery_sweeper().aclose()
+    await get_summarizer().aclose()
+    await get_message_bus().aclose()
+    await get_control_bus().aclose()
+    await get_pg_listener().aclose()
+    await get_lease_manager().aclose()
+    await get_kamiwaza_balancer().aclose()
+    await shutdown_kamiwaza_service()
+    get_tool_executor().shutdown()
+    # Flush spans still queued for export
+    get_tracer().shutdown()
+    mark_worker_exited()
 
 app = FastAPI(
     title="Corporate Strategy Simulator",
     description="API for managing AI agents and strategic discussions",
-    version="0.0.1"
+    version="0.0.1",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -20,14 +64,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create singleton instance of LLMConfigManager
-llm_config_manager = LLMConfigManager()
-
 # Include routers
 app.include_router(agents.router, prefix="/api/v1")
 app.include_router(round_tables.router, prefix="/api/v1")
 app.include_router(messages.router, prefix="/api/v1")
 app.include_router(kamiwaza.router, prefix="/api/v1")
+app.include_router(llm.router, prefix="/api/v1")
+app.include_router(search.router, prefix="/api/v1")
+app.include_router(export.router, prefix="/api/v1")
+app.include_router(sweeps.router, prefix="/api/v1")
+app.include_router(websocket.router, prefix="/api/v1")
+
+instrument_db_commits(SessionLocal)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Prometheus metrics, merged across workers when PROMETHEUS_MULTIPROC_DIR is set"""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/")
 async def root():
@@ -1,5 +1,10 @@
 from .agent import Agent
 from .round_table import RoundTable
 from .round_table_participant import RoundTableParticipant
+from .round_table_archive import RoundTableArchive
+from .model_benchmark import ModelBenchmark
+from .idempotency_key import IdempotencyKey
+from .sweep import Sweep, SweepRun
+from .document import Document, DocumentChunk, RoundTableDocument
 
-__all__ = ["Agent", "RoundTable", "RoundTableParticipant"]
+__all__ = ["Agent", "RoundTable", "RoundTableParticipant", "RoundTableArchive", "ModelBenchmark", "IdempotencyKey", "Sweep", "SweepRun", "Document", "DocumentChunk", "RoundTableDocument"]
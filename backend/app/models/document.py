@@ -0,0 +1,69 @@
+# app/models/document.py
+
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import Column, ForeignKey, String, Integer, BigInteger, DateTime, Text, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from ..db.session import Base
+
+class Document(Base):
+    """An uploaded file, stored and chunked once however many round tables attach it"""
+    __tablename__ = "documents"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    sha256 = Column(String(64), nullable=False, unique=True)  # Of the file's bytes; names its file on disk
+    filename = Column(String(255), nullable=False)  # As first uploaded
+    content_type = Column(String(255), nullable=True)
+    size = Column(BigInteger, nullable=False)
+    chunk_count = Column(Integer, nullable=False, default=0)
+    tokens = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    chunks = relationship(
+        "DocumentChunk",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        order_by="DocumentChunk.position"
+    )
+    attachments = relationship("RoundTableDocument", back_populates="document", cascade="all, delete-orphan")
+
+
+class DocumentChunk(Base):
+    """A passage of a document and its embedding, as retrieved into discussion turns"""
+    __tablename__ = "document_chunks"
+    __table_args__ = (
+        UniqueConstraint("document_id", "position", name="uq_document_chunks_document_id_position"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+    tokens = Column(Integer, nullable=False)
+    # Compacted hashing embedding: uint16 buckets and float16 weights
+    buckets = Column(LargeBinary, nullable=False)
+    weights = Column(LargeBinary, nullable=False)
+
+    document = relationship("Document", back_populates="chunks")
+
+
+class RoundTableDocument(Base):
+    """A document attached to a round table"""
+    __tablename__ = "round_table_documents"
+
+    round_table_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("round_tables.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    document_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True
+    )
+    filename = Column(String(255), nullable=False)  # As uploaded to this round table
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    document = relationship("Document", back_populates="attachments")
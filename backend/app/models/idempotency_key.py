@@ -0,0 +1,37 @@
+# app/models/idempotency_key.py
+
+from datetime import datetime
+from sqlalchemy import Column, ForeignKey, Index, String, Integer, DateTime, JSON, text
+from sqlalchemy.dialects.postgresql import UUID
+from ..db.session import Base
+
+class IdempotencyKey(Base):
+    """A client's ``Idempotency-Key`` for starting or resuming a discussion, and its outcome.
+
+    At most one key per round table can be ``running``; the partial unique
+    index makes a second concurrent start fail on insert.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index(
+            "ix_idempotency_keys_running_round_table",
+            "round_table_id",
+            unique=True,
+            postgresql_where=text("state = 'running'"),
+            sqlite_where=text("state = 'running'")
+        ),
+    )
+
+    key = Column(String(255), primary_key=True)
+    round_table_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("round_tables.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    operation = Column(String(20), nullable=False)  # discuss or resume
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of the request, to catch reused keys
+    state = Column(String(20), nullable=False, default="running")  # running or completed
+    status_code = Column(Integer, nullable=True)
+    response = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -2,28 +2,50 @@
 
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Column, ForeignKey, String, DateTime, Text
+from sqlalchemy import Column, ForeignKey, Index, String, DateTime, Text, Integer, Float, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from ..db.session import Base
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Transcripts are read in order, and recovery looks up the latest message of a round table
+        Index("ix_messages_round_table_id_created_at", "round_table_id", "created_at"),
+        UniqueConstraint("round_table_id", "sequence", name="uq_messages_round_table_id_sequence"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     round_table_id = Column(
         UUID(as_uuid=True), 
         ForeignKey("round_tables.id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
     agent_id = Column(
         UUID(as_uuid=True), 
         ForeignKey("agents.id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
     content = Column(Text, nullable=False)
     message_type = Column(String(50), nullable=False)  # introduction, discussion, conclusion
+    # 1-based position in the round table's full history, counting the messages a fork inherits
+    sequence = Column(Integer, nullable=False)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    # LLM accounting for the completion that produced this turn; null for
+    # messages that did not come from an LLM call
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    cost = Column(Float, nullable=True)  # USD, as estimated by AG2's pricing table
+    model = Column(String(255), nullable=True)
+    provider = Column(String(50), nullable=True)  # LLMConfig.active_config name
+    ttft_ms = Column(Float, nullable=True)
+    latency_ms = Column(Float, nullable=True)
+
+    # The table also has search_vector, a GIN-indexed tsvector Postgres
+    # generates from content. Only SearchService reads it, so it is not mapped.
     
     # Add relationships
     agent = relationship("Agent", back_populates="messages")
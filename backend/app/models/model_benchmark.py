@@ -0,0 +1,26 @@
+# app/models/model_benchmark.py
+
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import Column, String, Integer, Float, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from ..db.session import Base
+
+class ModelBenchmark(Base):
+    """Result of one throughput probe of a deployed Kamiwaza model"""
+    __tablename__ = "model_benchmarks"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    model_name = Column(String(255), nullable=False, index=True)
+    instances = Column(Integer, nullable=False)  # Instances the probe requests were spread over
+    concurrency = Column(Integer, nullable=False)
+    requests = Column(Integer, nullable=False)
+    max_tokens = Column(Integer, nullable=False)
+    errors = Column(Integer, nullable=False)
+    error_rate = Column(Float, nullable=False)
+    ttft_p50_ms = Column(Float, nullable=True)
+    ttft_p95_ms = Column(Float, nullable=True)
+    latency_p50_ms = Column(Float, nullable=True)
+    latency_p95_ms = Column(Float, nullable=True)
+    tokens_per_second = Column(Float, nullable=True)  # Completion tokens across all requests per wall-clock second
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, index=True)
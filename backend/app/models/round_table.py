@@ -1,7 +1,7 @@
 # app/models/round_table.py
 from datetime import datetime
 import uuid
-from sqlalchemy import Column, String, JSON, DateTime
+from sqlalchemy import Column, ForeignKey, String, Integer, JSON, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from ..db.session import Base
 from sqlalchemy.orm import relationship
@@ -21,8 +21,17 @@ class RoundTable(Base):
         "send_introductions": True
     })
     messages_state = Column(JSON, nullable=True)  # Store serialized chat state for pause/resume
+    checkpoint = Column(JSON, nullable=True)  # Resume point (next speaker, rounds used) of a stopped discussion
+    summary = Column(JSON, nullable=True)  # Map-reduce summary and the number of messages it covers
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=True)  # Messages moved to round_table_archives
+    # A fork shares the first fork_point messages of its parent's history instead of copying them
+    parent_id = Column(UUID(as_uuid=True), ForeignKey("round_tables.id"), nullable=True, index=True)
+    fork_point = Column(Integer, nullable=True)
+    # Lease of the worker driving the discussion; it lapses unless heartbeat_at is renewed
+    owner_id = Column(String(255), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
 
     # Add relationships
     participants = relationship(
@@ -34,4 +43,10 @@ class RoundTable(Base):
         "Message",
         back_populates="round_table",
         cascade="all, delete-orphan"
+    )
+    archive = relationship(
+        "RoundTableArchive",
+        back_populates="round_table",
+        uselist=False,
+        cascade="all, delete-orphan"
     )
\ No newline at end of file
@@ -0,0 +1,29 @@
+# app/models/round_table_archive.py
+
+from datetime import datetime
+from sqlalchemy import Column, ForeignKey, String, Integer, DateTime, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from ..db.session import Base
+
+class RoundTableArchive(Base):
+    """The transcript of an archived round table, compressed into one blob.
+
+    Its message rows are deleted when it is archived; ``payload`` holds them
+    as the JSON the history API serves.
+    """
+    __tablename__ = "round_table_archives"
+
+    round_table_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("round_tables.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    codec = Column(String(20), nullable=False)  # zlib
+    payload = Column(LargeBinary, nullable=False)
+    message_count = Column(Integer, nullable=False)
+    raw_bytes = Column(Integer, nullable=False)  # Size before compression
+    archived_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    # Add relationships
+    round_table = relationship("RoundTable", back_populates="archive")
@@ -0,0 +1,52 @@
+# app/models/sweep.py
+
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import Column, ForeignKey, String, Integer, DateTime, JSON, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from ..db.session import Base
+
+class Sweep(Base):
+    """One round table setup run across every point of a parameter grid"""
+    __tablename__ = "sweeps"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    name = Column(String(255), nullable=False)
+    config = Column(JSON, nullable=False)  # The SweepCreate request it was made from
+    concurrency = Column(Integer, nullable=False)  # Runs submitted to the discussion scheduler at once
+    priority = Column(Integer, nullable=False, default=0)
+    status = Column(String(50), nullable=False, default="pending")  # pending, running, completed, cancelled
+    # Lease of the worker running the sweep; it lapses unless heartbeat_at is renewed
+    owner_id = Column(String(255), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    runs = relationship("SweepRun", back_populates="sweep", cascade="all, delete-orphan", order_by="SweepRun.index")
+
+
+class SweepRun(Base):
+    """One grid point of a sweep and the round table that discusses it"""
+    __tablename__ = "sweep_runs"
+    __table_args__ = (
+        UniqueConstraint("sweep_id", "index", name="uq_sweep_runs_sweep_id_index"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    sweep_id = Column(UUID(as_uuid=True), ForeignKey("sweeps.id", ondelete="CASCADE"), nullable=False)
+    index = Column(Integer, nullable=False)
+    params = Column(JSON, nullable=False)  # The grid values of this run
+    prompt = Column(Text, nullable=False)
+    round_table_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("round_tables.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True
+    )
+    status = Column(String(50), nullable=False, default="pending")  # pending, running, or the discussion's final status
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    sweep = relationship("Sweep", back_populates="runs")
@@ -0,0 +1,30 @@
+# app/schemas/benchmark.py
+from uuid import UUID
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+class BenchmarkRequest(BaseModel):
+    models: Optional[List[str]] = None  # Defaults to every deployed model
+    concurrency: int = Field(4, ge=1, le=64)
+    requests: int = Field(16, ge=1, le=1000)
+    max_tokens: int = Field(64, ge=1, le=1024)
+
+class ModelBenchmarkResult(BaseModel):
+    id: UUID
+    model_name: str
+    instances: int
+    concurrency: int
+    requests: int
+    max_tokens: int
+    errors: int
+    error_rate: float
+    ttft_p50_ms: Optional[float] = None
+    ttft_p95_ms: Optional[float] = None
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+    tokens_per_second: Optional[float] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
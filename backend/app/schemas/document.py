@@ -0,0 +1,24 @@
+# app/schemas/document.py
+from uuid import UUID
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class RoundTableDocumentInDB(BaseModel):
+    round_table_id: UUID
+    document_id: UUID
+    filename: str
+    content_type: Optional[str] = None
+    size: int  # Bytes
+    sha256: str
+    chunks: int
+    tokens: int
+    deduplicated: bool = False  # The same file was already stored, so it was not processed again
+    created_at: Optional[datetime] = None
+
+class DocumentExcerpt(BaseModel):
+    document_id: UUID
+    filename: str
+    position: int  # Of the chunk in its document
+    content: str
+    score: float  # Cosine similarity to the query
@@ -0,0 +1,16 @@
+# app/schemas/memory.py
+from uuid import UUID
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class AgentMemory(BaseModel):
+    message_id: UUID
+    round_table_id: UUID
+    content: str
+    score: float  # Cosine similarity to the query
+    created_at: Optional[datetime] = None
+
+class MemoryRebuild(BaseModel):
+    agent_id: UUID
+    memories: int
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel
 
@@ -14,6 +15,14 @@ class MessageCreate(MessageBase):
 class MessageInDB(MessageBase):
     id: UUID
     created_at: datetime
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cost: Optional[float] = None
+    model: Optional[str] = None
+    provider: Optional[str] = None
+    ttft_ms: Optional[float] = None
+    latency_ms: Optional[float] = None
+    sequence: Optional[int] = None  # Position in the round table's history; subscribers resume after it
 
     class Config:
         from_attributes = True
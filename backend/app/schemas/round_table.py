@@ -19,6 +19,7 @@ class RoundTableSettings(BaseModel):
     allow_repeat_speaker: bool = True
     send_introductions: bool = True
     allowed_speaker_transitions: Optional[Dict[str, List[str]]] = None
+    temperature: Optional[float] = Field(None, ge=0, le=2)  # Overrides every participant's sampling temperature
 
 class RoundTableBase(BaseModel):
     name: str
@@ -61,6 +62,14 @@ class RoundTableCreate(BaseModel):
     participant_ids: List[UUID]
     settings: Optional[RoundTableSettings] = Field(default_factory=RoundTableSettings)
 
+class RoundTableFork(BaseModel):
+    at_message: Optional[int] = Field(None, ge=1)  # Messages of the parent's history to keep; defaults to all
+    title: Optional[str] = None
+    context: Optional[str] = None
+    participant_ids: Optional[List[UUID]] = None  # Defaults to the parent's participants
+    settings: Optional[RoundTableSettings] = None
+    prompt: Optional[str] = None  # New direction the branch continues from
+
 class RoundTableUpdate(RoundTableBase):
     name: Optional[str] = None
     objective: Optional[str] = None
@@ -76,7 +85,11 @@ class RoundTableInDB(BaseModel):
     settings: RoundTableSettings
     created_at: datetime
     completed_at: Optional[datetime]
+    archived_at: Optional[datetime] = None  # Transcript moved to compressed cold storage
+    parent_id: Optional[UUID] = None  # Round table this one was forked from
+    fork_point: Optional[int] = None  # Messages of the parent's history it shares
     messages: Optional[List[MessageInDB]] = []
+    queue_position: Optional[int] = None  # Position in the discussion queue while status is "queued"
 
     class Config:
         from_attributes = True
\ No newline at end of file
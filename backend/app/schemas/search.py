@@ -0,0 +1,28 @@
+# app/schemas/search.py
+from uuid import UUID
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class SearchHit(BaseModel):
+    message_id: UUID
+    agent_id: UUID
+    agent_name: str
+    created_at: Optional[datetime]
+    rank: float
+    headline: str  # Matching fragments with terms wrapped in <mark></mark>
+
+class RoundTableSearchResult(BaseModel):
+    round_table_id: UUID
+    title: str
+    status: Optional[str]
+    best_rank: float
+    hit_count: int
+    hits: List[SearchHit]  # Best hits first, at most hits_per_round_table
+
+class SearchResults(BaseModel):
+    query: str
+    total_round_tables: int
+    limit: int
+    offset: int
+    results: List[RoundTableSearchResult]
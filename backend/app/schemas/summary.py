@@ -0,0 +1,26 @@
+# app/schemas/summary.py
+from uuid import UUID
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class AgentPosition(BaseModel):
+    agent_id: Optional[UUID] = None  # None if the summary names a speaker not in the transcript
+    agent_name: str
+    position: str
+
+class RoundTableSummary(BaseModel):
+    round_table_id: UUID
+    status: str  # ready, stale (newer messages exist), running, failed or missing
+    summary: Optional[str] = None
+    positions: List[AgentPosition] = []
+    messages: int = 0  # Messages the summary covers
+    total_messages: int = 0
+    chunks: int = 0  # Transcript chunks summarized in the map step
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    model: Optional[str] = None
+    created_at: Optional[datetime] = None
+    error: Optional[str] = None
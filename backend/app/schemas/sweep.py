@@ -0,0 +1,46 @@
+# app/schemas/sweep.py
+from uuid import UUID
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+from .round_table import RoundTableSettings
+
+class SweepCreate(BaseModel):
+    name: str
+    title: str
+    context: str
+    prompt: str
+    participant_ids: List[UUID]
+    settings: RoundTableSettings = Field(default_factory=RoundTableSettings)
+    # Values to try per parameter; every combination becomes a run. Parameters are prompt,
+    # context, participant_ids or any round table setting, e.g. {"temperature": [0.2, 0.9]}
+    grid: Dict[str, List[Any]] = Field(default_factory=dict)
+    repeats: int = Field(1, ge=1, le=100)  # Runs per combination
+    concurrency: Optional[int] = Field(None, ge=1)  # Defaults to MAX_CONCURRENT_DISCUSSIONS
+    priority: int = 0
+
+class SweepRunResult(BaseModel):
+    index: int
+    params: Dict[str, Any]
+    round_table_id: Optional[UUID] = None
+    status: str
+    error: Optional[str] = None
+    messages: int = 0
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cost: Optional[float] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_s: Optional[float] = None
+
+class SweepResult(BaseModel):
+    id: UUID
+    name: str
+    status: str
+    concurrency: int
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    runs_by_status: Dict[str, int]
+    total_cost: Optional[float] = None
+    runs: List[SweepRunResult]
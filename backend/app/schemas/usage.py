@@ -0,0 +1,34 @@
+# app/schemas/usage.py
+from uuid import UUID
+from typing import List, Optional
+from pydantic import BaseModel
+
+class UsageTotals(BaseModel):
+    messages: int  # Stored turns, including ones not produced by an LLM
+    completions: int  # Turns with LLM accounting
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    cost: float
+    avg_latency_ms: Optional[float] = None
+    max_latency_ms: Optional[float] = None
+    avg_ttft_ms: Optional[float] = None
+
+class ModelUsage(UsageTotals):
+    provider: Optional[str] = None
+    model: Optional[str] = None
+
+class AgentUsage(ModelUsage):
+    agent_id: UUID
+    agent_name: str
+
+class RoundTableUsage(BaseModel):
+    round_table_id: UUID
+    totals: UsageTotals
+    by_agent: List[AgentUsage]
+
+class AgentUsageReport(BaseModel):
+    agent_id: UUID
+    agent_name: str
+    totals: UsageTotals
+    by_model: List[ModelUsage]
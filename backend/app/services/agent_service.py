@@ -8,32 +8,29 @@ from sqlalchemy.sql import text
 from ..repositories.agent_repository import AgentRepository
 from ..schemas.agent import AgentCreate, AgentUpdate, AgentInDB
 from ..models.agent import Agent
-from ..utils.ag2_wrapper import AG2Wrapper
-from ..utils.llm_config import LLMConfigManager, get_llm_config_manager
+from ..utils.ag2_wrapper import AG2Wrapper, get_ag2_wrapper
+from ..utils.memory_index import get_memory_index
 
 class AgentService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, ag2_wrapper: Optional[AG2Wrapper] = None):
         self.db = db
         self.repository = AgentRepository(Agent, db)
-        self.llm_config_manager = LLMConfigManager()
-        self.ag2_wrapper = AG2Wrapper(self.llm_config_manager)
+        # AG2Wrapper and its LLM config registry are shared process-wide
+        self.ag2_wrapper = ag2_wrapper or get_ag2_wrapper()
 
     def create_agent(self, agent_data: AgentCreate) -> AgentInDB:
         # If host is prod.kamiwaza.ai, use the model as model_name
         #TODO: THIS IS NOT HOW IT SHOULD WORK BUT A HOTFIX FOR NOW
-        print(agent_data)
-        
         if agent_data.llm_config.get('host_name') == "prod.kamiwaza.ai":
             agent_data.llm_config["model_name"] = 'model'
+        self._check_tools(agent_data.tool_config)
         
         # Create database record
         db_agent = self.repository.create(agent_data)
         
-        # Initialize AG2 agent
+        # Initialize AG2 agent, with the tools in its tool_config
         try:
-            ag2_agent = self.ag2_wrapper.create_agent(agent_data)
-            if agent_data.tool_config:
-                self.ag2_wrapper.register_tools(ag2_agent, agent_data.tool_config)
+            self.ag2_wrapper.create_agent(agent_data)
         except Exception as e:
             # Roll back database transaction
             self.repository.delete(db_agent.id)
@@ -42,6 +39,13 @@ class AgentService:
         
         return AgentInDB.model_validate(db_agent)
 
+    def _check_tools(self, tool_config) -> None:
+        """Reject a tool_config that names unknown tools before anything is stored"""
+        try:
+            self.ag2_wrapper.tool_registry.resolve(tool_config)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     def get_agent(self, agent_id: UUID) -> Optional[AgentInDB]:
         db_agent = self.repository.get(agent_id)
         if not db_agent:
@@ -53,6 +57,7 @@ class AgentService:
         return [AgentInDB.model_validate(agent) for agent in agents]
 
     def update_agent(self, agent_id: UUID, agent_data: AgentUpdate) -> AgentInDB:
+        self._check_tools(agent_data.tool_config)
         db_agent = self.repository.update(agent_id, agent_data)
         if not db_agent:
             raise HTTPException(status_code=404, detail="Agent not found")
@@ -61,12 +66,14 @@ class AgentService:
     def delete_agent(self, agent_id: UUID) -> bool:
         if not self.repository.delete(agent_id):
             raise HTTPException(status_code=404, detail="Agent not found")
+        get_memory_index().delete(agent_id)
         return True
 
     def delete_all_agents(self) -> bool:
         try:
             self.db.query(Agent).delete()
             self.db.commit()
+            get_memory_index().clear()
             return True
         except Exception as e:
             self.db.rollback()
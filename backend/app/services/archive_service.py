@@ -0,0 +1,145 @@
+# app/services/archive_service.py
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID
+import logging
+import time
+import zlib
+
+from sqlalchemy import delete, null, select
+from sqlalchemy.orm import Session
+
+from ..models.message import Message
+from ..models.round_table import RoundTable
+from ..models.round_table_archive import RoundTableArchive
+from ..utils.serialization import MESSAGE_COLUMNS, MESSAGE_LIST_ADAPTER, MessageRow, rows_to_dicts
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_CODEC = "zlib"
+
+
+def compress_transcript(messages: List[MessageRow]) -> Dict:
+    """Archive columns for a transcript: the history API's JSON, compressed"""
+    raw = MESSAGE_LIST_ADAPTER.dump_json(messages)
+    return {
+        "codec": ARCHIVE_CODEC,
+        "payload": zlib.compress(raw, 9),
+        "message_count": len(messages),
+        "raw_bytes": len(raw)
+    }
+
+
+def decompress_transcript(archive: RoundTableArchive) -> List[MessageRow]:
+    if archive.codec != ARCHIVE_CODEC:
+        raise ValueError(f"Unknown archive codec {archive.codec!r}")
+    return MESSAGE_LIST_ADAPTER.validate_json(zlib.decompress(archive.payload))
+
+
+class ArchiveService:
+    """Move the transcripts of old completed discussions into compressed blobs.
+
+    Each batch is one short transaction: it claims a few round tables with
+    ``FOR UPDATE SKIP LOCKED`` (so concurrent jobs never wait on each other
+    or on live writes), writes one archive row per round table, deletes
+    their message rows and drops the ``messages_state`` copy.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+
+    def _candidates(self, cutoff: datetime, limit: int):
+        return (
+            select(RoundTable)
+            .where(
+                RoundTable.status == "completed",
+                RoundTable.archived_at.is_(None),
+                RoundTable.completed_at < cutoff
+            )
+            .order_by(RoundTable.completed_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+    def archive_batch(self, cutoff: datetime, batch_size: Optional[int] = None) -> int:
+        """Archive up to ``batch_size`` round tables completed before ``cutoff``; returns how many"""
+        batch_size = batch_size or self.settings.ARCHIVE_BATCH_SIZE
+        try:
+            round_tables = self.db.execute(self._candidates(cutoff, batch_size)).scalars().all()
+            if not round_tables:
+                self.db.rollback()
+                return 0
+            ids = [round_table.id for round_table in round_tables]
+
+            messages_by_round_table: Dict[UUID, List[MessageRow]] = {round_table_id: [] for round_table_id in ids}
+            rows = (
+                self.db.query(*[getattr(Message, column) for column in MESSAGE_COLUMNS])
+                .filter(Message.round_table_id.in_(ids))
+                .order_by(Message.sequence, Message.id)
+                .all()
+            )
+            for message in rows_to_dicts(rows, MESSAGE_COLUMNS):
+                messages_by_round_table[message["round_table_id"]].append(message)
+
+            archived_at = datetime.utcnow()
+            for round_table in round_tables:
+                self.db.add(RoundTableArchive(
+                    round_table_id=round_table.id,
+                    archived_at=archived_at,
+                    **compress_transcript(messages_by_round_table[round_table.id])
+                ))
+                # SQL NULL; None would store a JSON null
+                round_table.messages_state = null()
+                round_table.archived_at = archived_at
+            self.db.execute(
+                delete(Message)
+                .where(Message.round_table_id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        logger.info(f"Archived {len(ids)} round tables ({len(rows)} messages)")
+        return len(ids)
+
+    def run(
+        self,
+        older_than_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None,
+        pause: Optional[float] = None
+    ) -> int:
+        """Archive batches until nothing old enough is left; returns the number of round tables"""
+        days = self.settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+        pause = self.settings.ARCHIVE_BATCH_PAUSE if pause is None else pause
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        total = batches = 0
+        while max_batches is None or batches < max_batches:
+            archived = self.archive_batch(cutoff, batch_size)
+            if not archived:
+                break
+            total += archived
+            batches += 1
+            if pause:
+                time.sleep(pause)
+        return total
+
+    def get_archived_history(self, round_table_id: UUID) -> Optional[List[MessageRow]]:
+        """The archived transcript of a round table, or None if it is not archived"""
+        archive = self.db.get(RoundTableArchive, round_table_id)
+        if archive is None:
+            return None
+        return decompress_transcript(archive)
+
+    def get_archived_histories(self, round_table_ids: List[UUID]) -> Dict[UUID, List[MessageRow]]:
+        if not round_table_ids:
+            return {}
+        archives = (
+            self.db.query(RoundTableArchive)
+            .filter(RoundTableArchive.round_table_id.in_(round_table_ids))
+            .all()
+        )
+        return {archive.round_table_id: decompress_transcript(archive) for archive in archives}
@@ -0,0 +1,184 @@
+# app/services/benchmark_service.py
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import logging
+import time
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.model_benchmark import ModelBenchmark
+from ..schemas.benchmark import BenchmarkRequest, ModelBenchmarkResult
+
+logger = logging.getLogger(__name__)
+
+# Every model gets the same short chat completion, so results are comparable
+PROBE_MESSAGES = [
+    {"role": "system", "content": "You are a concise strategy consultant."},
+    {"role": "user", "content": "List three risks of entering a new market, one short sentence each."}
+]
+PROBE_TIMEOUT = 120.0
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = int(round(pct / 100.0 * (len(ordered) - 1)))
+    return ordered[min(len(ordered) - 1, max(0, index))]
+
+
+async def probe_once(client, url: str, max_tokens: int) -> Dict[str, Any]:
+    """Stream one probe completion from an OpenAI-compatible ``url``.
+
+    Returns seconds to the first content token and to the end of the
+    stream, and the completion tokens: as reported in the final usage chunk,
+    or counted as content chunks when the server sends no usage.
+    """
+    started = time.perf_counter()
+    ttft = None
+    chunks = 0
+    usage_tokens = None
+    payload = {
+        "model": "model",  # Kamiwaza serves one model per deployment under this name
+        "messages": PROBE_MESSAGES,
+        "max_tokens": max_tokens,
+        "temperature": 0,
+        "stream": True,
+        "stream_options": {"include_usage": True}
+    }
+    async with client.stream("POST", f"{url}/chat/completions", json=payload, timeout=PROBE_TIMEOUT) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            event = json.loads(data)
+            if event.get("usage"):
+                usage_tokens = event["usage"].get("completion_tokens")
+            for choice in event.get("choices") or []:
+                if (choice.get("delta") or {}).get("content"):
+                    if ttft is None:
+                        ttft = time.perf_counter() - started
+                    chunks += 1
+    return {
+        "ttft": ttft,
+        "latency": time.perf_counter() - started,
+        "tokens": usage_tokens if usage_tokens is not None else chunks
+    }
+
+
+async def run_probe(
+    client,
+    urls: List[str],
+    concurrency: int = 4,
+    requests: int = 16,
+    max_tokens: int = 64
+) -> Dict[str, Any]:
+    """Send ``requests`` probes, ``concurrency`` at a time, spread over ``urls``"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(index: int) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            url = urls[index % len(urls)]
+            try:
+                return await probe_once(client, url, max_tokens)
+            except Exception as e:
+                logger.info(f"Benchmark probe against {url} failed: {e!r}")
+                return None
+
+    started = time.perf_counter()
+    samples = await asyncio.gather(*(probe(index) for index in range(requests)))
+    wall = time.perf_counter() - started
+
+    succeeded = [sample for sample in samples if sample is not None]
+    ttfts = [sample["ttft"] * 1000 for sample in succeeded if sample["ttft"] is not None]
+    latencies = [sample["latency"] * 1000 for sample in succeeded]
+    tokens = sum(sample["tokens"] for sample in succeeded)
+    errors = len(samples) - len(succeeded)
+    return {
+        "instances": len(urls),
+        "concurrency": concurrency,
+        "requests": requests,
+        "max_tokens": max_tokens,
+        "errors": errors,
+        "error_rate": errors / requests,
+        "ttft_p50_ms": _percentile(ttfts, 50),
+        "ttft_p95_ms": _percentile(ttfts, 95),
+        "latency_p50_ms": _percentile(latencies, 50),
+        "latency_p95_ms": _percentile(latencies, 95),
+        "tokens_per_second": tokens / wall if succeeded and wall > 0 else None
+    }
+
+
+class BenchmarkService:
+    """Probe deployed Kamiwaza models under load and keep the results"""
+
+    def __init__(self, db: Session, kamiwaza_service=None):
+        self.db = db
+        self._kamiwaza_service = kamiwaza_service
+
+    @property
+    def kamiwaza_service(self):
+        if self._kamiwaza_service is None:
+            from .kamiwaza_service import get_kamiwaza_service
+            self._kamiwaza_service = get_kamiwaza_service()
+        return self._kamiwaza_service
+
+    async def run(self, request: BenchmarkRequest) -> List[ModelBenchmarkResult]:
+        """Benchmark the requested deployed models one after another and store the results"""
+        models = await self.kamiwaza_service.get_available_models()
+        if request.models:
+            missing = set(request.models) - {model["model_name"] for model in models}
+            if missing:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Models not deployed: {', '.join(sorted(missing))}"
+                )
+            models = [model for model in models if model["model_name"] in request.models]
+
+        results = []
+        for model in models:
+            logger.info(f"Benchmarking {model['model_name']} at concurrency {request.concurrency}")
+            stats = await run_probe(
+                self.kamiwaza_service.client,
+                [instance["url"] for instance in model["instances"]],
+                concurrency=request.concurrency,
+                requests=request.requests,
+                max_tokens=request.max_tokens
+            )
+            benchmark = ModelBenchmark(model_name=model["model_name"], **stats)
+            self.db.add(benchmark)
+            self.db.commit()
+            results.append(ModelBenchmarkResult.model_validate(benchmark))
+        return results
+
+    def get_latest(self) -> Dict[str, ModelBenchmarkResult]:
+        """The most recent benchmark of every model"""
+        latest = (
+            self.db.query(ModelBenchmark.model_name, func.max(ModelBenchmark.created_at).label("created_at"))
+            .group_by(ModelBenchmark.model_name)
+            .subquery()
+        )
+        benchmarks = (
+            self.db.query(ModelBenchmark)
+            .join(
+                latest,
+                (ModelBenchmark.model_name == latest.c.model_name)
+                & (ModelBenchmark.created_at == latest.c.created_at)
+            )
+            .all()
+        )
+        return {benchmark.model_name: ModelBenchmarkResult.model_validate(benchmark) for benchmark in benchmarks}
+
+    def get_history(self, model_name: Optional[str] = None, limit: int = 50) -> List[ModelBenchmarkResult]:
+        query = self.db.query(ModelBenchmark)
+        if model_name:
+            query = query.filter(ModelBenchmark.model_name == model_name)
+        benchmarks = query.order_by(ModelBenchmark.created_at.desc()).limit(limit).all()
+        return [ModelBenchmarkResult.model_validate(benchmark) for benchmark in benchmarks]
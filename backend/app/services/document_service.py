@@ -0,0 +1,389 @@
+# app/services/document_service.py
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models.document import Document, DocumentChunk, RoundTableDocument
+from ..models.round_table import RoundTable
+from ..schemas.document import DocumentExcerpt, RoundTableDocumentInDB
+from ..utils.memory_index import MAX_FEATURES, HashingVectorizer, compact, cosine
+from .fork_service import ForkService
+from .summary_service import chunk_transcript, count_tokens
+
+# numpy is only imported once a discussion's documents are searched, so it stays off the start-up path
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bytes of an upload read and written at a time
+COPY_BLOCK_BYTES = 1 << 20
+TEXT_SUFFIXES = {".txt", ".md", ".markdown", ".rst", ".csv", ".json"}
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def document_kind(filename: str, content_type: Optional[str]) -> str:
+    """``pdf`` or ``text``; anything else is rejected before it is uploaded"""
+    suffix = os.path.splitext(filename)[1].lower()
+    if suffix == ".pdf" or content_type == "application/pdf":
+        return "pdf"
+    if suffix in TEXT_SUFFIXES or (content_type or "").startswith("text/"):
+        return "text"
+    raise HTTPException(status_code=415, detail=f"Unsupported document type: {suffix or content_type}")
+
+
+def extract_text(path: str, kind: str) -> str:
+    """The text of a stored file; PDFs need the optional pypdf package"""
+    if kind == "pdf":
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise HTTPException(status_code=415, detail="PDF documents need the pypdf package installed")
+        try:
+            return "\n\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"Could not read the PDF: {e}")
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", errors="replace")
+
+
+def chunk_document(text: str, max_tokens: int) -> List[str]:
+    """Pack a document's paragraphs, in order, into passages of at most ``max_tokens`` tokens"""
+    paragraphs = []
+    for paragraph in PARAGRAPH_BREAK.split(text):
+        lines = [line.strip() for line in paragraph.splitlines() if line.strip()]
+        if lines:
+            paragraphs.append("\n".join(lines))
+    return chunk_transcript(paragraphs, max_tokens)
+
+
+def ingest(path: str, kind: str, max_tokens: int) -> List[Dict]:
+    """Chunk and embed a stored file into ``DocumentChunk`` rows; CPU-bound, so run off the event loop"""
+    vectorizer = HashingVectorizer()
+    rows = []
+    for content in chunk_document(extract_text(path, kind), max_tokens):
+        embedding = vectorizer.transform(content)
+        if embedding is None:
+            continue
+        buckets, weights = compact(embedding)
+        rows.append({
+            "position": len(rows),
+            "content": content,
+            "tokens": count_tokens(content),
+            "buckets": buckets.tobytes(),
+            "weights": weights.tobytes()
+        })
+    return rows
+
+
+def format_excerpts(excerpts: List[DocumentExcerpt]) -> str:
+    """What a speaker's system message gets for a turn's passages; empty when there are none"""
+    if not excerpts:
+        return ""
+    passages = "\n\n".join(
+        f"[{excerpt.filename}, part {excerpt.position + 1}]\n{excerpt.content}" for excerpt in excerpts
+    )
+    return f"\n\nExcerpts from the discussion's documents that bear on the latest messages:\n{passages}"
+
+
+@dataclass
+class LoadedDocument:
+    contents: List[str]  # Chunk texts by position
+    buckets: np.ndarray  # (chunks, MAX_FEATURES) uint16
+    weights: np.ndarray  # (chunks, MAX_FEATURES) float16
+
+
+class ChunkCache:
+    """Chunks of recently used documents, shared by the discussions on this worker.
+
+    Stored documents never change, so an entry is only dropped when it is
+    evicted or its document is deleted.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._documents: "OrderedDict[UUID, LoadedDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, document_id: UUID, load: Callable[[UUID], LoadedDocument]) -> LoadedDocument:
+        with self._lock:
+            document = self._documents.get(document_id)
+            if document is not None:
+                self._documents.move_to_end(document_id)
+                return document
+        document = load(document_id)
+        with self._lock:
+            self._documents[document_id] = document
+            while len(self._documents) > self.size:
+                self._documents.popitem(last=False)
+        return document
+
+    def evict(self, document_id: UUID) -> None:
+        with self._lock:
+            self._documents.pop(document_id, None)
+
+
+@lru_cache()
+def get_chunk_cache() -> ChunkCache:
+    """Get or create the process-wide chunk cache"""
+    return ChunkCache(get_settings().DOCUMENT_CACHE_SIZE)
+
+
+class DocumentRetriever:
+    """Scores every passage of a round table's documents against a turn's latest messages"""
+
+    def __init__(self, documents: List[Tuple[UUID, str, LoadedDocument]]):
+        import numpy as np
+
+        self.vectorizer = HashingVectorizer()
+        self.filenames = [filename for _, filename, _ in documents]
+        self.sources = [
+            (document_id, filename, position)
+            for document_id, filename, loaded in documents
+            for position in range(len(loaded.contents))
+        ]
+        self.contents = [content for _, _, loaded in documents for content in loaded.contents]
+        self.buckets = np.concatenate([loaded.buckets for _, _, loaded in documents])
+        self.weights = np.concatenate([loaded.weights for _, _, loaded in documents])
+
+    def search(self, text: str, k: int, min_score: float = 0.0) -> List[DocumentExcerpt]:
+        import numpy as np
+
+        query = self.vectorizer.transform(text)
+        if query is None or not self.contents:
+            return []
+        scores = cosine(query, self.buckets, self.weights)
+        excerpts = []
+        for index in np.argsort(-scores)[:k]:
+            if scores[index] < min_score:
+                break
+            document_id, filename, position = self.sources[index]
+            excerpts.append(DocumentExcerpt(
+                document_id=document_id,
+                filename=filename,
+                position=position,
+                content=self.contents[index],
+                score=float(scores[index])
+            ))
+        return excerpts
+
+
+class DocumentService:
+    """Documents attached to round tables.
+
+    Uploads are streamed to disk while they are hashed. A file whose
+    SHA-256 is already stored is attached as is; a new one is chunked and
+    embedded once, at upload time. During a discussion each speaker gets
+    only the passages that bear on the latest messages, instead of whole
+    documents in the prompt.
+    """
+
+    def __init__(self, db: Session, settings=None):
+        self.db = db
+        self.settings = settings or get_settings()
+
+    def _get_round_table(self, round_table_id: UUID) -> RoundTable:
+        round_table = self.db.get(RoundTable, round_table_id)
+        if not round_table:
+            raise HTTPException(status_code=404, detail="Round table not found")
+        return round_table
+
+    def _path(self, sha256: str) -> str:
+        return os.path.join(self.settings.DOCUMENT_DIR, sha256[:2], sha256)
+
+    async def upload(self, round_table_id: UUID, file: UploadFile) -> RoundTableDocumentInDB:
+        """Attach an uploaded file to a round table, processing it only if no round table has it yet"""
+        self._get_round_table(round_table_id)
+        filename = os.path.basename(file.filename or "document")[:255]
+        kind = document_kind(filename, file.content_type)
+
+        os.makedirs(self.settings.DOCUMENT_DIR, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.settings.DOCUMENT_DIR, suffix=".upload")
+        try:
+            digest, size = hashlib.sha256(), 0
+            with os.fdopen(descriptor, "wb") as out:
+                while block := await file.read(COPY_BLOCK_BYTES):
+                    size += len(block)
+                    if size > self.settings.DOCUMENT_MAX_BYTES:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"Documents are limited to {self.settings.DOCUMENT_MAX_BYTES} bytes"
+                        )
+                    digest.update(block)
+                    out.write(block)
+            if not size:
+                raise HTTPException(status_code=400, detail="The document is empty")
+            sha256 = digest.hexdigest()
+            document = self.db.query(Document).filter(Document.sha256 == sha256).first()
+            deduplicated = document is not None
+            if document is None:
+                path = self._path(sha256)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temporary, path)
+                document = await self._store(sha256, path, kind, filename, file.content_type, size)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        return self._attach(round_table_id, document, filename, deduplicated)
+
+    async def _store(
+        self,
+        sha256: str,
+        path: str,
+        kind: str,
+        filename: str,
+        content_type: Optional[str],
+        size: int
+    ) -> Document:
+        try:
+            rows = await asyncio.to_thread(ingest, path, kind, self.settings.DOCUMENT_CHUNK_TOKENS)
+            if not rows:
+                raise HTTPException(status_code=422, detail="The document has no text to index")
+        except Exception:
+            os.remove(path)
+            raise
+        document = Document(
+            sha256=sha256,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            chunk_count=len(rows),
+            tokens=sum(row["tokens"] for row in rows),
+            chunks=[DocumentChunk(**row) for row in rows]
+        )
+        self.db.add(document)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Another upload of the same file was stored first
+            self.db.rollback()
+            document = self.db.query(Document).filter(Document.sha256 == sha256).one()
+        logger.info(f"Stored document {document.id} ({filename}, {size} bytes) as {len(rows)} chunks")
+        return document
+
+    def _attach(self, round_table_id: UUID, document: Document, filename: str, deduplicated: bool) -> RoundTableDocumentInDB:
+        attachment = self.db.get(RoundTableDocument, (round_table_id, document.id))
+        if attachment is None:
+            attachment = RoundTableDocument(round_table_id=round_table_id, document_id=document.id, filename=filename)
+            self.db.add(attachment)
+            try:
+                self.db.commit()
+            except IntegrityError:
+                # Attached by a concurrent upload of the same file
+                self.db.rollback()
+                attachment = self.db.get(RoundTableDocument, (round_table_id, document.id))
+        return self._to_schema(attachment, document, deduplicated)
+
+    def _to_schema(
+        self,
+        attachment: RoundTableDocument,
+        document: Document,
+        deduplicated: bool = False
+    ) -> RoundTableDocumentInDB:
+        return RoundTableDocumentInDB(
+            round_table_id=attachment.round_table_id,
+            document_id=document.id,
+            filename=attachment.filename,
+            content_type=document.content_type,
+            size=document.size,
+            sha256=document.sha256,
+            chunks=document.chunk_count,
+            tokens=document.tokens,
+            deduplicated=deduplicated,
+            created_at=attachment.created_at
+        )
+
+    def list_documents(self, round_table_id: UUID) -> List[RoundTableDocumentInDB]:
+        self._get_round_table(round_table_id)
+        rows = (
+            self.db.query(RoundTableDocument, Document)
+            .join(Document, Document.id == RoundTableDocument.document_id)
+            .filter(RoundTableDocument.round_table_id == round_table_id)
+            .order_by(RoundTableDocument.created_at)
+            .all()
+        )
+        return [self._to_schema(attachment, document) for attachment, document in rows]
+
+    def detach(self, round_table_id: UUID, document_id: UUID) -> bool:
+        """Remove a document from a round table, and from disk once no round table has it"""
+        attachment = self.db.get(RoundTableDocument, (round_table_id, document_id))
+        if not attachment:
+            raise HTTPException(status_code=404, detail="Document not attached to this round table")
+        self.db.delete(attachment)
+        self.db.flush()
+        still_attached = (
+            self.db.query(RoundTableDocument.round_table_id)
+            .filter(RoundTableDocument.document_id == document_id)
+            .first()
+        )
+        path = None
+        if still_attached is None:
+            document = self.db.get(Document, document_id)
+            path = self._path(document.sha256)
+            self.db.delete(document)
+        self.db.commit()
+        if path is not None:
+            get_chunk_cache().evict(document_id)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return True
+
+    def _load_chunks(self, document_id: UUID) -> LoadedDocument:
+        import numpy as np
+
+        rows = (
+            self.db.query(DocumentChunk.content, DocumentChunk.buckets, DocumentChunk.weights)
+            .filter(DocumentChunk.document_id == document_id)
+            .order_by(DocumentChunk.position)
+            .all()
+        )
+        return LoadedDocument(
+            contents=[row.content for row in rows],
+            buckets=np.frombuffer(b"".join(row.buckets for row in rows), dtype=np.uint16).reshape(len(rows), MAX_FEATURES),
+            weights=np.frombuffer(b"".join(row.weights for row in rows), dtype=np.float16).reshape(len(rows), MAX_FEATURES)
+        )
+
+    def retriever(self, round_table: RoundTable) -> Optional[DocumentRetriever]:
+        """A retriever over the documents of a round table and, for a fork, of its ancestors"""
+        ids = ForkService(self.db).lineage_ids(round_table.id) if round_table.parent_id else {round_table.id}
+        attachments = (
+            self.db.query(RoundTableDocument.document_id, RoundTableDocument.filename)
+            .filter(RoundTableDocument.round_table_id.in_(ids))
+            .order_by(RoundTableDocument.created_at)
+            .all()
+        )
+        filenames = {}
+        for document_id, filename in attachments:
+            filenames.setdefault(document_id, filename)
+        if not filenames:
+            return None
+        cache = get_chunk_cache()
+        return DocumentRetriever([
+            (document_id, filename, cache.get(document_id, self._load_chunks))
+            for document_id, filename in filenames.items()
+        ])
+
+    def search(self, round_table_id: UUID, query: str, k: Optional[int] = None) -> List[DocumentExcerpt]:
+        """The passages a speaker would be given for ``query``"""
+        retriever = self.retriever(self._get_round_table(round_table_id))
+        if retriever is None:
+            return []
+        return retriever.search(query, k or self.settings.DOCUMENT_TOP_K, self.settings.DOCUMENT_MIN_SCORE)
@@ -0,0 +1,295 @@
+# app/services/export_service.py
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing_extensions import TypedDict
+
+from ..models.agent import Agent
+from ..models.message import Message
+from ..models.round_table import RoundTable
+from ..models.round_table_archive import RoundTableArchive
+from .archive_service import decompress_transcript
+
+# Archived round tables decompressed per round trip
+ARCHIVE_BATCH_SIZE = 20
+
+# Rows fetched per round trip. With Postgres the query runs on a server-side
+# cursor, so this (not the export size) bounds memory.
+EXPORT_BATCH_SIZE = 2000
+
+# name -> (media type, file extension)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class ExportRow(TypedDict):
+    """One message with the metadata of its agent and round table"""
+    message_id: UUID
+    round_table_id: UUID
+    round_table_title: str
+    round_table_status: Optional[str]
+    round_table_created_at: Optional[datetime]
+    agent_id: UUID
+    agent_name: str
+    agent_title: str
+    message_type: str
+    content: str
+    created_at: Optional[datetime]
+    prompt_tokens: Optional[int]
+    completion_tokens: Optional[int]
+    cost: Optional[float]
+    model: Optional[str]
+    provider: Optional[str]
+    ttft_ms: Optional[float]
+    latency_ms: Optional[float]
+
+
+EXPORT_COLUMNS = tuple(ExportRow.__annotations__)
+EXPORT_ROW_ADAPTER = TypeAdapter(ExportRow)
+UUID_COLUMNS = ("message_id", "round_table_id", "agent_id")
+
+
+def _arrow_schema(pa):
+    timestamp = pa.timestamp("us", tz="UTC")
+    return pa.schema([
+        ("message_id", pa.string()),
+        ("round_table_id", pa.string()),
+        ("round_table_title", pa.string()),
+        ("round_table_status", pa.string()),
+        ("round_table_created_at", timestamp),
+        ("agent_id", pa.string()),
+        ("agent_name", pa.string()),
+        ("agent_title", pa.string()),
+        ("message_type", pa.string()),
+        ("content", pa.large_string()),
+        ("created_at", timestamp),
+        ("prompt_tokens", pa.int64()),
+        ("completion_tokens", pa.int64()),
+        ("cost", pa.float64()),
+        ("model", pa.string()),
+        ("provider", pa.string()),
+        ("ttft_ms", pa.float64()),
+        ("latency_ms", pa.float64()),
+    ])
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise HTTPException(
+            status_code=501,
+            detail="Arrow and Parquet exports need pyarrow; install it with `pip install pyarrow`"
+        )
+    return pyarrow
+
+
+class _ChunkSink:
+    """Write-only file object that hands back what was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """Stream transcripts, joined with agent and round table metadata.
+
+    Rows are read with ``yield_per`` and encoded one batch at a time, so an
+    export of any size holds at most ``batch_size`` rows in memory.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _filter(
+        stmt,
+        status: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        round_table_ids: Optional[Sequence[UUID]] = None
+    ):
+        if status:
+            stmt = stmt.where(RoundTable.status == status)
+        if date_from:
+            stmt = stmt.where(RoundTable.created_at >= date_from)
+        if date_to:
+            stmt = stmt.where(RoundTable.created_at < date_to)
+        if round_table_ids:
+            stmt = stmt.where(RoundTable.id.in_(round_table_ids))
+        return stmt
+
+    def _query(self, **filters: Any):
+        """Messages of the matching round tables, one discussion after another"""
+        stmt = (
+            select(
+                Message.id,
+                Message.round_table_id,
+                RoundTable.title,
+                RoundTable.status,
+                RoundTable.created_at,
+                Message.agent_id,
+                Agent.name,
+                Agent.title,
+                Message.message_type,
+                Message.content,
+                Message.created_at,
+                Message.prompt_tokens,
+                Message.completion_tokens,
+                Message.cost,
+                Message.model,
+                Message.provider,
+                Message.ttft_ms,
+                Message.latency_ms
+            )
+            .join(RoundTable, RoundTable.id == Message.round_table_id)
+            .join(Agent, Agent.id == Message.agent_id)
+            .order_by(RoundTable.created_at, Message.round_table_id, Message.sequence, Message.id)
+        )
+        return self._filter(stmt, **filters)
+
+    def _archived_query(self, **filters: Any):
+        """Archives of the matching round tables"""
+        stmt = (
+            select(RoundTableArchive, RoundTable.title, RoundTable.status, RoundTable.created_at)
+            .join(RoundTable, RoundTable.id == RoundTableArchive.round_table_id)
+            .order_by(RoundTable.created_at, RoundTable.id)
+        )
+        return self._filter(stmt, **filters)
+
+    def _iter_archived(self, batch_size: int, **filters: Any) -> Iterator[List[tuple]]:
+        agents: Dict[UUID, tuple] = {}
+        result = self.db.execute(self._archived_query(**filters).execution_options(yield_per=ARCHIVE_BATCH_SIZE))
+        try:
+            batch: List[tuple] = []
+            for archive, title, status, created_at in result:
+                messages = decompress_transcript(archive)
+                missing = {message["agent_id"] for message in messages} - agents.keys()
+                if missing:
+                    agents.update(
+                        (agent_id, (name, agent_title))
+                        for agent_id, name, agent_title in self.db.execute(
+                            select(Agent.id, Agent.name, Agent.title).where(Agent.id.in_(missing))
+                        )
+                    )
+                for message in messages:
+                    # Agents are deleted with their messages, so archives can outlive them
+                    agent_name, agent_title = agents.get(message["agent_id"], ("", ""))
+                    batch.append((
+                        message["id"], archive.round_table_id, title, status, created_at,
+                        message["agent_id"], agent_name, agent_title,
+                        *(message[column] for column in EXPORT_COLUMNS[8:])
+                    ))
+                # The archive row, blob included, is not needed once expanded
+                self.db.expunge(archive)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            result.close()
+
+    def iter_batches(self, batch_size: int = EXPORT_BATCH_SIZE, **filters: Any) -> Iterator[List[tuple]]:
+        """Lists of at most about ``batch_size`` row tuples in ``EXPORT_COLUMNS`` order.
+
+        Live messages come first, then the transcripts of archived round tables.
+        """
+        result = self.db.execute(self._query(**filters).execution_options(yield_per=batch_size))
+        try:
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+        finally:
+            result.close()
+        yield from self._iter_archived(batch_size, **filters)
+
+    def _ndjson(self, batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+        for batch in batches:
+            yield b"".join(
+                EXPORT_ROW_ADAPTER.dump_json(dict(zip(EXPORT_COLUMNS, row))) + b"\n"
+                for row in batch
+            )
+
+    def _arrow(self, pa, batches: Iterator[List[tuple]], fmt: str) -> Iterator[bytes]:
+        schema = _arrow_schema(pa)
+        sink = _ChunkSink()
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+        uuid_positions = [EXPORT_COLUMNS.index(name) for name in UUID_COLUMNS]
+
+        for batch in batches:
+            columns = [list(column) for column in zip(*batch)]
+            for position in uuid_positions:
+                columns[position] = [str(value) for value in columns[position]]
+            # Each batch becomes one Parquet row group / Arrow record batch
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+
+    def stream(
+        self,
+        fmt: str = "ndjson",
+        batch_size: int = EXPORT_BATCH_SIZE,
+        status: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        round_table_ids: Optional[Sequence[UUID]] = None
+    ) -> Iterator[bytes]:
+        """Encoded export, in chunks of one batch.
+
+        ``date_from``/``date_to`` select round tables by creation time, so
+        discussions are always exported whole. Unsupported formats and a
+        missing pyarrow are reported here, before anything is streamed.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown export format {fmt!r}; use one of {', '.join(EXPORT_FORMATS)}"
+            )
+        batches = self.iter_batches(
+            batch_size,
+            status=status,
+            date_from=date_from,
+            date_to=date_to,
+            round_table_ids=round_table_ids
+        )
+        if fmt == "ndjson":
+            return self._ndjson(batches)
+        return self._arrow(_import_pyarrow(), batches, fmt)
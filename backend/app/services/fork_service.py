@@ -0,0 +1,177 @@
+# app/services/fork_service.py
+from typing import Any, Dict, List, Optional, Sequence, Set
+from uuid import UUID
+import logging
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
+
+from ..models.agent import Agent
+from ..models.message import Message
+from ..models.round_table import RoundTable
+from ..models.round_table_archive import RoundTableArchive
+from ..models.round_table_participant import RoundTableParticipant
+from ..schemas.round_table import RoundTableFork
+from ..utils.serialization import MESSAGE_COLUMNS, MessageRow, rows_to_dicts
+from .archive_service import ArchiveService
+
+logger = logging.getLogger(__name__)
+
+
+def merge_forks(round_tables: Sequence[Dict[str, Any]], own: Dict[UUID, List]) -> Dict[UUID, List]:
+    """Full histories of ``round_tables`` from each one's own messages.
+
+    A fork's history is the first ``fork_point`` messages of its parent's
+    history followed by its own. Each history is built once, so a deep
+    fork tree costs one list per round table.
+    """
+    by_id = {round_table["id"]: round_table for round_table in round_tables}
+    merged: Dict[UUID, List] = {}
+
+    def history(round_table_id: UUID) -> List:
+        if round_table_id not in merged:
+            round_table = by_id.get(round_table_id)
+            inherited = []
+            if round_table and round_table["parent_id"]:
+                inherited = history(round_table["parent_id"])[:round_table["fork_point"] or 0]
+            merged[round_table_id] = inherited + own.get(round_table_id, [])
+        return merged[round_table_id]
+
+    for round_table in round_tables:
+        history(round_table["id"])
+    return merged
+
+
+class ForkService:
+    """Copy-on-write branches of round tables.
+
+    A fork stores only its parent and how many messages of the parent's
+    history it starts from (``fork_point``); its own messages are the only
+    rows it adds. Reading its history walks up the ancestors with one
+    recursive query and takes the shared prefix from each one in turn.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _lineage(self, round_table_id: UUID) -> List[Any]:
+        """The round table and its ancestors, nearest first"""
+        columns = lambda table: (table.id, table.parent_id, table.fork_point, table.archived_at)
+        lineage = select(*columns(RoundTable)).where(RoundTable.id == round_table_id).cte("lineage", recursive=True)
+        parent = aliased(RoundTable)
+        lineage = lineage.union_all(
+            select(*columns(parent)).join(lineage, parent.id == lineage.c.parent_id)
+        )
+        nodes = {node.id: node for node in self.db.execute(select(lineage)).all()}
+        chain = []
+        node = nodes.get(round_table_id)
+        while node is not None:
+            chain.append(node)
+            node = nodes.get(node.parent_id)
+        return chain
+
+    def lineage_ids(self, round_table_id: UUID) -> Set[UUID]:
+        """A round table and the ancestors it was forked from"""
+        return {node.id for node in self._lineage(round_table_id)}
+
+    def _own_rows(self, node, limit: Optional[int] = None) -> List[MessageRow]:
+        """The first ``limit`` messages a round table stored itself"""
+        if node.archived_at:
+            rows = ArchiveService(self.db).get_archived_history(node.id) or []
+            return rows if limit is None else rows[:limit]
+        query = (
+            self.db.query(*[getattr(Message, column) for column in MESSAGE_COLUMNS])
+            .filter(Message.round_table_id == node.id)
+            .order_by(Message.sequence, Message.id)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return rows_to_dicts(query.all(), MESSAGE_COLUMNS)
+
+    def get_inherited_rows(self, round_table_id: UUID) -> List[MessageRow]:
+        """The messages a fork shares with its ancestors; empty for a round table that is not a fork"""
+        chain = self._lineage(round_table_id)
+        if not chain or not chain[0].parent_id:
+            return []
+        segments = []
+        needed = chain[0].fork_point or 0
+        for node in chain[1:]:
+            if needed <= 0:
+                break
+            # The first fork_point messages of a fork come from further up
+            inherited = (node.fork_point or 0) if node.parent_id else 0
+            if needed > inherited:
+                segments.append(self._own_rows(node, needed - inherited))
+            needed = min(needed, inherited)
+        return [row for segment in reversed(segments) for row in segment]
+
+    def count_messages(self, round_table: RoundTable) -> int:
+        """Length of a round table's full history, without loading it"""
+        if round_table.archived_at:
+            own = self.db.query(RoundTableArchive.message_count).filter(
+                RoundTableArchive.round_table_id == round_table.id
+            ).scalar() or 0
+        else:
+            own = self.db.query(func.count(Message.id)).filter(Message.round_table_id == round_table.id).scalar()
+        return (round_table.fork_point or 0) + own
+
+    def fork(self, parent: RoundTable, data: RoundTableFork) -> RoundTable:
+        """Create a paused branch of ``parent`` that shares its first ``at_message`` messages"""
+        available = self.count_messages(parent)
+        fork_point = available if data.at_message is None else data.at_message
+        if fork_point > available:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot fork at message {fork_point}; the discussion has {available} messages"
+            )
+        if fork_point == 0 and not data.prompt:
+            raise HTTPException(status_code=400, detail="Cannot fork a discussion with no messages")
+
+        if data.participant_ids is not None:
+            agents = {agent.id: agent for agent in self.db.query(Agent).filter(Agent.id.in_(data.participant_ids))}
+            for agent_id in data.participant_ids:
+                if agent_id not in agents:
+                    raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+            participants = [
+                RoundTableParticipant(agent_id=agent_id, speaking_priority=i + 1)
+                for i, agent_id in enumerate(data.participant_ids)
+            ]
+        else:
+            participants = [
+                RoundTableParticipant(
+                    agent_id=participant.agent_id,
+                    role=participant.role,
+                    speaking_priority=participant.speaking_priority
+                )
+                for participant in parent.participants
+            ]
+        if not participants:
+            raise HTTPException(status_code=400, detail="A fork needs at least one participant")
+
+        child = RoundTable(
+            title=data.title or f"{parent.title} (fork)",
+            context=data.context or parent.context,
+            settings=data.settings.model_dump() if data.settings else dict(parent.settings),
+            status="paused",
+            parent_id=parent.id,
+            fork_point=fork_point,
+            # Resume continues after the shared messages, with the rounds they used counted
+            checkpoint={"next_speaker": None, "round": max(0, fork_point - 1), "reason": "forked"},
+            participants=participants
+        )
+        self.db.add(child)
+        self.db.flush()
+        if data.prompt:
+            # The branch resumes from this message, so agents answer the new direction first
+            self.db.add(Message(
+                round_table_id=child.id,
+                agent_id=participants[0].agent_id,
+                content=data.prompt,
+                message_type="introduction",
+                sequence=fork_point + 1
+            ))
+        self.db.commit()
+        self.db.refresh(child)
+        logger.info(f"Forked round table {parent.id} at message {fork_point} into {child.id}")
+        return child
@@ -0,0 +1,191 @@
+# app/services/idempotency_service.py
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import UUID
+import asyncio
+import hashlib
+import json
+import logging
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
+
+from ..config import get_settings
+from ..db.session import SessionLocal
+from ..models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 255
+# Errors worth retrying under the same key are not stored: conflicts, rate limits and server errors
+TRANSIENT_STATUS_CODES = {409, 429}
+
+
+def request_hash(operation: str, round_table_id: UUID, body: Dict[str, Any]) -> str:
+    """Fingerprint of a request, to tell a retry from a reused key"""
+    payload = json.dumps(
+        {"operation": operation, "round_table_id": str(round_table_id), "body": body},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class IdempotencyService:
+    """Runs each ``Idempotency-Key`` at most once.
+
+    The first request with a key inserts a ``running`` row and executes.
+    Retries with the same key wait for that execution and get its result:
+    in the same worker by awaiting it directly, in another worker by polling
+    the row. Finished results are replayed until ``IDEMPOTENCY_TTL_SECONDS``
+    pass. Only one key per round table can be running, so a second keyed
+    start of the same round table is rejected with 409 by the database.
+    """
+
+    def __init__(self, session_factory=None, settings=None):
+        self.settings = settings or get_settings()
+        self.session_factory = session_factory or SessionLocal
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def execute(
+        self,
+        key: str,
+        round_table_id: UUID,
+        operation: str,
+        fingerprint: str,
+        run: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run ``run`` for the first request with ``key``; return its result to every retry"""
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"
+            )
+        while True:
+            record = self._claim(key, round_table_id, operation, fingerprint)
+            if record is None:
+                return await self._run(key, run)
+            if (record.round_table_id, record.operation, record.request_hash) != (round_table_id, operation, fingerprint):
+                raise HTTPException(
+                    status_code=422,
+                    detail="Idempotency-Key was already used for a different request"
+                )
+            if record.state == "completed":
+                return self._replay(record)
+            record = await self._wait(key)
+            if record is not None:
+                return self._replay(record)
+            # The first request failed without a result to keep; try again under the same key
+
+    def _claim(self, key: str, round_table_id: UUID, operation: str, fingerprint: str) -> Optional[IdempotencyKey]:
+        """Insert a running row for ``key``; the existing row if there already is one"""
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            db.query(IdempotencyKey).filter(IdempotencyKey.expires_at < now).delete(synchronize_session=False)
+            db.add(IdempotencyKey(
+                key=key,
+                round_table_id=round_table_id,
+                operation=operation,
+                request_hash=fingerprint,
+                state="running",
+                created_at=now,
+                expires_at=now + timedelta(seconds=self.settings.IDEMPOTENCY_RUNNING_TTL_SECONDS)
+            ))
+            try:
+                db.commit()
+                return None
+            except IntegrityError:
+                db.rollback()
+            record = db.get(IdempotencyKey, key)
+            if record is None:
+                # The insert collided with another key running on the same round table
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Another request is already starting or resuming discussion {round_table_id}"
+                )
+            db.expunge(record)
+            return record
+
+    async def _run(self, key: str, run: Callable[[], Awaitable[Any]]) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting on it; mark any exception as retrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await run()
+        except HTTPException as e:
+            if e.status_code < 500 and e.status_code not in TRANSIENT_STATUS_CODES:
+                self._complete(key, e.status_code, {"detail": e.detail})
+            else:
+                self._release(key)
+            future.set_exception(e)
+            raise
+        except asyncio.CancelledError:
+            self._release(key)
+            future.cancel()
+            raise
+        except Exception as e:
+            self._release(key)
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self._complete(key, 200, jsonable_encoder(result))
+        future.set_result(result)
+        return result
+
+    async def _wait(self, key: str) -> Optional[IdempotencyKey]:
+        """Wait for the running request with ``key``; its finished row, or None if it kept nothing"""
+        future = self._inflight.get(key)
+        if future is not None:
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                raise HTTPException(status_code=409, detail="The original request was cancelled; retry it")
+            return IdempotencyKey(state="completed", status_code=200, response=result)
+        # Started by another worker; its row changes when it finishes
+        while True:
+            await asyncio.sleep(self.settings.IDEMPOTENCY_POLL_INTERVAL)
+            with self.session_factory() as db:
+                record = (
+                    db.query(IdempotencyKey)
+                    .filter(IdempotencyKey.key == key, IdempotencyKey.expires_at >= datetime.utcnow())
+                    .first()
+                )
+                if record is None:
+                    return None
+                if record.state == "completed":
+                    db.expunge(record)
+                    return record
+
+    @staticmethod
+    def _replay(record: IdempotencyKey) -> Any:
+        if record.status_code >= 400:
+            raise HTTPException(status_code=record.status_code, detail=record.response.get("detail"))
+        return record.response
+
+    def _complete(self, key: str, status_code: int, response: Any) -> None:
+        with self.session_factory() as db:
+            db.query(IdempotencyKey).filter(IdempotencyKey.key == key).update({
+                "state": "completed",
+                "status_code": status_code,
+                "response": response,
+                "expires_at": datetime.utcnow() + timedelta(seconds=self.settings.IDEMPOTENCY_TTL_SECONDS)
+            }, synchronize_session=False)
+            db.commit()
+
+    def _release(self, key: str) -> None:
+        """Forget ``key`` so a retry runs the request again"""
+        with self.session_factory() as db:
+            db.query(IdempotencyKey).filter(IdempotencyKey.key == key).delete(synchronize_session=False)
+            db.commit()
+
+
+@lru_cache()
+def get_idempotency_service() -> IdempotencyService:
+    """Get or create the process-wide IdempotencyService"""
+    return IdempotencyService()
@@ -1,10 +1,26 @@
-import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urlparse
+from functools import lru_cache
+import asyncio
+import logging
+import time
 
 from ..config import Settings, get_settings
 
+logger = logging.getLogger(__name__)
+
+
 class KamiwazaService:
+    """Client for the Kamiwaza control plane.
+
+    One instance is shared per process (``get_kamiwaza_service``) so the
+    HTTP connection pool is reused. The deployment list is cached: within
+    ``KAMIWAZA_MODELS_TTL`` it is served as is, after that it is served
+    stale while one background fetch refreshes it, and past
+    ``KAMIWAZA_MODELS_MAX_STALE`` callers wait for the fetch. Concurrent
+    callers always share a single upstream request.
+    """
+
     def __init__(self, settings: Settings = None):
         self.settings = settings or get_settings()
         if not self.settings.kamiwaza_api_uri:
@@ -19,32 +35,126 @@ class KamiwazaService:
         if parsed_uri.scheme == "http":
             self.api_uri = self.api_uri.replace("http://", "https://", 1)
 
+        self._client = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._models: Optional[List[Dict[str, Any]]] = None
+        self._fetched_at: Optional[float] = None
+        self._refresh: Optional[asyncio.Task] = None
+
+    @property
+    def client(self):
+        """The shared ``httpx.AsyncClient``, created on first use in the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # httpx (with its async backends) is slow to import, so load it on first use
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                verify=self.verify_ssl,
+                timeout=httpx.Timeout(self.settings.KAMIWAZA_TIMEOUT, connect=5.0),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._refresh is not None and not self._refresh.done():
+            self._refresh.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _format_instances(self, deployment: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Each running instance at its own address; the deployment's load balancer if none report one"""
+        instances = []
+        for instance in deployment["instances"]:
+            if instance.get("status") not in (None, "DEPLOYED", "RUNNING"):
+                continue
+            host = instance.get("host_name") or self.default_host
+            port = instance.get("listen_port") or instance.get("port") or deployment["lb_port"]
+            instances.append({
+                "host_name": host,
+                "port": port,
+                "url": f"http://{host}:{port}/v1",
+                "status": instance.get("status")
+            })
+        if not instances:
+            instances.append({
+                "host_name": self.default_host,
+                "port": deployment["lb_port"],
+                "url": f"http://{self.default_host}:{deployment['lb_port']}/v1",
+                "status": None
+            })
+        # Several instances may still share the load balancer address
+        return list({instance["url"]: instance for instance in instances}.values())
+
+    def _format_deployments(self, deployments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Filter to only include deployed models and format response
+        return [
+            {
+                "model_name": d["m_name"],
+                "status": d["status"],
+                "lb_port": d["lb_port"],
+                "instances": self._format_instances(d),
+                "capabilities": {
+                    "chat_completion": True,
+                    "text_completion": True,
+                    "embeddings": False
+                }
+            }
+            for d in deployments
+            if d["status"] == "DEPLOYED"
+        ]
+
+    async def _fetch_models(self) -> List[Dict[str, Any]]:
+        response = await self.client.get(f"{self.api_uri}/api/serving/deployments")
+        response.raise_for_status()
+        self._models = self._format_deployments(response.json())
+        self._fetched_at = time.monotonic()
+        return self._models
+
+    def _start_refresh(self) -> asyncio.Task:
+        """The running upstream fetch, starting one if there is none"""
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._fetch_models())
+            self._refresh.add_done_callback(self._log_refresh_failure)
+        return self._refresh
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Refreshing Kamiwaza deployments failed: {task.exception()!r}")
+
+    @property
+    def cache_age(self) -> Optional[float]:
+        """Seconds since the cached deployment list was fetched"""
+        if self._fetched_at is None:
+            return None
+        return time.monotonic() - self._fetched_at
+
+    async def get_models_with_age(self, refresh: bool = False) -> Tuple[List[Dict[str, Any]], float]:
+        """Deployed models and the age of the data in seconds"""
+        age = self.cache_age
+        if refresh or age is None or age > self.settings.KAMIWAZA_MODELS_MAX_STALE:
+            # Shielded so a caller that disconnects does not cancel the fetch others wait on
+            await asyncio.shield(self._start_refresh())
+        elif age > self.settings.KAMIWAZA_MODELS_TTL:
+            self._start_refresh()
+        return self._models, self.cache_age
+
     async def get_available_models(self) -> List[Dict[str, Any]]:
         """Fetch available deployed Kamiwaza models"""
-        async with httpx.AsyncClient(verify=self.verify_ssl, timeout=30.0) as client:
-            response = await client.get(f"{self.api_uri}/api/serving/deployments")
-            response.raise_for_status()
-            deployments = response.json()
-            
-            # Filter to only include deployed models and format response
-            return [
-                {
-                    "model_name": d["m_name"],
-                    "status": d["status"],
-                    "instances": [
-                        {
-                            "host_name": self.default_host,
-                            "port": d["lb_port"],
-                            "url": f"http://{self.default_host}:{d['lb_port']}/v1"
-                        }
-                        for instance in d["instances"]
-                    ],
-                    "capabilities": {
-                        "chat_completion": True,
-                        "text_completion": True,
-                        "embeddings": False
-                    }
-                }
-                for d in deployments
-                if d["status"] == "DEPLOYED"
-            ] 
\ No newline at end of file
+        models, _ = await self.get_models_with_age()
+        return models
+
+
+@lru_cache()
+def get_kamiwaza_service() -> KamiwazaService:
+    """Get or create the process-wide KamiwazaService"""
+    return KamiwazaService()
+
+
+async def shutdown_kamiwaza_service() -> None:
+    """Close the shared client, if one was ever created"""
+    if get_kamiwaza_service.cache_info().currsize:
+        await get_kamiwaza_service().aclose()
@@ -0,0 +1,154 @@
+# app/services/memory_service.py
+from typing import Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+import itertools
+import logging
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models.agent import Agent
+from ..models.message import Message
+from ..models.round_table_archive import RoundTableArchive
+from ..models.round_table_participant import RoundTableParticipant
+from ..schemas.memory import AgentMemory, MemoryRebuild
+from ..utils.memory_index import MemoryIndex, get_memory_index
+from .archive_service import ArchiveService
+
+logger = logging.getLogger(__name__)
+
+# Rows read at a time when rebuilding an agent's index
+REBUILD_BATCH_SIZE = 1000
+
+
+class MemoryService:
+    """An agent's long-term memory: what it said in earlier discussions.
+
+    Salient messages are added to the agent's vector index as they are
+    stored. When a discussion starts, the ones most similar to its topic
+    are recalled; the texts come from the messages table, or from the
+    transcript of a round table that has been archived since. A memory
+    whose round table has been deleted is simply not recalled.
+    """
+
+    def __init__(self, db: Session, index: Optional[MemoryIndex] = None, settings=None):
+        self.db = db
+        self.settings = settings or get_settings()
+        self._index = index
+
+    @property
+    def index(self) -> MemoryIndex:
+        # Created on first use, so services that never touch memory leave the disk alone
+        if self._index is None:
+            self._index = get_memory_index()
+        return self._index
+
+    def is_salient(self, message_type: str, content: Optional[str]) -> bool:
+        """Discussion turns with some substance; the opening prompt is the user's, not the agent's"""
+        return (
+            message_type == "discussion"
+            and len((content or "").strip()) >= self.settings.MEMORY_MIN_CHARS
+        )
+
+    def remember(self, message: Message) -> None:
+        """Index a stored message under the agent that said it"""
+        if not self.settings.MEMORY_ENABLED or not self.is_salient(message.message_type, message.content):
+            return
+        self.index.add(message.agent_id, message.id, message.round_table_id, message.content)
+
+    def _load(self, hits) -> List[AgentMemory]:
+        """The stored messages behind search hits, best first"""
+        if not hits:
+            return []
+        rows = {
+            row.id: (row.content, row.created_at)
+            for row in self.db.query(Message.id, Message.content, Message.created_at)
+            .filter(Message.id.in_([message_id for message_id, _, _ in hits]))
+        }
+        archived = {round_table_id for message_id, round_table_id, _ in hits if message_id not in rows}
+        # Archiving moved these messages into their round table's transcript
+        for transcript in ArchiveService(self.db).get_archived_histories(list(archived)).values():
+            rows.update({message["id"]: (message["content"], message["created_at"]) for message in transcript})
+        return [
+            AgentMemory(
+                message_id=message_id,
+                round_table_id=round_table_id,
+                content=rows[message_id][0],
+                score=score,
+                created_at=rows[message_id][1]
+            )
+            for message_id, round_table_id, score in hits
+            if message_id in rows
+        ]
+
+    def search(
+        self,
+        agent_id: UUID,
+        query: str,
+        k: Optional[int] = None,
+        exclude_round_tables: Optional[Set[UUID]] = None
+    ) -> List[AgentMemory]:
+        hits = self.index.search(
+            agent_id,
+            query,
+            k or self.settings.MEMORY_TOP_K,
+            exclude_round_tables=exclude_round_tables,
+            min_score=self.settings.MEMORY_MIN_SCORE
+        )
+        return self._load(hits)
+
+    def recall(self, agent_id: UUID, query: str, exclude_round_tables: Set[UUID]) -> List[str]:
+        """Texts of the agent's memories relevant to ``query``, from round tables other than ``exclude_round_tables``"""
+        if not self.settings.MEMORY_ENABLED:
+            return []
+        try:
+            memories = self.search(agent_id, query, exclude_round_tables=exclude_round_tables)
+        except Exception as e:
+            # A discussion is better off without memories than not starting
+            logger.warning(f"Recalling memories of agent {agent_id} failed: {e!r}")
+            return []
+        limit = self.settings.MEMORY_MAX_CHARS
+        return [
+            memory.content if len(memory.content) <= limit else memory.content[:limit].rstrip() + "..."
+            for memory in memories
+        ]
+
+    def _archived_entries(self, agent_id: UUID) -> Iterator[Tuple[UUID, UUID, str]]:
+        """The agent's salient messages in archived transcripts, one transcript in memory at a time"""
+        archives = ArchiveService(self.db)
+        round_table_ids = [
+            round_table_id for (round_table_id,) in
+            self.db.query(RoundTableArchive.round_table_id)
+            .join(RoundTableParticipant, RoundTableParticipant.round_table_id == RoundTableArchive.round_table_id)
+            .filter(RoundTableParticipant.agent_id == agent_id)
+            .order_by(RoundTableArchive.archived_at)
+        ]
+        for round_table_id in round_table_ids:
+            for message in archives.get_archived_history(round_table_id) or []:
+                if message["agent_id"] == agent_id and self.is_salient(message["message_type"], message["content"]):
+                    yield message["id"], round_table_id, message["content"]
+
+    def rebuild(self, agent_id: UUID) -> MemoryRebuild:
+        """Re-index all of an agent's stored and archived messages, e.g. on a new host or after enabling memory"""
+        if not self.db.get(Agent, agent_id):
+            raise HTTPException(status_code=404, detail="Agent not found")
+        rows = (
+            self.db.query(Message.id, Message.round_table_id, Message.content, Message.message_type)
+            .filter(Message.agent_id == agent_id)
+            .order_by(Message.created_at)
+            .yield_per(REBUILD_BATCH_SIZE)
+        )
+        count = self.index.rebuild(
+            agent_id,
+            itertools.chain(
+                (
+                    (row.id, row.round_table_id, row.content)
+                    for row in rows
+                    if self.is_salient(row.message_type, row.content)
+                ),
+                self._archived_entries(agent_id)
+            )
+        )
+        logger.info(f"Rebuilt the memory of agent {agent_id} with {count} memories")
+        return MemoryRebuild(agent_id=agent_id, memories=count)
@@ -0,0 +1,204 @@
+# app/services/recovery_service.py
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+import asyncio
+import logging
+
+from sqlalchemy import func, null, or_
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..db.session import SessionLocal
+from ..models.agent import Agent
+from ..models.message import Message
+from ..models.round_table import RoundTable
+from ..models.round_table_participant import RoundTableParticipant
+from ..utils.ownership import database_now, get_worker_id, lease_cutoff
+
+logger = logging.getLogger(__name__)
+
+# Statuses that need a live worker behind them
+ACTIVE_STATUSES = ("in_progress", "queued")
+
+
+class RecoveryService:
+    """Makes discussions orphaned by a dead worker resumable again.
+
+    A discussion is orphaned when it is in progress or queued but nobody
+    holds a live lease on it. Recovery marks it paused with a checkpoint
+    of the next speaker and the rounds used so far, worked out from the
+    message count and the latest message, so it costs a few index lookups
+    per discussion however long the transcript is. The chat itself is
+    rebuilt from the stored messages when the discussion is resumed.
+    """
+
+    def __init__(self, db: Session, settings=None, worker_id: Optional[str] = None):
+        self.db = db
+        self.settings = settings or get_settings()
+        self.worker_id = worker_id or get_worker_id()
+
+    def _orphaned(self, restarted_at: Optional[datetime] = None):
+        """Filter for leases that lapsed, and this worker's own from before ``restarted_at``, which died with it"""
+        cutoff = lease_cutoff(self.settings.DISCUSSION_LEASE_TTL)
+        conditions = [RoundTable.owner_id.is_(None), RoundTable.heartbeat_at.is_(None), RoundTable.heartbeat_at < cutoff]
+        if restarted_at is not None:
+            conditions.append((RoundTable.owner_id == self.worker_id) & (RoundTable.heartbeat_at < restarted_at))
+        return or_(*conditions)
+
+    def find_orphans(self, restarted_at: Optional[datetime] = None) -> List[Any]:
+        """Id, status and fork point of every orphaned discussion"""
+        return (
+            self.db.query(RoundTable.id, RoundTable.status, RoundTable.fork_point)
+            .filter(RoundTable.status.in_(ACTIVE_STATUSES), self._orphaned(restarted_at))
+            .order_by(RoundTable.created_at)
+            .all()
+        )
+
+    def _checkpoint(self, round_table_id: UUID, fork_point: Optional[int]) -> Optional[Dict]:
+        """Where a discussion stands, without loading its transcript; None if it never started"""
+        own = self.db.query(func.count(Message.id)).filter(Message.round_table_id == round_table_id).scalar()
+        total = (fork_point or 0) + own
+        if not total:
+            return None
+        last_agent_id = (
+            self.db.query(Message.agent_id)
+            .filter(Message.round_table_id == round_table_id)
+            .order_by(Message.sequence.desc(), Message.id.desc())
+            .limit(1)
+            .scalar()
+        )
+        speakers = [
+            (agent_id, name) for agent_id, name in
+            self.db.query(Agent.id, Agent.name)
+            .join(RoundTableParticipant, RoundTableParticipant.agent_id == Agent.id)
+            .filter(RoundTableParticipant.round_table_id == round_table_id)
+            .order_by(RoundTableParticipant.speaking_priority)
+        ]
+        next_speaker = None
+        if speakers:
+            # Speakers take turns in priority order; the introduction counts as the first one's turn
+            ids = [agent_id for agent_id, _ in speakers]
+            index = ids.index(last_agent_id) + 1 if last_agent_id in ids else 0
+            next_speaker = speakers[index % len(speakers)][1]
+        return {
+            "next_speaker": next_speaker,
+            # Every message after the introduction is a round
+            "round": total - 1,
+            "reason": "recovered"
+        }
+
+    def recover(self, orphan, restarted_at: Optional[datetime] = None) -> Optional[Dict]:
+        """Mark one orphaned discussion resumable; None if another worker got to it first"""
+        checkpoint = self._checkpoint(orphan.id, orphan.fork_point)
+        if checkpoint is None:
+            values = {"status": "pending", "checkpoint": None}
+        else:
+            values = {"status": "paused", "checkpoint": checkpoint}
+        # A snapshot from an earlier pause is stale once the discussion ran on
+        values.update({"messages_state": null(), "owner_id": None, "heartbeat_at": None})
+        claimed = (
+            self.db.query(RoundTable)
+            .filter(RoundTable.id == orphan.id, RoundTable.status == orphan.status, self._orphaned(restarted_at))
+            .update(values, synchronize_session=False)
+        )
+        self.db.commit()
+        if not claimed:
+            return None
+        logger.warning(
+            f"Recovered orphaned discussion {orphan.id} ({orphan.status}) as {values['status']}"
+            + (f", next speaker {checkpoint['next_speaker']} at round {checkpoint['round']}" if checkpoint else "")
+        )
+        return {"round_table_id": orphan.id, "status": values["status"], "checkpoint": checkpoint}
+
+    def recover_all(self, restarted_at: Optional[datetime] = None) -> List[Dict]:
+        """Recover every orphaned discussion"""
+        recovered = []
+        for orphan in self.find_orphans(restarted_at):
+            result = self.recover(orphan, restarted_at)
+            if result is not None:
+                recovered.append(result)
+        return recovered
+
+
+class RecoverySweeper:
+    """Runs recovery at startup and every ``RECOVERY_INTERVAL`` seconds.
+
+    With ``RECOVERY_AUTO_RESUME`` the recovered discussions that had
+    started are resumed on this worker; otherwise they wait, paused, for
+    someone to resume them. Sweeps whose worker died are always taken over,
+    since nobody else would finish them; their runs' discussions are
+    resumed by the sweep.
+    """
+
+    def __init__(self, session_factory=None, settings=None):
+        self.session_factory = session_factory or SessionLocal
+        self.settings = settings or get_settings()
+        self._task: Optional[asyncio.Task] = None
+        self._resumes: Set[asyncio.Task] = set()
+
+    def sweep(self, restarted_at: Optional[datetime] = None) -> List[Dict]:
+        with self.session_factory() as db:
+            return RecoveryService(db, self.settings).recover_all(restarted_at)
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _database_now(self) -> datetime:
+        with self.session_factory() as db:
+            return database_now(db)
+
+    async def _run(self) -> None:
+        # A worker restarted under a fixed WORKER_ID holds none of the leases in its name yet
+        try:
+            restarted_at = await asyncio.to_thread(self._database_now)
+        except Exception as e:
+            # Its old leases are then recovered once they lapse, like anyone else's
+            logger.warning(f"Reading the database clock failed: {e!r}")
+            restarted_at = None
+        while True:
+            try:
+                recovered = await asyncio.to_thread(self.sweep, restarted_at)
+                # After the discussions, so the sweeps find their runs' discussions recovered
+                from .sweep_service import get_sweep_runner
+                await get_sweep_runner().recover(restarted_at)
+            except Exception as e:
+                logger.warning(f"Sweeping for orphaned discussions failed: {e!r}")
+            else:
+                restarted_at = None
+                if self.settings.RECOVERY_AUTO_RESUME:
+                    for result in recovered:
+                        if result["status"] == "paused":
+                            self._resume(result["round_table_id"])
+            if self.settings.RECOVERY_INTERVAL <= 0:
+                return
+            await asyncio.sleep(self.settings.RECOVERY_INTERVAL)
+
+    def _resume(self, round_table_id: UUID) -> None:
+        async def resume():
+            from .round_table_service import RoundTableService
+            db = self.session_factory()
+            try:
+                await RoundTableService(db).resume_discussion(round_table_id, submitter="recovery")
+            except Exception as e:
+                logger.warning(f"Could not resume recovered discussion {round_table_id}: {e!r}")
+            finally:
+                db.close()
+
+        task = asyncio.get_running_loop().create_task(resume())
+        self._resumes.add(task)
+        task.add_done_callback(self._resumes.discard)
+
+    async def aclose(self) -> None:
+        # Resumed discussions are left to run; if the worker stops under them the next sweep recovers them
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+@lru_cache()
+def get_recovery_sweeper() -> RecoverySweeper:
+    """Get or create the process-wide recovery sweeper"""
+    return RecoverySweeper()
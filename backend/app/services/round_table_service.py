@@ -1,31 +1,65 @@
 # app/services/round_table_service.py
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict
 from uuid import UUID
 from fastapi import HTTPException
+from sqlalchemy import func, null
 from sqlalchemy.orm import Session, joinedload
 from datetime import datetime
-import autogen
+from contextlib import asynccontextmanager
 import asyncio
+import logging
+import time
 
 from ..repositories.base import BaseRepository
 from ..models.round_table import RoundTable
 from ..models.round_table_participant import RoundTableParticipant
 from ..models.message import Message
 from ..models.agent import Agent
-from ..schemas.round_table import RoundTableCreate, RoundTableUpdate, RoundTableInDB
+from ..schemas.round_table import RoundTableCreate, RoundTableFork, RoundTableUpdate, RoundTableInDB, RoundTableSettings
 from ..schemas.message import MessageCreate, MessageInDB
-from ..utils.llm_config import LLMConfigManager, get_llm_config_manager
-from ..utils.ag2_wrapper import AG2Wrapper
+from ..utils.ag2_wrapper import USAGE_FIELDS, AG2Wrapper, get_ag2_wrapper, pop_pending_usage
+from ..utils.discussion_registry import DiscussionAlreadyRunning, DiscussionHandle, get_discussion_registry
+from ..utils.admission import AdmissionRejected, get_admission_controller
+from ..utils.ownership import LEASE_LOST, get_control_bus, get_lease_manager
+from ..utils.tracing import get_tracer
+from ..utils.message_bus import get_message_bus
+from ..utils.metrics import ACTIVE_DISCUSSIONS, QUEUED_DISCUSSIONS, TURNS, observe_discussion_finished
+from ..utils.serialization import (
+    MESSAGE_COLUMNS,
+    ROUND_TABLE_COLUMNS,
+    MessageRow,
+    RoundTableRow,
+    rows_to_dicts
+)
+from ..config import get_settings
 from .agent_service import AgentService
+from .archive_service import ArchiveService
+from .document_service import DocumentRetriever, DocumentService, format_excerpts
+from .fork_service import ForkService, merge_forks
+from .memory_service import MemoryService
+from .summary_service import get_summarizer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUND_TABLE_SETTINGS = RoundTableSettings().model_dump()
+CONTROL_POLL_INTERVAL = 0.25  # Seconds between checks while another worker stops a discussion
 
 class RoundTableService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, ag2_wrapper: Optional[AG2Wrapper] = None):
         self.db = db
         self.repository = BaseRepository(RoundTable, db)
-        self.agent_service = AgentService(db)
-        # Initialize LLMConfigManager and AG2Wrapper
-        self.llm_config_manager = LLMConfigManager()
-        self.ag2_wrapper = AG2Wrapper(self.llm_config_manager)
+        # AG2Wrapper and its LLM config registry are shared process-wide
+        self.ag2_wrapper = ag2_wrapper or get_ag2_wrapper()
+        self.agent_service = AgentService(db, self.ag2_wrapper)
+        self.registry = get_discussion_registry()
+        self.admission = get_admission_controller()
+        self.leases = get_lease_manager()
+        self.control_bus = get_control_bus()
+        self.message_bus = get_message_bus()
+        self.memory = MemoryService(db)
+        self.documents = DocumentService(db)
+        self.settings = get_settings()
+        self.tracer = get_tracer()
         
     async def create_round_table(self, data: RoundTableCreate) -> RoundTableInDB:
         """Create a new round table discussion."""
@@ -64,34 +98,110 @@ class RoundTableService:
         self.db.commit()
         return RoundTableInDB.model_validate(db_round_table)
 
+    async def fork_round_table(self, round_table_id: UUID, data: RoundTableFork) -> RoundTableInDB:
+        """Branch a discussion at a message; the branch shares the history up to it instead of copying it"""
+        parent = self.repository.get(round_table_id)
+        if not parent:
+            raise HTTPException(status_code=404, detail="Round table not found")
+        child = ForkService(self.db).fork(parent, data)
+        result = RoundTableInDB.model_validate(child)
+        result.messages = [
+            MessageInDB.model_validate(message) for message in self.get_discussion_history_rows(child.id)
+        ]
+        return result
+
     def _store_message(self, message_data: Dict) -> Message:
         """Store a message in the database."""
-        print(f"Storing message: {message_data}")
-        message = Message(
-            round_table_id=message_data["round_table_id"],
-            agent_id=message_data["agent_id"],
-            content=message_data["content"],
+        with self.tracer.span(
+            "db.write",
+            table="messages",
+            agent_id=str(message_data["agent_id"]),
             message_type=message_data["message_type"]
-        )
-        self.db.add(message)
-        self.db.commit()
-        print(f"Message stored with ID: {message.id}")
+        ):
+            message = Message(
+                round_table_id=message_data["round_table_id"],
+                agent_id=message_data["agent_id"],
+                content=message_data["content"],
+                message_type=message_data["message_type"],
+                sequence=self._next_sequence(message_data["round_table_id"]),
+                **{field: message_data.get(field) for field in USAGE_FIELDS}
+            )
+            self.db.add(message)
+            self.db.flush()
+            # Subscribers on every worker hear about the message once it is committed
+            self.message_bus.publish(self.db, message.round_table_id, message.id, message.sequence)
+            self.db.commit()
+        try:
+            self.memory.remember(message)
+        except Exception as e:
+            # The transcript is stored; the agent's memory can be rebuilt from it
+            logger.warning(f"Could not add message {message.id} to the memory of agent {message.agent_id}: {e!r}")
+        logger.debug(f"Stored message {message.id} for round table {message.round_table_id}")
         return message
 
+    def _recall(self, round_table: RoundTable, participants: List[Dict], topic: str) -> Dict[UUID, List[str]]:
+        """What each participant said in earlier discussions that bears on ``topic``"""
+        if not self.settings.MEMORY_ENABLED:
+            return {}
+        # A fork's shared history is already in its transcript
+        exclude = ForkService(self.db).lineage_ids(round_table.id) if round_table.parent_id else {round_table.id}
+        with self.tracer.span("memory.recall", participants=len(participants)) as span:
+            memories = {
+                participant["agent"].id: self.memory.recall(participant["agent"].id, topic, exclude)
+                for participant in participants
+            }
+            span.set_attribute("memories", sum(len(recalled) for recalled in memories.values()))
+        return memories
+
+    def _next_sequence(self, round_table_id: UUID) -> int:
+        """Sequence of the next message; a fork's own messages follow the ones it inherits"""
+        last = self.db.query(func.max(Message.sequence)).filter(Message.round_table_id == round_table_id).scalar()
+        if last is None:
+            last = self.db.query(RoundTable.fork_point).filter(RoundTable.id == round_table_id).scalar() or 0
+        return last + 1
+
     def get_discussion_history(self, round_table_id: UUID) -> List[Dict]:
         """Get the message history for a round table discussion."""
-        print(f"Getting discussion history for round table: {round_table_id}")
         messages = (
             self.db.query(Message)
             .filter(Message.round_table_id == round_table_id)
-            .order_by(Message.created_at)
+            .order_by(Message.sequence, Message.id)
             .all()
         )
-        print(f"Found {len(messages)} messages")
+        if not messages:
+            archived = ArchiveService(self.db).get_archived_history(round_table_id)
+            if archived is not None:
+                messages = archived
+        # A fork's history starts with the messages it shares with its parent
+        messages = ForkService(self.db).get_inherited_rows(round_table_id) + messages
+        logger.debug(f"Found {len(messages)} messages for round table {round_table_id}")
         return [MessageInDB.model_validate(msg) for msg in messages]
 
-    async def run_discussion(self, round_table_id: UUID, prompt: str) -> Dict:
-        """Run a round table discussion"""
+    def get_discussion_history_rows(self, round_table_id: UUID) -> List[MessageRow]:
+        """Get the message history as plain rows for the fast serialization path."""
+        rows = (
+            self.db.query(*[getattr(Message, column) for column in MESSAGE_COLUMNS])
+            .filter(Message.round_table_id == round_table_id)
+            .order_by(Message.sequence, Message.id)
+            .all()
+        )
+        messages = rows_to_dicts(rows, MESSAGE_COLUMNS)
+        if not rows:
+            # Archived transcripts have no message rows left
+            archived = ArchiveService(self.db).get_archived_history(round_table_id)
+            if archived is not None:
+                messages = archived
+        # A fork's history starts with the messages it shares with its parent
+        return ForkService(self.db).get_inherited_rows(round_table_id) + messages
+
+    async def run_discussion(
+        self,
+        round_table_id: UUID,
+        prompt: str,
+        submitter: str = "anonymous",
+        priority: int = 0
+    ) -> Dict:
+        """Run a round table discussion once the admission controller lets it start"""
         # Get the round table
         round_table = self.repository.get(round_table_id)
         if not round_table:
@@ -105,50 +215,80 @@ class RoundTableService:
                 detail="No participants found for this round table"
             )
 
-        # Create AG2 agents for each participant
-        ag2_agents = []
-        # Create a mapping of agent names to database IDs
-        agent_name_to_id = {}
-        for participant in participants:
-            agent_data = participant["agent"]
-            # Create AG2 agent with the exact same name as the database agent
-            ag2_agent = self.ag2_wrapper.create_agent(agent_data)
-            ag2_agents.append(ag2_agent)
-            # Store the mapping of agent name to database ID
-            agent_name_to_id[ag2_agent.name] = agent_data.id
-            print(f"Created agent mapping: {ag2_agent.name} -> {agent_data.id}")
-
-        # Create group chat with proper settings (EXACTLY like test)
-        group_chat = self.ag2_wrapper.create_group_chat(
-            agents=ag2_agents,
-            settings={
-                "max_round": round_table.settings.get("max_round", 12),
-                "speaker_selection_method": round_table.settings.get("speaker_selection_method", "round_robin"),
-                "allow_repeat_speaker": round_table.settings.get("allow_repeat_speaker", False),
-                "messages": []  # Start empty like test
-            }
-        )
+        # Track the running discussion so pause/delete can stop it
+        handle = self._register_discussion(round_table_id)
+        try:
+            with self.tracer.span(
+                "discussion.run",
+                round_table_id=str(round_table_id),
+                submitter=submitter,
+                priority=priority
+            ):
+                async with self._admitted(round_table, participants, submitter, priority):
+                    return await self._start_discussion(round_table, participants, prompt, handle)
+        finally:
+            self._unregister_discussion(handle)
+
+    async def _start_discussion(
+        self,
+        round_table: RoundTable,
+        participants: List[Dict],
+        prompt: str,
+        handle: DiscussionHandle
+    ) -> Dict:
+        round_table_id = round_table.id
+
+        with self.tracer.span("discussion.setup", participants=len(participants)):
+            await self._resolve_kamiwaza_instances(participants)
+            memories = self._recall(round_table, participants, f"{round_table.title}\n{round_table.context}\n{prompt}")
+            documents = self.documents.retriever(round_table)
+            # Create AG2 agents for each participant
+            ag2_agents = []
+            # Create a mapping of agent names to database IDs
+            agent_name_to_id = {}
+            for participant in participants:
+                agent_data = participant["agent"]
+                # Create AG2 agent with the exact same name as the database agent
+                ag2_agent = self.ag2_wrapper.create_agent(
+                    agent_data, round_table.settings.get("temperature"), memories.get(agent_data.id)
+                )
+                ag2_agents.append(ag2_agent)
+                # Store the mapping of agent name to database ID
+                agent_name_to_id[ag2_agent.name] = agent_data.id
 
-        # Set system message (EXACTLY like test)
-        group_chat.messages = [{
-            "role": "system",
-            "content": "Discussion initialized.",
-            "name": "system"
-        }]
-
-        # Format and create initial message (EXACTLY like test)
-        formatted_content = self._format_initial_message(round_table, prompt)
-        initial_message = {
-            "role": "user",
-            "content": formatted_content,
-            "name": ag2_agents[0].name
-        }
+            # Create group chat with proper settings (EXACTLY like test)
+            group_chat = self.ag2_wrapper.create_group_chat(
+                agents=ag2_agents,
+                settings={
+                    "max_round": round_table.settings.get("max_round", 12),
+                    "speaker_selection_method": round_table.settings.get("speaker_selection_method", "round_robin"),
+                    "allow_repeat_speaker": round_table.settings.get("allow_repeat_speaker", False),
+                    "messages": []  # Start empty like test
+                }
+            )
 
-        # Add initial message (EXACTLY like test)
-        group_chat.messages.append(initial_message)
+            # Set system message (EXACTLY like test)
+            group_chat.messages = [{
+                "role": "system",
+                "content": "Discussion initialized.",
+                "name": "system"
+            }]
 
-        # Create manager (EXACTLY like test)
-        manager = self.ag2_wrapper.create_group_chat_manager(group_chat)
+            # Format and create initial message (EXACTLY like test)
+            formatted_content = self._format_initial_message(
+                round_table, prompt, documents.filenames if documents else None
+            )
+            initial_message = {
+                "role": "user",
+                "content": formatted_content,
+                "name": ag2_agents[0].name
+            }
+
+            # Add initial message (EXACTLY like test)
+            group_chat.messages.append(initial_message)
+
+            # Create manager (EXACTLY like test)
+            manager = self.ag2_wrapper.create_group_chat_manager(group_chat)
 
         # Store the initial message
         self._store_message({
@@ -160,70 +300,273 @@ class RoundTableService:
 
         # Update round table status
         round_table.status = "in_progress"
+        round_table.checkpoint = None
         self.db.commit()
 
+        # a_run_chat appends the initial message again before the first turn
+        store_messages = self._register_turn_hooks(
+            ag2_agents, agent_name_to_id, participants, round_table_id, handle, group_chat,
+            stored=len(group_chat.messages) + 1, documents=documents
+        )
+
+        logger.info(f"Running discussion {round_table_id} with {len(ag2_agents)} agents")
+
+        # Run chat (EXACTLY like test)
+        messages_before = len(group_chat.messages)
+        with self.tracer.span("discussion.chat", max_round=group_chat.max_round):
+            result = await manager.a_run_chat(
+                messages=group_chat.messages,# Use same initial_message object
+                sender=ag2_agents[0],
+                config=group_chat
+            )
+
+        # Complete the round table, or checkpoint it if it was stopped early
+        self._finish_discussion(
+            round_table, group_chat, handle, store_messages,
+            rounds=len(group_chat.messages) - messages_before
+        )
+
+        return {
+            "status": round_table.status,
+            "chat_history": manager.groupchat.messages,
+            "summary": None  # Summarized in the background; see GET /round-tables/{id}/summary
+        }
+
+    def _provider(self, agent: Agent) -> str:
+        """The provider the agent's completions go to, resolved as the AG2 wrapper does"""
+        return self.ag2_wrapper.llm_config_manager.provider_for(agent.llm_config)
+
+    async def _resolve_kamiwaza_instances(self, participants: List[Dict]) -> None:
+        """Refresh the instance pools Kamiwaza-backed agents are balanced across"""
+        if any(self._provider(p["agent"]) == "kamiwaza" for p in participants):
+            await self.ag2_wrapper.balancer.refresh()
+
+    @asynccontextmanager
+    async def _admitted(
+        self,
+        round_table: RoundTable,
+        participants: List[Dict],
+        submitter: str,
+        priority: int
+    ):
+        """Hold a run slot for the discussion, queueing for one if needed"""
+        providers = {self._provider(p["agent"]) for p in participants}
+        try:
+            ticket = self.admission.enqueue(round_table.id, providers, submitter, priority)
+        except AdmissionRejected as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+        previous_status = round_table.status
+        try:
+            if not ticket.admitted.done():
+                with self.tracer.span("discussion.queue") as span:
+                    # Committing releases the pooled connection while we wait
+                    round_table.status = "queued"
+                    self.db.commit()
+                    position = self.admission.position(round_table.id)
+                    span.set_attribute("queue_position", position)
+                    logger.info(f"Round table {round_table.id} queued at position {position}")
+                    with QUEUED_DISCUSSIONS.track_inprogress():
+                        await ticket.wait()
+        except asyncio.CancelledError:
+            self.admission.release(ticket)
+            self.db.rollback()
+            round_table.status = previous_status
+            self.db.commit()
+            raise
+
+        handle = self.registry.get(round_table.id)
+        if handle is not None:
+            handle.started = True
+        status = "failed"
+        try:
+            with ACTIVE_DISCUSSIONS.track_inprogress():
+                yield ticket
+            status = round_table.status
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            self.admission.release(ticket)
+            observe_discussion_finished(status)
+
+    def _register_discussion(self, round_table_id: UUID) -> DiscussionHandle:
+        """Claim a discussion in this process and, through its lease, across workers"""
+        try:
+            handle = self.registry.register(round_table_id)
+        except DiscussionAlreadyRunning as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        try:
+            acquired = self.leases.acquire(round_table_id)
+        except Exception:
+            self.registry.unregister(handle)
+            raise
+        if not acquired:
+            self.registry.unregister(handle)
+            owner = self.leases.owner_of(round_table_id) or "another worker"
+            raise HTTPException(
+                status_code=409,
+                detail=f"Discussion {round_table_id} is already running on {owner}"
+            )
+        return handle
+
+    def _unregister_discussion(self, handle: DiscussionHandle) -> None:
+        try:
+            if handle.stop_reason != LEASE_LOST:
+                self.leases.release(handle.round_table_id)
+        finally:
+            self.registry.unregister(handle)
+
+    async def _wait_for_release(self, round_table: RoundTable, timeout: float) -> bool:
+        """Wait for the worker that owns a discussion to stop it and give up its lease"""
+        deadline = time.monotonic() + timeout
+        while True:
+            self.db.refresh(round_table)
+            if round_table.owner_id is None:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(CONTROL_POLL_INTERVAL)
+
+    def _register_turn_hooks(
+        self,
+        ag2_agents: List,
+        agent_name_to_id: Dict,
+        participants: List[Dict],
+        round_table_id: UUID,
+        handle: DiscussionHandle,
+        group_chat,
+        stored: int,
+        documents: Optional[DocumentRetriever] = None
+    ) -> Callable[[], None]:
+        """Persist each turn's message and stop at the turn boundary when asked.
+
+        The hook runs as each speaker is asked to reply, before its LLM call,
+        once the previous speaker's message is in ``group_chat.messages``; the
+        first ``stored`` messages there are already in the database.
+        With ``documents``, it also swaps the passages relevant to the latest
+        messages into the speaker's system message.
+        Returns the function that stores new messages, so the final one can be flushed.
+        """
+        # Positions, not contents: two speakers may well say the same thing
+        position = {"stored": stored}
+        agents_by_name = {agent.name: agent for agent in ag2_agents}
+        system_messages = {agent.name: agent.system_message for agent in ag2_agents}
+
         # Define message callback that correctly maps sender to DB agent
-        def message_callback(message: Dict) -> None:
-            if not message.get("content"):
-                return
-                
+        def store_message(message: Dict) -> None:
             # Get the sender's name from the message
             sender_name = message.get("name")
-            print(f"Processing message from sender: {sender_name}")
-            print(f"Available agent mappings: {agent_name_to_id}")
-            
+
             # Find the corresponding participant agent using the name mapping
             agent_id = agent_name_to_id.get(sender_name)
             if not agent_id:
-                print(f"Warning: Could not find agent ID for sender {sender_name}, using first agent")
+                logger.warning(f"Could not find agent ID for sender {sender_name}, using first agent")
                 agent_id = participants[0]["agent"].id
 
-            # Store the message
+            # Store the message with the usage of the completion that produced it
             self._store_message({
                 "round_table_id": round_table_id,
                 "agent_id": agent_id,
                 "content": message.get("content", ""),
-                "message_type": "discussion"
+                "message_type": "discussion",
+                **pop_pending_usage(agents_by_name.get(sender_name))
             })
+            TURNS.inc()
+
+        def store_messages() -> None:
+            # Skip empty messages; the ones before position["stored"] are already in the database
+            new_messages = group_chat.messages[position["stored"]:]
+            position["stored"] += len(new_messages)
+            for message in new_messages:
+                if message.get("content"):
+                    store_message(message)
+
+        def on_turn(recipient, messages, sender, config):
+            store_messages()
+            if handle.stop_requested:
+                # Ending the reply here makes a_run_chat stop before this agent's LLM call
+                handle.next_speaker = recipient.name
+                return True, None
+            if documents is not None:
+                self._share_excerpts(recipient, system_messages[recipient.name], documents, messages)
+            return False, None
 
         # Register callback for all agents
         for agent in ag2_agents:
-            agent.register_reply(
-                reply_func=lambda recipient, messages, sender, config: (
-                    False, 
-                    message_callback({
-                        "name": messages[-1].get("name") if messages and len(messages) > 0 else sender.name,
-                        "content": messages[-1].get("content", "") if messages and len(messages) > 0 else ""
-                    }) if messages and len(messages) > 0 else None
-                ),
-                trigger=lambda _: True
-            )
-
-        print("running chat")
-        print(f"messages before chat: {group_chat.messages}")
-
-        # Run chat (EXACTLY like test)
-        result = await manager.a_run_chat(
-            messages=group_chat.messages,# Use same initial_message object
-            sender=ag2_agents[0],
-            config=group_chat
-        )
+            agent.register_reply(reply_func=on_turn, trigger=lambda _: True)
 
-        # Update round table status
-        round_table.status = "completed"
-        round_table.completed_at = datetime.utcnow()
-        self.db.commit()
+        return store_messages
 
-        return {
-            "chat_history": manager.groupchat.messages,
-            "summary": None  # Summary will be handled separately if needed
-        }
+    def _share_excerpts(self, agent, system_message: str, documents: DocumentRetriever, messages: List[Dict]) -> None:
+        """Give the speaker the document passages that bear on the latest messages, replacing the previous turn's"""
+        recent = "\n".join(message.get("content") or "" for message in messages[-self.settings.DOCUMENT_QUERY_MESSAGES:])
+        try:
+            with self.tracer.span("documents.retrieve", agent_name=agent.name) as span:
+                excerpts = documents.search(recent, self.settings.DOCUMENT_TOP_K, self.settings.DOCUMENT_MIN_SCORE)
+                span.set_attribute("excerpts", len(excerpts))
+        except Exception as e:
+            # The turn goes ahead without passages rather than failing
+            logger.warning(f"Retrieving document passages for {agent.name} failed: {e!r}")
+            excerpts = []
+        agent.update_system_message(system_message + format_excerpts(excerpts))
+
+    def _finish_discussion(
+        self,
+        round_table: RoundTable,
+        group_chat,
+        handle: DiscussionHandle,
+        store_messages: Callable[[], None],
+        rounds: int
+    ) -> None:
+        """Mark a discussion completed or cancelled, or checkpoint it if it was stopped"""
+        # The last reply never reaches another speaker's turn hook, so flush it here
+        store_messages()
+        if handle.stop_reason == LEASE_LOST:
+            # Another worker owns the round table now; its state is not ours to write
+            logger.warning(f"Not saving the state of round table {round_table.id}, which another worker took over")
+            self.db.rollback()
+            return
+        rounds += (round_table.checkpoint or {}).get("round", 0)
+        if handle.stop_reason == "cancelled":
+            round_table.status = "cancelled"
+            round_table.checkpoint = None
+            round_table.messages_state = null()
+        elif handle.stop_requested:
+            round_table.status = "paused"
+            round_table.messages_state = [
+                {
+                    "role": message.get("role", "assistant"),
+                    "content": message.get("content"),
+                    "name": message.get("name")
+                }
+                for message in group_chat.messages
+            ]
+            round_table.checkpoint = {
+                "next_speaker": handle.next_speaker,
+                "round": rounds,
+                "reason": handle.stop_reason
+            }
+            logger.info(f"Checkpointed round table {round_table.id} at round {rounds}, next speaker {handle.next_speaker}")
+        else:
+            round_table.status = "completed"
+            round_table.completed_at = datetime.utcnow()
+            round_table.checkpoint = None
+            # Only paused discussions resume from the snapshot; the messages table has the transcript
+            round_table.messages_state = null()
+        with self.tracer.span("db.write", table="round_tables", status=round_table.status, rounds=rounds):
+            self.db.commit()
+        if round_table.status == "completed" and self.settings.SUMMARY_ON_COMPLETE:
+            # Off the request path; the discussion's response does not wait for it
+            get_summarizer().schedule(round_table.id)
 
-    def _format_initial_message(self, round_table, prompt: str) -> str:
+    def _format_initial_message(self, round_table, prompt: str, documents: Optional[List[str]] = None) -> str:
         """Format the initial message with clear structure and guidelines"""
+        # Only the names; each speaker is given the passages relevant to its turn
+        attached = f"\n\nDocuments: {', '.join(documents)}" if documents else ""
         return f"""Topic: {round_table.title}
 
-Context: {round_table.context}
+Context: {round_table.context}{attached}
 
 Task: {prompt}
 
@@ -248,7 +591,67 @@ Begin the discussion by addressing the task directly."""
             .options(joinedload(RoundTable.messages))
             .all()
         )
-        return [RoundTableInDB.model_validate(rt) for rt in round_tables]
+        results = [RoundTableInDB.model_validate(rt) for rt in round_tables]
+        archived = ArchiveService(self.db).get_archived_histories(
+            [result.id for result in results if result.archived_at]
+        )
+        for result in results:
+            if result.id in archived:
+                result.messages = [MessageInDB.model_validate(message) for message in archived[result.id]]
+            result.queue_position = self.admission.position(result.id)
+        if any(result.parent_id for result in results):
+            histories = merge_forks(
+                [result.model_dump(include={"id", "parent_id", "fork_point"}) for result in results],
+                {result.id: result.messages for result in results}
+            )
+            for result in results:
+                result.messages = histories[result.id]
+        return results
+
+    def get_all_round_table_rows(self) -> List[RoundTableRow]:
+        """Get all round tables with their messages as plain rows.
+
+        Two column queries replace the joinedload and per-row model
+        validation of ``get_all_round_tables``; the result is meant for
+        ``PreSerializedJSONResponse``.
+        """
+        round_tables = rows_to_dicts(
+            self.db.query(*[getattr(RoundTable, column) for column in ROUND_TABLE_COLUMNS]).all(),
+            ROUND_TABLE_COLUMNS
+        )
+        messages_by_round_table: Dict[UUID, List[MessageRow]] = {}
+        message_rows = (
+            self.db.query(*[getattr(Message, column) for column in MESSAGE_COLUMNS])
+            .order_by(Message.sequence, Message.id)
+            .all()
+        )
+        for message in rows_to_dicts(message_rows, MESSAGE_COLUMNS):
+            messages_by_round_table.setdefault(message["round_table_id"], []).append(message)
+        messages_by_round_table.update(ArchiveService(self.db).get_archived_histories(
+            [round_table["id"] for round_table in round_tables if round_table["archived_at"]]
+        ))
+        if any(round_table["parent_id"] for round_table in round_tables):
+            messages_by_round_table = merge_forks(round_tables, messages_by_round_table)
+
+        for round_table in round_tables:
+            # Fill settings added since the row was written, as RoundTableSettings would
+            round_table["settings"] = {**DEFAULT_ROUND_TABLE_SETTINGS, **(round_table["settings"] or {})}
+            round_table["messages"] = messages_by_round_table.get(round_table["id"], [])
+            round_table["queue_position"] = self.admission.position(round_table["id"])
+        return round_tables
+
+    def get_queue_status(self, round_table_id: UUID) -> Dict:
+        """Get a round table's position in the discussion queue"""
+        round_table = self.repository.get(round_table_id)
+        if not round_table:
+            raise HTTPException(status_code=404, detail="Round table not found")
+        return {
+            "round_table_id": round_table_id,
+            "status": round_table.status,
+            "queue_position": self.admission.position(round_table_id),
+            "owner_id": self.leases.owner_of(round_table_id),
+            **self.admission.stats()
+        }
 
     def _get_participants(self, round_table_id: UUID) -> List[Dict]:
         """Get all participants for a round table"""
@@ -257,6 +660,8 @@ Begin the discussion by addressing the task directly."""
             self.db.query(RoundTableParticipant, Agent)
             .join(Agent, RoundTableParticipant.agent_id == Agent.id)
             .filter(RoundTableParticipant.round_table_id == round_table_id)
+            # Round-robin follows this order; recovery works out the next speaker from it too
+            .order_by(RoundTableParticipant.speaking_priority)
             .all()
         )
         
@@ -287,10 +692,22 @@ Begin the discussion by addressing the task directly."""
     async def delete_all_round_tables(self) -> bool:
         """Delete all round tables from the database.
         This will cascade delete all associated messages and participants.
+        Running discussions are stopped first so they stop spending LLM calls.
         
         Returns:
             bool: True if successful
         """
+        if self.control_bus.publish("cancel", reason="deleted"):
+            stopping_elsewhere = asyncio.create_task(self._wait_for_remote_leases(2 * self.settings.DISCUSSION_STOP_TIMEOUT))
+        else:
+            stopping_elsewhere = None
+        await self.registry.stop_all(
+            "deleted",
+            timeout=self.settings.DISCUSSION_STOP_TIMEOUT,
+            cancel=True
+        )
+        if stopping_elsewhere is not None:
+            await stopping_elsewhere
         try:
             self.db.query(RoundTable).delete()
             self.db.commit()
@@ -299,54 +716,64 @@ Begin the discussion by addressing the task directly."""
             self.db.rollback()
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def _wait_for_remote_leases(self, timeout: float) -> None:
+        """Wait for other workers to stop the discussions they drive"""
+        deadline = time.monotonic() + timeout
+        while await asyncio.to_thread(self.leases.count_remote_leases) and time.monotonic() < deadline:
+            await asyncio.sleep(CONTROL_POLL_INTERVAL)
+
     async def pause_discussion(self, round_table_id: UUID) -> Dict:
         """Pause a round table discussion and save its state"""
-        print(f"Attempting to pause discussion for round table: {round_table_id}")
+        logger.info(f"Pausing discussion for round table {round_table_id}")
         round_table = self.repository.get(round_table_id)
         if not round_table:
-            print(f"Round table not found: {round_table_id}")
             raise HTTPException(status_code=404, detail="Round table not found")
         
         if round_table.status != "in_progress":
-            print(f"Invalid status for pause. Current status: {round_table.status}")
+            logger.warning(f"Cannot pause round table {round_table_id} in status {round_table.status}")
             raise HTTPException(status_code=400, detail="Round table is not in progress")
 
-        # Get the current messages and participants
-        messages = self.get_discussion_history(round_table_id)
-        participants = self._get_participants(round_table_id)
-        print(f"Retrieved {len(messages)} messages for state storage")
-        
-        # Create agent ID to name mapping
-        agent_id_to_name = {
-            participant["agent"].id: participant["agent"].name 
-            for participant in participants
-        }
-        
-        # Convert messages to a serializable format
+        # A discussion running in this process checkpoints itself at the next turn boundary
+        if self.registry.is_running(round_table_id):
+            stopped = await self.registry.request_stop(
+                round_table_id,
+                "paused",
+                timeout=self.settings.DISCUSSION_STOP_TIMEOUT
+            )
+            self.db.refresh(round_table)
+            return {
+                "status": round_table.status if stopped else "pausing",
+                "round_table_id": round_table_id,
+                "message_count": len(round_table.messages_state or [])
+            }
+
+        # A discussion another worker drives is paused there, at its next turn boundary
+        owner = self.leases.owner_of(round_table_id)
+        if owner and owner != self.leases.worker_id and self.control_bus.publish("pause", round_table_id, owner):
+            stopped = await self._wait_for_release(round_table, self.settings.DISCUSSION_STOP_TIMEOUT)
+            return {
+                "status": round_table.status if stopped else "pausing",
+                "round_table_id": round_table_id,
+                "message_count": len(round_table.messages_state or [])
+            }
+
+        # Convert the stored messages to a serializable format
         try:
-            # Convert each message to AG2 format with agent names
-            serialized_messages = []
-            for msg in messages:
-                agent_name = agent_id_to_name.get(msg.agent_id, "unknown")
-                serialized_messages.append({
-                    "role": "assistant",  # All stored messages are from assistants
-                    "content": msg.content,
-                    "name": agent_name,
-                    "function_call": None
-                })
-            print(f"Successfully serialized {len(serialized_messages)} messages")
+            serialized_messages = self._serialize_history(round_table_id)
         except Exception as e:
-            print(f"Error serializing messages: {str(e)}")
+            logger.exception(f"Failed to serialize messages of round table {round_table_id}")
             raise HTTPException(status_code=500, detail=f"Failed to serialize messages: {str(e)}")
         
         # Update round table status and save state
         try:
             round_table.status = "paused"
             round_table.messages_state = serialized_messages
-            self.db.commit()
-            print(f"Successfully paused round table {round_table_id}")
+            round_table.checkpoint = None  # No turn boundary is known for a snapshot
+            with self.tracer.span("db.write", table="round_tables", status="paused"):
+                self.db.commit()
+            logger.info(f"Paused round table {round_table_id} with {len(serialized_messages)} messages")
         except Exception as e:
-            print(f"Error saving pause state: {str(e)}")
+            logger.exception(f"Failed to save pause state of round table {round_table_id}")
             self.db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to save pause state: {str(e)}")
         
@@ -354,117 +781,172 @@ Begin the discussion by addressing the task directly."""
         return {
             "status": "paused",
             "round_table_id": round_table_id,
-            "message_count": len(messages)
+            "message_count": len(serialized_messages)
         }
 
-    async def resume_discussion(self, round_table_id: UUID) -> Dict:
-        """Resume a paused round table discussion"""
-        print(f"Attempting to resume discussion for round table: {round_table_id}")
+    async def cancel_discussion(self, round_table_id: UUID) -> Dict:
+        """Stop a running or queued discussion for good, wherever it runs"""
+        round_table = self.repository.get(round_table_id)
+        if not round_table:
+            raise HTTPException(status_code=404, detail="Round table not found")
+        if round_table.status not in ("in_progress", "queued"):
+            raise HTTPException(status_code=400, detail="Round table is not running")
+
+        timeout = self.settings.DISCUSSION_STOP_TIMEOUT
+        stopped = True  # Nobody holds a lease: the process that ran it is gone
+        if self.registry.is_running(round_table_id):
+            stopped = await self.registry.request_stop(round_table_id, "cancelled", timeout=timeout, cancel=True)
+        else:
+            owner = self.leases.owner_of(round_table_id)
+            if owner and owner != self.leases.worker_id and self.control_bus.publish("cancel", round_table_id, owner):
+                # The owner cancels the task outright only once the timeout passes
+                stopped = await self._wait_for_release(round_table, 2 * timeout)
+
+        self.db.refresh(round_table)
+        if stopped and round_table.status in ("in_progress", "queued"):
+            # Cancelled outright, before reaching a turn boundary that would have recorded it
+            round_table.status = "cancelled"
+            round_table.checkpoint = None
+            round_table.messages_state = null()
+            self.db.commit()
+        logger.info(f"Cancelled discussion {round_table_id}: {round_table.status}")
+        return {
+            "status": round_table.status if stopped else "cancelling",
+            "round_table_id": round_table_id
+        }
+
+    def _serialize_history(self, round_table_id: UUID) -> List[Dict]:
+        """The stored history in AG2 message format, named after the agents that wrote it"""
+        messages = self.get_discussion_history_rows(round_table_id)
+        agent_ids = {message["agent_id"] for message in messages}
+        agent_id_to_name = dict(
+            self.db.query(Agent.id, Agent.name).filter(Agent.id.in_(agent_ids)).all()
+        ) if agent_ids else {}
+        return [
+            {
+                "role": "assistant",  # All stored messages are from assistants
+                "content": message["content"],
+                "name": agent_id_to_name.get(message["agent_id"], "unknown"),
+                "function_call": None
+            }
+            for message in messages
+        ]
+
+    async def resume_discussion(
+        self,
+        round_table_id: UUID,
+        submitter: str = "anonymous",
+        priority: int = 0
+    ) -> Dict:
+        """Resume a paused round table discussion once the admission controller lets it start"""
+        logger.info(f"Resuming discussion for round table {round_table_id}")
         round_table = self.repository.get(round_table_id)
         if not round_table:
-            print(f"Round table not found: {round_table_id}")
             raise HTTPException(status_code=404, detail="Round table not found")
         
         if round_table.status != "paused":
-            print(f"Invalid status for resume. Current status: {round_table.status}")
+            logger.warning(f"Cannot resume round table {round_table_id} in status {round_table.status}")
             raise HTTPException(status_code=400, detail="Round table is not paused")
+
+        if not round_table.messages_state:
+            # Forks and recovered discussions have no snapshot; their chat is rebuilt from the stored history
+            round_table.messages_state = self._serialize_history(round_table_id)
             
         if not round_table.messages_state:
-            print(f"No saved message state found for round table: {round_table_id}")
+            logger.warning(f"No saved message state found for round table {round_table_id}")
             raise HTTPException(status_code=400, detail="No saved state found")
 
-        print(f"Retrieved saved state with {len(round_table.messages_state)} messages")
-
         # Get participants
         participants = self._get_participants(round_table_id)
         if not participants:
-            print(f"No participants found for round table: {round_table_id}")
             raise HTTPException(
                 status_code=400, 
                 detail="No participants found for this round table"
             )
 
-        print(f"Found {len(participants)} participants")
+        # Track the running discussion so it can be paused again
+        handle = self._register_discussion(round_table_id)
+        try:
+            with self.tracer.span(
+                "discussion.resume",
+                round_table_id=str(round_table_id),
+                submitter=submitter,
+                priority=priority
+            ):
+                async with self._admitted(round_table, participants, submitter, priority):
+                    return await self._continue_discussion(round_table, participants, handle)
+        finally:
+            self._unregister_discussion(handle)
+
+    async def _continue_discussion(
+        self,
+        round_table: RoundTable,
+        participants: List[Dict],
+        handle: DiscussionHandle
+    ) -> Dict:
+        round_table_id = round_table.id
+        checkpoint = round_table.checkpoint or {}
+        # Only run the rounds left at the checkpoint, plus one for replaying the last message
+        max_round = max(1, round_table.settings.get("max_round", 12) - checkpoint.get("round", 0)) + 1
 
         # Create AG2 agents and group chat like in run_discussion
         try:
-            ag2_agents = []
-            agent_name_to_id = {}
-            for participant in participants:
-                agent_data = participant["agent"]
-                ag2_agent = self.ag2_wrapper.create_agent(agent_data)
-                ag2_agents.append(ag2_agent)
-                agent_name_to_id[ag2_agent.name] = agent_data.id
-                print(f"Recreated agent: {ag2_agent.name} -> {agent_data.id}")
-
-            # Create group chat with proper settings
-            print("Creating group chat with settings:", {
-                "max_round": round_table.settings.get("max_round", 12),
-                "speaker_selection_method": round_table.settings.get("speaker_selection_method", "auto"),
-                "allow_repeat_speaker": round_table.settings.get("allow_repeat_speaker", True),
-                "send_introductions": False
-            })
-
-            group_chat = self.ag2_wrapper.create_group_chat(
-                ag2_agents,
-                {
-                    "max_round": round_table.settings.get("max_round", 12),
-                    "speaker_selection_method": round_table.settings.get("speaker_selection_method", "auto"),
-                    "allow_repeat_speaker": round_table.settings.get("allow_repeat_speaker", True),
-                    "send_introductions": False  # Don't send introductions when resuming
-                }
-            )
-
-            # Create the GroupChatManager
-            manager = self.ag2_wrapper.create_group_chat_manager(group_chat)
-            print("Successfully created GroupChatManager")
+            with self.tracer.span("discussion.setup", participants=len(participants)):
+                await self._resolve_kamiwaza_instances(participants)
+                memories = self._recall(round_table, participants, f"{round_table.title}\n{round_table.context}")
+                documents = self.documents.retriever(round_table)
+                ag2_agents = []
+                agent_name_to_id = {}
+                for participant in participants:
+                    agent_data = participant["agent"]
+                    ag2_agent = self.ag2_wrapper.create_agent(
+                        agent_data, round_table.settings.get("temperature"), memories.get(agent_data.id)
+                    )
+                    ag2_agents.append(ag2_agent)
+                    agent_name_to_id[ag2_agent.name] = agent_data.id
+
+                # Create group chat with proper settings
+                group_chat = self.ag2_wrapper.create_group_chat(
+                    ag2_agents,
+                    {
+                        "max_round": max_round,
+                        "speaker_selection_method": round_table.settings.get("speaker_selection_method", "auto"),
+                        "allow_repeat_speaker": round_table.settings.get("allow_repeat_speaker", True),
+                        "send_introductions": False  # Don't send introductions when resuming
+                    }
+                )
+
+                # Create the GroupChatManager
+                manager = self.ag2_wrapper.create_group_chat_manager(group_chat)
 
         except Exception as e:
-            print(f"Error setting up AG2 components: {str(e)}")
+            logger.exception(f"Failed to set up AG2 components for round table {round_table_id}")
             raise HTTPException(status_code=500, detail=f"Failed to setup discussion: {str(e)}")
 
-        # Register message callbacks
-        def message_callback(message: Dict) -> None:
-            if not message.get("content"):
-                return
-                
-            sender_name = message.get("name")
-            agent_id = agent_name_to_id.get(sender_name)
-            if not agent_id:
-                print(f"Warning: Could not find agent ID for sender {sender_name}, using first agent")
-                agent_id = participants[0]["agent"].id
-
-            self._store_message({
-                "round_table_id": round_table_id,
-                "agent_id": agent_id,
-                "content": message.get("content", ""),
-                "message_type": "discussion"
-            })
+        # Get the last message, which the chat is resumed with; like the others it must not carry empty keys
+        last_message = {key: value for key, value in round_table.messages_state[-1].items() if value is not None}
 
-        for agent in ag2_agents:
-            agent.register_reply(
-                reply_func=lambda recipient, messages, sender, config: (
-                    False, 
-                    message_callback({
-                        "name": messages[-1].get("name") if messages and len(messages) > 0 else sender.name,
-                        "content": messages[-1].get("content", "") if messages and len(messages) > 0 else ""
-                    }) if messages and len(messages) > 0 else None
-                ),
-                trigger=lambda _: True
-            )
+        # Register message callbacks; the saved messages are stored, and a_run_chat re-appends the last one
+        store_messages = self._register_turn_hooks(
+            ag2_agents, agent_name_to_id, participants, round_table_id, handle, group_chat,
+            stored=len(round_table.messages_state), documents=documents
+        )
 
         # Update status to in_progress
         round_table.status = "in_progress"
         self.db.commit()
-        print(f"Updated round table status to in_progress")
 
         # Resume the chat with saved state
         try:
-            print(f"Attempting to resume chat with {len(round_table.messages_state)} messages")
-            # Get the last message to determine the next speaker
-            last_message = round_table.messages_state[-1] if round_table.messages_state else None
+            logger.info(f"Resuming chat of round table {round_table_id} with {len(round_table.messages_state)} messages")
+            # Resume from the agent right before the checkpointed next speaker,
+            # falling back to whoever spoke last
+            agent_names = [agent.name for agent in ag2_agents]
             next_speaker = None
-            if last_message:
+            if checkpoint.get("next_speaker") in agent_names:
+                index = agent_names.index(checkpoint["next_speaker"])
+                next_speaker = ag2_agents[(index - 1) % len(ag2_agents)]
+            else:
                 last_speaker_name = last_message.get("name")
                 for agent in ag2_agents:
                     if agent.name == last_speaker_name:
@@ -474,16 +956,27 @@ Begin the discussion by addressing the task directly."""
             if not next_speaker:
                 next_speaker = ag2_agents[0]
 
-            # Initialize the group chat with all saved messages
-            group_chat.messages = round_table.messages_state
+            # Initialize the group chat with the saved messages; a_run_chat re-appends the last one.
+            # Empty keys such as a null function_call would trip AG2's speaker selection.
+            group_chat.messages = [
+                {key: value for key, value in message.items() if value is not None}
+                for message in round_table.messages_state[:-1]
+            ]
+            messages_before = len(group_chat.messages)
             
             # Start the discussion from where it left off
-            result = await manager.a_run_chat(
-                messages=[last_message],  # Pass ONLY the last message
-                sender=next_speaker,
-                config=group_chat
+            with self.tracer.span("discussion.chat", max_round=group_chat.max_round):
+                result = await manager.a_run_chat(
+                    messages=[last_message],  # Pass ONLY the last message
+                    sender=next_speaker,
+                    config=group_chat
+                )
+
+            # The replayed last message does not count as a new round
+            self._finish_discussion(
+                round_table, group_chat, handle, store_messages,
+                rounds=len(group_chat.messages) - messages_before - 1
             )
-            print("Successfully resumed chat")
             
             return {
                 "status": "resumed",
@@ -492,7 +985,8 @@ Begin the discussion by addressing the task directly."""
             }
             
         except Exception as e:
-            print(f"Error resuming chat: {str(e)}")
+            logger.exception(f"Failed to resume chat of round table {round_table_id}")
+            self.db.rollback()
             round_table.status = "paused"  # Revert status if resume fails
             self.db.commit()
-            raise HTTPException(status_code=500, detail=f"Failed to resume discussion: {str(e)}")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=f"Failed to resume discussion: {str(e)}")
@@ -0,0 +1,174 @@
+# app/services/search_service.py
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import desc, distinct, func, literal_column, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+
+from ..models.agent import Agent
+from ..models.message import Message
+from ..models.round_table import RoundTable
+from ..schemas.search import RoundTableSearchResult, SearchHit, SearchResults
+
+# Must match the configuration messages.search_vector is generated with
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=35, MinWords=15"
+
+# Generated by Postgres from messages.content and GIN-indexed; not mapped on Message
+search_vector = literal_column("messages.search_vector", TSVECTOR)
+
+class SearchService:
+    """Full-text search over transcripts using the messages.search_vector GIN index.
+
+    Matching and ranking only touch the index and the tsvector column.
+    ``ts_headline``, which re-parses message content, runs only for the hits
+    on the requested page.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _matches(
+        self,
+        tsquery,
+        agent_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ):
+        """Every matching message with its rank, as a CTE"""
+        stmt = (
+            select(
+                Message.id.label("message_id"),
+                Message.round_table_id,
+                Message.agent_id,
+                Message.created_at,
+                func.ts_rank_cd(search_vector, tsquery).label("rank")
+            )
+            .where(search_vector.op("@@")(tsquery))
+        )
+        if agent_id:
+            stmt = stmt.where(Message.agent_id == agent_id)
+        if status:
+            stmt = stmt.join(RoundTable, RoundTable.id == Message.round_table_id).where(RoundTable.status == status)
+        if date_from:
+            stmt = stmt.where(Message.created_at >= date_from)
+        if date_to:
+            stmt = stmt.where(Message.created_at < date_to)
+        return stmt.cte("matches")
+
+    def _round_table_page(self, matches, limit: int, offset: int):
+        """Round tables ordered by their best hit, with the total number of matching round tables"""
+        groups = (
+            select(
+                matches.c.round_table_id,
+                func.max(matches.c.rank).label("best_rank"),
+                func.count().label("hit_count")
+            )
+            .group_by(matches.c.round_table_id)
+            .subquery("groups")
+        )
+        return (
+            select(
+                groups.c.round_table_id,
+                groups.c.best_rank,
+                groups.c.hit_count,
+                RoundTable.title,
+                RoundTable.status,
+                func.count().over().label("total")
+            )
+            .join(RoundTable, RoundTable.id == groups.c.round_table_id)
+            .order_by(desc(groups.c.best_rank), groups.c.round_table_id)
+            .limit(limit)
+            .offset(offset)
+        )
+
+    def _page_hits(self, matches, tsquery, round_table_ids, hits_per_round_table: int):
+        """The best hits of each round table on the page, highlighted"""
+        ranked = (
+            select(
+                matches,
+                func.row_number().over(
+                    partition_by=matches.c.round_table_id,
+                    order_by=(desc(matches.c.rank), desc(matches.c.created_at))
+                ).label("position")
+            )
+            .where(matches.c.round_table_id.in_(round_table_ids))
+            .subquery("ranked")
+        )
+        return (
+            select(
+                ranked.c.message_id,
+                ranked.c.round_table_id,
+                ranked.c.agent_id,
+                ranked.c.created_at,
+                ranked.c.rank,
+                Agent.name.label("agent_name"),
+                func.ts_headline(SEARCH_CONFIG, Message.content, tsquery, HEADLINE_OPTIONS).label("headline")
+            )
+            .join(Message, Message.id == ranked.c.message_id)
+            .join(Agent, Agent.id == ranked.c.agent_id)
+            .where(ranked.c.position <= hits_per_round_table)
+            .order_by(ranked.c.round_table_id, ranked.c.position)
+        )
+
+    def search(
+        self,
+        query: str,
+        agent_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        limit: int = 20,
+        offset: int = 0,
+        hits_per_round_table: int = 3
+    ) -> SearchResults:
+        """Search transcripts, grouping ranked hits by round table.
+
+        ``query`` uses web search syntax: quoted phrases, ``or`` and ``-word``.
+        Pagination is over round tables.
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        matches = self._matches(tsquery, agent_id, status, date_from, date_to)
+        groups = self.db.execute(self._round_table_page(matches, limit, offset)).all()
+
+        if groups:
+            total = groups[0].total
+        elif offset:
+            total = self.db.execute(select(func.count(distinct(matches.c.round_table_id)))).scalar_one()
+        else:
+            total = 0
+
+        hits_by_round_table = {}
+        if groups:
+            hits = self.db.execute(self._page_hits(
+                matches, tsquery, [group.round_table_id for group in groups], hits_per_round_table
+            )).all()
+            for hit in hits:
+                hits_by_round_table.setdefault(hit.round_table_id, []).append(SearchHit(
+                    message_id=hit.message_id,
+                    agent_id=hit.agent_id,
+                    agent_name=hit.agent_name,
+                    created_at=hit.created_at,
+                    rank=hit.rank,
+                    headline=hit.headline
+                ))
+
+        return SearchResults(
+            query=query,
+            total_round_tables=total,
+            limit=limit,
+            offset=offset,
+            results=[
+                RoundTableSearchResult(
+                    round_table_id=group.round_table_id,
+                    title=group.title,
+                    status=group.status,
+                    best_rank=group.best_rank,
+                    hit_count=group.hit_count,
+                    hits=hits_by_round_table.get(group.round_table_id, [])
+                )
+                for group in groups
+            ]
+        )
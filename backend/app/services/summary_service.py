@@ -0,0 +1,341 @@
+# app/services/summary_service.py
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+import asyncio
+import json
+import logging
+import re
+import time
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..db.session import SessionLocal
+from ..models.agent import Agent
+from ..models.message import Message
+from ..models.round_table import RoundTable
+from ..schemas.summary import RoundTableSummary
+from ..utils.llm_config import get_llm_config_registry
+from ..utils.metrics import observe_llm_completion
+from ..utils.tracing import get_tracer
+from .archive_service import ArchiveService
+from .fork_service import ForkService
+
+logger = logging.getLogger(__name__)
+
+# Rough tokens per character when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+MAP_PROMPT = """You summarize one excerpt of a strategy discussion between executives.
+Reply with JSON only, shaped as {"summary": "...", "positions": {"<speaker>": "..."}}.
+Keep the summary under 150 words. Give each speaker in the excerpt a one or two sentence position."""
+
+REDUCE_PROMPT = """You merge consecutive partial summaries of one strategy discussion into a single summary.
+Reply with JSON only, shaped as {"summary": "...", "positions": {"<speaker>": "..."}}.
+Keep the summary under 250 words, covering decisions, disagreements and open questions.
+Give every speaker one or two sentences on where they ended up, preferring later parts over earlier ones."""
+
+
+@lru_cache()
+def _encoding():
+    """The cl100k tokenizer, or None when tiktoken cannot load it (e.g. offline)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.info(f"Estimating token counts from text length, tokenizer unavailable: {e!r}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def chunk_transcript(lines: List[str], max_tokens: int) -> List[str]:
+    """Pack transcript lines, in order, into chunks of at most ``max_tokens`` tokens.
+
+    A single line over the budget is cut into pieces of its own.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for line in lines:
+        tokens = count_tokens(line)
+        if tokens > max_tokens:
+            # Cut at roughly the budget's share of characters
+            width = max(1, len(line) * max_tokens // tokens)
+            pieces = [line[start:start + width] for start in range(0, len(line), width)]
+        else:
+            pieces = [line]
+        for piece in pieces:
+            tokens = min(count_tokens(piece), max_tokens)
+            if current and used + tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, used = [], 0
+            current.append(piece)
+            used += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def parse_digest(text: Optional[str]) -> Dict[str, Any]:
+    """Read a ``{"summary", "positions"}`` reply, keeping free text as the summary if it is not JSON"""
+    text = (text or "").strip()
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match:
+        try:
+            parsed = json.loads(match.group(0))
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict) and isinstance(parsed.get("summary"), str):
+            positions = parsed.get("positions")
+            return {
+                "summary": parsed["summary"].strip(),
+                "positions": {
+                    str(name): str(position).strip()
+                    for name, position in (positions.items() if isinstance(positions, dict) else ())
+                }
+            }
+    return {"summary": text, "positions": {}}
+
+
+class SummaryService:
+    """Reads and requests the summaries of round tables"""
+
+    def __init__(self, db: Session, summarizer: Optional["Summarizer"] = None):
+        self.db = db
+        self.summarizer = summarizer or get_summarizer()
+
+    def _message_count(self, round_table: RoundTable) -> int:
+        """Length of the history, from the sequence of the latest message"""
+        last = self.db.query(func.max(Message.sequence)).filter(Message.round_table_id == round_table.id).scalar()
+        if last is None and round_table.archived_at is not None:
+            # Archived transcripts no longer change
+            return (round_table.summary or {}).get("messages", 0)
+        return last if last is not None else round_table.fork_point or 0
+
+    def get_summary(self, round_table_id: UUID) -> RoundTableSummary:
+        round_table = self.db.get(RoundTable, round_table_id)
+        if not round_table:
+            raise HTTPException(status_code=404, detail="Round table not found")
+        stored = round_table.summary or {}
+        total = self._message_count(round_table)
+        error = self.summarizer.errors.get(round_table_id)
+        if self.summarizer.is_running(round_table_id):
+            status = "running"
+        elif error:
+            status = "failed"
+        elif not stored:
+            status = "missing"
+        else:
+            status = "stale" if stored["messages"] < total else "ready"
+        return RoundTableSummary(
+            round_table_id=round_table_id,
+            status=status,
+            total_messages=total,
+            error=error,
+            **stored
+        )
+
+    def request_summary(self, round_table_id: UUID, force: bool = False) -> RoundTableSummary:
+        """Start summarizing unless a summary of the current history exists; ``force`` redoes it anyway"""
+        current = self.get_summary(round_table_id)
+        if not current.total_messages:
+            raise HTTPException(status_code=400, detail="Round table has no messages to summarize")
+        if current.status in ("missing", "stale", "failed") or (force and current.status == "ready"):
+            self.summarizer.schedule(round_table_id, force=force)
+            current.status = "running"
+        return current
+
+
+class Summarizer:
+    """Summarizes discussions off the request path, map-reduce style.
+
+    The stored transcript is cut into chunks of ``SUMMARY_CHUNK_TOKENS``
+    tokens, which are summarized concurrently. The partial summaries are
+    then merged, in token-bounded groups and again concurrently, until one
+    summary with a position per agent is left. The result is stored on the
+    round table along with how many messages it covers, so it is reused
+    until newer messages arrive. ``SUMMARY_CONCURRENCY`` caps this worker's
+    summary completions across all discussions.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        settings=None,
+        complete: Optional[Callable[[List[Dict[str, str]]], Tuple[str, Dict[str, Any]]]] = None
+    ):
+        self.session_factory = session_factory or SessionLocal
+        self.settings = settings or get_settings()
+        self.complete = complete or self._complete
+        self.tracer = get_tracer()
+        self.errors: Dict[UUID, str] = {}
+        self._tasks: Dict[UUID, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def is_running(self, round_table_id: UUID) -> bool:
+        return round_table_id in self._tasks
+
+    def schedule(self, round_table_id: UUID, force: bool = False) -> None:
+        """Summarize in the background; a summary already running for the round table is reused"""
+        if self.is_running(round_table_id):
+            return
+        task = asyncio.get_running_loop().create_task(self.summarize(round_table_id, force))
+        self._tasks[round_table_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(round_table_id, None))
+
+    def _complete(self, messages: List[Dict[str, str]]) -> Tuple[str, Dict[str, Any]]:
+        """One completion on the active LLM configuration"""
+        import autogen
+
+        registry = get_llm_config_registry()
+        client = autogen.OpenAIWrapper(config_list=registry.get_active_config()["config_list"])
+        started = time.monotonic()
+        response = client.create(
+            messages=messages,
+            temperature=0,
+            max_tokens=self.settings.SUMMARY_MAX_TOKENS,
+            cache_seed=None
+        )
+        usage = {
+            "model": response.model,
+            "prompt_tokens": response.usage.prompt_tokens if response.usage else 0,
+            "completion_tokens": response.usage.completion_tokens if response.usage else 0,
+            "cost": getattr(response, "cost", 0) or 0
+        }
+        observe_llm_completion(
+            registry.active_config_name(),
+            usage["model"],
+            time.monotonic() - started,
+            prompt_tokens=usage["prompt_tokens"],
+            completion_tokens=usage["completion_tokens"]
+        )
+        return client.extract_text_or_completion_object(response)[0], usage
+
+    async def _call(self, prompt: str, content: str, totals: Dict[str, Any]) -> Dict[str, Any]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.settings.SUMMARY_CONCURRENCY)
+        async with self._semaphore:
+            text, usage = await asyncio.to_thread(
+                self.complete, [{"role": "system", "content": prompt}, {"role": "user", "content": content}]
+            )
+        totals["llm_calls"] += 1
+        for key in ("prompt_tokens", "completion_tokens", "cost"):
+            totals[key] += usage.get(key) or 0
+        totals["model"] = usage.get("model") or totals["model"]
+        return parse_digest(text)
+
+    def _load(self, round_table_id: UUID) -> Optional[Dict[str, Any]]:
+        """The round table's title, transcript lines, speakers and stored summary"""
+        with self.session_factory() as db:
+            round_table = db.get(RoundTable, round_table_id)
+            if round_table is None:
+                return None
+            rows = [
+                {"agent_id": row.agent_id, "content": row.content}
+                for row in (
+                    db.query(Message.agent_id, Message.content)
+                    .filter(Message.round_table_id == round_table_id)
+                    .order_by(Message.sequence)
+                    .all()
+                )
+            ]
+            if not rows:
+                rows = ArchiveService(db).get_archived_history(round_table_id) or []
+            rows = ForkService(db).get_inherited_rows(round_table_id) + rows
+            names = dict(
+                db.query(Agent.id, Agent.name).filter(Agent.id.in_({row["agent_id"] for row in rows})).all()
+            ) if rows else {}
+            return {
+                "title": round_table.title,
+                "lines": [f"{names.get(row['agent_id'], 'Unknown')}: {row['content']}" for row in rows],
+                "agents": {name: agent_id for agent_id, name in names.items()},
+                "summary": round_table.summary
+            }
+
+    def _store(self, round_table_id: UUID, summary: Dict[str, Any]) -> None:
+        with self.session_factory() as db:
+            db.query(RoundTable).filter(RoundTable.id == round_table_id).update(
+                {"summary": summary}, synchronize_session=False
+            )
+            db.commit()
+
+    async def _reduce(self, title: str, digests: List[Dict[str, Any]], totals: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge partial summaries in order, a token-bounded group at a time, until one is left"""
+        while len(digests) > 1:
+            parts = [f"Part {i + 1}: {json.dumps(digest)}" for i, digest in enumerate(digests)]
+            groups = chunk_transcript(parts, self.settings.SUMMARY_CHUNK_TOKENS)
+            if len(groups) >= len(digests):
+                # Every part fills a group on its own; merge them pairwise so the tree still shrinks
+                groups = ["\n\n".join(parts[i:i + 2]) for i in range(0, len(parts), 2)]
+            with self.tracer.span("summary.reduce", parts=len(digests), groups=len(groups)):
+                digests = list(await asyncio.gather(*(
+                    self._call(REDUCE_PROMPT, f"Topic: {title}\n\n{group}", totals) for group in groups
+                )))
+        return digests[0]
+
+    async def summarize(self, round_table_id: UUID, force: bool = False) -> Optional[Dict[str, Any]]:
+        """Summarize a round table's history and store the result on it"""
+        try:
+            loaded = await asyncio.to_thread(self._load, round_table_id)
+            if loaded is None or not loaded["lines"]:
+                return None
+            stored = loaded["summary"]
+            if stored and stored.get("messages") == len(loaded["lines"]) and not force:
+                return stored
+            with self.tracer.span("summary.run", round_table_id=str(round_table_id), messages=len(loaded["lines"])):
+                chunks = await asyncio.to_thread(
+                    chunk_transcript, loaded["lines"], self.settings.SUMMARY_CHUNK_TOKENS
+                )
+                totals = {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost": 0.0, "model": None}
+                with self.tracer.span("summary.map", chunks=len(chunks)):
+                    digests = await asyncio.gather(*(
+                        self._call(MAP_PROMPT, f"Topic: {loaded['title']}\n\nExcerpt {i + 1} of {len(chunks)}:\n\n{chunk}", totals)
+                        for i, chunk in enumerate(chunks)
+                    ))
+                final = await self._reduce(loaded["title"], list(digests), totals)
+            summary = {
+                "summary": final["summary"],
+                "positions": [
+                    {
+                        "agent_id": str(loaded["agents"][name]) if name in loaded["agents"] else None,
+                        "agent_name": name,
+                        "position": position
+                    }
+                    for name, position in final["positions"].items()
+                ],
+                "messages": len(loaded["lines"]),
+                "chunks": len(chunks),
+                "created_at": datetime.utcnow().isoformat(),
+                **totals
+            }
+            await asyncio.to_thread(self._store, round_table_id, summary)
+        except Exception as e:
+            logger.exception(f"Summarizing round table {round_table_id} failed")
+            self.errors[round_table_id] = repr(e)
+            return None
+        self.errors.pop(round_table_id, None)
+        logger.info(
+            f"Summarized round table {round_table_id}: {summary['messages']} messages "
+            f"in {summary['chunks']} chunks, {summary['llm_calls']} LLM calls"
+        )
+        return summary
+
+    async def aclose(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+
+@lru_cache()
+def get_summarizer() -> Summarizer:
+    """Get or create the process-wide summarizer"""
+    return Summarizer()
@@ -0,0 +1,556 @@
+# app/services/sweep_service.py
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+import asyncio
+import itertools
+import logging
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..db.session import SessionLocal
+from ..models.agent import Agent
+from ..models.message import Message
+from ..models.round_table import RoundTable
+from ..models.round_table_participant import RoundTableParticipant
+from ..models.sweep import Sweep, SweepRun
+from ..schemas.round_table import RoundTableSettings
+from ..schemas.sweep import SweepCreate, SweepResult, SweepRunResult
+from ..utils.ownership import get_worker_id, lease_cutoff
+from .recovery_service import ACTIVE_STATUSES
+from .round_table_service import RoundTableService
+
+logger = logging.getLogger(__name__)
+
+# Grid parameters that are not round table settings
+RUN_PARAMETERS = ("prompt", "context", "participant_ids")
+FINISHED_SWEEP_STATUSES = ("completed", "cancelled")
+UNFINISHED_SWEEP_STATUSES = ("pending", "running")
+QUEUE_FULL_RETRY_DELAY = 5.0  # Seconds before resubmitting a run the scheduler's queue turned away
+
+
+def expand_grid(grid: Dict[str, List[Any]], repeats: int = 1) -> List[Dict[str, Any]]:
+    """Every combination of the grid's values, the last parameter varying fastest, each ``repeats`` times"""
+    keys = list(grid)
+    points = [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+    return [point for point in points for _ in range(repeats)]
+
+
+class SweepService:
+    """Round table setups run across a parameter grid.
+
+    Creating a sweep materializes one round table per grid point in a
+    single transaction and hands the sweep to this worker's
+    ``SweepRunner``, which feeds the runs to the discussion scheduler a
+    bounded number at a time.
+    """
+
+    def __init__(self, db: Session, runner: Optional["SweepRunner"] = None):
+        self.db = db
+        self.settings = get_settings()
+        self.runner = runner or get_sweep_runner()
+
+    def _materialize(self, data: SweepCreate) -> Sweep:
+        unknown = set(data.grid) - set(RUN_PARAMETERS) - set(RoundTableSettings.model_fields)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+        empty = [key for key, values in data.grid.items() if not values]
+        if empty:
+            raise HTTPException(status_code=400, detail=f"Sweep parameters without values: {', '.join(empty)}")
+        points = expand_grid(data.grid, data.repeats)
+        if len(points) > self.settings.MAX_SWEEP_RUNS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Sweep has {len(points)} runs; the limit is {self.settings.MAX_SWEEP_RUNS}"
+            )
+
+        try:
+            lineups = [
+                [UUID(str(agent_id)) for agent_id in point.get("participant_ids", data.participant_ids)]
+                for point in points
+            ]
+            settings = [
+                RoundTableSettings(**{
+                    **data.settings.model_dump(),
+                    **{key: value for key, value in point.items() if key not in RUN_PARAMETERS}
+                }).model_dump()
+                for point in points
+            ]
+        except (ValueError, ValidationError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid sweep parameters: {e}")
+        agent_ids = {agent_id for lineup in lineups for agent_id in lineup}
+        found = {agent_id for (agent_id,) in self.db.query(Agent.id).filter(Agent.id.in_(agent_ids))}
+        missing = agent_ids - found
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Agent {min(missing)} not found")
+        if not all(lineups):
+            raise HTTPException(status_code=400, detail="Every run needs at least one participant")
+
+        sweep = Sweep(
+            name=data.name,
+            config=data.model_dump(mode="json"),
+            concurrency=data.concurrency or self.settings.MAX_CONCURRENT_DISCUSSIONS,
+            priority=data.priority,
+            # Held from the start, so recovery never mistakes a new sweep for an orphan
+            owner_id=get_worker_id(),
+            heartbeat_at=func.now()
+        )
+        round_tables = [
+            RoundTable(
+                title=f"{data.title} [{index + 1}/{len(points)}]",
+                context=point.get("context", data.context),
+                settings=settings[index],
+                participants=[
+                    RoundTableParticipant(agent_id=agent_id, speaking_priority=position + 1)
+                    for position, agent_id in enumerate(lineups[index])
+                ]
+            )
+            for index, point in enumerate(points)
+        ]
+        self.db.add(sweep)
+        self.db.add_all(round_tables)
+        self.db.flush()
+        self.db.add_all([
+            SweepRun(
+                sweep_id=sweep.id,
+                index=index,
+                params=point,
+                prompt=point.get("prompt", data.prompt),
+                round_table_id=round_table.id
+            )
+            for index, (point, round_table) in enumerate(zip(points, round_tables))
+        ])
+        self.db.commit()
+        logger.info(f"Created sweep {sweep.id} with {len(points)} runs at concurrency {sweep.concurrency}")
+        return sweep
+
+    async def create(self, data: SweepCreate) -> SweepResult:
+        """Create the sweep's round tables and start running them on this worker"""
+        sweep = self._materialize(data)
+        self.runner.start(sweep.id, sweep.concurrency, sweep.priority)
+        return self.get_result(sweep.id)
+
+    def get_result(self, sweep_id: UUID) -> SweepResult:
+        """The sweep's runs with their outcome and LLM usage, one row per run"""
+        sweep = self.db.get(Sweep, sweep_id)
+        if not sweep:
+            raise HTTPException(status_code=404, detail="Sweep not found")
+        usage = (
+            self.db.query(
+                Message.round_table_id.label("round_table_id"),
+                func.count(Message.id).label("messages"),
+                func.sum(Message.prompt_tokens).label("prompt_tokens"),
+                func.sum(Message.completion_tokens).label("completion_tokens"),
+                func.sum(Message.cost).label("cost")
+            )
+            .join(SweepRun, SweepRun.round_table_id == Message.round_table_id)
+            .filter(SweepRun.sweep_id == sweep_id)
+            .group_by(Message.round_table_id)
+            .subquery()
+        )
+        rows = (
+            self.db.query(SweepRun, usage.c.messages, usage.c.prompt_tokens, usage.c.completion_tokens, usage.c.cost)
+            .outerjoin(usage, usage.c.round_table_id == SweepRun.round_table_id)
+            .filter(SweepRun.sweep_id == sweep_id)
+            .order_by(SweepRun.index)
+            .all()
+        )
+        runs = [
+            SweepRunResult(
+                index=run.index,
+                params=run.params,
+                round_table_id=run.round_table_id,
+                status=run.status,
+                error=run.error,
+                messages=messages or 0,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                cost=cost,
+                started_at=run.started_at,
+                finished_at=run.finished_at,
+                duration_s=(run.finished_at - run.started_at).total_seconds()
+                if run.started_at and run.finished_at else None
+            )
+            for run, messages, prompt_tokens, completion_tokens, cost in rows
+        ]
+        by_status: Dict[str, int] = {}
+        for run in runs:
+            by_status[run.status] = by_status.get(run.status, 0) + 1
+        costs = [run.cost for run in runs if run.cost is not None]
+        return SweepResult(
+            id=sweep.id,
+            name=sweep.name,
+            status=sweep.status,
+            concurrency=sweep.concurrency,
+            created_at=sweep.created_at,
+            completed_at=sweep.completed_at,
+            runs_by_status=by_status,
+            total_cost=sum(costs) if costs else None,
+            runs=runs
+        )
+
+    async def cancel(self, sweep_id: UUID) -> SweepResult:
+        """Stop a sweep: runs that have not started never will, running ones are cancelled"""
+        sweep = self.db.get(Sweep, sweep_id)
+        if not sweep:
+            raise HTTPException(status_code=404, detail="Sweep not found")
+        if sweep.status not in FINISHED_SWEEP_STATUSES:
+            sweep.status = "cancelled"
+            sweep.completed_at = datetime.utcnow()
+            running = [
+                round_table_id for (round_table_id,) in
+                self.db.query(SweepRun.round_table_id)
+                .join(RoundTable, RoundTable.id == SweepRun.round_table_id)
+                .filter(
+                    SweepRun.sweep_id == sweep_id,
+                    SweepRun.status == "running",
+                    RoundTable.status.in_(ACTIVE_STATUSES)
+                )
+            ]
+            # Runs not started yet, queued, or waiting to get into a full queue end here
+            self.db.query(SweepRun).filter(
+                SweepRun.sweep_id == sweep_id,
+                or_(
+                    SweepRun.status == "pending",
+                    (SweepRun.status == "running") & SweepRun.round_table_id.not_in(
+                        select(RoundTable.id).where(RoundTable.status == "in_progress")
+                    )
+                )
+            ).update({"status": "cancelled", "finished_at": datetime.utcnow()}, synchronize_session=False)
+            self.db.commit()
+            round_table_service = RoundTableService(self.db)
+            for round_table_id in running:
+                try:
+                    # Reaches the discussion on whichever worker runs it
+                    await round_table_service.cancel_discussion(round_table_id)
+                except HTTPException as e:
+                    logger.info(f"Could not cancel sweep run {round_table_id}: {e.detail}")
+            logger.info(f"Cancelled sweep {sweep_id} with {len(running)} runs in flight")
+        self.runner.notify(sweep_id)
+        return self.get_result(sweep_id)
+
+
+class SweepRunner:
+    """Runs the sweeps started on this worker.
+
+    Each run is an ordinary discussion submitted to the admission
+    controller under the sweep's own submitter, so sweeps share run slots
+    fairly with each other and with interactive discussions, and provider
+    limits still cap what reaches the LLMs. Only ``concurrency`` runs of a
+    sweep are submitted at a time, so a large sweep never floods the queue.
+
+    The worker running a sweep holds a lease on it, renewed like a
+    discussion's. When the lease lapses because the worker died, the
+    recovery sweeper of another worker claims the sweep and runs what is
+    left of it: runs not started yet, and runs whose discussion recovery
+    paused or sent back to pending.
+    """
+
+    def __init__(self, session_factory=None, settings=None, worker_id: Optional[str] = None):
+        self.session_factory = session_factory or SessionLocal
+        self.settings = settings or get_settings()
+        self.worker_id = worker_id or get_worker_id()
+        self._tasks: Dict[UUID, asyncio.Task] = {}
+        self._listeners: Dict[UUID, Set[asyncio.Event]] = {}
+        self._lost: Set[UUID] = set()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    def start(self, sweep_id: UUID, concurrency: int, priority: int = 0) -> None:
+        if self.is_running(sweep_id):
+            return
+        task = asyncio.get_running_loop().create_task(self._run(sweep_id, concurrency, priority))
+        self._tasks[sweep_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(sweep_id, None))
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat_loop())
+
+    def is_running(self, sweep_id: UUID) -> bool:
+        return sweep_id in self._tasks
+
+    def notify(self, sweep_id: UUID) -> None:
+        """Wake the event streams of a sweep"""
+        for listener in self._listeners.get(sweep_id, ()):
+            listener.set()
+
+    def _cutoff(self) -> lease_cutoff:
+        """Heartbeats older than this no longer hold a lease"""
+        return lease_cutoff(self.settings.DISCUSSION_LEASE_TTL)
+
+    def _orphaned(self, restarted_at: Optional[datetime] = None):
+        """Filter for leases that lapsed, and this worker's own from before ``restarted_at``, which died with it"""
+        conditions = [Sweep.owner_id.is_(None), Sweep.heartbeat_at.is_(None), Sweep.heartbeat_at < self._cutoff()]
+        if restarted_at is not None:
+            conditions.append((Sweep.owner_id == self.worker_id) & (Sweep.heartbeat_at < restarted_at))
+        return or_(*conditions)
+
+    def find_orphans(self, restarted_at: Optional[datetime] = None) -> List[Any]:
+        """Id, concurrency and priority of every unfinished sweep that no live worker runs"""
+        with self.session_factory() as db:
+            return (
+                db.query(Sweep.id, Sweep.concurrency, Sweep.priority)
+                .filter(Sweep.status.in_(UNFINISHED_SWEEP_STATUSES), self._orphaned(restarted_at))
+                .order_by(Sweep.created_at)
+                .all()
+            )
+
+    def claim(self, sweep_id: UUID, restarted_at: Optional[datetime] = None) -> bool:
+        """Take the lease on an orphaned sweep; False if another worker got to it first"""
+        with self.session_factory() as db:
+            claimed = (
+                db.query(Sweep)
+                .filter(
+                    Sweep.id == sweep_id,
+                    Sweep.status.in_(UNFINISHED_SWEEP_STATUSES),
+                    self._orphaned(restarted_at)
+                )
+                .update({"owner_id": self.worker_id, "heartbeat_at": func.now()}, synchronize_session=False)
+            )
+            db.commit()
+        return bool(claimed)
+
+    async def recover(self, restarted_at: Optional[datetime] = None) -> List[UUID]:
+        """Claim the sweeps whose worker died and run what is left of them here"""
+        recovered = []
+        for orphan in await asyncio.to_thread(self.find_orphans, restarted_at):
+            if self.is_running(orphan.id) or not await asyncio.to_thread(self.claim, orphan.id, restarted_at):
+                continue
+            logger.warning(f"Recovered orphaned sweep {orphan.id}; running its remaining runs here")
+            self.start(orphan.id, orphan.concurrency, orphan.priority)
+            recovered.append(orphan.id)
+        return recovered
+
+    def heartbeat(self) -> Set[UUID]:
+        """Renew the leases of the sweeps running here; returns the ones another worker has taken over"""
+        held = set(self._tasks)
+        if not held:
+            return set()
+        with self.session_factory() as db:
+            db.query(Sweep).filter(Sweep.id.in_(held), Sweep.owner_id == self.worker_id).update(
+                {"heartbeat_at": func.now()}, synchronize_session=False
+            )
+            db.commit()
+            kept = {
+                sweep_id for (sweep_id,) in
+                db.query(Sweep.id).filter(Sweep.id.in_(held), Sweep.owner_id == self.worker_id)
+            }
+        return held - kept
+
+    async def _heartbeat_loop(self) -> None:
+        while self._tasks:
+            await asyncio.sleep(self.settings.DISCUSSION_HEARTBEAT_INTERVAL)
+            try:
+                lost = await asyncio.to_thread(self.heartbeat)
+            except Exception as e:
+                logger.warning(f"Renewing sweep leases failed: {e!r}")
+                continue
+            for sweep_id in lost - self._lost:
+                # The runs in flight finish; the new owner starts the rest
+                logger.error(f"Sweep {sweep_id} was taken over by another worker; starting no more of its runs here")
+            self._lost |= lost
+
+    async def _run(self, sweep_id: UUID, concurrency: int, priority: int) -> None:
+        with self.session_factory() as db:
+            db.query(Sweep).filter(Sweep.id == sweep_id, Sweep.status == "pending").update(
+                {"status": "running"}, synchronize_session=False
+            )
+            db.commit()
+            runs = (
+                db.query(SweepRun.id, SweepRun.round_table_id, SweepRun.prompt, SweepRun.status)
+                .filter(SweepRun.sweep_id == sweep_id, SweepRun.status.in_(("pending", "running")))
+                .order_by(SweepRun.index)
+                .all()
+            )
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(run):
+            async with semaphore:
+                if run.status == "running":
+                    # Started by a worker that died; its discussion was recovered with it
+                    await self._adopt(sweep_id, run, priority)
+                else:
+                    await self._run_one(sweep_id, run, priority)
+
+        try:
+            await asyncio.gather(*(bounded(run) for run in runs))
+            with self.session_factory() as db:
+                if sweep_id not in self._lost:
+                    db.query(Sweep).filter(Sweep.id == sweep_id, Sweep.status == "running").update(
+                        {"status": "completed", "completed_at": datetime.utcnow()}, synchronize_session=False
+                    )
+                db.query(Sweep).filter(Sweep.id == sweep_id, Sweep.owner_id == self.worker_id).update(
+                    {"owner_id": None, "heartbeat_at": None}, synchronize_session=False
+                )
+                db.commit()
+        finally:
+            self._lost.discard(sweep_id)
+        logger.info(f"Sweep {sweep_id} finished its {len(runs)} runs")
+        self.notify(sweep_id)
+
+    async def _run_one(self, sweep_id: UUID, run, priority: int) -> None:
+        if sweep_id in self._lost:
+            return
+        with self.session_factory() as db:
+            # A cancelled sweep's runs are no longer pending
+            claimed = db.query(SweepRun).filter(SweepRun.id == run.id, SweepRun.status == "pending").update(
+                {"status": "running", "started_at": datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+        if not claimed:
+            return
+        status, error = await self._discuss(sweep_id, run, priority)
+        self._finish_run(sweep_id, run, status, error)
+
+    async def _adopt(self, sweep_id: UUID, run, priority: int) -> None:
+        """See a run that the sweep's previous owner started through to its end"""
+        while sweep_id not in self._lost:
+            status, checkpoint = await asyncio.to_thread(self._round_table_state, run.round_table_id)
+            if status == "pending":
+                # Recovery sent it back before it got past the queue: start it over
+                with self.session_factory() as db:
+                    db.query(SweepRun).filter(SweepRun.id == run.id, SweepRun.status == "running").update(
+                        {"status": "pending", "started_at": None}, synchronize_session=False
+                    )
+                    db.commit()
+                await self._run_one(sweep_id, run, priority)
+                return
+            if status == "paused" and (checkpoint or {}).get("reason") == "recovered":
+                status, error = await self._discuss(sweep_id, run, priority, resume=True)
+                if status is None:
+                    # Someone else resumed it first; wait for it like any other running discussion
+                    continue
+                self._finish_run(sweep_id, run, status, error)
+                return
+            if status not in ACTIVE_STATUSES:
+                self._finish_run(sweep_id, run, status or "failed", None if status else "Round table was deleted")
+                return
+            await asyncio.sleep(self.settings.SWEEP_POLL_INTERVAL)
+
+    def _round_table_state(self, round_table_id: Optional[UUID]) -> Tuple[Optional[str], Optional[Dict]]:
+        with self.session_factory() as db:
+            row = db.query(RoundTable.status, RoundTable.checkpoint).filter(RoundTable.id == round_table_id).first()
+        return (row.status, row.checkpoint) if row else (None, None)
+
+    async def _discuss(
+        self,
+        sweep_id: UUID,
+        run,
+        priority: int,
+        resume: bool = False
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Run or resume a run's discussion; its final status and error, or no status if it is not paused any more"""
+        status, error = "failed", None
+        db = self.session_factory()
+        try:
+            while True:
+                try:
+                    service = RoundTableService(db)
+                    if resume:
+                        await service.resume_discussion(
+                            run.round_table_id, submitter=f"sweep:{sweep_id}", priority=priority
+                        )
+                        status = db.query(RoundTable.status).filter(RoundTable.id == run.round_table_id).scalar()
+                    else:
+                        result = await service.run_discussion(
+                            run.round_table_id, run.prompt, submitter=f"sweep:{sweep_id}", priority=priority
+                        )
+                        status = result["status"]
+                except HTTPException as e:
+                    if e.status_code == 429:
+                        db.rollback()
+                        await asyncio.sleep(QUEUE_FULL_RETRY_DELAY)
+                        if await asyncio.to_thread(self._cancelled, sweep_id, run):
+                            return "cancelled", None
+                        continue
+                    if resume and e.status_code in (400, 409):
+                        return None, None
+                    error = str(e.detail)
+                except Exception as e:
+                    logger.exception(f"Sweep {sweep_id} run on round table {run.round_table_id} failed")
+                    error = repr(e)
+                break
+        finally:
+            db.close()
+        return status, error
+
+    def _cancelled(self, sweep_id: UUID, run) -> bool:
+        """Whether the sweep, or this run of it, was cancelled or deleted"""
+        with self.session_factory() as db:
+            sweep_status = db.query(Sweep.status).filter(Sweep.id == sweep_id).scalar()
+            run_status = db.query(SweepRun.status).filter(SweepRun.id == run.id).scalar()
+        return sweep_status in (None, "cancelled") or run_status in (None, "cancelled")
+
+    def _finish_run(self, sweep_id: UUID, run, status: str, error: Optional[str]) -> None:
+        with self.session_factory() as db:
+            db.query(SweepRun).filter(SweepRun.id == run.id).update(
+                {"status": status, "error": error, "finished_at": datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+        self.notify(sweep_id)
+
+    def _finished_runs(self, sweep_id: UUID, seen: Set[int]) -> Any:
+        with self.session_factory() as db:
+            sweep_status = db.query(Sweep.status).filter(Sweep.id == sweep_id).scalar()
+            runs = (
+                db.query(SweepRun)
+                .filter(SweepRun.sweep_id == sweep_id, SweepRun.status.not_in(("pending", "running")))
+                .order_by(SweepRun.finished_at, SweepRun.index)
+                .all()
+            )
+            events = [
+                {
+                    "event": "run",
+                    "index": run.index,
+                    "params": run.params,
+                    "round_table_id": str(run.round_table_id) if run.round_table_id else None,
+                    "status": run.status,
+                    "error": run.error,
+                    "duration_s": (run.finished_at - run.started_at).total_seconds()
+                    if run.started_at and run.finished_at else None
+                }
+                for run in runs if run.index not in seen
+            ]
+        return sweep_status, events
+
+    async def events(self, sweep_id: UUID) -> AsyncIterator[Dict[str, Any]]:
+        """Completion events of a sweep's runs, then the result table once it is done.
+
+        A sweep running on this worker wakes the stream as each run ends;
+        one running elsewhere is checked every ``SWEEP_POLL_INTERVAL``,
+        and keeps going on another worker if the one running it dies.
+        """
+        wake = asyncio.Event()
+        self._listeners.setdefault(sweep_id, set()).add(wake)
+        seen: Set[int] = set()
+        try:
+            while True:
+                wake.clear()
+                status, events = await asyncio.to_thread(self._finished_runs, sweep_id, seen)
+                for event in events:
+                    seen.add(event["index"])
+                    yield event
+                if status is None or status in FINISHED_SWEEP_STATUSES:
+                    if status is not None:
+                        with self.session_factory() as db:
+                            result = SweepService(db, self).get_result(sweep_id)
+                        yield {"event": "sweep", **result.model_dump(mode="json")}
+                    return
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=self.settings.SWEEP_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            listeners = self._listeners.get(sweep_id)
+            listeners.discard(wake)
+            if not listeners:
+                del self._listeners[sweep_id]
+
+
+@lru_cache()
+def get_sweep_runner() -> SweepRunner:
+    """Get or create the process-wide sweep runner"""
+    return SweepRunner()
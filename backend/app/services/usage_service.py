@@ -0,0 +1,123 @@
+# app/services/usage_service.py
+from typing import Any, Dict, List
+from uuid import UUID
+from fastapi import HTTPException
+from sqlalchemy import desc, func
+from sqlalchemy.orm import Session
+
+from ..models.agent import Agent
+from ..models.message import Message
+from ..models.round_table import RoundTable
+from ..schemas.usage import AgentUsage, AgentUsageReport, ModelUsage, RoundTableUsage, UsageTotals
+
+# Sort keys for the agent leaderboard
+USAGE_ORDERINGS = {
+    "cost": "cost",
+    "tokens": "total_tokens",
+    "latency": "avg_latency_ms"
+}
+
+class UsageService:
+    """Token, cost and latency totals aggregated in SQL from per-message accounting"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _aggregates() -> List[Any]:
+        prompt_tokens = func.coalesce(func.sum(Message.prompt_tokens), 0)
+        completion_tokens = func.coalesce(func.sum(Message.completion_tokens), 0)
+        return [
+            func.count(Message.id).label("messages"),
+            func.count(Message.latency_ms).label("completions"),
+            prompt_tokens.label("prompt_tokens"),
+            completion_tokens.label("completion_tokens"),
+            (prompt_tokens + completion_tokens).label("total_tokens"),
+            func.coalesce(func.sum(Message.cost), 0.0).label("cost"),
+            func.avg(Message.latency_ms).label("avg_latency_ms"),
+            func.max(Message.latency_ms).label("max_latency_ms"),
+            func.avg(Message.ttft_ms).label("avg_ttft_ms")
+        ]
+
+    @staticmethod
+    def _row(row) -> Dict[str, Any]:
+        return dict(row._mapping)
+
+    def get_round_table_usage(self, round_table_id: UUID) -> RoundTableUsage:
+        """Totals for a round table, broken down by agent and model"""
+        if not self.db.get(RoundTable, round_table_id):
+            raise HTTPException(status_code=404, detail="Round table not found")
+
+        totals = (
+            self.db.query(*self._aggregates())
+            .filter(Message.round_table_id == round_table_id)
+            .one()
+        )
+        by_agent = (
+            self.db.query(
+                Message.agent_id,
+                Agent.name.label("agent_name"),
+                Message.provider,
+                Message.model,
+                *self._aggregates()
+            )
+            .join(Agent, Agent.id == Message.agent_id)
+            .filter(Message.round_table_id == round_table_id)
+            .group_by(Message.agent_id, Agent.name, Message.provider, Message.model)
+            .order_by(desc("cost"), desc("total_tokens"))
+            .all()
+        )
+        return RoundTableUsage(
+            round_table_id=round_table_id,
+            totals=UsageTotals(**self._row(totals)),
+            by_agent=[AgentUsage(**self._row(row)) for row in by_agent]
+        )
+
+    def get_agent_usage(self, agent_id: UUID) -> AgentUsageReport:
+        """Totals for an agent across all round tables, broken down by model"""
+        agent = self.db.get(Agent, agent_id)
+        if not agent:
+            raise HTTPException(status_code=404, detail="Agent not found")
+
+        totals = (
+            self.db.query(*self._aggregates())
+            .filter(Message.agent_id == agent_id)
+            .one()
+        )
+        by_model = (
+            self.db.query(Message.provider, Message.model, *self._aggregates())
+            .filter(Message.agent_id == agent_id)
+            .group_by(Message.provider, Message.model)
+            .order_by(desc("cost"), desc("total_tokens"))
+            .all()
+        )
+        return AgentUsageReport(
+            agent_id=agent_id,
+            agent_name=agent.name,
+            totals=UsageTotals(**self._row(totals)),
+            by_model=[ModelUsage(**self._row(row)) for row in by_model]
+        )
+
+    def get_top_agents(self, order_by: str = "cost", limit: int = 20) -> List[AgentUsage]:
+        """Agents and model configs ranked by spend, tokens or latency"""
+        if order_by not in USAGE_ORDERINGS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"order_by must be one of {', '.join(USAGE_ORDERINGS)}"
+            )
+        rows = (
+            self.db.query(
+                Message.agent_id,
+                Agent.name.label("agent_name"),
+                Message.provider,
+                Message.model,
+                *self._aggregates()
+            )
+            .join(Agent, Agent.id == Message.agent_id)
+            .filter(Message.latency_ms.isnot(None))
+            .group_by(Message.agent_id, Agent.name, Message.provider, Message.model)
+            .order_by(desc(USAGE_ORDERINGS[order_by]))
+            .limit(limit)
+            .all()
+        )
+        return [AgentUsage(**self._row(row)) for row in rows]
@@ -0,0 +1,161 @@
+# app/utils/admission.py
+
+import asyncio
+import itertools
+import logging
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when the waiting queue is full"""
+    pass
+
+
+class AdmissionTicket:
+    """A discussion waiting for, or holding, a run slot"""
+
+    def __init__(
+        self,
+        round_table_id: UUID,
+        providers: Iterable[str],
+        submitter: str,
+        priority: int,
+        sequence: int
+    ):
+        self.round_table_id = round_table_id
+        self.providers = frozenset(providers)
+        self.submitter = submitter
+        self.priority = priority
+        self.sequence = sequence
+        self.admitted = asyncio.get_running_loop().create_future()
+
+    async def wait(self) -> None:
+        await asyncio.shield(self.admitted)
+
+
+class AdmissionController:
+    """Caps concurrently running discussions per process and per LLM provider.
+
+    Discussions over the cap wait in a queue ordered by priority (higher
+    first), then by fair share between submitters (fewest running, then
+    fewest admitted so far), then by arrival. A waiting discussion whose
+    providers are saturated does not block others behind it. When the queue
+    is full new discussions are rejected outright, so overload turns into
+    fast back-pressure instead of piling up DB connections and LLM calls.
+    """
+
+    def __init__(
+        self,
+        max_running: int = 8,
+        max_per_provider: int = 4,
+        provider_limits: Optional[Dict[str, int]] = None,
+        max_queue: int = 100
+    ):
+        self.max_running = max_running
+        self.max_per_provider = max_per_provider
+        self.provider_limits = provider_limits or {}
+        self.max_queue = max_queue
+        self._waiting: List[AdmissionTicket] = []
+        self._running: Dict[UUID, AdmissionTicket] = {}
+        self._running_by_provider: Counter = Counter()
+        self._running_by_submitter: Counter = Counter()
+        self._admitted_by_submitter: Counter = Counter()
+        self._sequence = itertools.count()
+
+    def _limit(self, provider: str) -> int:
+        return self.provider_limits.get(provider, self.max_per_provider)
+
+    def _fits(self, ticket: AdmissionTicket) -> bool:
+        return all(
+            self._running_by_provider[provider] < self._limit(provider)
+            for provider in ticket.providers
+        )
+
+    def _order_key(self, ticket: AdmissionTicket):
+        return (
+            -ticket.priority,
+            self._running_by_submitter[ticket.submitter],
+            self._admitted_by_submitter[ticket.submitter],
+            ticket.sequence
+        )
+
+    def enqueue(
+        self,
+        round_table_id: UUID,
+        providers: Iterable[str],
+        submitter: str,
+        priority: int = 0
+    ) -> AdmissionTicket:
+        """Queue a discussion; the ticket is admitted right away if there is room"""
+        if len(self._waiting) >= self.max_queue:
+            raise AdmissionRejected(
+                f"Too many discussions waiting to run ({len(self._waiting)}); try again later"
+            )
+        ticket = AdmissionTicket(round_table_id, providers, submitter, priority, next(self._sequence))
+        self._waiting.append(ticket)
+        self._dispatch()
+        return ticket
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        """Give up a slot or a queue position"""
+        if ticket in self._waiting:
+            self._waiting.remove(ticket)
+        elif self._running.get(ticket.round_table_id) is ticket:
+            del self._running[ticket.round_table_id]
+            self._running_by_submitter[ticket.submitter] -= 1
+            for provider in ticket.providers:
+                self._running_by_provider[provider] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._waiting and len(self._running) < self.max_running:
+            ticket = next(
+                (t for t in sorted(self._waiting, key=self._order_key) if self._fits(t)),
+                None
+            )
+            if ticket is None:
+                return
+            self._waiting.remove(ticket)
+            self._running[ticket.round_table_id] = ticket
+            self._running_by_submitter[ticket.submitter] += 1
+            self._admitted_by_submitter[ticket.submitter] += 1
+            for provider in ticket.providers:
+                self._running_by_provider[provider] += 1
+            if not ticket.admitted.done():
+                ticket.admitted.set_result(True)
+            logger.info(f"Admitted discussion {ticket.round_table_id} for {ticket.submitter}")
+
+    def position(self, round_table_id: UUID) -> Optional[int]:
+        """1-based position in the waiting queue, or None if not waiting"""
+        for index, ticket in enumerate(sorted(self._waiting, key=self._order_key)):
+            if ticket.round_table_id == round_table_id:
+                return index + 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": len(self._running),
+            "waiting": len(self._waiting),
+            "max_running": self.max_running,
+            "running_by_provider": {k: v for k, v in self._running_by_provider.items() if v},
+            "waiting_by_submitter": dict(Counter(t.submitter for t in self._waiting))
+        }
+
+
+@lru_cache()
+def get_admission_controller() -> AdmissionController:
+    """Get or create the process-wide admission controller"""
+    settings = get_settings()
+    return AdmissionController(
+        max_running=settings.MAX_CONCURRENT_DISCUSSIONS,
+        max_per_provider=settings.MAX_DISCUSSIONS_PER_PROVIDER,
+        provider_limits=settings.DISCUSSION_PROVIDER_LIMITS,
+        max_queue=settings.MAX_QUEUED_DISCUSSIONS
+    )
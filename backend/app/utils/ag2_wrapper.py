@@ -1,108 +1,325 @@
 # app/utils/ag2_wrapper.py - Complete updated file
 
-from typing import List, Optional, Dict, Callable
-import autogen
-import os
-from dotenv import load_dotenv
+from __future__ import annotations
+
+import copy
+import logging
+import time
+from typing import TYPE_CHECKING, Any, List, Optional, Dict, Callable
+from functools import lru_cache, partial
 from app.schemas.round_table import RoundTableSettings
 from app.schemas.agent import AgentCreate
+from app.utils.hedging import HedgingPolicy, get_hedging_policy
+from app.utils.llm_config import LLMConfigRegistry, get_llm_config_registry
+from app.utils.load_balancer import EndpointPool, KamiwazaBalancer, get_kamiwaza_balancer
+from app.utils.metrics import observe_llm_completion
+from app.utils.tools import Tool, ToolExecutor, ToolRegistry, get_tool_executor, get_tool_registry
+from app.utils.tracing import get_tracer
+
+# autogen (and openai underneath it) dominates start-up time, so it is only
+# imported once the first agent is built
+if TYPE_CHECKING:
+    import autogen
+
+logger = logging.getLogger(__name__)
+
+# Instances a Kamiwaza completion is tried on before the error is raised
+MAX_INSTANCE_ATTEMPTS = 2
+
+
+def usage_delta(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Tokens an OpenAIWrapper spent between two ``actual_usage_summary`` snapshots"""
+    before = before or {}
+    for model, usage in (after or {}).items():
+        if model == "total_cost" or not isinstance(usage, dict):
+            continue
+        previous = before.get(model) or {}
+        prompt_tokens = usage.get("prompt_tokens", 0) - previous.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0) - previous.get("completion_tokens", 0)
+        if prompt_tokens or completion_tokens:
+            return {
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cost": usage.get("cost", 0) - previous.get("cost", 0)
+            }
+    return {}
+
 
-# Load environment variables
-load_dotenv()
+# Message columns filled from an agent's completions
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "cost", "model", "provider", "ttft_ms", "latency_ms")
+
+
+def add_pending_usage(agent, usage: Dict[str, Any]) -> None:
+    """Accumulate a completion's usage on the agent until its message is stored.
+
+    A reply that needed several completions (tool calls) sums their tokens,
+    cost and latency and keeps the first completion's time to first token.
+    """
+    pending = getattr(agent, "_pending_usage", None)
+    if not pending:
+        agent._pending_usage = dict(usage)
+        return
+    for key in ("prompt_tokens", "completion_tokens", "cost", "latency_ms"):
+        if usage.get(key) is not None:
+            pending[key] = (pending.get(key) or 0) + usage[key]
+    pending["model"] = usage.get("model") or pending.get("model")
+    pending["provider"] = usage.get("provider") or pending.get("provider")
+
+
+def pop_pending_usage(agent) -> Dict[str, Any]:
+    """Take the usage accumulated since the agent's last stored message"""
+    pending = getattr(agent, "_pending_usage", None) or {}
+    if agent is not None:
+        agent._pending_usage = None
+    return {key: pending.get(key) for key in USAGE_FIELDS}
 
 class AG2Wrapper:
-    def __init__(self, llm_config_manager):
-        self.llm_config_manager = llm_config_manager
+    def __init__(
+        self,
+        llm_config_manager: Optional[LLMConfigRegistry] = None,
+        hedging_policy: Optional[HedgingPolicy] = None,
+        balancer: Optional[KamiwazaBalancer] = None,
+        tool_registry: Optional[ToolRegistry] = None,
+        tool_executor: Optional[ToolExecutor] = None
+    ):
+        self.llm_config_manager = llm_config_manager or get_llm_config_registry()
+        self.hedging_policy = hedging_policy or get_hedging_policy()
+        self.balancer = balancer or get_kamiwaza_balancer()
+        self.tool_registry = tool_registry or get_tool_registry()
+        self.tool_executor = tool_executor or get_tool_executor()
+        self.tracer = get_tracer()
 
-    def create_agent(self, agent_data: AgentCreate) -> autogen.ConversableAgent:
-        """Create an AG2 agent based on configuration"""
-        # Use the agent's llm_config, falling back to global config if needed
-        agent_llm_config = agent_data.llm_config
-        
-        # If agent config doesn't have config_list, create it from the config
-        if "config_list" not in agent_llm_config:
-            # Determine the config type and create appropriate config
-            if "api_type" in agent_llm_config and agent_llm_config["api_type"] == "azure":
-                # Fill in empty values from environment
-                api_key = agent_llm_config.get("api_key") or os.getenv("AZURE_OPENAI_API_KEY")
-                azure_endpoint = agent_llm_config.get("azure_endpoint") or os.getenv("AZURE_OPENAI_ENDPOINT")
-                model = agent_llm_config.get("model") or os.getenv("AZURE_OPENAI_MODEL", "gpt-4o")
-                api_version = agent_llm_config.get("api_version") or os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
-                
-                if not (api_key and azure_endpoint):
-                    raise ValueError("Azure configuration is incomplete. Please provide api_key and azure_endpoint.")
-                
-                endpoint = azure_endpoint.rstrip('/')  # Remove trailing slash
-                config_list = [{
-                    "model": model,
-                    "api_key": api_key,
-                    "azure_endpoint": endpoint,
-                    "api_version": api_version,
-                    "api_type": "azure"
-                }]
-            elif "provider" in agent_llm_config and agent_llm_config["provider"] == "kamiwaza":
-                port = agent_llm_config.get("port")
-                model = agent_llm_config.get("model_name")
-                host = agent_llm_config.get("host_name")
-                
-                if not (port and model and host):
-                    raise ValueError("Kamiwaza configuration is incomplete. Please provide port, model_name, and host_name.")
-                
-                config_list = [{
-                    "model": "model",  # Always use "model" as the model name for Kamiwaza
-                    "base_url": f"http://{host}:{port}/v1",
-                    "api_key": "not-needed"
-                }]
+    def create_agent(
+        self,
+        agent_data: AgentCreate,
+        temperature: Optional[float] = None,
+        memories: Optional[List[str]] = None
+    ) -> autogen.ConversableAgent:
+        """Create an AG2 agent based on configuration, optionally with the round table's temperature
+        and what the agent recalls from earlier discussions"""
+        import autogen
+
+        agent_id = getattr(agent_data, "id", None)  # Set for agents loaded from the database
+        with self.tracer.span("agent.create", agent_id=agent_id, agent_name=agent_data.name):
+            # Precomputed per distinct llm_config by the process-wide registry
+            base_config = self.llm_config_manager.get_agent_config(agent_data.llm_config)
+            if temperature is not None:
+                # Per endpoint, so hedged and per-instance clients built from the entries keep it
+                base_config = {
+                    **base_config,
+                    "config_list": [{**entry, "temperature": temperature} for entry in base_config["config_list"]]
+                }
+
+            # Format system message with constraints
+            system_message = self._format_system_message(agent_data.background, memories)
+
+            # Handle different agent types
+            if agent_data.agent_type == "system":
+                agent = autogen.AssistantAgent(
+                    name=agent_data.name,
+                    system_message=system_message,
+                    llm_config=base_config
+                )
+            elif agent_data.agent_type in ["assistant", "standard"]:
+                agent = autogen.AssistantAgent(
+                    name=agent_data.name,
+                    system_message=system_message,
+                    llm_config=base_config
+                )
+            elif agent_data.agent_type == "user_proxy":
+                agent = autogen.UserProxyAgent(
+                    name=agent_data.name,
+                    code_execution_config={"use_docker": False}
+                )
             else:
-                # For OpenAI or unknown configs, use the global config
-                global_config = self.llm_config_manager.get_active_config()
-                config_list = global_config.get("config_list", [])
-                
-            base_config = {"config_list": config_list}
-        else:
-            base_config = agent_llm_config
+                raise ValueError(f"Unsupported agent type: {agent_data.agent_type}")
 
-        print(f"Using LLM config: {base_config}")
+            logger.debug(f"Created {agent_data.agent_type} agent {agent.name}")
+
+            # Force set the config if it's not sticking
+            if not hasattr(agent, 'llm_config'):
+                logger.warning(f"Agent {agent.name} is missing llm_config, forcing it")
+                agent.llm_config = base_config
+
+            if agent.llm_config:
+                # Before the completion clients are built from the config, so they carry the tool schemas
+                if agent_data.tool_config:
+                    self.register_tools(agent, agent_data.tool_config)
+                provider = self.llm_config_manager.provider_for(agent_data.llm_config)
+                # Kamiwaza models resolved by the balancer are spread across their instances
+                pool = self.balancer.pool_for(agent_data.llm_config) if provider == "kamiwaza" else None
+                self._register_llm_reply(agent, agent_id, provider, pool)
 
-        # Format system message with constraints
-        system_message = self._format_system_message(agent_data.background)
-        
-        print(f"Creating agent with name: {agent_data.name}")
-        
-        # Handle different agent types
-        if agent_data.agent_type == "system":
-            agent = autogen.AssistantAgent(
-                name=agent_data.name,
-                system_message=system_message,
-                llm_config=base_config
-            )
-        elif agent_data.agent_type in ["assistant", "standard"]:
-            agent = autogen.AssistantAgent(
-                name=agent_data.name,
-                system_message=system_message,
-                llm_config=base_config
-            )
-        elif agent_data.agent_type == "user_proxy":
-            agent = autogen.UserProxyAgent(
-                name=agent_data.name,
-                code_execution_config={"use_docker": False}
-            )
-        else:
-            raise ValueError(f"Unsupported agent type: {agent_data.agent_type}")
-            
-        print(f"Created agent with name: {agent.name}")
-        print(f"Verifying agent config - llm_config: {getattr(agent, 'llm_config', None)}")
-        print(f"Verifying agent config - client: {getattr(agent, 'client', None)}")
-        
-        # Force set the config if it's not sticking
-        if not hasattr(agent, 'llm_config'):
-            print("WARNING: Agent missing llm_config, forcing it")
-            agent.llm_config = base_config
-            
         return agent
 
-    def _format_system_message(self, message: str) -> str:
+    def register_tools(self, agent: autogen.ConversableAgent, tool_config: Dict[str, Any]) -> List[Tool]:
+        """Let the agent call the tools ``tool_config`` declares.
+
+        The model is given their schemas; the calls it makes are run by the
+        tool executor within the agent's reply (see ``_register_llm_reply``).
+        """
+        if not agent.llm_config:
+            raise ValueError(f"Agent {agent.name} has no LLM to call tools with")
+        tools = self.tool_registry.resolve(tool_config)
+        # Registering adds the schemas to the config, which may be shared with other agents
+        agent.llm_config = dict(agent.llm_config)
+        for tool in tools:
+            agent.register_for_llm(name=tool.name, description=tool.description)(tool.function)
+        agent._tool_map = {**getattr(agent, "_tool_map", {}), **{tool.name: tool for tool in tools}}
+        return tools
+
+    def _register_llm_reply(
+        self,
+        agent: autogen.ConversableAgent,
+        agent_id=None,
+        provider: Optional[str] = None,
+        pool: Optional[EndpointPool] = None
+    ) -> None:
+        """Route the agent's completions through the hedging policy, tracing and metrics.
+
+        The completion runs on the policy's thread pool, like AG2's own async
+        reply does on the default executor; hedging only kicks in when the
+        policy is enabled. With an instance ``pool`` each completion goes to
+        the instance the pool picks, and a failed one is retried once on
+        another instance. When the model calls the agent's tools, the calls
+        run concurrently on the tool executor and the model is asked again
+        with their results, up to ``TOOL_MAX_ROUNDS`` times, so the reply
+        the discussion sees is always the agent's answer.
+        """
+        import autogen
+        from autogen.io import IOStream
+
+        config_list = agent.llm_config["config_list"]
+        endpoint = config_list[0]
+        # Clients built here need the tool schemas the agent's own client has
+        extra = {"tools": agent.llm_config["tools"]} if agent.llm_config.get("tools") else {}
+        key = f"{endpoint.get('azure_endpoint') or endpoint.get('base_url') or 'default'}/{endpoint.get('model')}"
+        # Hedge against the next endpoint in the config list when there is one
+        alternate_client = None
+        if self.hedging_policy.enabled and len(config_list) > 1:
+            alternate_client = autogen.OpenAIWrapper(config_list=config_list[1:] + config_list[:1], **extra)
+        policy = self.hedging_policy
+        tracer = self.tracer
+        tool_executor = self.tool_executor
+        instance_clients: Dict[str, Any] = {}
+
+        def instance_client(url: str):
+            client = instance_clients.get(url)
+            if client is None:
+                client = instance_clients[url] = autogen.OpenAIWrapper(
+                    config_list=[{**endpoint, "base_url": url}],
+                    **extra
+                )
+            return client
+
+        async def a_traced_oai_reply(recipient, messages=None, sender=None, config=None):
+            client = recipient.client
+            if client is None:
+                return False, None
+            if messages is None:
+                messages = recipient._oai_messages[sender]
+            iostream = IOStream.get_default()
+            submitted = time.monotonic()
+
+            def complete(llm_client):
+                started = time.monotonic()
+                usage_before = copy.deepcopy(llm_client.actual_usage_summary)
+                # Each attempt gets its own copies since the client pops "context" from the last message
+                prompt = recipient._oai_system_message + [dict(message) for message in messages]
+                with IOStream.set_default(iostream):
+                    reply = recipient._generate_oai_reply_from_client(llm_client, prompt, recipient.client_cache)
+                stats = usage_delta(usage_before, llm_client.actual_usage_summary)
+                stats["queue_wait_ms"] = round((started - submitted) * 1000, 1)
+                stats["completion_ms"] = round((time.monotonic() - started) * 1000, 1)
+                return reply, stats
+
+            def complete_on_instance(llm_client):
+                tried: List[str] = []
+                while True:
+                    instance = pool.acquire(exclude=tried)
+                    if instance is None:
+                        if not tried:  # The model has no known instances; use the configured URL
+                            return complete(llm_client)
+                        raise last_error
+                    started = time.monotonic()
+                    try:
+                        reply, stats = complete(instance_client(instance.url))
+                    except Exception as e:
+                        pool.release(instance, ok=False)
+                        tried.append(instance.url)
+                        last_error = e
+                        if len(tried) >= MAX_INSTANCE_ATTEMPTS:
+                            raise
+                        logger.warning(f"Completion on {instance.url} failed, retrying on another instance: {e!r}")
+                        continue
+                    pool.release(instance, ok=True, latency=time.monotonic() - started)
+                    stats["instance"] = instance.url
+                    return reply, stats
+
+            run = complete_on_instance if pool is not None else complete
+
+            async def complete_reply():
+                nonlocal submitted
+                submitted = time.monotonic()
+                with tracer.span("llm.completion", agent_id=agent_id, agent_name=recipient.name, endpoint=key) as span:
+                    reply, stats = await policy.call(
+                        key,
+                        partial(run, client),
+                        partial(run, alternate_client or client)
+                    )
+                    usage = {
+                        "prompt_tokens": stats.get("prompt_tokens"),
+                        "completion_tokens": stats.get("completion_tokens"),
+                        "cost": stats.get("cost"),
+                        "model": stats.get("model") or endpoint.get("model"),
+                        "provider": provider,
+                        # Completions are not streamed, so the first token arrives with the last
+                        "ttft_ms": stats["completion_ms"],
+                        "latency_ms": round((time.monotonic() - submitted) * 1000, 1)
+                    }
+                    span.set_attributes({
+                        **usage,
+                        "queue_wait_ms": stats["queue_wait_ms"],
+                        "instance": stats.get("instance")
+                    })
+                observe_llm_completion(
+                    provider,
+                    usage["model"],
+                    stats["completion_ms"] / 1000,
+                    prompt_tokens=usage["prompt_tokens"] or 0,
+                    completion_tokens=usage["completion_tokens"] or 0
+                )
+                add_pending_usage(recipient, usage)
+                return reply
+
+            reply = await complete_reply()
+            tools = getattr(recipient, "_tool_map", None)
+            rounds = 0
+            while tools and isinstance(reply, dict) and reply.get("tool_calls"):
+                if rounds == tool_executor.settings.TOOL_MAX_ROUNDS:
+                    logger.warning(f"{recipient.name} still calls tools after {rounds} rounds; answering without them")
+                    reply = reply.get("content") or "I could not finish looking that up."
+                    break
+                rounds += 1
+                with tracer.span("tool.round", agent_name=recipient.name, calls=len(reply["tool_calls"])):
+                    results = await tool_executor.call_all(tools, reply["tool_calls"])
+                # The completion closures read ``messages``, so the next one sees the results
+                messages = [
+                    *messages,
+                    {"role": "assistant", "content": reply.get("content"), "tool_calls": reply["tool_calls"]},
+                    *results
+                ]
+                reply = await complete_reply()
+            return (False, None) if reply is None else (True, reply)
+
+        agent.register_reply([autogen.Agent, None], a_traced_oai_reply, ignore_async_in_sync_chat=True)
+
+    def _format_system_message(self, message: str, memories: Optional[List[str]] = None) -> str:
         """Add constraints to system message to control agent behavior"""
+        if memories:
+            recalled = "\n".join(f"- {memory}" for memory in memories)
+            message = f"{message}\n\nWhat you said in earlier discussions that may be relevant here:\n{recalled}"
         return f"""
 {message}
 
@@ -121,9 +338,8 @@ Follow these guidelines in all responses:
         settings: Dict
     ) -> autogen.GroupChat:
         """Create an AG2 GroupChat with optimized settings"""
-        print(f"Creating GroupChat with settings: {settings}")
-        print(f"Number of agents: {len(agents)}")
-        
+        import autogen
+
         # Create GroupChat exactly like the docs example
         group_chat = autogen.GroupChat(
             agents=agents,
@@ -141,22 +357,39 @@ Follow these guidelines in all responses:
                 "name": "system"
             }]
         
-        print(f"Created GroupChat object: {group_chat}")
-        print(f"GroupChat max_round: {getattr(group_chat, 'max_round', None)}")
-        
+        logger.debug(f"Created GroupChat with {len(agents)} agents, max_round {group_chat.max_round}")
+
         # Verify the group chat was created properly
         if not hasattr(group_chat, 'max_round'):
             raise ValueError("GroupChat initialization failed - max_round not set")
-                
+
+        self._trace_speaker_selection(group_chat)
         return group_chat
 
+    def _trace_speaker_selection(self, group_chat: autogen.GroupChat) -> None:
+        """Time each speaker selection made by the group chat manager"""
+        select_speaker = group_chat.a_select_speaker
+        tracer = self.tracer
+
+        async def a_select_speaker(last_speaker, selector):
+            with tracer.span(
+                "speaker.select",
+                method=str(group_chat.speaker_selection_method),
+                last_speaker=last_speaker.name
+            ) as span:
+                speaker = await select_speaker(last_speaker, selector)
+                span.set_attribute("speaker", speaker.name)
+                return speaker
+
+        group_chat.a_select_speaker = a_select_speaker
+
     def create_group_chat_manager(
         self, 
         group_chat: autogen.GroupChat
     ) -> autogen.GroupChatManager:
         """Create an AG2 GroupChatManager with optimized settings"""
-        print(f"Creating GroupChatManager with group_chat: {group_chat}")
-        
+        import autogen
+
         if not hasattr(group_chat, 'max_round'):
             raise ValueError("GroupChat must be properly initialized with max_round")
             
@@ -171,12 +404,16 @@ Follow these guidelines in all responses:
             base_config = self.llm_config_manager.get_active_config()
             llm_config = {"config_list": base_config["config_list"]}
             
-        print(f"Final LLM config for manager: {llm_config}")
-            
         # Create manager exactly like the test
         manager = autogen.GroupChatManager(
             groupchat=group_chat,
             llm_config=llm_config
         )
         
-        return manager
\ No newline at end of file
+        return manager
+
+
+@lru_cache()
+def get_ag2_wrapper() -> AG2Wrapper:
+    """Get or create the process-wide AG2Wrapper"""
+    return AG2Wrapper(get_llm_config_registry())
@@ -0,0 +1,69 @@
+# app/utils/builtin_tools.py
+from datetime import datetime, timezone as dt_timezone
+from typing import Annotated
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import ast
+import math
+import operator
+
+from .tools import tool
+
+# Largest exponent ``calculate`` accepts, so 10 ** 10 ** 10 cannot stall a thread
+MAX_EXPONENT = 1000
+# Largest integer ``calculate`` computes: big-integer arithmetic holds the GIL, so
+# ((10 ** 1000) ** 1000) ** 10 would stall the event loop rather than just a tool thread
+MAX_RESULT_BITS = 10_000
+
+OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos
+}
+FUNCTIONS = {"abs": abs, "round": round, "min": min, "max": max, "sqrt": math.sqrt, "log": math.log, "exp": math.exp}
+
+
+def _evaluate(node: ast.AST):
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in OPERATORS:
+        left, right = _evaluate(node.left), _evaluate(node.right)
+        if isinstance(node.op, ast.Pow) and abs(right) > MAX_EXPONENT:
+            raise ValueError(f"exponents are limited to {MAX_EXPONENT}")
+        if isinstance(left, int) and isinstance(right, int):
+            # Bound the size of the result before computing it
+            if isinstance(node.op, ast.Pow) and right > 0:
+                bits = left.bit_length() * right
+            elif isinstance(node.op, ast.Mult):
+                bits = left.bit_length() + right.bit_length()
+            else:
+                bits = 0
+            if bits > MAX_RESULT_BITS:
+                raise ValueError(f"results are limited to {MAX_RESULT_BITS} bits")
+        return OPERATORS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in OPERATORS:
+        return OPERATORS[type(node.op)](_evaluate(node.operand))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS and not node.keywords:
+        return FUNCTIONS[node.func.id](*(_evaluate(argument) for argument in node.args))
+    raise ValueError(f"unsupported expression: {ast.unparse(node)}")
+
+
+@tool(pure=True)
+def calculate(expression: Annotated[str, "Arithmetic expression, e.g. (1200 * 0.15) / 12"]) -> str:
+    """Evaluate an arithmetic expression with + - * / // % ** and abs, round, min, max, sqrt, log, exp"""
+    return str(_evaluate(ast.parse(expression, mode="eval").body))
+
+
+@tool()
+def current_time(timezone: Annotated[str, "IANA time zone, e.g. Europe/Berlin"] = "UTC") -> str:
+    """The current date and time in a time zone"""
+    try:
+        zone = ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown time zone {timezone}")
+    return datetime.now(dt_timezone.utc).astimezone(zone).isoformat(timespec="seconds")
@@ -0,0 +1,104 @@
+# app/utils/discussion_registry.py
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Dict, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+class DiscussionAlreadyRunning(Exception):
+    """Raised when a round table already has a discussion running in this process"""
+    pass
+
+
+class DiscussionHandle:
+    """Tracks the task driving a single round table discussion"""
+
+    def __init__(self, round_table_id: UUID, task: Optional[asyncio.Task]):
+        self.round_table_id = round_table_id
+        self.task = task
+        self.stop_reason: Optional[str] = None
+        self.next_speaker: Optional[str] = None
+        self.started = False  # False while still waiting for a run slot
+        self.finished = asyncio.Event()
+
+    @property
+    def stop_requested(self) -> bool:
+        return self.stop_reason is not None
+
+
+class DiscussionRegistry:
+    """Process-wide registry of running discussions.
+
+    Discussions check ``stop_requested`` at every turn boundary, so a stop
+    request lets the current turn's message be persisted and ends the chat
+    before the next LLM call is made.
+    """
+
+    def __init__(self):
+        self._handles: Dict[UUID, DiscussionHandle] = {}
+
+    def register(self, round_table_id: UUID) -> DiscussionHandle:
+        """Register the current task as the driver of ``round_table_id``"""
+        existing = self._handles.get(round_table_id)
+        if existing and not existing.finished.is_set():
+            raise DiscussionAlreadyRunning(f"Discussion {round_table_id} is already running")
+        handle = DiscussionHandle(round_table_id, asyncio.current_task())
+        self._handles[round_table_id] = handle
+        return handle
+
+    def unregister(self, handle: DiscussionHandle) -> None:
+        handle.finished.set()
+        if self._handles.get(handle.round_table_id) is handle:
+            del self._handles[handle.round_table_id]
+
+    def get(self, round_table_id: UUID) -> Optional[DiscussionHandle]:
+        return self._handles.get(round_table_id)
+
+    def is_running(self, round_table_id: UUID) -> bool:
+        return round_table_id in self._handles
+
+    async def request_stop(
+        self,
+        round_table_id: UUID,
+        reason: str,
+        timeout: float,
+        cancel: bool = False
+    ) -> bool:
+        """Ask a discussion to stop at its next turn boundary.
+
+        Waits up to ``timeout`` seconds for it to wind down. With ``cancel``
+        the task is cancelled outright once the timeout passes. Returns True
+        if the discussion has stopped.
+        """
+        handle = self._handles.get(round_table_id)
+        if handle is None:
+            return True
+        handle.stop_reason = reason
+        logger.info(f"Stop requested for discussion {round_table_id}: {reason}")
+        if cancel and not handle.started and handle.task is not None:
+            # Nothing to checkpoint while the discussion is still queued
+            handle.task.cancel()
+        try:
+            await asyncio.wait_for(asyncio.shield(handle.finished.wait()), timeout)
+            return True
+        except asyncio.TimeoutError:
+            if cancel and handle.task is not None:
+                handle.task.cancel()
+                await asyncio.wait({handle.task}, timeout=timeout)
+            return handle.finished.is_set()
+
+    async def stop_all(self, reason: str, timeout: float, cancel: bool = False) -> None:
+        await asyncio.gather(*[
+            self.request_stop(round_table_id, reason, timeout, cancel)
+            for round_table_id in list(self._handles)
+        ])
+
+
+@lru_cache()
+def get_discussion_registry() -> DiscussionRegistry:
+    """Get or create the process-wide discussion registry"""
+    return DiscussionRegistry()
@@ -0,0 +1,206 @@
+# app/utils/hedging.py
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Sliding window of completion latencies for a single endpoint"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the recorded latencies"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = int(round(pct / 100.0 * (len(ordered) - 1)))
+        return ordered[min(len(ordered) - 1, max(0, index))]
+
+
+class HedgingPolicy:
+    """Hedge slow LLM completions with a duplicate request.
+
+    Completions run on a dedicated thread pool. When a call has not finished
+    within the tracked latency percentile for its endpoint, a duplicate is sent
+    (to an alternate endpoint when one is available) and whichever finishes
+    first wins. The loser is cancelled if it has not started yet, otherwise its
+    result is discarded when it arrives. Hedges are capped to a fraction of all
+    completions so a slow provider cannot double our traffic.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 95.0,
+        budget: float = 0.1,
+        min_samples: int = 20,
+        min_delay: float = 0.5,
+        max_workers: int = 32,
+        window: int = 200
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-completion")
+        self._trackers: Dict[str, LatencyTracker] = {}
+        # Loser callbacks fire on worker threads, so stats are guarded
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._latency_saved = 0.0
+
+    def _tracker(self, key: str) -> LatencyTracker:
+        tracker = self._trackers.get(key)
+        if tracker is None:
+            tracker = self._trackers[key] = LatencyTracker(self.window)
+        return tracker
+
+    def _record_latency(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._tracker(key).record(seconds)
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Deadline after which a call to ``key`` gets hedged, if known yet"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            tracker = self._trackers.get(key)
+            if tracker is None or len(tracker) < self.min_samples:
+                return None
+            return max(self.min_delay, tracker.percentile(self.percentile))
+
+    def _reserve_hedge(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self.budget * self._requests:
+                return False
+            self._hedges += 1
+            return True
+
+    async def call(
+        self,
+        key: str,
+        primary: Callable[[], Any],
+        alternate: Optional[Callable[[], Any]] = None
+    ) -> Any:
+        """Run ``primary`` off the event loop, hedging it with ``alternate``.
+
+        ``key`` identifies the endpoint whose latency distribution sets the
+        hedge deadline. ``alternate`` defaults to re-issuing ``primary``.
+        """
+        with self._lock:
+            self._requests += 1
+        started = time.monotonic()
+        primary_future = self._executor.submit(primary)
+        primary_task = asyncio.wrap_future(primary_future)
+
+        delay = self.hedge_delay(key)
+        if delay is not None:
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+            if not done and self._reserve_hedge():
+                return await self._race(key, started, primary_future, primary_task, alternate or primary)
+
+        result = await primary_task
+        self._record_latency(key, time.monotonic() - started)
+        return result
+
+    async def _race(
+        self,
+        key: str,
+        started: float,
+        primary_future: Future,
+        primary_task: asyncio.Future,
+        alternate: Callable[[], Any]
+    ) -> Any:
+        logger.info(f"Hedging completion for {key} after {time.monotonic() - started:.2f}s")
+        hedge_future = self._executor.submit(alternate)
+        hedge_task = asyncio.wrap_future(hedge_future)
+
+        pending = {primary_task, hedge_task}
+        winner = None
+        error: Optional[BaseException] = None
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = task
+                    break
+                error = task.exception()
+        if winner is None:
+            raise error
+
+        finished = time.monotonic()
+        if winner is hedge_task:
+            with self._lock:
+                self._hedge_wins += 1
+            # Keep measuring the straggler so the deadline and the win stay honest
+            primary_future.add_done_callback(
+                lambda future: self._record_straggler(future, key, started, finished)
+            )
+        else:
+            self._record_latency(key, finished - started)
+
+        for task in pending:
+            task.cancel()
+        return winner.result()
+
+    def _record_straggler(self, future: Future, key: str, started: float, hedge_finished: float) -> None:
+        if future.cancelled():
+            return
+        primary_finished = time.monotonic()
+        with self._lock:
+            self._tracker(key).record(primary_finished - started)
+            self._latency_saved += primary_finished - hedge_finished
+
+    def stats(self) -> Dict[str, Any]:
+        """Hedge rate and latency won so far"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "requests": self._requests,
+                "hedges": self._hedges,
+                "hedge_rate": self._hedges / self._requests if self._requests else 0.0,
+                "hedge_wins": self._hedge_wins,
+                "win_rate": self._hedge_wins / self._hedges if self._hedges else 0.0,
+                "latency_saved_seconds": round(self._latency_saved, 3),
+                "deadlines": {
+                    key: tracker.percentile(self.percentile)
+                    for key, tracker in self._trackers.items()
+                    if len(tracker) >= self.min_samples
+                }
+            }
+
+
+@lru_cache()
+def get_hedging_policy() -> HedgingPolicy:
+    """Get or create the process-wide hedging policy"""
+    settings = get_settings()
+    return HedgingPolicy(
+        enabled=settings.LLM_HEDGING_ENABLED,
+        percentile=settings.LLM_HEDGING_PERCENTILE,
+        budget=settings.LLM_HEDGING_BUDGET,
+        min_samples=settings.LLM_HEDGING_MIN_SAMPLES,
+        min_delay=settings.LLM_HEDGING_MIN_DELAY,
+        max_workers=settings.LLM_HEDGING_MAX_WORKERS
+    )
@@ -1,17 +1,16 @@
 #app/utils/llm_config.py
 
 import os
-from typing import Optional, Dict, Any
+import json
+import threading
+import time
+from typing import Optional, Dict, Any, Set
 from functools import lru_cache
 import logging
 from pydantic import ValidationError
-from dotenv import load_dotenv
-
-load_dotenv()
-
-#load env 
-
+from dotenv import dotenv_values
 
+from .. import config  # noqa: F401  (loads .env into os.environ once)
 from ..schemas.llm import LLMConfig, AzureOpenAIConfig, OpenAIConfig, KamiwazaConfig
 
 logger = logging.getLogger(__name__)
@@ -155,4 +154,221 @@ def get_llm_config_manager() -> LLMConfigManager:
     """Get or create a singleton LLM configuration manager"""
     manager = LLMConfigManager()
     manager.initialize_from_env()
-    return manager
\ No newline at end of file
+    return manager
+
+# Environment variables that feed LLM configuration; changes to these trigger a reload
+LLM_ENV_PREFIXES = ("AZURE_OPENAI_", "OPENAI_", "KAMIWAZA_", "ACTIVE_LLM_CONFIG")
+
+
+class LLMConfigRegistry:
+    """Process-wide LLM configuration shared by every request.
+
+    Parses the environment once and precomputes the AG2 ``config_list`` for
+    the active configuration and for each distinct agent ``llm_config``.
+    Every ``check_interval`` seconds an access also checks the .env file's
+    mtime and the LLM-related environment variables, and reloads if either
+    changed, so edits take effect without a restart. A reload that fails
+    keeps serving the last good configuration.
+    """
+
+    def __init__(self, env_file: Optional[str] = ".env", check_interval: float = 2.0):
+        self.env_file = env_file
+        self.check_interval = check_interval
+        self.version = 0
+        self.loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._manager: Optional[LLMConfigManager] = None
+        self._active_config: Optional[Dict[str, Any]] = None
+        self._error: Optional[LLMConfigurationError] = None
+        self._agent_configs: Dict[str, Dict[str, Any]] = {}
+        self._env_file_mtime: Optional[int] = None
+        self._env_file_keys: Set[str] = set()  # LLM settings the .env file put into the environment
+        self._env_snapshot: Optional[tuple] = None
+        self._last_check = float("-inf")
+
+    def _read_env_file_mtime(self) -> Optional[int]:
+        if not self.env_file:
+            return None
+        try:
+            return os.stat(self.env_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _read_env_file(self) -> Dict[str, str]:
+        """The LLM settings in the .env file"""
+        if not self.env_file or not os.path.exists(self.env_file):
+            return {}
+        return {
+            key: value for key, value in dotenv_values(self.env_file).items()
+            if key.startswith(LLM_ENV_PREFIXES) and value is not None
+        }
+
+    def _apply_env_file(self) -> None:
+        """Copy LLM settings from an edited .env file into the environment, dropping the ones it no longer has"""
+        values = self._read_env_file()
+        for key in self._env_file_keys - set(values):
+            os.environ.pop(key, None)
+        os.environ.update(values)
+        self._env_file_keys = set(values)
+
+    @staticmethod
+    def _read_env_snapshot() -> tuple:
+        return tuple(sorted(
+            (key, value) for key, value in os.environ.items()
+            if key.startswith(LLM_ENV_PREFIXES)
+        ))
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            if now - self._last_check < self.check_interval:
+                return
+            self._last_check = now
+            mtime = self._read_env_file_mtime()
+            if mtime != self._env_file_mtime:
+                if self._env_file_mtime is not None:
+                    self._apply_env_file()
+                else:
+                    # Loaded into the environment at start-up
+                    self._env_file_keys = set(self._read_env_file())
+                self._env_file_mtime = mtime
+            snapshot = self._read_env_snapshot()
+            if snapshot != self._env_snapshot:
+                self._env_snapshot = snapshot
+                self._load()
+
+    def _load(self) -> None:
+        manager = LLMConfigManager()
+        try:
+            manager.initialize_from_env()
+            active_config = manager.get_active_config()
+        except LLMConfigurationError as e:
+            if self._manager is None:
+                self._error = e
+            logger.warning(f"LLM configuration reload failed: {e}")
+        else:
+            self._manager = manager
+            self._active_config = active_config
+            self._error = None
+        # Agent configs fall back to environment values, so they are rebuilt lazily
+        self._agent_configs = {}
+        self.version += 1
+        self.loaded_at = time.time()
+        logger.info(f"LLM configuration loaded (version {self.version})")
+
+    def reload(self) -> None:
+        """Force a reload from the .env file and environment"""
+        with self._lock:
+            self._apply_env_file()
+            self._env_file_mtime = self._read_env_file_mtime()
+            self._env_snapshot = self._read_env_snapshot()
+            self._last_check = time.monotonic()
+            self._load()
+
+    def get_active_config(self) -> Dict[str, Any]:
+        """Get the active configuration in AG2 format"""
+        self._maybe_reload()
+        if self._active_config is None:
+            raise self._error or LLMConfigurationError("LLM configuration not initialized")
+        return _copy_config(self._active_config)
+
+    def get_client_config(self) -> Dict[str, Any]:
+        """Get configuration for direct API client usage"""
+        self._maybe_reload()
+        if self._manager is None:
+            raise self._error or LLMConfigurationError("LLM configuration not initialized")
+        return self._manager.get_client_config()
+
+    def get_agent_config(self, agent_llm_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the AG2 config for an agent's stored ``llm_config``"""
+        if "config_list" in agent_llm_config:
+            return _copy_config(agent_llm_config)
+        self._maybe_reload()
+        key = json.dumps(agent_llm_config, sort_keys=True, default=str)
+        config = self._agent_configs.get(key)
+        if config is None:
+            config = self._agent_configs[key] = self._build_agent_config(agent_llm_config)
+        return _copy_config(config)
+
+    def _build_agent_config(self, agent_llm_config: Dict[str, Any]) -> Dict[str, Any]:
+        # Determine the config type and create appropriate config
+        if agent_llm_config.get("api_type") == "azure":
+            # Fill in empty values from environment
+            api_key = agent_llm_config.get("api_key") or os.getenv("AZURE_OPENAI_API_KEY")
+            azure_endpoint = agent_llm_config.get("azure_endpoint") or os.getenv("AZURE_OPENAI_ENDPOINT")
+            model = agent_llm_config.get("model") or os.getenv("AZURE_OPENAI_MODEL", "gpt-4o")
+            api_version = agent_llm_config.get("api_version") or os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
+
+            if not (api_key and azure_endpoint):
+                raise ValueError("Azure configuration is incomplete. Please provide api_key and azure_endpoint.")
+
+            config_list = [{
+                "model": model,
+                "api_key": api_key,
+                "azure_endpoint": azure_endpoint.rstrip('/'),  # Remove trailing slash
+                "api_version": api_version,
+                "api_type": "azure"
+            }]
+        elif agent_llm_config.get("provider") == "kamiwaza":
+            port = agent_llm_config.get("port")
+            model = agent_llm_config.get("model_name")
+            host = agent_llm_config.get("host_name")
+
+            if not (port and model and host):
+                raise ValueError("Kamiwaza configuration is incomplete. Please provide port, model_name, and host_name.")
+
+            config_list = [{
+                "model": "model",  # Always use "model" as the model name for Kamiwaza
+                "base_url": f"http://{host}:{port}/v1",
+                "api_key": "not-needed"
+            }]
+        else:
+            # For OpenAI or unknown configs, use the global config
+            config_list = self.get_active_config().get("config_list", [])
+        return {"config_list": config_list}
+
+    def active_config_name(self) -> Optional[str]:
+        """Name of the active configuration ("azure", "openai" or "kamiwaza")"""
+        self._maybe_reload()
+        return self._manager._config.active_config if self._manager else None
+
+    def provider_for(self, agent_llm_config: Dict[str, Any]) -> str:
+        """The provider an agent's ``llm_config`` runs on; the active configuration's if it uses the global one"""
+        return provider_of(agent_llm_config, default=self.active_config_name() or "openai")
+
+    def describe(self) -> Dict[str, Any]:
+        """Summarize the loaded configuration without exposing credentials"""
+        self._maybe_reload()
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "active_config": self.active_config_name(),
+            "error": str(self._error) if self._error else None,
+            "cached_agent_configs": len(self._agent_configs)
+        }
+
+
+def provider_of(llm_config: Dict[str, Any], default: str = "openai") -> str:
+    """The ``LLMConfig.active_config`` name an agent's ``llm_config`` belongs to.
+
+    Configs that are neither Azure nor Kamiwaza run on the global
+    configuration, reported as ``default``.
+    """
+    if llm_config.get("provider") == "kamiwaza":
+        return "kamiwaza"
+    if llm_config.get("api_type") == "azure":
+        return "azure"
+    return default
+
+
+def _copy_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Shallow-copy a precomputed config so AG2 cannot mutate the cached one"""
+    return {**config, "config_list": [dict(entry) for entry in config.get("config_list", [])]}
+
+
+@lru_cache()
+def get_llm_config_registry() -> LLMConfigRegistry:
+    """Get or create the process-wide LLM configuration registry"""
+    return LLMConfigRegistry()
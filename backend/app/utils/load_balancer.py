@@ -0,0 +1,264 @@
+# app/utils/load_balancer.py
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("p2c", "least_outstanding")
+
+
+class Endpoint:
+    """One serving instance of a model, with its live load and health"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejections = 0  # Consecutive ejections; each one doubles the ejection time
+        self.ejected_until = 0.0
+        self.latency_ewma: Optional[float] = None  # Seconds
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def describe(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "url": self.url,
+            "outstanding": self.outstanding,
+            "consecutive_failures": self.consecutive_failures,
+            "ejected_for": round(max(0.0, self.ejected_until - now), 1),
+            "latency_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None
+        }
+
+
+class EndpointPool:
+    """Spreads requests for one model across its instances.
+
+    Picks an instance with power-of-two-choices (two random instances, the
+    less loaded wins) or least-outstanding-requests. An instance that fails
+    ``failure_threshold`` requests in a row is ejected for
+    ``ejection_seconds``, doubling on each repeat up to
+    ``max_ejection_seconds``; a successful request or health check brings
+    it back. If every instance is ejected the pool fails open and uses the
+    one whose ejection ends first. Thread-safe: completions run on worker
+    threads.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        policy: str = "p2c",
+        failure_threshold: int = 3,
+        ejection_seconds: float = 30.0,
+        max_ejection_seconds: float = 300.0
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown load balancing policy {policy!r}; use one of {', '.join(POLICIES)}")
+        self.name = name
+        self.policy = policy
+        self.failure_threshold = failure_threshold
+        self.ejection_seconds = ejection_seconds
+        self.max_ejection_seconds = max_ejection_seconds
+        self._endpoints: Dict[str, Endpoint] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._endpoints)
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self._endpoints)
+
+    def set_urls(self, urls: Iterable[str]) -> None:
+        """Replace the instance list, keeping the state of instances that remain"""
+        with self._lock:
+            self._endpoints = {url: self._endpoints.get(url) or Endpoint(url) for url in urls}
+
+    def _choose(self, candidates: List[Endpoint]) -> Endpoint:
+        # Latency is only reported, not used to pick: an instance that had one
+        # slow response would otherwise be starved whenever load is low
+        def load(endpoint: Endpoint):
+            return endpoint.outstanding
+
+        if self.policy == "p2c" and len(candidates) > 2:
+            return min(random.sample(candidates, 2), key=load)
+        lowest = min(load(endpoint) for endpoint in candidates)
+        return random.choice([endpoint for endpoint in candidates if load(endpoint) == lowest])
+
+    def acquire(self, exclude: Iterable[str] = ()) -> Optional[Endpoint]:
+        """Pick an instance and count a request against it; None if the pool is empty"""
+        exclude = set(exclude)
+        with self._lock:
+            endpoints = [endpoint for endpoint in self._endpoints.values() if endpoint.url not in exclude]
+            if not endpoints:
+                return None
+            now = time.monotonic()
+            available = [endpoint for endpoint in endpoints if endpoint.available(now)]
+            if available:
+                endpoint = self._choose(available)
+            else:
+                endpoint = min(endpoints, key=lambda e: e.ejected_until)
+            endpoint.outstanding += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, ok: bool, latency: Optional[float] = None) -> None:
+        """Finish a request started with ``acquire`` and record how it went"""
+        with self._lock:
+            endpoint.outstanding = max(0, endpoint.outstanding - 1)
+            if ok:
+                self._mark_healthy(endpoint)
+                if latency is not None:
+                    endpoint.latency_ewma = latency if endpoint.latency_ewma is None else (
+                        0.8 * endpoint.latency_ewma + 0.2 * latency
+                    )
+            else:
+                self._mark_failed(endpoint)
+
+    def _mark_healthy(self, endpoint: Endpoint) -> None:
+        if endpoint.ejected_until:
+            logger.info(f"Instance {endpoint.url} of {self.name} is back in rotation")
+        endpoint.consecutive_failures = 0
+        endpoint.ejections = 0
+        endpoint.ejected_until = 0.0
+
+    def _mark_failed(self, endpoint: Endpoint) -> None:
+        endpoint.consecutive_failures += 1
+        now = time.monotonic()
+        if endpoint.consecutive_failures >= self.failure_threshold and endpoint.available(now):
+            duration = min(self.max_ejection_seconds, self.ejection_seconds * 2 ** endpoint.ejections)
+            endpoint.ejections += 1
+            endpoint.ejected_until = now + duration
+            logger.warning(
+                f"Ejected instance {endpoint.url} of {self.name} for {duration:.0f}s "
+                f"after {endpoint.consecutive_failures} consecutive failures"
+            )
+
+    def record_health(self, url: str, healthy: bool) -> None:
+        """Apply the result of an active health check"""
+        with self._lock:
+            endpoint = self._endpoints.get(url)
+            if endpoint is None:
+                return
+            if healthy:
+                self._mark_healthy(endpoint)
+            else:
+                self._mark_failed(endpoint)
+
+    def describe(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "model": self.name,
+                "policy": self.policy,
+                "instances": [endpoint.describe() for endpoint in self._endpoints.values()]
+            }
+
+
+class KamiwazaBalancer:
+    """Pools of Kamiwaza deployment instances, kept in sync with the control plane.
+
+    ``refresh`` resolves deployments through the cached ``KamiwazaService``
+    list and starts a background task that health checks every instance
+    each ``KAMIWAZA_HEALTH_INTERVAL`` seconds.
+    """
+
+    def __init__(self, kamiwaza_service=None, settings=None):
+        self.settings = settings or get_settings()
+        self._kamiwaza_service = kamiwaza_service
+        self._pools: Dict[str, EndpointPool] = {}  # By model name
+        self._ports: Dict[int, str] = {}  # Load balancer and instance ports -> model name
+        self._health_task: Optional[asyncio.Task] = None
+
+    @property
+    def kamiwaza_service(self):
+        if self._kamiwaza_service is None:
+            from ..services.kamiwaza_service import get_kamiwaza_service
+            self._kamiwaza_service = get_kamiwaza_service()
+        return self._kamiwaza_service
+
+    def _new_pool(self, name: str) -> EndpointPool:
+        return EndpointPool(
+            name,
+            policy=self.settings.KAMIWAZA_LB_POLICY,
+            failure_threshold=self.settings.KAMIWAZA_LB_FAILURE_THRESHOLD,
+            ejection_seconds=self.settings.KAMIWAZA_LB_EJECTION_SECONDS,
+            max_ejection_seconds=self.settings.KAMIWAZA_LB_MAX_EJECTION_SECONDS
+        )
+
+    def update(self, models: List[Dict[str, Any]]) -> None:
+        """Sync the pools with a deployment list from ``KamiwazaService``"""
+        ports: Dict[int, str] = {}
+        for model in models:
+            name = model["model_name"]
+            pool = self._pools.get(name) or self._new_pool(name)
+            pool.set_urls(dict.fromkeys(instance["url"] for instance in model["instances"]))
+            self._pools[name] = pool
+            for port in [model.get("lb_port")] + [instance["port"] for instance in model["instances"]]:
+                if port:
+                    ports[int(port)] = name
+        for name in set(self._pools) - {model["model_name"] for model in models}:
+            self._pools[name].set_urls([])
+        self._ports = ports
+
+    async def refresh(self) -> None:
+        """Resolve deployments to instances; agents keep their configured URL if this fails"""
+        try:
+            self.update(await self.kamiwaza_service.get_available_models())
+        except Exception as e:
+            logger.warning(f"Could not resolve Kamiwaza instances: {e!r}")
+            return
+        if self.settings.KAMIWAZA_HEALTH_INTERVAL > 0 and (self._health_task is None or self._health_task.done()):
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    def pool_for(self, llm_config: Dict[str, Any]) -> Optional[EndpointPool]:
+        """The instance pool of an agent's Kamiwaza model, matched by model name or port"""
+        pool = self._pools.get(llm_config.get("model_name"))
+        if pool is None and llm_config.get("port"):
+            pool = self._pools.get(self._ports.get(int(llm_config["port"])))
+        return pool if pool else None
+
+    async def check_health(self) -> None:
+        """Probe every instance's ``/models`` endpoint once"""
+        client = self.kamiwaza_service.client
+
+        async def probe(pool: EndpointPool, url: str) -> None:
+            try:
+                response = await client.get(f"{url}/models", timeout=self.settings.KAMIWAZA_HEALTH_TIMEOUT)
+                healthy = response.status_code < 500
+            except Exception:
+                healthy = False
+            pool.record_health(url, healthy)
+
+        await asyncio.gather(*(
+            probe(pool, url) for pool in self._pools.values() for url in pool.urls
+        ))
+
+    async def _health_loop(self) -> None:
+        while any(self._pools.values()):
+            await asyncio.sleep(self.settings.KAMIWAZA_HEALTH_INTERVAL)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.warning(f"Kamiwaza health checks failed: {e!r}")
+
+    async def aclose(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+
+    def describe(self) -> List[Dict[str, Any]]:
+        return [pool.describe() for pool in self._pools.values() if pool]
+
+
+@lru_cache()
+def get_kamiwaza_balancer() -> KamiwazaBalancer:
+    """Get or create the process-wide Kamiwaza balancer"""
+    return KamiwazaBalancer()
@@ -0,0 +1,309 @@
+# app/utils/memory_index.py
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+import fcntl
+import logging
+import os
+import re
+import threading
+
+from ..config import get_settings
+
+# numpy is only imported once memories are embedded or searched, so it stays off the start-up path
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Hash buckets of the embeddings; changing them, or the features, means rebuilding every index
+BUCKETS = 1 << 16
+# Heaviest features kept per memory, so rows have a fixed width
+MAX_FEATURES = 128
+# Bits of the SimHash code used to shortlist candidates before exact scoring
+CODE_BITS = 256
+# Shortlisted candidates per requested result
+RERANK_FACTOR = 64
+MIN_CANDIDATES = 512
+# Agents whose files stay mapped at once
+MAX_OPEN_AGENTS = 128
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in is it its of on or our so that the their "
+    "there these they this to was we were what when which will with would you your".split()
+)
+TOKEN = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+
+
+@dataclass
+class Embedding:
+    buckets: np.ndarray  # uint16 bucket of each nonzero weight
+    weights: np.ndarray  # float32, L2-normalized over all of the text's features
+    code: np.ndarray  # uint64 words of the SimHash code
+
+
+class HashingVectorizer:
+    """Embeds text by hashing its words and word pairs; no model, no training.
+
+    Each feature is hashed once: the hash picks the feature's bucket and
+    sign in a sparse vector of ``BUCKETS`` dimensions, and its bits vote
+    on the text's SimHash code, whose Hamming distances track the cosine
+    distances of the vectors. The same text embeds the same way in every
+    process, in tens of microseconds.
+    """
+
+    def features(self, text: str) -> List[str]:
+        words = [word for word in TOKEN.findall(text.lower()) if word not in STOPWORDS]
+        return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+    def transform(self, text: str) -> Optional[Embedding]:
+        """The embedding of ``text``, or None if it has no features"""
+        import numpy as np
+
+        counts: Dict[str, int] = {}
+        for feature in self.features(text):
+            counts[feature] = counts.get(feature, 0) + 1
+        if not counts:
+            return None
+        digests = np.frombuffer(
+            b"".join(blake2b(feature.encode(), digest_size=CODE_BITS // 8).digest() for feature in counts),
+            dtype=np.uint8
+        ).reshape(len(counts), CODE_BITS // 8)
+        # Sublinear term frequency
+        weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        code = np.packbits(weights @ (np.unpackbits(digests, axis=1).astype(np.float32) * 2 - 1) > 0)
+        # The sign keeps colliding features from always adding up
+        signs = np.where(digests[:, 2] & 1, 1.0, -1.0).astype(np.float32)
+        buckets, slots = np.unique(digests[:, :2].copy().view(np.uint16).ravel(), return_inverse=True)
+        values = np.zeros(len(buckets), dtype=np.float32)
+        np.add.at(values, slots, weights * signs)
+        values /= np.linalg.norm(values) or 1.0
+        return Embedding(buckets=buckets.astype(np.uint16), weights=values, code=code.view(np.uint64))
+
+
+def compact(embedding: Embedding) -> Tuple[np.ndarray, np.ndarray]:
+    """The embedding's heaviest ``MAX_FEATURES`` buckets and weights, zero-padded to that width"""
+    import numpy as np
+
+    buckets = np.zeros(MAX_FEATURES, dtype=np.uint16)
+    weights = np.zeros(MAX_FEATURES, dtype=np.float16)
+    keep = np.argsort(-np.abs(embedding.weights), kind="stable")[:MAX_FEATURES]
+    buckets[:len(keep)] = embedding.buckets[keep]
+    weights[:len(keep)] = embedding.weights[keep]
+    return buckets, weights
+
+
+def cosine(query: Embedding, buckets: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Scores of compacted rows against ``query``"""
+    import numpy as np
+
+    dense = np.zeros(BUCKETS, dtype=np.float32)
+    dense[query.buckets] = query.weights
+    return (weights.astype(np.float32) * dense[buckets]).sum(axis=1)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    import numpy as np
+
+    if hasattr(np, "bitwise_count"):  # NumPy 2
+        return np.bitwise_count(words)
+    return np.unpackbits(words.view(np.uint8)).reshape(len(words), 64).sum(axis=1, dtype=np.uint8)
+
+
+class MemoryIndex:
+    """Per-agent vector index kept in append-only, memory-mapped files.
+
+    Each agent has a row per memory in several files: the message and
+    round table ids, the embedding's heaviest ``MAX_FEATURES`` buckets and
+    weights, and its 256-bit SimHash code, stored one 64-bit word per file
+    so each is scanned contiguously. A search ranks every row by the
+    Hamming distance of its code to the query's, touching 32 bytes per
+    memory, then scores the closest few hundred exactly. A search over a
+    million memories takes under twenty milliseconds on one core.
+
+    Writers append under an exclusive ``flock``, so the uvicorn workers on
+    one host can share a directory; readers take the row count from the
+    file sizes and see new rows on their next search. The messages table
+    remains the source of truth: the index only holds ids, and an agent's
+    files can be rebuilt from its messages and archived transcripts at any time.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.vectorizer = HashingVectorizer()
+        self.words = CODE_BITS // 64
+        self._maps: "OrderedDict[UUID, Tuple[int, np.ndarray, np.ndarray, np.ndarray, List[np.ndarray]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, agent_id: UUID, kind: str) -> str:
+        return os.path.join(self.directory, f"{agent_id}.{kind}")
+
+    def _row_bytes(self) -> Dict[str, int]:
+        return {
+            "ids": 32,
+            "buckets": MAX_FEATURES * 2,
+            "weights": MAX_FEATURES * 2,
+            **{f"code{word}": 8 for word in range(self.words)}
+        }
+
+    def _rows(self, agent_id: UUID) -> int:
+        """Complete rows in an agent's files; a torn append leaves a shorter file behind"""
+        counts = []
+        for kind, size in self._row_bytes().items():
+            try:
+                counts.append(os.path.getsize(self._path(agent_id, kind)) // size)
+            except FileNotFoundError:
+                return 0
+        return min(counts)
+
+    @contextmanager
+    def _locked(self, agent_id: UUID):
+        with open(self._path(agent_id, "lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _encode(self, entries: Iterable[Tuple[UUID, UUID, str]]) -> Dict[str, bytes]:
+        """The bytes to append to each file for ``entries``, skipping texts with nothing to index"""
+        columns: Dict[str, List[bytes]] = {kind: [] for kind in self._row_bytes()}
+        for message_id, round_table_id, text in entries:
+            embedding = self.vectorizer.transform(text)
+            if embedding is None:
+                continue
+            buckets, weights = compact(embedding)
+            columns["ids"].append(message_id.bytes + round_table_id.bytes)
+            columns["buckets"].append(buckets.tobytes())
+            columns["weights"].append(weights.tobytes())
+            for word in range(self.words):
+                columns[f"code{word}"].append(embedding.code[word].tobytes())
+        return {kind: b"".join(chunks) for kind, chunks in columns.items()}
+
+    def add(self, agent_id: UUID, message_id: UUID, round_table_id: UUID, text: str) -> bool:
+        """Append one memory; False if the text has nothing to index"""
+        encoded = self._encode([(message_id, round_table_id, text)])
+        if not encoded["ids"]:
+            return False
+        with self._locked(agent_id):
+            rows = self._rows(agent_id)
+            for kind, data in encoded.items():
+                with open(self._path(agent_id, kind), "ab") as f:
+                    # Drop what a torn append left past the last complete row
+                    f.truncate(rows * self._row_bytes()[kind])
+                    f.write(data)
+        return True
+
+    def rebuild(self, agent_id: UUID, entries: Iterable[Tuple[UUID, UUID, str]]) -> int:
+        """Replace an agent's memories with ``entries`` of (message id, round table id, text)"""
+        encoded = self._encode(entries)
+        with self._locked(agent_id):
+            for kind, data in encoded.items():
+                temporary = self._path(agent_id, f"{kind}.tmp")
+                with open(temporary, "wb") as f:
+                    f.write(data)
+                os.replace(temporary, self._path(agent_id, kind))
+        with self._lock:
+            self._maps.pop(agent_id, None)
+        return len(encoded["ids"]) // 32
+
+    def delete(self, agent_id: UUID) -> None:
+        with self._lock:
+            self._maps.pop(agent_id, None)
+        for kind in (*self._row_bytes(), "lock"):
+            try:
+                os.remove(self._path(agent_id, kind))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """Delete every agent's memories"""
+        with self._lock:
+            self._maps.clear()
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+
+    def count(self, agent_id: UUID) -> int:
+        return self._rows(agent_id)
+
+    def _mapped(self, agent_id: UUID) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, List[np.ndarray]]]:
+        """The agent's files as arrays, remapped when other writers have appended to them"""
+        import numpy as np
+
+        rows = self._rows(agent_id)
+        if not rows:
+            return None
+        with self._lock:
+            cached = self._maps.get(agent_id)
+            if cached is not None and cached[0] == rows:
+                self._maps.move_to_end(agent_id)
+                return cached[1:]
+            mapped = (
+                rows,
+                np.memmap(self._path(agent_id, "ids"), dtype=np.uint8, mode="r", shape=(rows, 32)),
+                np.memmap(self._path(agent_id, "buckets"), dtype=np.uint16, mode="r", shape=(rows, MAX_FEATURES)),
+                np.memmap(self._path(agent_id, "weights"), dtype=np.float16, mode="r", shape=(rows, MAX_FEATURES)),
+                [
+                    np.memmap(self._path(agent_id, f"code{word}"), dtype=np.uint64, mode="r", shape=(rows,))
+                    for word in range(self.words)
+                ]
+            )
+            self._maps[agent_id] = mapped
+            while len(self._maps) > MAX_OPEN_AGENTS:
+                self._maps.popitem(last=False)
+            return mapped[1:]
+
+    def search(
+        self,
+        agent_id: UUID,
+        text: str,
+        k: int = 5,
+        exclude_round_tables: Optional[Set[UUID]] = None,
+        min_score: float = 0.0
+    ) -> List[Tuple[UUID, UUID, float]]:
+        """The ``k`` memories most similar to ``text``, as (message id, round table id, cosine score)"""
+        import numpy as np
+
+        mapped = self._mapped(agent_id)
+        query = self.vectorizer.transform(text)
+        if mapped is None or query is None:
+            return []
+        ids, buckets, weights, words = mapped
+        distances = np.zeros(len(ids), dtype=np.uint16)
+        for word, column in zip(query.code, words):
+            distances += _popcount(column ^ word)
+        shortlist = min(len(distances), max(MIN_CANDIDATES, k * RERANK_FACTOR))
+        if shortlist < len(distances):
+            # Everything within the distance that admits the shortlist, trimmed if ties overshoot it
+            cutoff = np.searchsorted(np.cumsum(np.bincount(distances, minlength=CODE_BITS + 1)), shortlist)
+            candidates = np.flatnonzero(distances <= cutoff)
+            if len(candidates) > 2 * shortlist:
+                candidates = candidates[np.argpartition(distances[candidates], shortlist - 1)[:shortlist]]
+        else:
+            candidates = np.arange(len(distances))
+        candidates.sort()  # Reads the rows in file order
+        scores = cosine(query, buckets[candidates], weights[candidates])
+        excluded = {round_table_id.bytes for round_table_id in exclude_round_tables or ()}
+        results = []
+        for position in np.argsort(-scores):
+            score = float(scores[position])
+            if score < min_score or len(results) == k:
+                break
+            row = ids[candidates[position]].tobytes()
+            if row[16:] in excluded:
+                continue
+            results.append((UUID(bytes=row[:16]), UUID(bytes=row[16:]), score))
+        return results
+
+
+@lru_cache()
+def get_memory_index() -> MemoryIndex:
+    """Get or create the process-wide memory index"""
+    return MemoryIndex(get_settings().MEMORY_INDEX_DIR)
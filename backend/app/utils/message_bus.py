@@ -0,0 +1,191 @@
+# app/utils/message_bus.py
+
+import asyncio
+import json
+import logging
+from functools import lru_cache
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..db.session import SessionLocal
+from ..models.message import Message
+from .pg_listener import RECONNECT_DELAY, PgListener, get_pg_listener
+from .redis_manager import create_async_redis_client, get_redis_client
+from .serialization import MESSAGE_COLUMNS, MessageRow, rows_to_dicts
+from .websocket_manager import WebSocketManager, get_websocket_manager
+
+logger = logging.getLogger(__name__)
+
+
+class MessageBus:
+    """Tells every worker about new messages, so each can push them to its own subscribers.
+
+    ``publish`` sends a compact event (round table, message id, sequence)
+    along with the transaction that stores the message: as a Postgres
+    ``NOTIFY``, which is only delivered if the transaction commits, or with
+    ``MESSAGE_BUS=redis`` as a Redis ``PUBLISH`` after the commit. Each
+    worker receives the events on one connection and, for the round tables
+    that have subscribers on it, loads the new messages with one query per
+    batch of events. With ``local``, or without Postgres, events only reach
+    the worker that stored the message.
+    """
+
+    def __init__(
+        self,
+        settings=None,
+        session_factory=None,
+        listener: Optional[PgListener] = None,
+        subscribers: Optional[WebSocketManager] = None
+    ):
+        self.settings = settings or get_settings()
+        self.session_factory = session_factory or SessionLocal
+        self._listener = listener
+        self.subscribers = subscribers or get_websocket_manager()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._events: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def listener(self) -> PgListener:
+        if self._listener is None:
+            self._listener = get_pg_listener()
+        return self._listener
+
+    @property
+    def backend(self) -> str:
+        backend = self.settings.MESSAGE_BUS
+        if backend == "postgres" and not self.listener.enabled:
+            return "local"
+        return backend
+
+    def publish(self, db: Session, round_table_id: UUID, message_id: UUID, sequence: int) -> None:
+        """Announce a message that ``db`` is about to commit"""
+        payload = json.dumps({
+            "round_table_id": str(round_table_id),
+            "message_id": str(message_id),
+            "sequence": sequence
+        })
+        backend = self.backend
+        if backend == "postgres":
+            db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.settings.MESSAGE_CHANNEL, "payload": payload}
+            )
+        else:
+            # Subscribers load the message, so the event must not go out before it is committed
+            db.info.setdefault("message_events", []).append((self, backend, payload))
+
+    def _send(self, backend: str, payload: str) -> None:
+        if backend == "redis":
+            try:
+                get_redis_client().publish(self.settings.MESSAGE_CHANNEL, payload)
+            except Exception as e:
+                logger.warning(f"Could not publish a message event to Redis: {e!r}")
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.deliver, payload)
+
+    def deliver(self, payload: str) -> None:
+        """Queue an event received from any worker for fan-out here"""
+        if self._events is not None:
+            self._events.put_nowait(json.loads(payload))
+
+    def load_messages(self, message_ids: List[UUID]) -> List[MessageRow]:
+        with self.session_factory() as db:
+            rows = (
+                db.query(*[getattr(Message, column) for column in MESSAGE_COLUMNS])
+                .filter(Message.id.in_(message_ids))
+                .order_by(Message.round_table_id, Message.sequence)
+                .all()
+            )
+        return rows_to_dicts(rows, MESSAGE_COLUMNS)
+
+    def load_messages_after(self, round_table_id: UUID, sequence: int) -> List[MessageRow]:
+        """A round table's own messages after ``sequence``, for a subscriber catching up"""
+        with self.session_factory() as db:
+            rows = (
+                db.query(*[getattr(Message, column) for column in MESSAGE_COLUMNS])
+                .filter(Message.round_table_id == round_table_id, Message.sequence > sequence)
+                .order_by(Message.sequence)
+                .all()
+            )
+        return rows_to_dicts(rows, MESSAGE_COLUMNS)
+
+    async def _fan_out(self) -> None:
+        while True:
+            events = [await self._events.get()]
+            while not self._events.empty():
+                events.append(self._events.get_nowait())
+            # Only messages somebody here is waiting for are loaded, each once for all its subscribers
+            wanted = [
+                UUID(item["message_id"]) for item in events
+                if self.subscribers.has_subscribers(UUID(item["round_table_id"]))
+            ]
+            if not wanted:
+                continue
+            try:
+                messages = await asyncio.to_thread(self.load_messages, wanted)
+            except Exception as e:
+                logger.warning(f"Could not load {len(wanted)} new messages for subscribers: {e!r}")
+                continue
+            for message in messages:
+                self.subscribers.publish(message["round_table_id"], message)
+
+    async def _listen_redis(self) -> None:
+        while True:
+            client = create_async_redis_client()
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.settings.MESSAGE_CHANNEL)
+                    async for item in pubsub.listen():
+                        if item["type"] == "message":
+                            self.deliver(item["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Lost the Redis message subscription: {e!r}")
+            finally:
+                await client.aclose()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def start(self) -> None:
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._events = asyncio.Queue()
+        self._tasks.append(self._loop.create_task(self._fan_out()))
+        backend = self.backend
+        if backend == "postgres":
+            await self.listener.listen(self.settings.MESSAGE_CHANNEL, self.deliver)
+        elif backend == "redis":
+            self._tasks.append(self._loop.create_task(self._listen_redis()))
+        logger.info(f"Fanning out new messages over {backend}")
+
+    async def aclose(self) -> None:
+        if self.backend == "postgres":
+            self.listener.unlisten(self.settings.MESSAGE_CHANNEL, self.deliver)
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._loop = None
+        self._events = None
+
+
+@event.listens_for(Session, "after_commit")
+def _send_committed_events(session: Session) -> None:
+    for bus, backend, payload in session.info.pop("message_events", []):
+        bus._send(backend, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back_events(session: Session) -> None:
+    session.info.pop("message_events", None)
+
+
+@lru_cache()
+def get_message_bus() -> MessageBus:
+    """Get or create the process-wide message bus"""
+    return MessageBus()
@@ -0,0 +1,161 @@
+# app/utils/metrics.py
+
+import os
+import threading
+import time
+from typing import Optional, Set
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess
+)
+
+# With several uvicorn workers each process writes its samples to files in
+# this directory and a scrape merges them. It must be set (and emptied)
+# before the workers start.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Label values are bounded so a typo'd or user-supplied model name cannot
+# create unbounded series
+PROVIDERS = {"azure", "openai", "kamiwaza"}
+MAX_MODELS = 20
+DISCUSSION_STATUSES = {"completed", "paused", "failed", "cancelled"}
+OTHER = "other"
+
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0, 60.0)
+TOOL_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DB_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "roundtable_llm_request_seconds",
+    "Latency of LLM completions",
+    ["provider", "model"],
+    buckets=LLM_LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "roundtable_llm_tokens_total",
+    "Tokens spent on LLM completions",
+    ["provider", "model", "kind"]
+)
+TURNS = Counter(
+    "roundtable_turns_total",
+    "Discussion turns stored"
+)
+DISCUSSIONS = Counter(
+    "roundtable_discussions_total",
+    "Discussion runs by final status",
+    ["status"]
+)
+ACTIVE_DISCUSSIONS = Gauge(
+    "roundtable_active_discussions",
+    "Discussions currently running",
+    multiprocess_mode="livesum"
+)
+QUEUED_DISCUSSIONS = Gauge(
+    "roundtable_queued_discussions",
+    "Discussions waiting for a run slot",
+    multiprocess_mode="livesum"
+)
+TOOL_CALLS = Counter(
+    "roundtable_tool_calls_total",
+    "Tool calls made by agents, by outcome",
+    ["tool", "status"]
+)
+TOOL_SECONDS = Histogram(
+    "roundtable_tool_seconds",
+    "Latency of tool calls that ran",
+    ["tool"],
+    buckets=TOOL_LATENCY_BUCKETS
+)
+DB_COMMIT_SECONDS = Histogram(
+    "roundtable_db_commit_seconds",
+    "Latency of database commits, including the flush",
+    buckets=DB_LATENCY_BUCKETS
+)
+
+_models: Set[str] = set()
+_models_lock = threading.Lock()
+
+
+def provider_label(provider: Optional[str]) -> str:
+    return provider if provider in PROVIDERS else OTHER
+
+
+def model_label(model: Optional[str]) -> str:
+    """Pass through the first ``MAX_MODELS`` distinct models; later ones are reported as ``other``"""
+    if not model:
+        return OTHER
+    if model in _models:
+        return model
+    with _models_lock:
+        if len(_models) < MAX_MODELS:
+            _models.add(model)
+            return model
+    return OTHER
+
+
+def observe_llm_completion(
+    provider: Optional[str],
+    model: Optional[str],
+    seconds: float,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0
+) -> None:
+    labels = (provider_label(provider), model_label(model))
+    LLM_REQUEST_SECONDS.labels(*labels).observe(seconds)
+    if prompt_tokens:
+        LLM_TOKENS.labels(*labels, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(*labels, "completion").inc(completion_tokens)
+
+
+def observe_tool_call(tool: str, status: str, seconds: Optional[float] = None) -> None:
+    """Count a tool call; ``seconds`` is left out for calls answered from the cache"""
+    TOOL_CALLS.labels(tool, status).inc()
+    if seconds is not None:
+        TOOL_SECONDS.labels(tool).observe(seconds)
+
+
+def observe_discussion_finished(status: str) -> None:
+    DISCUSSIONS.labels(status if status in DISCUSSION_STATUSES else OTHER).inc()
+
+
+def instrument_db_commits(session_factory) -> None:
+    """Time every commit made by sessions from ``session_factory``"""
+    from sqlalchemy import event
+
+    @event.listens_for(session_factory, "before_commit")
+    def _before_commit(session):
+        session.info["commit_started"] = time.perf_counter()
+
+    @event.listens_for(session_factory, "after_commit")
+    def _after_commit(session):
+        started = session.info.pop("commit_started", None)
+        if started is not None:
+            DB_COMMIT_SECONDS.observe(time.perf_counter() - started)
+
+    @event.listens_for(session_factory, "after_rollback")
+    def _after_rollback(session):
+        session.info.pop("commit_started", None)
+
+
+def render_metrics() -> bytes:
+    """Current samples in the Prometheus text format, merged across workers"""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_worker_exited(pid: Optional[int] = None) -> None:
+    """Drop this worker's live gauges from the merged view"""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid or os.getpid())
+
@@ -0,0 +1,280 @@
+# app/utils/ownership.py
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Set
+from uuid import UUID
+
+from sqlalchemy import DateTime, func, or_, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+from ..config import get_settings
+from ..db.session import SessionLocal, engine as default_engine
+from ..models.round_table import RoundTable
+from .discussion_registry import get_discussion_registry
+from .pg_listener import PgListener, get_pg_listener
+
+logger = logging.getLogger(__name__)
+
+# Stop reason of a discussion whose lease another worker took over
+LEASE_LOST = "lease lost"
+
+
+@lru_cache()
+def get_worker_id() -> str:
+    """Identity of this worker process in leases and control messages"""
+    return get_settings().WORKER_ID or f"{socket.gethostname()}:{os.getpid()}"
+
+
+class lease_cutoff(FunctionElement):
+    """The database's clock less ``ttl`` seconds; heartbeats older than this no longer hold a lease.
+
+    Heartbeats are written and compared on the database's clock, so workers
+    whose own clocks drift apart still agree on which leases lapsed.
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(lease_cutoff)
+def _lease_cutoff(element, compiler, **kw):
+    return f"now() - {compiler.process(element.clauses, **kw)} * interval '1 second'"
+
+
+@compiles(lease_cutoff, "sqlite")
+def _lease_cutoff_sqlite(element, compiler, **kw):
+    return f"datetime('now', '-' || {compiler.process(element.clauses, **kw)} || ' seconds')"
+
+
+def database_now(db: Session) -> datetime:
+    """The time on the database's clock, which leases are measured by"""
+    return db.execute(select(func.now())).scalar_one()
+
+
+class LeaseManager:
+    """Leases that make one worker the owner of each running discussion.
+
+    A worker takes a round table's lease with a conditional UPDATE that only
+    succeeds if nobody holds it or the holder's heartbeat is older than
+    ``DISCUSSION_LEASE_TTL``, so two workers never drive the same
+    discussion. A background task renews the held leases every
+    ``DISCUSSION_HEARTBEAT_INTERVAL``. If a lease turns out to have been
+    taken over, because this worker stalled past the TTL, its discussion
+    stops at the next turn without writing its state.
+    """
+
+    def __init__(self, session_factory=None, settings=None, worker_id: Optional[str] = None):
+        self.settings = settings or get_settings()
+        self.session_factory = session_factory or SessionLocal
+        self.worker_id = worker_id or get_worker_id()
+        self._held: Set[UUID] = set()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    def _cutoff(self) -> lease_cutoff:
+        """Heartbeats older than this no longer hold a lease"""
+        return lease_cutoff(self.settings.DISCUSSION_LEASE_TTL)
+
+    def acquire(self, round_table_id: UUID) -> bool:
+        """Take the lease on a round table; False if another worker holds it"""
+        with self.session_factory() as db:
+            taken = (
+                db.query(RoundTable)
+                .filter(
+                    RoundTable.id == round_table_id,
+                    or_(
+                        RoundTable.owner_id.is_(None),
+                        RoundTable.owner_id == self.worker_id,
+                        RoundTable.heartbeat_at.is_(None),
+                        RoundTable.heartbeat_at < self._cutoff()
+                    )
+                )
+                .update({"owner_id": self.worker_id, "heartbeat_at": func.now()}, synchronize_session=False)
+            )
+            db.commit()
+        if not taken:
+            return False
+        self._held.add(round_table_id)
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat_loop())
+        return True
+
+    def release(self, round_table_id: UUID) -> None:
+        self._held.discard(round_table_id)
+        with self.session_factory() as db:
+            db.query(RoundTable).filter(
+                RoundTable.id == round_table_id,
+                RoundTable.owner_id == self.worker_id
+            ).update({"owner_id": None, "heartbeat_at": None}, synchronize_session=False)
+            db.commit()
+
+    def owner_of(self, round_table_id: UUID) -> Optional[str]:
+        """The worker holding a live lease on the round table"""
+        with self.session_factory() as db:
+            return (
+                db.query(RoundTable.owner_id)
+                .filter(RoundTable.id == round_table_id, RoundTable.heartbeat_at >= self._cutoff())
+                .scalar()
+            )
+
+    def count_remote_leases(self) -> int:
+        """Live leases held by other workers"""
+        with self.session_factory() as db:
+            return (
+                db.query(func.count(RoundTable.id))
+                .filter(
+                    RoundTable.owner_id.is_not(None),
+                    RoundTable.owner_id != self.worker_id,
+                    RoundTable.heartbeat_at >= self._cutoff()
+                )
+                .scalar()
+            )
+
+    def heartbeat(self) -> Set[UUID]:
+        """Renew the held leases; returns the ones another worker has taken over"""
+        held = set(self._held)
+        if not held:
+            return set()
+        with self.session_factory() as db:
+            db.query(RoundTable).filter(
+                RoundTable.id.in_(held),
+                RoundTable.owner_id == self.worker_id
+            ).update({"heartbeat_at": func.now()}, synchronize_session=False)
+            db.commit()
+            kept = {
+                round_table_id for (round_table_id,) in
+                db.query(RoundTable.id).filter(RoundTable.id.in_(held), RoundTable.owner_id == self.worker_id)
+            }
+        # Leases released while this ran are not lost
+        lost = (held - kept) & self._held
+        self._held -= lost
+        return lost
+
+    async def _heartbeat_loop(self) -> None:
+        registry = get_discussion_registry()
+        while self._held:
+            await asyncio.sleep(self.settings.DISCUSSION_HEARTBEAT_INTERVAL)
+            try:
+                lost = await asyncio.to_thread(self.heartbeat)
+            except Exception as e:
+                logger.warning(f"Renewing discussion leases failed: {e!r}")
+                continue
+            for round_table_id in lost:
+                logger.error(f"Discussion {round_table_id} was taken over by another worker; stopping it here")
+                handle = registry.get(round_table_id)
+                if handle is not None:
+                    handle.stop_reason = LEASE_LOST
+
+    async def aclose(self) -> None:
+        """Stop heartbeating and hand back the held leases"""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        for round_table_id in list(self._held):
+            try:
+                self.release(round_table_id)
+            except Exception as e:
+                logger.warning(f"Could not release the lease on discussion {round_table_id}: {e!r}")
+
+
+class ControlBus:
+    """Routes pause and cancel requests to the worker that owns a discussion.
+
+    Messages go over Postgres ``LISTEN``/``NOTIFY`` on ``CONTROL_CHANNEL``,
+    received on the worker's shared listener connection. Every worker acts
+    on the messages addressed to it or to every worker. With any other
+    database there is only ever one worker, so the bus is disabled and
+    ``publish`` returns False.
+    """
+
+    def __init__(self, engine=None, settings=None, registry=None, worker_id: Optional[str] = None, listener=None):
+        self.settings = settings or get_settings()
+        self.engine = engine or default_engine
+        self.registry = registry or get_discussion_registry()
+        self.worker_id = worker_id or get_worker_id()
+        self._listener = listener
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def listener(self) -> PgListener:
+        if self._listener is None:
+            self._listener = get_pg_listener() if self.engine is default_engine else PgListener(self.engine)
+        return self._listener
+
+    @property
+    def enabled(self) -> bool:
+        return self.listener.enabled
+
+    def publish(
+        self,
+        action: str,
+        round_table_id: Optional[UUID] = None,
+        owner: Optional[str] = None,
+        reason: Optional[str] = None
+    ) -> bool:
+        """Send ``action`` (pause or cancel) for one discussion, or all of them, to its owner or every worker"""
+        if not self.enabled:
+            return False
+        payload = json.dumps({
+            "action": action,
+            "round_table_id": str(round_table_id) if round_table_id else None,
+            "owner": owner,
+            "reason": reason,
+            "sender": self.worker_id
+        })
+        with self.engine.begin() as connection:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.settings.CONTROL_CHANNEL, "payload": payload}
+            )
+        return True
+
+    async def start(self) -> None:
+        """Start listening for control messages"""
+        if self.enabled:
+            await self.listener.listen(self.settings.CONTROL_CHANNEL, self.dispatch)
+            logger.info(f"Worker {self.worker_id} listening for discussion control messages")
+
+    def dispatch(self, payload: str) -> Optional[asyncio.Task]:
+        """Act on a control message if it concerns this worker"""
+        message = json.loads(payload)
+        if message.get("owner") not in (None, self.worker_id) or message.get("sender") == self.worker_id:
+            return None
+        action = message["action"]
+        reason = message.get("reason") or ("paused" if action == "pause" else "cancelled")
+        timeout = self.settings.DISCUSSION_STOP_TIMEOUT
+        cancel = action == "cancel"
+        if message.get("round_table_id"):
+            round_table_id = UUID(message["round_table_id"])
+            if not self.registry.is_running(round_table_id):
+                return None
+            logger.info(f"Stopping discussion {round_table_id} for worker {message.get('sender')}: {reason}")
+            stop = self.registry.request_stop(round_table_id, reason, timeout, cancel=cancel)
+        else:
+            stop = self.registry.stop_all(reason, timeout, cancel=cancel)
+        task = asyncio.get_running_loop().create_task(stop)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def aclose(self) -> None:
+        if self.enabled:
+            self.listener.unlisten(self.settings.CONTROL_CHANNEL, self.dispatch)
+
+
+@lru_cache()
+def get_lease_manager() -> LeaseManager:
+    """Get or create the process-wide lease manager"""
+    return LeaseManager()
+
+
+@lru_cache()
+def get_control_bus() -> ControlBus:
+    """Get or create the process-wide control bus"""
+    return ControlBus()
@@ -0,0 +1,135 @@
+# app/utils/pg_listener.py
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from ..db.session import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY = 5.0
+
+
+class PgListener:
+    """The one connection a worker ``LISTEN``s on, shared by every channel it follows.
+
+    The connection is read from the event loop and each notification goes
+    to the handlers of its channel. If the connection drops, it is
+    re-established in the background and every channel listened to again.
+    Only Postgres through psycopg2 supports this; with anything else
+    ``enabled`` is False and nothing is ever received.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine or default_engine
+        self._handlers: Dict[str, List[Callable[[str], None]]] = {}
+        self._connection = None
+        self._reconnect: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        # Reading notifications relies on psycopg2's poll()/notifies
+        return self.engine.dialect.name == "postgresql" and self.engine.dialect.driver == "psycopg2"
+
+    async def listen(self, channel: str, handler: Callable[[str], None]) -> None:
+        """Call ``handler`` with the payload of every notification on ``channel``"""
+        if not self.enabled:
+            return
+        self._handlers.setdefault(channel, []).append(handler)
+        if self._connection is None:
+            await self.start()
+            return
+        try:
+            self._execute(f'LISTEN "{channel}"')
+        except Exception as e:
+            logger.warning(f"Could not listen on {channel}: {e!r}")
+            self._disconnect()
+            self._schedule_reconnect()
+
+    def unlisten(self, channel: str, handler: Callable[[str], None]) -> None:
+        handlers = self._handlers.get(channel, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if handlers or self._connection is None:
+            return
+        self._handlers.pop(channel, None)
+        try:
+            self._execute(f'UNLISTEN "{channel}"')
+        except Exception:
+            pass
+
+    def _execute(self, statement: str) -> None:
+        with self._connection.cursor() as cursor:
+            cursor.execute(statement)
+
+    async def start(self) -> None:
+        """Connect and listen on every channel; retried in the background if the database is unreachable"""
+        if not self.enabled or self._connection is not None:
+            return
+        try:
+            pooled = self.engine.raw_connection()
+            # The listening connection lives as long as the worker, outside the pool
+            pooled.detach()
+            connection = pooled.dbapi_connection
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                for channel in self._handlers:
+                    cursor.execute(f'LISTEN "{channel}"')
+        except Exception as e:
+            logger.warning(f"Could not listen for notifications: {e!r}")
+            self._schedule_reconnect()
+            return
+        self._connection = connection
+        asyncio.get_running_loop().add_reader(connection.fileno(), self._on_readable)
+        logger.info(f"Listening for notifications on {', '.join(self._handlers) or 'no channels yet'}")
+
+    def _schedule_reconnect(self) -> None:
+        async def reconnect():
+            await asyncio.sleep(RECONNECT_DELAY)
+            await self.start()
+
+        if self._reconnect is None or self._reconnect.done():
+            self._reconnect = asyncio.get_running_loop().create_task(reconnect())
+
+    def _disconnect(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._connection.fileno())
+        except Exception:
+            pass
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+    def _on_readable(self) -> None:
+        try:
+            self._connection.poll()
+        except Exception as e:
+            logger.warning(f"Lost the notification connection: {e!r}")
+            self._disconnect()
+            self._schedule_reconnect()
+            return
+        while self._connection is not None and self._connection.notifies:
+            notification = self._connection.notifies.pop(0)
+            for handler in list(self._handlers.get(notification.channel, [])):
+                try:
+                    handler(notification.payload)
+                except Exception:
+                    logger.exception(f"Bad notification on {notification.channel}: {notification.payload!r}")
+
+    async def aclose(self) -> None:
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            self._reconnect = None
+        self._disconnect()
+
+
+@lru_cache()
+def get_pg_listener() -> PgListener:
+    """Get or create the process-wide notification listener"""
+    return PgListener()
@@ -0,0 +1,18 @@
+# app/utils/redis_manager.py
+
+from functools import lru_cache
+
+from ..config import get_settings
+
+
+@lru_cache()
+def get_redis_client():
+    """Process-wide Redis client for ``REDIS_URL``; redis is only imported when it is used"""
+    import redis
+    return redis.Redis.from_url(get_settings().REDIS_URL)
+
+
+def create_async_redis_client():
+    """A fresh asyncio Redis client for ``REDIS_URL``, e.g. for a pub/sub subscription"""
+    import redis.asyncio
+    return redis.asyncio.Redis.from_url(get_settings().REDIS_URL)
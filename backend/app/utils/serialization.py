@@ -0,0 +1,79 @@
+# app/utils/serialization.py
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from uuid import UUID
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from typing_extensions import NotRequired, TypedDict  # pydantic needs this one before Python 3.12
+
+
+class MessageRow(TypedDict):
+    """Wire shape of ``MessageInDB``"""
+    id: UUID
+    content: str
+    message_type: str
+    agent_id: UUID
+    round_table_id: UUID
+    created_at: Optional[datetime]
+    prompt_tokens: Optional[int]
+    completion_tokens: Optional[int]
+    cost: Optional[float]
+    model: Optional[str]
+    provider: Optional[str]
+    ttft_ms: Optional[float]
+    latency_ms: Optional[float]
+    sequence: NotRequired[Optional[int]]  # Missing from transcripts archived before messages were numbered
+
+
+class RoundTableRow(TypedDict):
+    """Wire shape of ``RoundTableInDB``"""
+    id: UUID
+    title: str
+    context: str
+    status: Optional[str]
+    settings: Dict[str, Any]
+    created_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    archived_at: Optional[datetime]
+    parent_id: Optional[UUID]
+    fork_point: Optional[int]
+    messages: List[MessageRow]
+    queue_position: Optional[int]
+
+
+# Column order of the tuples the fast paths select
+MESSAGE_COLUMNS = (
+    "id", "content", "message_type", "agent_id", "round_table_id", "created_at",
+    "prompt_tokens", "completion_tokens", "cost", "model", "provider", "ttft_ms", "latency_ms", "sequence"
+)
+ROUND_TABLE_COLUMNS = (
+    "id", "title", "context", "status", "settings", "created_at", "completed_at", "archived_at",
+    "parent_id", "fork_point"
+)
+
+# Built once at import. Serializing TypedDicts skips model construction and
+# validation entirely; pydantic-core encodes UUIDs and datetimes to JSON bytes
+# in Rust, without an intermediate jsonable_encoder/json.dumps pass.
+MESSAGE_ADAPTER = TypeAdapter(MessageRow)
+MESSAGE_LIST_ADAPTER = TypeAdapter(List[MessageRow])
+ROUND_TABLE_LIST_ADAPTER = TypeAdapter(List[RoundTableRow])
+
+
+def rows_to_dicts(rows: Iterable[Sequence[Any]], columns: Sequence[str]) -> List[Dict[str, Any]]:
+    """Turn selected column tuples into dicts keyed by ``columns``"""
+    return [dict(zip(columns, row)) for row in rows]
+
+
+class PreSerializedJSONResponse(Response):
+    """JSON response whose body was already encoded by a TypeAdapter.
+
+    Returning a ``Response`` from a route makes FastAPI skip re-validating
+    and re-encoding against ``response_model``, which still documents the
+    schema in OpenAPI.
+    """
+    media_type = "application/json"
+
+    def __init__(self, content: Any, adapter: TypeAdapter, **kwargs):
+        super().__init__(adapter.dump_json(content), **kwargs)
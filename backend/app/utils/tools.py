@@ -0,0 +1,284 @@
+# app/utils/tools.py
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import importlib
+import inspect
+import json
+import logging
+import multiprocessing
+import threading
+import time
+
+from ..config import get_settings
+from .metrics import observe_tool_call
+from .tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+# Seconds an isolated tool's process may take to start, on top of the call's timeout
+PROCESS_START_TIMEOUT = 30.0
+
+
+class ToolError(Exception):
+    """A tool call that failed; its message is what the model is told"""
+
+
+@dataclass(frozen=True)
+class Tool:
+    name: str
+    function: Callable[..., Any]  # Annotated parameters become the schema the model sees
+    description: str
+    pure: bool = False  # Same arguments, same result: calls are memoized
+    isolated: bool = False  # Run in a child process that is killed on timeout
+    timeout: Optional[float] = None  # Seconds; TOOL_TIMEOUT by default
+
+
+class ToolRegistry:
+    """Tools agents may be given, by name.
+
+    An agent's ``tool_config`` maps the names of the tools it may call to
+    options: ``description`` and ``timeout`` override the tool's own. Code
+    that builds agents directly may pass an ``implementation`` callable
+    instead of naming a registered tool.
+    """
+
+    def __init__(self):
+        self._tools: Dict[str, Tool] = {}
+
+    def register(self, tool: Tool) -> Tool:
+        if tool.name in self._tools and self._tools[tool.name].function is not tool.function:
+            raise ValueError(f"A different tool named {tool.name} is already registered")
+        self._tools[tool.name] = tool
+        return tool
+
+    def get(self, name: str) -> Optional[Tool]:
+        return self._tools.get(name)
+
+    def names(self) -> List[str]:
+        return sorted(self._tools)
+
+    def resolve(self, tool_config: Optional[Dict[str, Any]]) -> List[Tool]:
+        """The tools a ``tool_config`` declares; ValueError if one is unknown or malformed"""
+        tools = []
+        for name, options in (tool_config or {}).items():
+            options = options if options is not None else {}
+            if not isinstance(options, dict):
+                raise ValueError(f"Options of tool {name} must be an object")
+            implementation = options.get("implementation")
+            if callable(implementation):
+                tool = Tool(name=name, function=implementation, description=inspect.getdoc(implementation) or name)
+            else:
+                tool = self.get(name)
+                if tool is None:
+                    raise ValueError(f"Unknown tool {name}; available tools: {', '.join(self.names()) or 'none'}")
+            overrides = {key: options[key] for key in ("description", "timeout") if options.get(key) is not None}
+            if "timeout" in overrides and not (isinstance(overrides["timeout"], (int, float)) and overrides["timeout"] > 0):
+                raise ValueError(f"Timeout of tool {name} must be a positive number of seconds")
+            tools.append(replace(tool, **overrides))
+        return tools
+
+
+_registry = ToolRegistry()
+
+
+def tool(
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    pure: bool = False,
+    isolated: bool = False,
+    timeout: Optional[float] = None
+) -> Callable:
+    """Register a function as a tool agents can be given in their ``tool_config``"""
+    def decorator(function: Callable) -> Callable:
+        _registry.register(Tool(
+            name=name or function.__name__,
+            function=function,
+            description=description or inspect.getdoc(function) or "",
+            pure=pure,
+            isolated=isolated,
+            timeout=timeout
+        ))
+        return function
+    return decorator
+
+
+@lru_cache()
+def get_tool_registry() -> ToolRegistry:
+    """The process-wide registry, with the built-in tools and those of TOOL_MODULES loaded"""
+    from . import builtin_tools  # noqa: F401 - registers the built-in tools
+
+    for module in get_settings().TOOL_MODULES:
+        importlib.import_module(module)
+    return _registry
+
+
+@lru_cache()
+def _process_context():
+    # A fork of a threaded server could inherit held locks; a fork server starts clean,
+    # with the tool modules imported once so each child starts warm
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__, f"{__package__}.builtin_tools", *get_settings().TOOL_MODULES])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _isolated_main(connection, function: Callable, arguments: Dict[str, Any], memory_bytes: int) -> None:
+    if memory_bytes:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    # Started: the function and its arguments were unpickled
+    connection.send(None)
+    try:
+        connection.send((True, function(**arguments)))
+    except BaseException as e:
+        connection.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+def run_isolated(function: Callable, arguments: Dict[str, Any], timeout: float, memory_bytes: int = 0) -> Any:
+    """Call ``function`` in a child process of its own, killing it if the call outlives ``timeout``"""
+    context = _process_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_isolated_main, args=(sender, function, arguments, memory_bytes), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(PROCESS_START_TIMEOUT):
+            raise ToolError("the tool's process did not start")
+        receiver.recv()
+        if not receiver.poll(timeout):
+            raise asyncio.TimeoutError()
+        ok, value = receiver.recv()
+    except EOFError:
+        raise ToolError("the tool's process exited without a result")
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+    if not ok:
+        raise ToolError(value)
+    return value
+
+
+class ToolExecutor:
+    """Runs agents' tool calls off the event loop, on bounded pools.
+
+    Tools run on a thread pool of ``TOOL_THREADS``; coroutine tools run on
+    the loop itself. A thread cannot be stopped, so a call that times out
+    keeps its thread until it returns: tools that may hang or burn CPU
+    should be ``isolated``, which runs each call in a child process with an
+    address-space limit that is killed when the call times out, at most
+    ``TOOL_PROCESSES`` at once. Results of pure tools are memoized. The
+    calls of one reply run concurrently, and failures are reported to the
+    model as text rather than raised into the discussion.
+    """
+
+    def __init__(self, settings=None):
+        self.settings = settings or get_settings()
+        self.tracer = get_tracer()
+        self._threads = ThreadPoolExecutor(max_workers=self.settings.TOOL_THREADS, thread_name_prefix="tool")
+        # Each slot waits on one child process
+        self._processes = ThreadPoolExecutor(
+            max_workers=self.settings.TOOL_PROCESSES,
+            thread_name_prefix="tool-process"
+        )
+        self._cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _cached(self, key: Tuple[str, str]) -> Optional[str]:
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+            return result
+
+    def _remember(self, key: Tuple[str, str], result: str) -> None:
+        with self._cache_lock:
+            self._cache[key] = result
+            while len(self._cache) > self.settings.TOOL_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    async def _invoke(self, tool: Tool, arguments: Dict[str, Any], timeout: float) -> Any:
+        loop = asyncio.get_running_loop()
+        if tool.isolated:
+            # The process is killed at the timeout, so its slot is freed with it
+            return await loop.run_in_executor(
+                self._processes,
+                partial(run_isolated, tool.function, arguments, timeout, self.settings.TOOL_MEMORY_MB * 1024 * 1024)
+            )
+        if inspect.iscoroutinefunction(tool.function):
+            return await asyncio.wait_for(tool.function(**arguments), timeout)
+        return await asyncio.wait_for(loop.run_in_executor(self._threads, partial(tool.function, **arguments)), timeout)
+
+    async def call(self, tool: Tool, arguments: Any) -> str:
+        """The result of one call, as the text the model is shown"""
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments or "{}")
+            except ValueError as e:
+                observe_tool_call(tool.name, "error")
+                return f"Error: the arguments of {tool.name} are not valid JSON: {e}"
+        if not isinstance(arguments, dict):
+            observe_tool_call(tool.name, "error")
+            return f"Error: the arguments of {tool.name} must be an object"
+
+        key = (tool.name, json.dumps(arguments, sort_keys=True, default=str)) if tool.pure else None
+        if key is not None:
+            cached = self._cached(key)
+            if cached is not None:
+                observe_tool_call(tool.name, "cached")
+                return cached
+
+        timeout = tool.timeout or self.settings.TOOL_TIMEOUT
+        started = time.monotonic()
+        with self.tracer.span("tool.call", tool=tool.name, isolated=tool.isolated) as span:
+            try:
+                result = await self._invoke(tool, arguments, timeout)
+                status = "ok"
+                text = result if isinstance(result, str) else json.dumps(result, default=str)
+            except asyncio.TimeoutError:
+                status = "timeout"
+                text = f"Error: {tool.name} did not finish within {timeout:g} seconds"
+            except Exception as e:
+                status = "error"
+                text = f"Error: {tool.name} failed: {e}"
+                logger.warning(f"Tool {tool.name} failed: {e!r}")
+            span.set_attribute("status", status)
+        observe_tool_call(tool.name, status, time.monotonic() - started)
+
+        limit = self.settings.TOOL_MAX_RESULT_CHARS
+        if len(text) > limit:
+            text = text[:limit] + "... (truncated)"
+        if key is not None and status == "ok":
+            self._remember(key, text)
+        return text
+
+    async def call_all(self, tools: Dict[str, Tool], tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run the tool calls of one reply concurrently; a tool message per call, in order"""
+        async def run(tool_call: Dict[str, Any]) -> Dict[str, Any]:
+            function = tool_call.get("function") or {}
+            tool = tools.get(function.get("name"))
+            if tool is None:
+                content = f"Error: there is no tool named {function.get('name')}"
+            else:
+                content = await self.call(tool, function.get("arguments"))
+            return {"role": "tool", "tool_call_id": tool_call.get("id"), "content": content}
+
+        return list(await asyncio.gather(*(run(tool_call) for tool_call in tool_calls)))
+
+    def shutdown(self) -> None:
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        self._processes.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache()
+def get_tool_executor() -> ToolExecutor:
+    """Get or create the process-wide tool executor"""
+    return ToolExecutor()
@@ -0,0 +1,290 @@
+# app/utils/tracing.py
+
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Attributes that child spans copy from their parent, so every span of a
+# discussion can be filtered by round table without threading it through
+PROPAGATED_ATTRIBUTES = ("round_table_id",)
+
+
+class Span:
+    """A timed operation with attributes, exported when it ends"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def sampled(self) -> bool:
+        return True
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class _UnsampledSpan:
+    """Stand-in for spans of traces that were not sampled; records nothing"""
+    sampled = False
+    attributes: Dict[str, Any] = {}
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+
+UNSAMPLED_SPAN = _UnsampledSpan()
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class SpanExporter:
+    """Ships finished spans somewhere; called from the exporter thread"""
+
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class JsonLinesExporter(SpanExporter):
+    """Append one JSON object per span to a file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+class OTLPHttpExporter(SpanExporter):
+    """POST spans to an OTLP/HTTP collector using the JSON encoding"""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 10.0):
+        import httpx
+
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._client = httpx.Client(timeout=timeout)
+
+    @staticmethod
+    def _value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _span(self, span: Span) -> Dict[str, Any]:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [
+                {"key": key, "value": self._value(value)}
+                for key, value in span.attributes.items()
+                if value is not None
+            ],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1}
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        return otlp_span
+
+    def export(self, spans: List[Span]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": self.service_name}}
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": "roundtable"},
+                    "spans": [self._span(span) for span in spans]
+                }]
+            }]
+        }
+        response = self._client.post(self.endpoint, json=payload)
+        response.raise_for_status()
+
+    def shutdown(self) -> None:
+        self._client.close()
+
+
+class Tracer:
+    """Creates spans and exports them in batches off the request path.
+
+    Sampling is decided once per trace at its root span; spans of an
+    unsampled trace cost a context lookup and nothing else. Finished spans
+    are queued and written by a background thread, so exporting never
+    blocks the event loop. When the queue is full spans are dropped.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[SpanExporter] = None,
+        sample_rate: float = 1.0,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 2.0
+    ):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=max_queue)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None and self.sample_rate > 0
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """Time the enclosed block as a child of the current span"""
+        parent = _current_span.get()
+        if parent is UNSAMPLED_SPAN or not self.enabled:
+            yield UNSAMPLED_SPAN
+            return
+        if parent is None:
+            if random.random() >= self.sample_rate:
+                token = _current_span.set(UNSAMPLED_SPAN)
+                try:
+                    yield UNSAMPLED_SPAN
+                finally:
+                    _current_span.reset(token)
+                return
+            trace_id, parent_id = os.urandom(16).hex(), None
+        else:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+            for key in PROPAGATED_ATTRIBUTES:
+                if key in parent.attributes and key not in attributes:
+                    attributes[key] = parent.attributes[key]
+
+        span = Span(name, trace_id, parent_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self._enqueue(span)
+
+    def _enqueue(self, span: Span) -> None:
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stopping = True
+                    break
+                batch.append(span)
+            if batch:
+                try:
+                    self.exporter.export(batch)
+                except Exception as e:
+                    logger.warning(f"Failed to export {len(batch)} spans: {e}")
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Flush queued spans and stop the exporter thread"""
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._worker.join(timeout)
+        self._worker = None
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+def current_span() -> Any:
+    """The span the caller is running in, or a no-op span"""
+    return _current_span.get() or UNSAMPLED_SPAN
+
+
+@lru_cache()
+def get_tracer() -> Tracer:
+    """Get or create the process-wide tracer"""
+    settings = get_settings()
+    exporter: Optional[SpanExporter] = None
+    if settings.TRACING_EXPORTER == "jsonl":
+        exporter = JsonLinesExporter(settings.TRACING_JSONL_PATH)
+    elif settings.TRACING_EXPORTER == "otlp":
+        exporter = OTLPHttpExporter(settings.TRACING_OTLP_ENDPOINT, settings.TRACING_SERVICE_NAME)
+    elif settings.TRACING_EXPORTER != "none":
+        logger.warning(f"Unknown TRACING_EXPORTER {settings.TRACING_EXPORTER!r}; tracing is disabled")
+    return Tracer(exporter, sample_rate=settings.TRACING_SAMPLE_RATE)
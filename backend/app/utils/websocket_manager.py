@@ -0,0 +1,62 @@
+# app/utils/websocket_manager.py
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Dict, Optional, Set
+from uuid import UUID
+
+from ..config import get_settings
+from .serialization import MessageRow
+
+logger = logging.getLogger(__name__)
+
+
+class WebSocketManager:
+    """The subscribers on this worker to new messages, by round table.
+
+    Each subscriber gets its own bounded queue of message rows. A
+    subscriber that falls ``SUBSCRIBER_BACKLOG`` messages behind is sent
+    ``None`` in place of its backlog, and is expected to disconnect and
+    catch up from the last sequence it saw.
+    """
+
+    def __init__(self, max_backlog: Optional[int] = None):
+        self.max_backlog = max_backlog or get_settings().SUBSCRIBER_BACKLOG
+        self._subscribers: Dict[UUID, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, round_table_id: UUID) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.max_backlog)
+        self._subscribers.setdefault(round_table_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, round_table_id: UUID, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(round_table_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[round_table_id]
+
+    def has_subscribers(self, round_table_id: UUID) -> bool:
+        return round_table_id in self._subscribers
+
+    def count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, round_table_id: UUID, message: MessageRow) -> None:
+        """Hand a message to every subscriber of its round table"""
+        for queue in list(self._subscribers.get(round_table_id, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning(f"A subscriber to round table {round_table_id} fell behind; dropping its backlog")
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+
+@lru_cache()
+def get_websocket_manager() -> WebSocketManager:
+    """Get or create the process-wide subscriber registry"""
+    return WebSocketManager()
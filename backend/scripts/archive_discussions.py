@@ -0,0 +1,45 @@
+"""Archive the transcripts of old completed discussions into compressed blobs.
+
+Meant to run from cron. Works in short batches that skip rows other jobs
+have locked, so it is safe to run alongside the API and alongside itself.
+
+Usage:
+    python scripts/archive_discussions.py [--older-than-days 30] [--batch-size 20] [--max-batches N]
+"""
+import argparse
+import logging
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--older-than-days", type=int, help="Defaults to ARCHIVE_AFTER_DAYS")
+    parser.add_argument("--batch-size", type=int, help="Round tables per transaction; defaults to ARCHIVE_BATCH_SIZE")
+    parser.add_argument("--max-batches", type=int, help="Stop after this many batches")
+    parser.add_argument("--pause", type=float, help="Seconds between batches; defaults to ARCHIVE_BATCH_PAUSE")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    from app.db.session import SessionLocal
+    from app.services.archive_service import ArchiveService
+
+    db = SessionLocal()
+    try:
+        archived = ArchiveService(db).run(
+            older_than_days=args.older_than_days,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+            pause=args.pause
+        )
+    finally:
+        db.close()
+    print(f"Archived {archived} round tables", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Compare the fast serialization path for transcripts and listings to the model path.
+
+Seeds a throwaway SQLite database, then times both ways of producing the
+JSON body for ``GET /messages/round-table/{id}`` and ``GET /round-tables/``:
+
+- model: ORM objects -> ``model_validate`` per row -> response_model
+  validation -> ``jsonable_encoder``-style dump -> ``json.dumps``
+  (what FastAPI does for a route returning Pydantic models)
+- fast: column tuples -> TypedDict rows -> precompiled ``TypeAdapter.dump_json``
+
+Usage:
+    python scripts/bench_serialization.py [--messages 10000] [--round-tables 20] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def best_of(repeat: int, fn: Callable[[], bytes]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10000, help="Messages in the large transcript")
+    parser.add_argument("--round-tables", type=int, default=20, help="Round tables in the listing")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path; the best one is reported")
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.sqlite")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("AZURE_OPENAI_API_KEY", "bench")
+    os.environ.setdefault("KAMIWAZA_API_URI", "http://localhost")
+
+    from pydantic import TypeAdapter
+    from app.db.session import Base, SessionLocal, engine
+    from app.models.agent import Agent
+    from app.models.message import Message
+    from app.models.round_table import RoundTable
+    from app.schemas.message import MessageInDB
+    from app.schemas.round_table import RoundTableInDB
+    from app.services.round_table_service import RoundTableService
+    from app.utils.serialization import MESSAGE_LIST_ADAPTER, ROUND_TABLE_LIST_ADAPTER
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    agent = Agent(
+        name="bench_agent", title="Bench", background="Benchmark agent",
+        agent_type="assistant", llm_config={}
+    )
+    db.add(agent)
+    round_tables = [
+        RoundTable(title=f"Bench {i}", context="Benchmark", status="completed", settings={})
+        for i in range(args.round_tables)
+    ]
+    db.add_all(round_tables)
+    db.flush()
+
+    started_at = datetime.utcnow()
+    target = round_tables[0]
+    per_table = max(1, args.messages // (10 * args.round_tables))
+    counts = [args.messages] + [per_table] * (args.round_tables - 1)
+    for round_table, count in zip(round_tables, counts):
+        db.bulk_save_objects([
+            Message(
+                id=uuid.uuid4(), round_table_id=round_table.id, agent_id=agent.id,
+                content=f"Message {n} " + "lorem ipsum dolor sit amet " * 8,
+                message_type="discussion", created_at=started_at + timedelta(seconds=n)
+            )
+            for n in range(count)
+        ])
+    db.commit()
+
+    service = RoundTableService(db)
+    message_models = TypeAdapter(List[MessageInDB])
+    round_table_models = TypeAdapter(List[RoundTableInDB])
+
+    def encode(adapter: TypeAdapter, content) -> bytes:
+        # FastAPI validates against response_model, dumps to JSON-able Python, then json.dumps
+        validated = adapter.validate_python(content, from_attributes=True)
+        return json.dumps(
+            adapter.dump_python(validated, mode="json"),
+            ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def model_transcript() -> bytes:
+        db.expire_all()
+        return encode(message_models, service.get_discussion_history(target.id))
+
+    def fast_transcript() -> bytes:
+        db.expire_all()
+        return MESSAGE_LIST_ADAPTER.dump_json(service.get_discussion_history_rows(target.id))
+
+    def model_listing() -> bytes:
+        db.expire_all()
+        return encode(round_table_models, asyncio.run(service.get_all_round_tables()))
+
+    def fast_listing() -> bytes:
+        db.expire_all()
+        return ROUND_TABLE_LIST_ADAPTER.dump_json(service.get_all_round_table_rows())
+
+    # Both paths must produce the same document
+    assert json.loads(model_transcript()) == json.loads(fast_transcript())
+
+    total_messages = sum(counts)
+    print(f"transcript: {args.messages} messages; listing: {args.round_tables} round tables, {total_messages} messages")
+    print(f"{'endpoint':<12} {'model (ms)':>12} {'fast (ms)':>12} {'speed-up':>10}")
+    for name, model_path, fast_path in (
+        ("transcript", model_transcript, fast_transcript),
+        ("listing", model_listing, fast_listing),
+    ):
+        model_time = best_of(args.repeat, model_path)
+        fast_time = best_of(args.repeat, fast_path)
+        print(f"{name:<12} {model_time * 1000:>12.1f} {fast_time * 1000:>12.1f} {model_time / fast_time:>9.1f}x")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
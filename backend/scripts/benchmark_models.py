@@ -0,0 +1,79 @@
+"""Benchmark the throughput of deployed Kamiwaza models.
+
+Sends the same short chat completion to every instance of each deployed
+model at a fixed concurrency and prints TTFT, latency percentiles,
+tokens/sec and error rate. Results are stored and show up in
+``GET /api/v1/kamiwaza/models``. With ``--url`` it probes one
+OpenAI-compatible endpoint directly (for example ``scripts/kamiwaza_stub.py``)
+without discovery and without storing anything.
+
+Usage:
+    python scripts/benchmark_models.py [--model NAME ...] [--concurrency 4] [--requests 16] [--max-tokens 64]
+    python scripts/benchmark_models.py --url http://localhost:7778/v1 [--concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+async def probe_url(args) -> list:
+    import httpx
+
+    from app.services.benchmark_service import run_probe
+
+    async with httpx.AsyncClient(verify=False) as client:
+        stats = await run_probe(
+            client,
+            args.url,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            max_tokens=args.max_tokens
+        )
+    return [{"model_name": ", ".join(args.url), **stats}]
+
+
+async def benchmark_deployments(args) -> list:
+    from app.db.session import SessionLocal
+    from app.schemas.benchmark import BenchmarkRequest
+    from app.services.benchmark_service import BenchmarkService
+    from app.services.kamiwaza_service import shutdown_kamiwaza_service
+
+    request = BenchmarkRequest(
+        models=args.model,
+        concurrency=args.concurrency,
+        requests=args.requests,
+        max_tokens=args.max_tokens
+    )
+    db = SessionLocal()
+    try:
+        results = await BenchmarkService(db).run(request)
+    finally:
+        db.close()
+        await shutdown_kamiwaza_service()
+    return [result.model_dump(mode="json") for result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", action="append", help="Deployed model to benchmark; repeatable, defaults to all")
+    parser.add_argument("--url", action="append", help="Probe this OpenAI-compatible base URL instead; repeatable")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--max-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    results = asyncio.run(probe_url(args) if args.url else benchmark_deployments(args))
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
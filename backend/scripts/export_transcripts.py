@@ -0,0 +1,64 @@
+"""Export transcripts as NDJSON, an Arrow IPC stream or Parquet.
+
+Streams straight from the database configured in the environment (``.env``)
+without going through the API. Memory stays flat for exports of any size.
+
+Usage:
+    python scripts/export_transcripts.py --format parquet --output transcripts.parquet \\
+        [--status completed] [--date-from 2025-01-01] [--date-to 2025-02-01] [--batch-size 2000]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from uuid import UUID
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def main():
+    from app.services.export_service import EXPORT_BATCH_SIZE, EXPORT_FORMATS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--output", "-o", help="File to write; defaults to stdout")
+    parser.add_argument("--status", help="Only round tables with this status")
+    parser.add_argument("--date-from", type=datetime.fromisoformat, help="Round tables created at or after")
+    parser.add_argument("--date-to", type=datetime.fromisoformat, help="Round tables created before")
+    parser.add_argument("--round-table-id", action="append", dest="round_table_ids", type=UUID, help="Repeatable")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    from fastapi import HTTPException
+    from app.db.session import SessionLocal
+    from app.services.export_service import ExportService
+
+    db = SessionLocal()
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    started = time.perf_counter()
+    written = 0
+    try:
+        chunks = ExportService(db).stream(
+            args.format,
+            batch_size=args.batch_size,
+            status=args.status,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            round_table_ids=args.round_table_ids
+        )
+        for chunk in chunks:
+            output.write(chunk)
+            written += len(chunk)
+    except HTTPException as e:
+        raise SystemExit(e.detail)
+    finally:
+        if args.output:
+            output.close()
+        db.close()
+    print(f"Wrote {written / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""A stand-in Kamiwaza deployment for trying the benchmark without GPUs.
+
+Serves one deployed model: ``GET /api/serving/deployments`` lists it and
+``POST /v1/chat/completions`` streams a canned answer with a configurable
+time to first token and token rate, failing a share of requests on demand.
+
+Usage:
+    python scripts/kamiwaza_stub.py [--port 7778] [--ttft 0.2] [--tokens-per-second 50] [--error-rate 0]
+    python scripts/benchmark_models.py --url http://localhost:7778/v1
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = "Currency swings can erase margins . Local rivals may undercut prices . Regulation can delay launch .".split()
+
+
+def create_app(port: int, ttft: float, tokens_per_second: float, error_rate: float) -> FastAPI:
+    app = FastAPI(title="Kamiwaza stub")
+
+    @app.get("/api/serving/deployments")
+    async def deployments():
+        return [{
+            "m_name": "stub-model",
+            "status": "DEPLOYED",
+            "lb_port": port,
+            "instances": [{"host_name": "localhost", "listen_port": port, "status": "DEPLOYED"}]
+        }]
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "model", "object": "model"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if random.random() < error_rate:
+            return JSONResponse({"error": {"message": "stub failure"}}, status_code=503)
+        tokens = WORDS[:body.get("max_tokens", 64)]
+
+        async def stream():
+            created = int(time.time())
+            await asyncio.sleep(ttft)
+            for n, word in enumerate(tokens):
+                if n:
+                    await asyncio.sleep(1 / tokens_per_second)
+                chunk = {"object": "chat.completion.chunk", "created": created, "model": "model",
+                         "choices": [{"index": 0, "delta": {"content": word + " "}}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            usage = {"prompt_tokens": 30, "completion_tokens": len(tokens), "total_tokens": 30 + len(tokens)}
+            yield f"data: {json.dumps({'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=7778)
+    parser.add_argument("--ttft", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 503")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(create_app(args.port, args.ttft, args.tokens_per_second, args.error_rate), port=args.port)
+
+
+if __name__ == "__main__":
+    main()
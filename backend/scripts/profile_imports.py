@@ -0,0 +1,64 @@
+"""Report per-module import cost of the backend's start-up.
+
+Runs ``python -X importtime`` in a fresh interpreter so nothing is cached,
+then prints the slowest modules and the cost per top-level package.
+
+Usage:
+    python scripts/profile_imports.py [--module app.main] [--top 25]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile(module: str) -> List[Tuple[str, int, int]]:
+    """Import ``module`` in a subprocess and return (name, self_us, cumulative_us) rows"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        # importtime output goes to stderr as well, so only show the traceback tail
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to list")
+    args = parser.parse_args()
+
+    rows = profile(args.module)
+    total_us = next((cumulative for name, _, cumulative in rows if name == args.module), 0)
+
+    print(f"Importing {args.module} took {total_us / 1000:.1f} ms\n")
+
+    print(f"Slowest {args.top} modules (cumulative ms / self ms):")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:9.1f} {self_us / 1000:9.1f}  {name}")
+
+    packages: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    print("\nCost per top-level package (self ms):")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:9.1f}  {package}")
+
+
+if __name__ == "__main__":
+    main()
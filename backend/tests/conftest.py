@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Importing the models creates the engine; it never connects here
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test-key")
+os.environ.setdefault("KAMIWAZA_API_URI", "http://localhost:7777")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/roundtable-test.db")
+
+import app.db.base  # noqa: E402,F401 - registers every model so the mappers configure
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "models(*models): tables the session_factory and db fixtures create")
+
+
+@pytest.fixture
+def session_factory(request):
+    """Sessions on a private in-memory SQLite database with the tables of ``@pytest.mark.models(...)``.
+
+    A single model goes through ``pytest.mark.models.with_args(Model)``, since a
+    mark called with one class decorates it instead.
+    """
+    marker = request.node.get_closest_marker("models")
+    if marker is None:
+        raise pytest.UsageError("Name the tables to create with @pytest.mark.models(...)")
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    for model in marker.args:
+        model.__table__.create(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        yield session
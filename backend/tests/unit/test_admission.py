@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.round_table_service import RoundTableService
+from app.utils.admission import AdmissionController, AdmissionRejected
+from app.utils.llm_config import LLMConfigRegistry
+
+
+def test_admits_up_to_process_limit():
+    async def scenario():
+        controller = AdmissionController(max_running=2, max_per_provider=5)
+        tickets = [controller.enqueue(uuid4(), {"azure"}, "alice") for _ in range(3)]
+        assert [t.admitted.done() for t in tickets] == [True, True, False]
+        assert controller.position(tickets[2].round_table_id) == 1
+
+        controller.release(tickets[0])
+        assert tickets[2].admitted.done()
+
+    asyncio.run(scenario())
+
+
+def test_provider_limit_does_not_block_other_providers():
+    async def scenario():
+        controller = AdmissionController(max_running=5, max_per_provider=1)
+        first = controller.enqueue(uuid4(), {"azure"}, "alice")
+        blocked = controller.enqueue(uuid4(), {"azure"}, "alice")
+        other = controller.enqueue(uuid4(), {"kamiwaza"}, "alice")
+        assert first.admitted.done()
+        assert not blocked.admitted.done()
+        assert other.admitted.done()
+
+    asyncio.run(scenario())
+
+
+def test_priority_then_fair_share_ordering():
+    async def scenario():
+        controller = AdmissionController(max_running=1, max_per_provider=5)
+        running = controller.enqueue(uuid4(), {"azure"}, "alice")
+        alice = controller.enqueue(uuid4(), {"azure"}, "alice")
+        bob = controller.enqueue(uuid4(), {"azure"}, "bob")
+        urgent = controller.enqueue(uuid4(), {"azure"}, "alice", priority=10)
+
+        # Priority first, then the submitter with fewer running discussions
+        assert controller.position(urgent.round_table_id) == 1
+        assert controller.position(bob.round_table_id) == 2
+        assert controller.position(alice.round_table_id) == 3
+
+        controller.release(running)
+        assert urgent.admitted.done()
+        controller.release(urgent)
+        assert bob.admitted.done()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects():
+    async def scenario():
+        controller = AdmissionController(max_running=1, max_per_provider=1, max_queue=1)
+        controller.enqueue(uuid4(), {"azure"}, "alice")
+        controller.enqueue(uuid4(), {"azure"}, "alice")
+        with pytest.raises(AdmissionRejected):
+            controller.enqueue(uuid4(), {"azure"}, "alice")
+
+    asyncio.run(scenario())
+
+
+def test_agents_on_the_global_config_count_against_the_active_provider(monkeypatch):
+    monkeypatch.setenv("ACTIVE_LLM_CONFIG", "azure")
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "azure-key")
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com/")
+    registry = LLMConfigRegistry(env_file=None, check_interval=3600)
+    service = RoundTableService(None, ag2_wrapper=SimpleNamespace(llm_config_manager=registry))
+    enqueued = []
+
+    def enqueue(round_table_id, providers, submitter, priority):
+        enqueued.append(providers)
+        raise AdmissionRejected("Discussion queue is full")
+
+    service.admission = SimpleNamespace(enqueue=enqueue)
+    participants = [
+        {"agent": SimpleNamespace(llm_config={})},
+        {"agent": SimpleNamespace(llm_config={"provider": "kamiwaza", "model_name": "m"})}
+    ]
+
+    async def scenario():
+        async with service._admitted(SimpleNamespace(id=uuid4()), participants, "alice", 0):
+            pass
+
+    with pytest.raises(HTTPException):
+        asyncio.run(scenario())
+    assert enqueued == [{"azure", "kamiwaza"}]
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services.archive_service import compress_transcript, decompress_transcript
+from app.utils.serialization import MESSAGE_COLUMNS
+
+
+def make_messages(n):
+    round_table_id, agent_id = uuid4(), uuid4()
+    return [
+        {
+            **dict.fromkeys(MESSAGE_COLUMNS),
+            "id": uuid4(), "round_table_id": round_table_id, "agent_id": agent_id,
+            "content": f"We should revisit the pricing of tier {i % 3}", "message_type": "discussion",
+            "created_at": datetime(2025, 1, 1, 12, i, tzinfo=timezone.utc), "prompt_tokens": 100 + i
+        }
+        for i in range(n)
+    ]
+
+
+def test_archived_transcript_reads_back_as_the_same_rows():
+    messages = make_messages(40)
+    columns = compress_transcript(messages)
+    assert columns["message_count"] == 40
+    assert len(columns["payload"]) < columns["raw_bytes"] / 4
+    assert decompress_transcript(SimpleNamespace(**columns)) == messages
+
+
+def test_unknown_codec_is_refused():
+    columns = {**compress_transcript(make_messages(1)), "codec": "lz4"}
+    with pytest.raises(ValueError):
+        decompress_transcript(SimpleNamespace(**columns))
@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import httpx
+
+from app.services.benchmark_service import _percentile, run_probe
+
+
+def sse(*events):
+    return "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(n) for n in range(1, 101)]
+    assert _percentile(values, 50) == 51.0
+    assert _percentile(values, 95) == 95.0
+    assert _percentile([], 50) is None
+
+
+def test_probe_reports_tokens_and_error_rate():
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        if request.url.host == "bad":
+            return httpx.Response(503)
+        body = sse(
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "Currency "}}]},
+            {"choices": [{"delta": {"content": "risk"}}]},
+            {"choices": [], "usage": {"completion_tokens": 5}}
+        )
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await run_probe(client, ["http://good/v1", "http://bad/v1"], concurrency=2, requests=8)
+
+    stats = asyncio.run(scenario())
+
+    assert len(calls) == 8
+    assert sum("bad" in url for url in calls) == 4
+    assert stats["errors"] == 4
+    assert stats["error_rate"] == 0.5
+    assert stats["instances"] == 2
+    assert stats["ttft_p50_ms"] is not None
+    assert stats["latency_p95_ms"] >= stats["ttft_p50_ms"]
+    assert stats["tokens_per_second"] > 0
+
+
+def test_probe_counts_chunks_without_usage():
+    def handler(request):
+        body = sse(*({"choices": [{"delta": {"content": "word "}}]} for _ in range(3)))
+        return httpx.Response(200, text=body)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await run_probe(client, ["http://good/v1"], concurrency=1, requests=1)
+
+    stats = asyncio.run(scenario())
+
+    assert stats["errors"] == 0
+    assert stats["tokens_per_second"] > 0
@@ -0,0 +1,100 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.utils.discussion_registry import DiscussionAlreadyRunning, DiscussionRegistry
+
+
+def test_register_rejects_concurrent_discussion():
+    async def scenario():
+        registry = DiscussionRegistry()
+        round_table_id = uuid4()
+        handle = registry.register(round_table_id)
+        with pytest.raises(DiscussionAlreadyRunning):
+            registry.register(round_table_id)
+        registry.unregister(handle)
+        assert not registry.is_running(round_table_id)
+        registry.register(round_table_id)
+
+    asyncio.run(scenario())
+
+
+def test_request_stop_waits_for_turn_boundary():
+    async def scenario():
+        registry = DiscussionRegistry()
+        round_table_id = uuid4()
+        turns = []
+
+        async def discussion():
+            handle = registry.register(round_table_id)
+            try:
+                while not handle.stop_requested:
+                    turns.append(len(turns))
+                    await asyncio.sleep(0.01)
+            finally:
+                registry.unregister(handle)
+
+        task = asyncio.create_task(discussion())
+        await asyncio.sleep(0.03)
+        assert await registry.request_stop(round_table_id, "paused", timeout=1.0)
+        await task
+        assert not registry.is_running(round_table_id)
+        assert turns
+
+    asyncio.run(scenario())
+
+
+def test_request_stop_cancels_after_timeout():
+    async def scenario():
+        registry = DiscussionRegistry()
+        round_table_id = uuid4()
+
+        async def stuck_discussion():
+            handle = registry.register(round_table_id)
+            handle.started = True
+            try:
+                await asyncio.sleep(10)
+            finally:
+                registry.unregister(handle)
+
+        task = asyncio.create_task(stuck_discussion())
+        await asyncio.sleep(0)
+        assert await registry.request_stop(round_table_id, "deleted", timeout=0.05, cancel=True)
+        assert task.cancelled()
+
+    asyncio.run(scenario())
+
+
+def test_turn_hooks_store_every_turn_once_even_when_replies_repeat():
+    from autogen import ConversableAgent, GroupChat, GroupChatManager
+
+    from app.services.round_table_service import RoundTableService
+
+    agents = [ConversableAgent(name, llm_config=False, human_input_mode="NEVER") for name in ("CEO", "CFO", "CTO")]
+    for agent in agents:
+        agent.register_reply(trigger=lambda _: True, reply_func=lambda *args, **kwargs: (True, "Agreed."))
+    group_chat = GroupChat(agents=agents, messages=[], max_round=4, speaker_selection_method="round_robin")
+    opening = {"role": "user", "content": "Shall we launch?", "name": "CEO"}
+    group_chat.messages = [{"role": "system", "content": "Discussion initialized.", "name": "system"}, opening]
+    stored = []
+    service = RoundTableService.__new__(RoundTableService)
+    service._store_message = stored.append
+
+    async def scenario():
+        handle = DiscussionRegistry().register(uuid4())
+        store_messages = service._register_turn_hooks(
+            agents, {agent.name: agent.name for agent in agents}, [], uuid4(), handle, group_chat,
+            stored=len(group_chat.messages) + 1
+        )
+        await GroupChatManager(group_chat, llm_config=False).a_run_chat(
+            messages=group_chat.messages, sender=agents[0], config=group_chat
+        )
+        store_messages()
+
+    asyncio.run(scenario())
+
+    # The opening message is not stored again, and identical replies are separate turns
+    assert [(message["agent_id"], message["content"]) for message in stored] == [
+        ("CFO", "Agreed."), ("CTO", "Agreed."), ("CEO", "Agreed.")
+    ]
@@ -0,0 +1,73 @@
+import asyncio
+import io
+import os
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.config import Settings
+from app.models.document import Document, DocumentChunk, RoundTableDocument
+from app.models.round_table import RoundTable
+from app.services.document_service import DocumentService, format_excerpts
+
+pytestmark = pytest.mark.models(RoundTable, Document, DocumentChunk, RoundTableDocument)
+
+BRIEF = "\n\n".join([
+    "# Strategy brief",
+    "Pricing: the enterprise tier launches at a premium, with volume discounts above 500 seats.",
+    "Hiring: two support engineers join the Dublin office to cover European accounts.",
+    "Security: the data center migration waits for the vendor's penetration test results.",
+    "Retention: renewing customers get a loyalty discount instead of more marketing spend."
+] * 20)
+
+
+def upload(data: bytes, filename: str = "brief.md", content_type: str = "text/markdown") -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename, headers=Headers({"content-type": content_type}))
+
+
+def test_documents_are_stored_once_and_retrieved_by_passage(db, tmp_path):
+    settings = Settings(
+        azure_openai_api_key="test-key",
+        kamiwaza_api_uri="http://kamiwaza.local",
+        DOCUMENT_DIR=str(tmp_path),
+        DOCUMENT_CHUNK_TOKENS=60,
+        DOCUMENT_MAX_BYTES=len(BRIEF) + 10
+    )
+    service = DocumentService(db, settings)
+    first, second = (RoundTable(title="Planning", context="", settings={}) for _ in range(2))
+    db.add_all([first, second])
+    db.commit()
+
+    async def scenario():
+        attached = await service.upload(first.id, upload(BRIEF.encode()))
+        again = await service.upload(second.id, upload(BRIEF.encode(), filename="copy.md"))
+        with pytest.raises(HTTPException) as too_large:
+            await service.upload(first.id, upload(BRIEF.encode() * 2))
+        with pytest.raises(HTTPException) as unsupported:
+            await service.upload(first.id, upload(b"\x00\x01", filename="deck.pptx", content_type="application/octet-stream"))
+        return attached, again, too_large.value, unsupported.value
+
+    attached, again, too_large, unsupported = asyncio.run(scenario())
+
+    # The second round table reuses the chunks of the first upload
+    assert attached.chunks > 10 and not attached.deduplicated
+    assert again.deduplicated and again.document_id == attached.document_id
+    assert db.query(Document).count() == 1
+    assert db.query(DocumentChunk).count() == attached.chunks
+    assert (too_large.status_code, unsupported.status_code) == (413, 415)
+    # Only the stored file is left; rejected uploads are cleaned up
+    stored = [os.path.join(root, name) for root, _, names in os.walk(tmp_path) for name in names]
+    assert stored == [os.path.join(str(tmp_path), attached.sha256[:2], attached.sha256)]
+
+    excerpts = service.search(second.id, "when do we migrate the data center after the penetration test?", k=2)
+    assert "penetration test" in excerpts[0].content
+    assert excerpts[0].filename == "copy.md"
+    assert "[copy.md, part" in format_excerpts(excerpts)
+
+    # The file goes once the last round table lets go of it
+    service.detach(first.id, attached.document_id)
+    assert os.path.exists(stored[0])
+    service.detach(second.id, attached.document_id)
+    assert not os.path.exists(stored[0])
+    assert db.query(DocumentChunk).count() == 0
@@ -0,0 +1,49 @@
+import io
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.export_service import EXPORT_COLUMNS, ExportService
+
+
+def make_batch(n):
+    round_table_id, agent_id = uuid4(), uuid4()
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    row = {
+        "round_table_id": round_table_id, "round_table_title": "Pricing", "round_table_status": "completed",
+        "round_table_created_at": created, "agent_id": agent_id, "agent_name": "cfo", "agent_title": "CFO",
+        "message_type": "discussion", "created_at": created, "prompt_tokens": 120, "completion_tokens": 40,
+        "cost": 0.002, "model": "gpt-4o", "provider": "azure", "ttft_ms": 350.0, "latency_ms": 900.0
+    }
+    return [
+        tuple({**row, "message_id": uuid4(), "content": f"turn {i}"}[column] for column in EXPORT_COLUMNS)
+        for i in range(n)
+    ]
+
+
+def test_ndjson_writes_one_object_per_message_and_a_chunk_per_batch():
+    chunks = list(ExportService(db=None)._ndjson(iter([make_batch(3), make_batch(2)])))
+    assert len(chunks) == 2
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [row["content"] for row in rows] == ["turn 0", "turn 1", "turn 2", "turn 0", "turn 1"]
+    assert rows[0]["agent_name"] == "cfo" and rows[0]["created_at"] == "2025-01-01T00:00:00Z"
+
+
+def test_parquet_writes_a_row_group_per_batch():
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = b"".join(ExportService(db=None)._arrow(pa, iter([make_batch(3), make_batch(2)]), "parquet"))
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.num_row_groups == 2
+    table = parquet.read()
+    assert table.num_rows == 5
+    assert table.column_names == list(EXPORT_COLUMNS)
+
+
+def test_unknown_format_is_rejected_before_streaming():
+    with pytest.raises(HTTPException) as e:
+        ExportService(db=None).stream("csv")
+    assert e.value.status_code == 400
@@ -0,0 +1,195 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import Settings
+from app.models.agent import Agent
+from app.models.message import Message
+from app.models.round_table import RoundTable
+from app.models.round_table_archive import RoundTableArchive
+from app.models.round_table_participant import RoundTableParticipant
+from app.schemas.round_table import RoundTableFork
+from app.services.archive_service import ArchiveService
+from app.services.fork_service import ForkService, merge_forks
+from app.services.round_table_service import RoundTableService
+from app.utils.discussion_registry import DiscussionRegistry
+
+pytestmark = pytest.mark.models(Agent, RoundTable, RoundTableParticipant, Message, RoundTableArchive)
+
+
+def round_table(parent=None, fork_point=None):
+    return {"id": uuid4(), "parent_id": parent["id"] if parent else None, "fork_point": fork_point}
+
+
+def test_forks_share_their_parents_prefix():
+    root = round_table()
+    child = round_table(root, 2)
+    grandchild = round_table(child, 3)  # Two messages from root, one from child
+    sibling = round_table(root, 0)
+    own = {
+        root["id"]: ["r0", "r1", "r2", "r3"],
+        child["id"]: ["c0", "c1"],
+        grandchild["id"]: ["g0"],
+        sibling["id"]: ["s0"]
+    }
+
+    histories = merge_forks([grandchild, sibling, child, root], own)
+
+    assert histories[root["id"]] == ["r0", "r1", "r2", "r3"]
+    assert histories[child["id"]] == ["r0", "r1", "c0", "c1"]
+    assert histories[grandchild["id"]] == ["r0", "r1", "c0", "g0"]
+    assert histories[sibling["id"]] == ["s0"]
+
+
+def test_fork_without_own_messages():
+    root = round_table()
+    child = round_table(root, 1)
+
+    histories = merge_forks([root, child], {root["id"]: ["r0", "r1"]})
+
+    assert histories[child["id"]] == ["r0"]
+
+
+def add_round_table(db, agents, contents, parent=None, fork_point=None, first_sequence=1):
+    round_table = RoundTable(
+        title="Pricing",
+        context="Decide the launch price",
+        settings={"max_round": 10},
+        status="completed",
+        completed_at=datetime.utcnow(),
+        parent_id=parent.id if parent else None,
+        fork_point=fork_point,
+        participants=[RoundTableParticipant(agent=agent, speaking_priority=i + 1) for i, agent in enumerate(agents)]
+    )
+    db.add(round_table)
+    started = datetime.utcnow() - timedelta(minutes=5)
+    for i, content in enumerate(contents):
+        db.add(Message(
+            round_table=round_table,
+            agent=agents[i % len(agents)],
+            content=content,
+            message_type="discussion",
+            sequence=first_sequence + i,
+            created_at=started + timedelta(seconds=i)
+        ))
+    db.commit()
+    return round_table
+
+
+@pytest.fixture
+def agents(db):
+    agents = [Agent(name=name, title="Executive", background="", llm_config={}) for name in ("CEO", "CFO")]
+    db.add_all(agents)
+    db.commit()
+    return agents
+
+
+def make_round_table_service(db):
+    settings = Settings(azure_openai_api_key="test-key", kamiwaza_api_uri="http://kamiwaza.local", MEMORY_ENABLED=False)
+    service = RoundTableService(db, ag2_wrapper=SimpleNamespace())
+    service.settings = settings
+    return service
+
+
+def test_history_follows_the_sequence_when_timestamps_tie(db, agents):
+    round_table = add_round_table(db, agents, [])
+    stamp = datetime.utcnow()
+    # Stored out of order with the same clock reading, as two quick turns can be
+    for sequence, content in ((2, "second"), (1, "first")):
+        db.add(Message(
+            round_table=round_table,
+            agent=agents[0],
+            content=content,
+            message_type="discussion",
+            sequence=sequence,
+            created_at=stamp
+        ))
+    db.commit()
+    service = make_round_table_service(db)
+
+    assert [message.content for message in service.get_discussion_history(round_table.id)] == ["first", "second"]
+    assert [row["content"] for row in service.get_discussion_history_rows(round_table.id)] == ["first", "second"]
+
+
+def test_fork_checks_its_point_and_continues_after_it(db, agents):
+    root = add_round_table(db, agents, ["r0", "r1", "r2", "r3"])
+    empty = add_round_table(db, agents, [])
+    forks = ForkService(db)
+
+    with pytest.raises(HTTPException) as beyond:
+        forks.fork(root, RoundTableFork(at_message=5))
+    with pytest.raises(HTTPException) as nothing:
+        forks.fork(empty, RoundTableFork())
+    assert (beyond.value.status_code, nothing.value.status_code) == (400, 400)
+
+    child = forks.fork(root, RoundTableFork(at_message=2, prompt="What if we cut prices?"))
+
+    assert child.status == "paused" and child.fork_point == 2
+    assert child.checkpoint == {"next_speaker": None, "round": 1, "reason": "forked"}
+    assert [p.agent_id for p in sorted(child.participants, key=lambda p: p.speaking_priority)] == [a.id for a in agents]
+    prompt = db.query(Message).filter(Message.round_table_id == child.id).one()
+    assert (prompt.sequence, prompt.message_type) == (3, "introduction")
+    history = make_round_table_service(db).get_discussion_history_rows(child.id)
+    assert [row["content"] for row in history] == ["r0", "r1", "What if we cut prices?"]
+    assert [row["sequence"] for row in history] == [1, 2, 3]
+
+
+def test_inherited_rows_follow_the_lineage_through_archived_ancestors(db, agents):
+    root = add_round_table(db, agents, ["r0", "r1", "r2", "r3"])
+    child = add_round_table(db, agents, ["c0", "c1"], parent=root, fork_point=2, first_sequence=3)
+    grandchild = add_round_table(db, agents, ["g0"], parent=child, fork_point=3, first_sequence=4)
+    bare = add_round_table(db, agents, [], parent=child, fork_point=4)
+    forks = ForkService(db)
+    service = make_round_table_service(db)
+
+    def contents(round_table):
+        return [row["content"] for row in forks.get_inherited_rows(round_table.id)]
+
+    assert contents(root) == []
+    assert contents(grandchild) == ["r0", "r1", "c0"]
+    assert contents(bare) == ["r0", "r1", "c0", "c1"]
+    # A fork's first message of its own follows the ones it shares
+    assert service._next_sequence(bare.id) == 5
+    assert service._next_sequence(grandchild.id) == 5
+
+    # Archiving the root moves its messages into a blob, which the forks now read from
+    assert ArchiveService(db).archive_batch(datetime.utcnow() + timedelta(days=1)) == 4
+    assert db.query(Message).filter(Message.round_table_id == root.id).count() == 0
+    db.expire_all()
+    assert contents(grandchild) == ["r0", "r1", "c0"]
+    assert [row["content"] for row in service.get_discussion_history_rows(grandchild.id)] == ["r0", "r1", "c0", "g0"]
+    assert forks.count_messages(db.get(RoundTable, child.id)) == 4
+
+
+def test_resumed_fork_counts_the_rounds_it_shares(db, agents):
+    root = add_round_table(db, agents, ["r0", "r1", "r2", "r3", "r4"])
+    child = ForkService(db).fork(root, RoundTableFork(at_message=4))
+    service = make_round_table_service(db)
+    group_chats = []
+
+    def create_group_chat(agents, settings):
+        group_chats.append(settings)
+        raise RuntimeError("stop after setting up the chat")
+
+    service.ag2_wrapper = SimpleNamespace(
+        create_agent=lambda agent, temperature, memories: SimpleNamespace(name=agent.name),
+        create_group_chat=create_group_chat,
+        llm_config_manager=SimpleNamespace(provider_for=lambda llm_config: "azure")
+    )
+    service.documents = SimpleNamespace(retriever=lambda round_table: None)
+    participants = service._get_participants(child.id)
+
+    async def scenario():
+        handle = DiscussionRegistry().register(child.id)
+        with pytest.raises(HTTPException):
+            await service._continue_discussion(child, participants, handle)
+
+    asyncio.run(scenario())
+
+    # Ten rounds in all, three used by the shared messages after the introduction, plus the replayed message
+    assert group_chats[0]["max_round"] == 10 - 3 + 1
+    assert [row["content"] for row in service._serialize_history(child.id)] == ["r0", "r1", "r2", "r3"]
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from app.utils.hedging import HedgingPolicy, LatencyTracker
+
+
+def _warm(policy, key, seconds, count=20):
+    for _ in range(count):
+        policy._record_latency(key, seconds)
+        policy._requests += 1
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker(window=10)
+    assert tracker.percentile(95) is None
+    for value in range(1, 11):
+        tracker.record(float(value))
+    assert tracker.percentile(50) == 5.0
+    assert tracker.percentile(100) == 10.0
+
+
+def test_no_hedge_until_enough_samples():
+    policy = HedgingPolicy(enabled=True, min_samples=5)
+    _warm(policy, "endpoint", 0.1, count=4)
+    assert policy.hedge_delay("endpoint") is None
+    policy._record_latency("endpoint", 0.1)
+    assert policy.hedge_delay("endpoint") == 0.5  # min_delay floor
+
+
+def test_hedge_wins_over_straggler():
+    policy = HedgingPolicy(enabled=True, min_samples=5, min_delay=0.05, budget=1.0)
+    _warm(policy, "endpoint", 0.01, count=5)
+
+    def slow():
+        time.sleep(0.5)
+        return "slow"
+
+    def fast():
+        return "fast"
+
+    result = asyncio.run(policy.call("endpoint", slow, fast))
+    stats = policy.stats()
+
+    assert result == "fast"
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def test_hedging_respects_budget():
+    policy = HedgingPolicy(enabled=True, min_samples=5, min_delay=0.01, budget=0.0)
+    _warm(policy, "endpoint", 0.001, count=5)
+
+    def slow():
+        time.sleep(0.05)
+        return "primary"
+
+    result = asyncio.run(policy.call("endpoint", slow, lambda: "hedge"))
+
+    assert result == "primary"
+    assert policy.stats()["hedges"] == 0
+
+
+def test_disabled_policy_never_hedges():
+    policy = HedgingPolicy(enabled=False, min_samples=1)
+    _warm(policy, "endpoint", 0.001)
+    assert policy.hedge_delay("endpoint") is None
+    assert asyncio.run(policy.call("endpoint", lambda: 42)) == 42
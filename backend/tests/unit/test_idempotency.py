@@ -0,0 +1,117 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import Settings
+from app.models.idempotency_key import IdempotencyKey
+from app.services.idempotency_service import IdempotencyService
+
+pytestmark = pytest.mark.models.with_args(IdempotencyKey)
+
+
+def make_service(session_factory):
+    settings = Settings(
+        azure_openai_api_key="test-key",
+        kamiwaza_api_uri="http://kamiwaza.local",
+        IDEMPOTENCY_POLL_INTERVAL=0.01
+    )
+    return IdempotencyService(session_factory, settings)
+
+
+def test_retries_attach_to_the_running_request(session_factory):
+    service = make_service(session_factory)
+    round_table_id = uuid4()
+    calls = []
+
+    async def run():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"status": "completed", "round_table_id": round_table_id}
+
+    async def scenario():
+        first, retry = await asyncio.gather(
+            service.execute("key-1", round_table_id, "discuss", "hash", run),
+            service.execute("key-1", round_table_id, "discuss", "hash", run)
+        )
+        replay = await service.execute("key-1", round_table_id, "discuss", "hash", run)
+        return first, retry, replay
+
+    first, retry, replay = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert first == retry
+    assert replay == {"status": "completed", "round_table_id": str(round_table_id)}
+
+
+def test_other_worker_polls_for_the_result(session_factory):
+    worker_a, worker_b = make_service(session_factory), make_service(session_factory)
+    round_table_id = uuid4()
+
+    async def run():
+        await asyncio.sleep(0.05)
+        return {"status": "completed"}
+
+    async def unexpected():
+        raise AssertionError("retry must not run the discussion again")
+
+    async def scenario():
+        return await asyncio.gather(
+            worker_a.execute("key-1", round_table_id, "discuss", "hash", run),
+            worker_b.execute("key-1", round_table_id, "discuss", "hash", unexpected)
+        )
+
+    assert asyncio.run(scenario()) == [{"status": "completed"}] * 2
+
+
+def test_conflicting_start_and_reused_key_are_rejected(session_factory):
+    service = make_service(session_factory)
+    round_table_id = uuid4()
+
+    async def run():
+        await asyncio.sleep(0.05)
+        return {"status": "completed"}
+
+    async def scenario():
+        running = asyncio.create_task(service.execute("key-1", round_table_id, "discuss", "hash", run))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as conflict:
+            await service.execute("key-2", round_table_id, "discuss", "hash", run)
+        await running
+        with pytest.raises(HTTPException) as reused:
+            await service.execute("key-1", round_table_id, "discuss", "other-hash", run)
+        return conflict.value, reused.value
+
+    conflict, reused = asyncio.run(scenario())
+
+    assert conflict.status_code == 409
+    assert reused.status_code == 422
+
+
+def test_client_errors_are_replayed_and_server_errors_retried(session_factory):
+    service = make_service(session_factory)
+    round_table_id = uuid4()
+    calls = []
+
+    async def not_paused():
+        calls.append("resume")
+        raise HTTPException(status_code=400, detail="Round table is not paused")
+
+    async def flaky():
+        calls.append("discuss")
+        if calls.count("discuss") == 1:
+            raise HTTPException(status_code=500, detail="Failed to setup discussion")
+        return {"status": "completed"}
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(HTTPException) as error:
+                await service.execute("resume-1", round_table_id, "resume", "hash", not_paused)
+            assert (error.value.status_code, error.value.detail) == (400, "Round table is not paused")
+        with pytest.raises(HTTPException):
+            await service.execute("discuss-1", round_table_id, "discuss", "hash", flaky)
+        return await service.execute("discuss-1", round_table_id, "discuss", "hash", flaky)
+
+    assert asyncio.run(scenario()) == {"status": "completed"}
+    assert calls == ["resume", "discuss", "discuss"]
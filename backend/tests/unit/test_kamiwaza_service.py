@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import httpx
+
+from app.config import Settings
+from app.services.kamiwaza_service import KamiwazaService
+
+DEPLOYMENTS = [
+    {"m_name": "llama-3-8b", "status": "DEPLOYED", "lb_port": 61100, "instances": [{"host_name": "node-1"}]},
+    {"m_name": "mistral-7b", "status": "STOPPED", "lb_port": 61101, "instances": []},
+]
+
+
+def make_service(handler, **overrides):
+    settings = Settings(
+        azure_openai_api_key="test-key",
+        kamiwaza_api_uri="http://kamiwaza.local",
+        **overrides
+    )
+    service = KamiwazaService(settings)
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service._client_loop = asyncio.get_running_loop()
+    return service
+
+
+def test_concurrent_callers_share_one_upstream_fetch():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=DEPLOYMENTS)
+
+    async def scenario():
+        service = make_service(handler)
+        results = await asyncio.gather(*(service.get_available_models() for _ in range(10)))
+        assert calls == ["/api/serving/deployments"]
+        assert all(models == results[0] for models in results)
+        assert [model["model_name"] for model in results[0]] == ["llama-3-8b"]
+
+    asyncio.run(scenario())
+
+
+def test_stale_list_is_served_while_refreshing_in_the_background():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=DEPLOYMENTS)
+
+    async def scenario():
+        service = make_service(handler, KAMIWAZA_MODELS_TTL=1.0, KAMIWAZA_MODELS_MAX_STALE=60.0)
+        await service.get_available_models()
+        service._fetched_at = time.monotonic() - 5.0
+
+        started = time.perf_counter()
+        models, age = await service.get_models_with_age()
+        assert time.perf_counter() - started < 0.04  # Did not wait for the upstream
+        assert age >= 5.0 and models
+        await service._refresh
+        assert len(calls) == 2
+        assert service.cache_age < 1.0
+
+    asyncio.run(scenario())
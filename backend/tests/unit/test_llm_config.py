@@ -1,7 +1,7 @@
 import pytest
 from pydantic import ValidationError
 import os
-from app.utils.llm_config import LLMConfigManager, LLMConfigurationError
+from app.utils.llm_config import LLMConfigManager, LLMConfigRegistry, LLMConfigurationError
 from app.schemas.llm import AzureOpenAIConfig, OpenAIConfig, LLMConfig
 import openai
 from openai import AzureOpenAI
@@ -93,4 +93,64 @@ def test_azure_live_connection():
         print("\nAzure OpenAI Response:", response.choices[0].message.content)
         assert response.choices[0].message.content is not None
     except Exception as e:
-        pytest.fail(f"Failed to connect to Azure OpenAI: {str(e)}")
\ No newline at end of file
+        pytest.fail(f"Failed to connect to Azure OpenAI: {str(e)}")
+
+
+def test_registry_reloads_when_env_file_changes(tmp_path, monkeypatch):
+    for key in list(os.environ):
+        if key.startswith(("AZURE_OPENAI_", "OPENAI_", "KAMIWAZA_", "ACTIVE_LLM_CONFIG")):
+            monkeypatch.delenv(key)
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "ACTIVE_LLM_CONFIG=openai\nOPENAI_API_KEY=sk-first\nOPENAI_MODEL=gpt-4\n"
+    )
+    monkeypatch.setenv("ACTIVE_LLM_CONFIG", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-first")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4")
+
+    registry = LLMConfigRegistry(env_file=str(env_file), check_interval=0)
+    assert registry.get_active_config()["config_list"][0]["api_key"] == "sk-first"
+    version = registry.version
+
+    # Unchanged environment does not rebuild anything
+    registry.get_active_config()
+    assert registry.version == version
+
+    env_file.write_text(
+        "ACTIVE_LLM_CONFIG=openai\nOPENAI_API_KEY=sk-second\nOPENAI_MODEL=gpt-4\n"
+    )
+    os.utime(env_file, ns=(0, os.stat(env_file).st_mtime_ns + 1_000_000_000))
+    assert registry.get_active_config()["config_list"][0]["api_key"] == "sk-second"
+    assert registry.version == version + 1
+    assert "sk-second" not in str(registry.describe())
+
+    # Settings removed from the file are removed from the environment too
+    env_file.write_text("ACTIVE_LLM_CONFIG=openai\nOPENAI_API_KEY=sk-second\n")
+    os.utime(env_file, ns=(0, os.stat(env_file).st_mtime_ns + 1_000_000_000))
+    registry.get_active_config()
+    assert registry.version == version + 2
+    assert "OPENAI_MODEL" not in os.environ
+
+
+def test_registry_caches_agent_configs(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "azure-key")
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com/")
+    registry = LLMConfigRegistry(env_file=None, check_interval=3600)
+
+    agent_config = {"api_type": "azure", "model": "gpt-4o"}
+    first = registry.get_agent_config(agent_config)
+    assert first["config_list"][0]["azure_endpoint"] == "https://test.openai.azure.com"
+
+    # Callers get a copy, so mutating it cannot corrupt the cached entry
+    first["config_list"][0]["model"] = "mutated"
+    second = registry.get_agent_config(dict(agent_config))
+    assert second["config_list"][0]["model"] == "gpt-4o"
+    assert registry.describe()["cached_agent_configs"] == 1
+
+    with pytest.raises(ValueError):
+        registry.get_agent_config({"provider": "kamiwaza", "model_name": "m"})
+
+    # Including a config that already carries its config_list
+    explicit = {"config_list": [{"model": "gpt-4o", "api_key": "k"}]}
+    registry.get_agent_config(explicit)["config_list"][0]["model"] = "mutated"
+    assert explicit["config_list"][0]["model"] == "gpt-4o"
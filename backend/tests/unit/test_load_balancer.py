@@ -0,0 +1,71 @@
+import random
+from collections import Counter
+
+from app.config import Settings
+from app.utils.load_balancer import EndpointPool, KamiwazaBalancer
+
+URLS = [f"http://node-{i}:8000/v1" for i in range(4)]
+
+
+def test_p2c_prefers_less_loaded_instances():
+    random.seed(7)
+    pool = EndpointPool("llama", policy="p2c")
+    pool.set_urls(URLS)
+    held = [pool.acquire() for _ in range(40)]
+    # Picking the less loaded of two keeps instances within a few requests of each other
+    loads = Counter(endpoint.url for endpoint in held)
+    assert set(loads) == set(URLS)
+    assert max(loads.values()) - min(loads.values()) <= 3
+
+
+def test_least_outstanding_balances_exactly():
+    pool = EndpointPool("llama", policy="least_outstanding")
+    pool.set_urls(URLS)
+    loads = Counter(pool.acquire().url for _ in range(8))
+    assert all(count == 2 for count in loads.values())
+
+
+def test_failing_instance_is_ejected_and_readmitted_by_a_health_check():
+    pool = EndpointPool("llama", policy="least_outstanding", failure_threshold=2, ejection_seconds=60)
+    pool.set_urls(URLS[:2])
+    bad = pool.acquire(exclude=[URLS[1]])
+    pool.release(bad, ok=False)
+    bad = pool.acquire(exclude=[URLS[1]])
+    pool.release(bad, ok=False)
+
+    picks = set()
+    for _ in range(5):
+        endpoint = pool.acquire()
+        picks.add(endpoint.url)
+        pool.release(endpoint, ok=True, latency=0.1)
+    assert picks == {URLS[1]}
+
+    pool.record_health(URLS[0], healthy=True)
+    assert {pool.acquire().url, pool.acquire().url} == set(URLS[:2])
+
+
+def test_pool_fails_open_when_every_instance_is_ejected():
+    pool = EndpointPool("llama", failure_threshold=1)
+    pool.set_urls(URLS[:1])
+    pool.release(pool.acquire(), ok=False)
+    assert pool.acquire().url == URLS[0]
+
+
+def test_agents_resolve_to_their_model_pool_by_name_or_port():
+    settings = Settings(azure_openai_api_key="test-key", kamiwaza_api_uri="http://kamiwaza.local")
+    balancer = KamiwazaBalancer(kamiwaza_service=object(), settings=settings)
+    balancer.update([{
+        "model_name": "llama-3-8b",
+        "lb_port": 61100,
+        "instances": [
+            {"port": 8001, "url": URLS[0]},
+            {"port": 8002, "url": URLS[1]},
+        ]
+    }])
+    assert balancer.pool_for({"model_name": "llama-3-8b"}).urls == URLS[:2]
+    # Agents created through the prod hotfix store "model" as the model name
+    assert balancer.pool_for({"model_name": "model", "port": 61100}).urls == URLS[:2]
+    assert balancer.pool_for({"model_name": "other", "port": 9999}) is None
+
+    balancer.update([])
+    assert balancer.pool_for({"model_name": "llama-3-8b"}) is None
@@ -0,0 +1,108 @@
+import os
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.config import Settings
+from app.models.agent import Agent
+from app.models.message import Message
+from app.models.round_table import RoundTable
+from app.models.round_table_archive import RoundTableArchive
+from app.models.round_table_participant import RoundTableParticipant
+from app.services.archive_service import ArchiveService
+from app.services.memory_service import MemoryService
+from app.utils.memory_index import MemoryIndex
+
+pytestmark = pytest.mark.models(Agent, RoundTable, RoundTableParticipant, Message, RoundTableArchive)
+
+TOPICS = [
+    "Pricing the enterprise tier at a premium protects margin while volume ramps in the second half",
+    "Hiring two more support engineers in Europe would cut response times for our largest accounts",
+    "The data center migration should wait until the security audit of the new vendor is finished",
+    "A loyalty discount for renewing customers lowers churn more cheaply than new marketing spend"
+]
+
+
+def test_index_finds_similar_memories_across_processes(tmp_path):
+    writer, agent_id, earlier = MemoryIndex(str(tmp_path)), uuid4(), uuid4()
+    ids = [uuid4() for _ in TOPICS]
+    for message_id, text in zip(ids, TOPICS):
+        assert writer.add(agent_id, message_id, earlier, text)
+    # Noise a million-row index would be full of
+    for i in range(2000):
+        writer.add(agent_id, uuid4(), uuid4(), f"status update {i} on project {i % 37} milestone {i % 11}")
+    assert not writer.add(agent_id, uuid4(), earlier, "the and of")
+
+    # Another worker on the host sees the same files
+    reader = MemoryIndex(str(tmp_path))
+    hits = reader.search(agent_id, "should we charge enterprise customers a premium price?", k=2)
+    assert hits[0][:2] == (ids[0], earlier)
+    assert hits[0][2] > hits[1][2]
+    assert reader.search(agent_id, "premium enterprise pricing", exclude_round_tables={earlier})[0][0] not in ids
+
+    # A torn append is dropped by the next one
+    with open(os.path.join(str(tmp_path), f"{agent_id}.weights"), "ab") as f:
+        f.write(b"\0" * 7)
+    writer.add(agent_id, uuid4(), earlier, "Renewal discounts beat marketing spend on churn")
+    assert reader.count(agent_id) == 2005
+
+
+def test_agents_recall_their_own_relevant_messages(db, tmp_path):
+    settings = Settings(azure_openai_api_key="test-key", kamiwaza_api_uri="http://kamiwaza.local", MEMORY_MIN_SCORE=0.1)
+    service = MemoryService(db, MemoryIndex(str(tmp_path)), settings)
+    cfo, ceo = (Agent(name=name, title="Executive", background="", llm_config={}) for name in ("CFO", "CEO"))
+    earlier, current = (RoundTable(title="Planning", context="", settings={}) for _ in range(2))
+    db.add_all([cfo, ceo, earlier, current])
+    db.commit()
+    for sequence, (agent, text, message_type) in enumerate([
+        (cfo, TOPICS[0], "discussion"),
+        (cfo, TOPICS[3], "discussion"),
+        (ceo, TOPICS[0].replace("protects", "risks"), "discussion"),
+        (cfo, "Topic: pricing of the enterprise tier, premium or discount? " * 3, "introduction"),
+        (cfo, "Agreed on premium pricing.", "discussion")
+    ]):
+        message = Message(round_table=earlier, agent=agent, content=text, message_type=message_type, sequence=sequence + 1)
+        db.add(message)
+        db.flush()
+        service.remember(message)
+    db.commit()
+
+    recalled = service.recall(cfo.id, "Price the enterprise tier", exclude_round_tables={current.id})
+
+    assert recalled[0] == TOPICS[0]
+    assert TOPICS[0].replace("protects", "risks") not in recalled
+    assert service.recall(cfo.id, "Price the enterprise tier", exclude_round_tables={earlier.id}) == []
+    db.query(Message).filter(Message.content == TOPICS[0]).delete()
+    assert TOPICS[0] not in service.recall(cfo.id, "Price the enterprise tier", exclude_round_tables=set())
+
+
+def test_archived_discussions_are_still_recalled(db, tmp_path):
+    settings = Settings(azure_openai_api_key="test-key", kamiwaza_api_uri="http://kamiwaza.local", MEMORY_MIN_SCORE=0.1)
+    service = MemoryService(db, MemoryIndex(str(tmp_path)), settings)
+    cfo = Agent(name="CFO", title="Executive", background="", llm_config={})
+    earlier = RoundTable(
+        title="Planning",
+        context="",
+        settings={},
+        status="completed",
+        completed_at=datetime.utcnow() - timedelta(days=90),
+        participants=[RoundTableParticipant(agent=cfo, speaking_priority=1)]
+    )
+    db.add_all([cfo, earlier])
+    for sequence, text in enumerate(TOPICS[:2]):
+        message = Message(round_table=earlier, agent=cfo, content=text, message_type="discussion", sequence=sequence + 1)
+        db.add(message)
+        db.flush()
+        service.remember(message)
+    db.commit()
+
+    assert ArchiveService(db).archive_batch(datetime.utcnow()) == 1
+    assert db.query(Message).count() == 0
+
+    assert service.recall(cfo.id, "Price the enterprise tier", exclude_round_tables=set()) == [TOPICS[0]]
+    memory = service.search(cfo.id, "Price the enterprise tier")[0]
+    assert (memory.round_table_id, memory.created_at is not None) == (earlier.id, True)
+    # A rebuilt index keeps them too
+    assert service.rebuild(cfo.id).memories == 2
+    assert service.recall(cfo.id, "support engineers in Europe", exclude_round_tables=set()) == [TOPICS[1]]
@@ -0,0 +1,74 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.config import Settings
+from app.models.message import Message
+from app.utils.message_bus import MessageBus
+from app.utils.pg_listener import PgListener
+from app.utils.websocket_manager import WebSocketManager
+
+pytestmark = pytest.mark.models.with_args(Message)
+
+
+def make_bus(session_factory):
+    settings = Settings(azure_openai_api_key="test-key", kamiwaza_api_uri="http://kamiwaza.local", MESSAGE_BUS="postgres")
+    # Without Postgres the bus falls back to fanning out within this process
+    engine = session_factory.kw["bind"]
+    bus = MessageBus(settings, session_factory, PgListener(engine), WebSocketManager(max_backlog=2))
+    return bus
+
+
+def store(bus, round_table_id, sequence, commit=True):
+    with bus.session_factory() as db:
+        message = Message(
+            round_table_id=round_table_id,
+            agent_id=uuid4(),
+            content=f"turn {sequence}",
+            message_type="discussion",
+            sequence=sequence
+        )
+        db.add(message)
+        db.flush()
+        bus.publish(db, round_table_id, message.id, sequence)
+        if commit:
+            db.commit()
+
+
+def test_committed_messages_reach_subscribers(session_factory):
+    bus = make_bus(session_factory)
+    watched, other = uuid4(), uuid4()
+
+    async def scenario():
+        await bus.start()
+        assert bus.backend == "local"
+        queue = bus.subscribers.subscribe(watched)
+        store(bus, watched, 1)
+        store(bus, watched, 2, commit=False)  # Rolled back, never announced
+        store(bus, other, 1)
+        store(bus, watched, 3)
+        first = await asyncio.wait_for(queue.get(), 1)
+        second = await asyncio.wait_for(queue.get(), 1)
+        await asyncio.sleep(0.05)
+        await bus.aclose()
+        return first, second, queue.empty()
+
+    first, second, drained = asyncio.run(scenario())
+    assert (first["content"], second["content"]) == ("turn 1", "turn 3")
+    assert first["round_table_id"] == watched
+    assert drained
+    assert bus.load_messages_after(watched, 1)[0]["sequence"] == 3
+
+
+def test_slow_subscriber_is_told_to_catch_up():
+    manager = WebSocketManager(max_backlog=2)
+    round_table_id = uuid4()
+
+    async def scenario():
+        queue = manager.subscribe(round_table_id)
+        for sequence in range(1, 4):
+            manager.publish(round_table_id, {"sequence": sequence})
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert asyncio.run(scenario()) == [None]
@@ -0,0 +1,41 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.utils import metrics
+
+
+def sample(name, **labels):
+    return metrics.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_llm_series_are_labelled_and_bounded(monkeypatch):
+    monkeypatch.setattr(metrics, "_models", set())
+    monkeypatch.setattr(metrics, "MAX_MODELS", 2)
+
+    before = sample("roundtable_llm_tokens_total", provider="azure", model="gpt-4o", kind="prompt")
+    metrics.observe_llm_completion("azure", "gpt-4o", 1.5, prompt_tokens=40, completion_tokens=7)
+    assert sample("roundtable_llm_tokens_total", provider="azure", model="gpt-4o", kind="prompt") == before + 40
+
+    assert metrics.model_label("model-b") == "model-b"
+    assert metrics.model_label("model-c") == "other"
+    assert metrics.model_label("gpt-4o") == "gpt-4o"
+    assert metrics.provider_label("made-up") == "other"
+
+
+def test_discussion_status_is_bounded():
+    before = sample("roundtable_discussions_total", status="other")
+    metrics.observe_discussion_finished("something-new")
+    assert sample("roundtable_discussions_total", status="other") == before + 1
+
+
+def test_db_commits_are_timed():
+    engine = create_engine("sqlite://")
+    factory = sessionmaker(bind=engine)
+    metrics.instrument_db_commits(factory)
+
+    before = sample("roundtable_db_commit_seconds_count")
+    with factory() as session:
+        session.execute(text("select 1"))
+        session.commit()
+    assert sample("roundtable_db_commit_seconds_count") == before + 1
+    assert b"roundtable_db_commit_seconds_bucket" in metrics.render_metrics()
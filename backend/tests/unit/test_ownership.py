@@ -0,0 +1,79 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.config import Settings
+from app.models.round_table import RoundTable
+from app.utils.discussion_registry import DiscussionRegistry
+from app.utils.ownership import ControlBus, LeaseManager
+
+pytestmark = pytest.mark.models.with_args(RoundTable)
+
+
+def make_settings():
+    return Settings(azure_openai_api_key="test-key", kamiwaza_api_uri="http://kamiwaza.local", DISCUSSION_LEASE_TTL=30)
+
+
+def add_round_table(session_factory):
+    with session_factory() as db:
+        round_table = RoundTable(title="Pricing", context="Decide the launch price", settings={})
+        db.add(round_table)
+        db.commit()
+        return round_table.id
+
+
+def test_one_worker_holds_a_lease_until_it_lapses(session_factory):
+    worker_a = LeaseManager(session_factory, make_settings(), worker_id="worker-a")
+    worker_b = LeaseManager(session_factory, make_settings(), worker_id="worker-b")
+    round_table_id = add_round_table(session_factory)
+
+    async def scenario():
+        assert worker_a.acquire(round_table_id)
+        assert not worker_b.acquire(round_table_id)
+        assert worker_b.owner_of(round_table_id) == "worker-a"
+        assert worker_a.heartbeat() == set()
+
+        # Worker A stalls past the TTL and B takes over
+        with session_factory() as db:
+            db.get(RoundTable, round_table_id).heartbeat_at = datetime.utcnow() - timedelta(seconds=60)
+            db.commit()
+        assert worker_b.owner_of(round_table_id) is None
+        assert worker_b.acquire(round_table_id)
+        assert worker_a.heartbeat() == {round_table_id}
+
+        worker_b.release(round_table_id)
+        assert worker_a.owner_of(round_table_id) is None
+        await worker_a.aclose()
+        await worker_b.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_bus_stops_only_discussions_this_worker_runs():
+    async def scenario():
+        registry = DiscussionRegistry()
+        bus = ControlBus(SimpleNamespace(), make_settings(), registry, worker_id="worker-a")
+        running, elsewhere = uuid4(), uuid4()
+        handle = registry.register(running)
+
+        def message(round_table_id, owner):
+            return json.dumps({
+                "action": "pause",
+                "round_table_id": str(round_table_id),
+                "owner": owner,
+                "sender": "worker-b"
+            })
+
+        assert bus.dispatch(message(running, "worker-c")) is None
+        assert bus.dispatch(message(elsewhere, "worker-a")) is None
+        stop = bus.dispatch(message(running, "worker-a"))
+        await asyncio.sleep(0)
+        assert handle.stop_reason == "paused"
+        registry.unregister(handle)
+        assert await stop is True
+
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import Settings
+from app.models.agent import Agent
+from app.models.message import Message
+from app.models.round_table import RoundTable
+from app.models.round_table_participant import RoundTableParticipant
+from app.services.recovery_service import RecoveryService
+
+pytestmark = pytest.mark.models(Agent, RoundTable, RoundTableParticipant, Message)
+
+
+def make_service(db):
+    settings = Settings(azure_openai_api_key="test-key", kamiwaza_api_uri="http://kamiwaza.local", DISCUSSION_LEASE_TTL=30)
+    return RecoveryService(db, settings, worker_id="worker-b")
+
+
+def add_discussion(db, speakers, owner=None, heartbeat_age=0):
+    agents = [
+        Agent(name=name, title="Executive", background="", llm_config={}) for name in ("CEO", "CFO", "CTO")
+    ]
+    round_table = RoundTable(
+        title="Pricing",
+        context="Decide the launch price",
+        settings={},
+        status="in_progress",
+        owner_id=owner,
+        heartbeat_at=datetime.utcnow() - timedelta(seconds=heartbeat_age) if owner else None,
+        participants=[RoundTableParticipant(agent=agent, speaking_priority=i + 1) for i, agent in enumerate(agents)]
+    )
+    db.add(round_table)
+    started = datetime.utcnow() - timedelta(minutes=5)
+    for i, speaker in enumerate(speakers):
+        db.add(Message(
+            round_table=round_table,
+            agent=agents[speaker],
+            content=f"turn {i}",
+            message_type="introduction" if i == 0 else "discussion",
+            sequence=i + 1,
+            created_at=started + timedelta(seconds=i)
+        ))
+    db.commit()
+    return round_table.id
+
+
+def test_orphans_are_paused_at_the_next_speaker(db):
+    # The worker died after the CFO's turn, two rounds in
+    orphan = add_discussion(db, [0, 1, 2, 0, 1], owner="worker-a", heartbeat_age=600)
+    running = add_discussion(db, [0, 1], owner="worker-a", heartbeat_age=5)
+
+    recovered = make_service(db).recover_all()
+
+    assert [result["round_table_id"] for result in recovered] == [orphan]
+    round_table = db.get(RoundTable, orphan)
+    db.refresh(round_table)
+    assert round_table.status == "paused"
+    assert round_table.checkpoint == {"next_speaker": "CTO", "round": 4, "reason": "recovered"}
+    assert round_table.owner_id is None
+    assert db.get(RoundTable, running).status == "in_progress"
+    # Recovering again finds nothing left to do
+    assert make_service(db).recover_all() == []
+
+
+def test_discussion_that_never_started_goes_back_to_pending(db):
+    orphan = add_discussion(db, [])
+    db.get(RoundTable, orphan).status = "queued"
+    db.commit()
+
+    assert make_service(db).recover_all()[0]["status"] == "pending"
+
+
+def test_restarted_worker_recovers_its_own_leases(db):
+    orphan = add_discussion(db, [0], owner="worker-b", heartbeat_age=5)
+
+    assert make_service(db).recover_all() == []
+    recovered = make_service(db).recover_all(restarted_at=datetime.utcnow())
+    assert recovered[0]["checkpoint"]["next_speaker"] == "CFO"
+    assert recovered[0]["round_table_id"] == orphan
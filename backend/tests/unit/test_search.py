@@ -0,0 +1,126 @@
+import os
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event, func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.models.agent import Agent
+from app.models.message import Message
+from app.models.round_table import RoundTable
+from app.services.search_service import SEARCH_CONFIG, SearchService
+
+TRANSCRIPTS = {
+    ("Launch pricing", "completed"): [
+        ("CEO", "Pricing, pricing and more pricing: we price the enterprise tier above the competition."),
+        ("CFO", "Higher pricing on the enterprise tier protects our margins while volume ramps."),
+        ("CTO", "The data center migration is on schedule for the second quarter.")
+    ],
+    ("Support hiring", "in_progress"): [
+        ("CEO", "Contractor pricing matters less than hiring two engineers in Dublin."),
+        ("CTO", "Hiring in Dublin covers the European accounts.")
+    ],
+    ("Security review", "completed"): [
+        ("CTO", "The vendor's penetration test comes back next week.")
+    ]
+}
+
+
+def compile_pg(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def pg_db():
+    """A session on a throwaway schema of TEST_DATABASE_URL holding TRANSCRIPTS"""
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url or not url.startswith("postgresql"):
+        pytest.skip("Set TEST_DATABASE_URL to a Postgres database to run the search against it")
+    schema = f"test_search_{uuid4().hex[:12]}"
+    engine = create_engine(url)
+
+    @event.listens_for(engine, "connect")
+    def use_schema(connection, _):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET search_path TO {schema}, public")
+
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(f"CREATE SCHEMA {schema}"))
+            for model in (Agent, RoundTable, Message):
+                model.__table__.create(connection)
+            # As in the migration that adds it
+            connection.execute(text(
+                "ALTER TABLE messages ADD COLUMN search_vector tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', content)) STORED"
+            ))
+    except OperationalError as e:
+        pytest.skip(f"TEST_DATABASE_URL is not reachable: {e}")
+
+    with sessionmaker(bind=engine)() as session:
+        agents = {name: Agent(name=name, title="Executive", background="", llm_config={}) for name in ("CEO", "CFO", "CTO")}
+        started = datetime.utcnow() - timedelta(hours=1)
+        for (title, status), lines in TRANSCRIPTS.items():
+            round_table = RoundTable(title=title, context="", settings={}, status=status)
+            session.add(round_table)
+            for i, (speaker, content) in enumerate(lines):
+                session.add(Message(
+                    round_table=round_table,
+                    agent=agents[speaker],
+                    content=content,
+                    message_type="discussion",
+                    sequence=i + 1,
+                    created_at=started + timedelta(minutes=i)
+                ))
+        session.commit()
+        yield session
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    engine.dispose()
+
+
+def test_matching_uses_the_indexed_vector_and_headlines_only_the_page():
+    service = SearchService(db=None)
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, "pricing -margins")
+    matches = service._matches(tsquery, status="completed")
+
+    page = compile_pg(service._round_table_page(matches, limit=20, offset=0))
+    assert "messages.search_vector @@ websearch_to_tsquery" in page
+    assert "ts_rank_cd" in page
+    assert "ts_headline" not in page
+    assert "count(*) OVER ()" in page
+
+    hits = compile_pg(service._page_hits(matches, tsquery, ["rt"], hits_per_round_table=3))
+    assert "ts_headline" in hits
+    assert "row_number() OVER (PARTITION BY matches.round_table_id" in hits
+
+
+def test_search_ranks_groups_and_highlights_matching_messages(pg_db):
+    service = SearchService(pg_db)
+
+    results = service.search("pricing")
+
+    # Stemming matches "price" and "pricing"; the round table that dwells on it ranks first
+    assert results.total_round_tables == 2
+    assert [(group.title, group.hit_count) for group in results.results] == [("Launch pricing", 2), ("Support hiring", 1)]
+    best = results.results[0]
+    assert best.best_rank > results.results[1].best_rank
+    assert [hit.agent_name for hit in best.hits] == ["CEO", "CFO"]
+    assert best.hits[0].rank >= best.hits[1].rank
+    assert "<mark>Pricing</mark>" in best.hits[0].headline
+    assert "<mark>price</mark>" in best.hits[0].headline
+
+    # Web search syntax, filters and paging
+    assert [hit.agent_name for hit in service.search("pricing -margins").results[0].hits] == ["CEO"]
+    assert [group.title for group in service.search('"enterprise tier"').results] == ["Launch pricing"]
+    assert [group.title for group in service.search("pricing", status="in_progress").results] == ["Support hiring"]
+    assert {group.title for group in service.search("dublin or penetration").results} == {"Support hiring", "Security review"}
+    assert len(service.search("pricing", hits_per_round_table=1).results[0].hits) == 1
+    second_page = service.search("pricing", limit=1, offset=1)
+    assert (second_page.total_round_tables, [group.title for group in second_page.results]) == (2, ["Support hiring"])
+    past_the_end = service.search("pricing", limit=1, offset=5)
+    assert (past_the_end.total_round_tables, past_the_end.results) == (2, [])
+    assert service.search("kubernetes").results == []
@@ -0,0 +1,63 @@
+import json
+from datetime import datetime, timezone
+from typing import List
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from app.schemas.message import MessageInDB
+from app.schemas.round_table import RoundTableInDB
+from app.utils.serialization import (
+    MESSAGE_COLUMNS,
+    MESSAGE_LIST_ADAPTER,
+    ROUND_TABLE_LIST_ADAPTER,
+    PreSerializedJSONResponse,
+    rows_to_dicts
+)
+
+def model_path_json(model_type, content):
+    adapter = TypeAdapter(List[model_type])
+    return json.loads(json.dumps(adapter.dump_python(adapter.validate_python(content), mode="json")))
+
+def make_messages(round_table_id, count):
+    usage = [(None,) * 7, (120, 45, 0.0012, "gpt-4o", "azure", 850.0, 912.5)]
+    rows = [
+        (uuid4(), f"Message {n} with ünïcode", "discussion", uuid4(), round_table_id,
+         datetime(2025, 1, 1, 12, 0, n, 123456, tzinfo=timezone.utc)) + usage[n % 2] + (n + 1,)
+        for n in range(count)
+    ]
+    return rows_to_dicts(rows, MESSAGE_COLUMNS)
+
+def test_message_rows_match_model_path():
+    messages = make_messages(uuid4(), 3)
+    response = PreSerializedJSONResponse(messages, MESSAGE_LIST_ADAPTER)
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == model_path_json(MessageInDB, messages)
+
+def test_round_table_rows_match_model_path():
+    round_table_id = uuid4()
+    round_tables = [{
+        "id": round_table_id,
+        "title": "Pricing",
+        "context": "Decide the launch price",
+        "status": "completed",
+        "settings": {
+            "max_rounds": 12,
+            "speaker_selection_method": "auto",
+            "allow_repeat_speaker": True,
+            "send_introductions": True,
+            "allowed_speaker_transitions": None,
+            "temperature": None
+        },
+        "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        "completed_at": None,
+        "archived_at": None,
+        "parent_id": None,
+        "fork_point": None,
+        "messages": make_messages(round_table_id, 2),
+        "queue_position": None
+    }]
+    body = ROUND_TABLE_LIST_ADAPTER.dump_json(round_tables)
+
+    assert json.loads(body) == model_path_json(RoundTableInDB, round_tables)
@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Generous enough for slow CI machines; override with APP_IMPORT_BUDGET_SECONDS
+IMPORT_BUDGET_SECONDS = float(os.getenv("APP_IMPORT_BUDGET_SECONDS", "3.0"))
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "heavy": [name for name in ("autogen", "openai", "httpx", "numpy") if name in sys.modules]
+}))
+"""
+
+
+def _import_app_main(tmp_path):
+    env = {
+        **os.environ,
+        "AZURE_OPENAI_API_KEY": os.getenv("AZURE_OPENAI_API_KEY", "test-key"),
+        "KAMIWAZA_API_URI": os.getenv("KAMIWAZA_API_URI", "http://localhost:7777"),
+        # The engine is created at import time but never connects
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'startup.db'}",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_app_main_does_not_import_heavy_dependencies(tmp_path):
+    probe = _import_app_main(tmp_path)
+    assert probe["heavy"] == []
+
+
+def test_app_main_import_time_within_budget(tmp_path):
+    # Best of three to keep the check stable on a busy machine
+    seconds = min(_import_app_main(tmp_path)["seconds"] for _ in range(3))
+    assert seconds < IMPORT_BUDGET_SECONDS, (
+        f"Importing app.main took {seconds:.2f}s (budget {IMPORT_BUDGET_SECONDS:.2f}s); "
+        "run scripts/profile_imports.py to find the regression"
+    )
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from app.config import Settings
+from app.models.agent import Agent
+from app.models.message import Message
+from app.models.round_table import RoundTable
+from app.services.summary_service import SummaryService, Summarizer, chunk_transcript, count_tokens, parse_digest
+
+pytestmark = pytest.mark.models(Agent, RoundTable, Message)
+
+
+class FakeLLM:
+    """Answers every summary call with a digest naming the speakers it was shown"""
+
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, messages):
+        with self.lock:
+            self.calls.append(messages)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        content = messages[1]["content"]
+        speakers = [name for name in ("CEO", "CFO") if f"{name}:" in content or f'"{name}"' in content]
+        reply = {"summary": f"covered {len(content)} chars", "positions": {name: f"{name} view" for name in speakers}}
+        return f"```json\n{json.dumps(reply)}\n```", {"model": "fake", "prompt_tokens": 10, "completion_tokens": 5}
+
+
+def add_messages(db, round_table, agents, count, start=0):
+    for i in range(start, start + count):
+        db.add(Message(
+            round_table=round_table,
+            agent=agents[i % 2],
+            content=f"Turn {i}: " + "we should weigh price against volume " * 20,
+            message_type="discussion",
+            sequence=i + 1
+        ))
+    db.commit()
+
+
+def test_chunks_stay_within_the_token_budget():
+    lines = [f"CEO: point {i} " + "x" * 400 for i in range(10)] + ["CFO: " + "y" * 5000]
+
+    chunks = chunk_transcript(lines, max_tokens=300)
+
+    assert all(count_tokens(chunk) <= 300 + 10 for chunk in chunks)
+    assert "".join(chunks).replace("\n\n", "") == "".join(lines)
+    assert parse_digest("not json") == {"summary": "not json", "positions": {}}
+
+
+def test_long_discussion_is_mapped_then_reduced_and_cached(session_factory):
+    llm = FakeLLM()
+    settings = Settings(
+        azure_openai_api_key="test-key",
+        kamiwaza_api_uri="http://kamiwaza.local",
+        SUMMARY_CHUNK_TOKENS=400,
+        SUMMARY_CONCURRENCY=3
+    )
+    summarizer = Summarizer(session_factory, settings, complete=llm)
+    with session_factory() as db:
+        agents = [Agent(name=name, title="Executive", background="", llm_config={}) for name in ("CEO", "CFO")]
+        round_table = RoundTable(title="Pricing", context="Decide the launch price", settings={}, status="completed")
+        db.add(round_table)
+        add_messages(db, round_table, agents, 12)
+        round_table_id, ceo_id = round_table.id, agents[0].id
+
+    async def scenario():
+        first = await summarizer.summarize(round_table_id)
+        calls = len(llm.calls)
+        # Unchanged history is served from the stored summary
+        cached = await summarizer.summarize(round_table_id)
+        assert len(llm.calls) == calls and cached == first
+        with session_factory() as db:
+            add_messages(db, db.get(RoundTable, round_table_id), agents=db.query(Agent).all(), count=2, start=12)
+            assert SummaryService(db, summarizer).get_summary(round_table_id).status == "stale"
+        return first, await summarizer.summarize(round_table_id)
+
+    summary, refreshed = asyncio.run(scenario())
+
+    assert summary["messages"] == 12
+    assert summary["chunks"] > 3
+    # Each chunk once, then merges until one summary is left
+    assert summary["llm_calls"] > summary["chunks"]
+    assert 1 < llm.max_in_flight <= 3
+    assert refreshed["messages"] == 14
+    with session_factory() as db:
+        result = SummaryService(db, summarizer).get_summary(round_table_id)
+        assert result.status == "ready"
+        assert {position.agent_name: position.agent_id for position in result.positions}["CEO"] == ceo_id
+        assert result.prompt_tokens == 10 * refreshed["llm_calls"]
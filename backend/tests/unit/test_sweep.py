@@ -0,0 +1,173 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import Settings
+from app.models.agent import Agent
+from app.models.message import Message
+from app.models.round_table import RoundTable
+from app.models.round_table_participant import RoundTableParticipant
+from app.models.sweep import Sweep, SweepRun
+from app.schemas.sweep import SweepCreate
+from app.services.sweep_service import SweepRunner, SweepService, expand_grid
+
+pytestmark = pytest.mark.models(Agent, RoundTable, RoundTableParticipant, Message, Sweep, SweepRun)
+
+
+def test_grid_expands_to_every_combination():
+    points = expand_grid({"temperature": [0.2, 0.9], "prompt": ["a", "b", "c"]}, repeats=2)
+
+    assert len(points) == 12
+    assert points[:3] == [
+        {"temperature": 0.2, "prompt": "a"},
+        {"temperature": 0.2, "prompt": "a"},
+        {"temperature": 0.2, "prompt": "b"}
+    ]
+    assert expand_grid({}) == [{}]
+
+
+def test_sweep_materializes_a_round_table_per_run(db):
+    ceo, cfo = (Agent(name=name, title="Executive", background="", llm_config={}) for name in ("CEO", "CFO"))
+    db.add_all([ceo, cfo])
+    db.commit()
+    service = SweepService(db, runner=SimpleNamespace())
+    data = SweepCreate(
+        name="Pricing",
+        title="Pricing",
+        context="Decide the launch price",
+        prompt="Pick a price",
+        participant_ids=[ceo.id, cfo.id],
+        grid={"temperature": [0.2, 0.9], "participant_ids": [[str(ceo.id)], [str(cfo.id), str(ceo.id)]]}
+    )
+
+    sweep = service._materialize(data)
+
+    result = service.get_result(sweep.id)
+    assert [run.params["temperature"] for run in result.runs] == [0.2, 0.2, 0.9, 0.9]
+    assert result.runs_by_status == {"pending": 4}
+    last = db.get(RoundTable, result.runs[3].round_table_id)
+    assert last.settings["temperature"] == 0.9
+    assert [participant.agent_id for participant in sorted(last.participants, key=lambda p: p.speaking_priority)] == [cfo.id, ceo.id]
+
+    with pytest.raises(HTTPException) as error:
+        service._materialize(data.model_copy(update={"grid": {"mood": ["calm"]}}))
+    assert error.value.status_code == 400
+
+
+def test_orphaned_sweeps_are_finished_by_another_worker(session_factory, monkeypatch):
+    calls = []
+
+    class FakeRoundTableService:
+        def __init__(self, db):
+            self.db = db
+
+        async def _finish(self, action, round_table_id):
+            calls.append((action, round_table_id))
+            self.db.get(RoundTable, round_table_id).status = "completed"
+            self.db.commit()
+
+        async def run_discussion(self, round_table_id, prompt, submitter, priority):
+            await self._finish("run", round_table_id)
+            return {"status": "completed"}
+
+        async def resume_discussion(self, round_table_id, submitter, priority):
+            await self._finish("resume", round_table_id)
+            return {"status": "resumed"}
+
+    monkeypatch.setattr("app.services.sweep_service.RoundTableService", FakeRoundTableService)
+    stale = datetime.utcnow() - timedelta(minutes=10)
+    with session_factory() as db:
+        # worker-a died with one run done, one back in the queue, one paused by recovery and one not started
+        round_tables = [
+            RoundTable(title=f"Run {i}", context="", settings={}, status=status, checkpoint=checkpoint)
+            for i, (status, checkpoint) in enumerate([
+                ("completed", None), ("pending", None), ("paused", {"reason": "recovered", "round": 2}), ("pending", None)
+            ])
+        ]
+        orphan = Sweep(name="Pricing", config={}, concurrency=2, status="running", owner_id="worker-a", heartbeat_at=stale)
+        alive = Sweep(name="Hiring", config={}, concurrency=1, status="running", owner_id="worker-c", heartbeat_at=datetime.utcnow())
+        db.add_all(round_tables + [orphan, alive])
+        db.flush()
+        db.add_all([
+            SweepRun(sweep_id=orphan.id, index=i, params={}, prompt="Pick a price", round_table_id=round_table.id, status=status)
+            for i, (round_table, status) in enumerate(zip(round_tables, ["completed", "running", "running", "pending"]))
+        ])
+        db.commit()
+        orphan_id, round_table_ids = orphan.id, [round_table.id for round_table in round_tables]
+
+    settings = Settings(
+        azure_openai_api_key="test-key",
+        kamiwaza_api_uri="http://kamiwaza.local",
+        DISCUSSION_LEASE_TTL=30,
+        SWEEP_POLL_INTERVAL=0.01
+    )
+    runner = SweepRunner(session_factory, settings, worker_id="worker-b")
+
+    async def scenario():
+        recovered = await runner.recover()
+        while runner._tasks:
+            await asyncio.sleep(0.01)
+        # The stream ends with the result table instead of polling forever
+        return recovered, [event async for event in runner.events(orphan_id)]
+
+    recovered, events = asyncio.run(scenario())
+
+    assert recovered == [orphan_id]
+    assert sorted(calls, key=lambda call: round_table_ids.index(call[1])) == [
+        ("run", round_table_ids[1]), ("resume", round_table_ids[2]), ("run", round_table_ids[3])
+    ]
+    assert [event["event"] for event in events] == ["run"] * 4 + ["sweep"]
+    assert events[-1]["status"] == "completed"
+    assert events[-1]["runs_by_status"] == {"completed": 4}
+    with session_factory() as db:
+        assert db.get(Sweep, orphan_id).owner_id is None
+        assert db.query(Sweep.status).filter(Sweep.owner_id == "worker-c").scalar() == "running"
+
+
+def test_cancelling_stops_runs_waiting_for_a_full_queue(session_factory, monkeypatch):
+    attempts = []
+
+    class FullQueueRoundTableService:
+        def __init__(self, db):
+            self.db = db
+
+        async def run_discussion(self, round_table_id, prompt, submitter, priority):
+            attempts.append(round_table_id)
+            raise HTTPException(status_code=429, detail="Discussion queue is full")
+
+    monkeypatch.setattr("app.services.sweep_service.RoundTableService", FullQueueRoundTableService)
+    monkeypatch.setattr("app.services.sweep_service.QUEUE_FULL_RETRY_DELAY", 0.01)
+    with session_factory() as db:
+        round_tables = [RoundTable(title=f"Run {i}", context="", settings={}) for i in range(2)]
+        sweep = Sweep(name="Pricing", config={}, concurrency=1)
+        db.add_all(round_tables + [sweep])
+        db.flush()
+        db.add_all([
+            SweepRun(sweep_id=sweep.id, index=i, params={}, prompt="Pick a price", round_table_id=round_table.id)
+            for i, round_table in enumerate(round_tables)
+        ])
+        db.commit()
+        sweep_id = sweep.id
+
+    runner = SweepRunner(session_factory, Settings(azure_openai_api_key="test-key", kamiwaza_api_uri="http://kamiwaza.local"))
+
+    async def scenario():
+        runner.start(sweep_id, 1)
+        while len(attempts) < 3:
+            await asyncio.sleep(0.01)
+        with session_factory() as db:
+            result = await SweepService(db, runner).cancel(sweep_id)
+        await asyncio.wait_for(asyncio.gather(*runner._tasks.values()), 1)
+        return result
+
+    result = asyncio.run(scenario())
+
+    assert result.status == "cancelled"
+    assert result.runs_by_status == {"cancelled": 2}
+    # The second run never reached the queue
+    assert set(attempts) == {attempts[0]}
+    with session_factory() as db:
+        assert [status for (status,) in db.query(SweepRun.status)] == ["cancelled", "cancelled"]
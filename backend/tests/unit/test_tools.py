@@ -0,0 +1,168 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import Settings
+from app.schemas.agent import AgentCreate
+from app.utils.ag2_wrapper import AG2Wrapper
+from app.utils.tools import Tool, ToolExecutor, ToolRegistry, get_tool_registry
+
+
+def slow_lookup(account: str) -> dict:
+    time.sleep(0.3)
+    return {"account": account, "calls": len(calls)}
+
+
+calls = []
+
+
+def nap(seconds: float) -> str:
+    time.sleep(seconds)
+    return "rested"
+
+
+def counted_square(x: int) -> int:
+    calls.append(x)
+    return x * x
+
+
+@pytest.fixture
+def settings():
+    return Settings(
+        azure_openai_api_key="test-key",
+        kamiwaza_api_uri="http://kamiwaza.local",
+        TOOL_THREADS=4,
+        TOOL_PROCESSES=2,
+        TOOL_TIMEOUT=1.0
+    )
+
+
+def test_calls_run_concurrently_with_timeouts_and_memoized_pure_results(settings):
+    executor = ToolExecutor(settings)
+    tools = {
+        "lookup": Tool("lookup", slow_lookup, "Look up an account"),
+        "square": Tool("square", counted_square, "Square a number", pure=True),
+        "hang": Tool("hang", nap, "Sleep", timeout=0.2),
+        "runaway": Tool("runaway", nap, "Sleep in a child process", isolated=True, timeout=0.5),
+        "crash": Tool("crash", os.abort, "Kill its own process", isolated=True)
+    }
+    tool_calls = [
+        {"id": f"call_{i}", "type": "function", "function": {"name": "lookup", "arguments": json.dumps({"account": f"a{i}"})}}
+        for i in range(3)
+    ] + [
+        {"id": "call_3", "type": "function", "function": {"name": "missing", "arguments": "{}"}},
+        {"id": "call_4", "type": "function", "function": {"name": "lookup", "arguments": "{not json"}}
+    ]
+
+    async def scenario():
+        started = time.monotonic()
+        results = await executor.call_all(tools, tool_calls)
+        elapsed = time.monotonic() - started
+        squares = [await executor.call(tools["square"], {"x": 7}) for _ in range(3)]
+        hung = await executor.call(tools["hang"], {"seconds": 5})
+        started = time.monotonic()
+        isolated = await asyncio.gather(
+            executor.call(tools["runaway"], {"seconds": 0.1}),
+            executor.call(tools["runaway"], {"seconds": 30}),
+            executor.call(tools["crash"], {})
+        )
+        return results, elapsed, squares, hung, isolated, time.monotonic() - started
+
+    results, elapsed, squares, hung, (rested, killed, crashed), isolated_elapsed = asyncio.run(scenario())
+
+    # Three 0.3 s lookups in parallel, answered in the order they were asked
+    assert elapsed < 0.6
+    assert [result["tool_call_id"] for result in results] == [f"call_{i}" for i in range(5)]
+    assert json.loads(results[2]["content"])["account"] == "a2"
+    assert "no tool named missing" in results[3]["content"]
+    assert "not valid JSON" in results[4]["content"]
+    assert squares == ["49"] * 3 and calls == [7]
+    assert "did not finish within 0.2 seconds" in hung
+    # A child that outlives its timeout is killed, and one that dies is reported
+    assert rested == "rested"
+    assert "did not finish within 0.5 seconds" in killed
+    assert "exited without a result" in crashed
+    assert isolated_elapsed < 5
+    assert not multiprocessing.active_children()
+    executor.shutdown()
+
+
+def test_agents_answer_after_running_their_tools(settings):
+    registry = ToolRegistry()
+    registry.register(get_tool_registry().get("calculate"))
+    with pytest.raises(ValueError):
+        registry.resolve({"shell": {}})
+    base_config = {"config_list": [{"model": "gpt-4o", "api_key": "k"}]}
+    wrapper = AG2Wrapper(
+        llm_config_manager=SimpleNamespace(get_agent_config=lambda llm_config: base_config, provider_for=lambda llm_config: "azure"),
+        tool_registry=registry,
+        tool_executor=ToolExecutor(settings)
+    )
+    agent = wrapper.create_agent(AgentCreate(
+        name="CFO",
+        title="Chief Financial Officer",
+        background="Keeps the numbers honest",
+        llm_config={"config_list": base_config["config_list"]},
+        tool_config={"calculate": {"description": "Do arithmetic"}}
+    ))
+    prompts = []
+
+    def fake_completion(llm_client, messages, cache):
+        prompts.append(messages)
+        if len(prompts) == 1:
+            return {"role": "assistant", "content": None, "tool_calls": [
+                {"id": "a", "type": "function", "function": {"name": "calculate", "arguments": '{"expression": "1200 * 0.15"}'}},
+                {"id": "b", "type": "function", "function": {"name": "calculate", "arguments": '{"expression": "2 ** 10"}'}}
+            ]}
+        return "Margins come to 180."
+
+    agent._generate_oai_reply_from_client = fake_completion
+    reply = asyncio.run(agent.a_generate_reply(messages=[{"role": "user", "content": "What is 15% of 1200?", "name": "CEO"}]))
+
+    assert reply == "Margins come to 180."
+    assert [tool["function"]["name"] for tool in agent.llm_config["tools"]] == ["calculate"]
+    assert agent.llm_config["tools"][0]["function"]["description"] == "Do arithmetic"
+    # The shared config is not given the agent's tools
+    assert "tools" not in base_config
+    assert [(message["role"], message["content"]) for message in prompts[1][-2:]] == [("tool", "180.0"), ("tool", "1024")]
+
+
+def test_runaway_arithmetic_is_refused_without_stalling_the_event_loop(settings):
+    executor = ToolExecutor(settings)
+    calculate = get_tool_registry().get("calculate")
+
+    async def scenario():
+        gaps = []
+        running = True
+
+        async def ticker():
+            last = time.monotonic()
+            while running:
+                await asyncio.sleep(0.01)
+                now = time.monotonic()
+                gaps.append(now - last)
+                last = now
+
+        ticks = asyncio.create_task(ticker())
+        results = await asyncio.gather(
+            executor.call(calculate, {"expression": "((10**1000)**1000)**10"}),
+            executor.call(calculate, {"expression": "(10**999) * (10**999) * (10**999) * (10**999)"}),
+            executor.call(calculate, {"expression": "2 ** 64 * 3"})
+        )
+        await asyncio.sleep(0.05)
+        running = False
+        await ticks
+        return results, max(gaps)
+
+    (nested, product, fine), worst_gap = asyncio.run(scenario())
+
+    assert "results are limited to" in nested
+    assert "results are limited to" in product
+    assert fine == str(2 ** 64 * 3)
+    assert worst_gap < 0.25
+    executor.shutdown()
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import pytest
+
+from app.utils.tracing import JsonLinesExporter, OTLPHttpExporter, Tracer, UNSAMPLED_SPAN
+
+
+class CollectingExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+    def shutdown(self):
+        pass
+
+
+def test_child_spans_share_trace_and_round_table():
+    exporter = CollectingExporter()
+    tracer = Tracer(exporter, flush_interval=0.01)
+
+    async def turn(agent_id):
+        with tracer.span("llm.completion", agent_id=agent_id):
+            await asyncio.sleep(0)
+
+    async def discussion():
+        with tracer.span("discussion.run", round_table_id="rt-1"):
+            await asyncio.gather(turn("a"), turn("b"))
+
+    asyncio.run(discussion())
+    tracer.shutdown()
+
+    root = next(span for span in exporter.spans if span.name == "discussion.run")
+    children = [span for span in exporter.spans if span.name == "llm.completion"]
+    assert len(children) == 2
+    for child in children:
+        assert child.trace_id == root.trace_id
+        assert child.parent_id == root.span_id
+        assert child.attributes["round_table_id"] == "rt-1"
+        assert child.duration_ms is not None
+
+
+def test_unsampled_trace_records_nothing():
+    exporter = CollectingExporter()
+    tracer = Tracer(exporter, sample_rate=0.0)
+    with tracer.span("discussion.run") as root:
+        with tracer.span("db.write") as child:
+            child.set_attribute("table", "messages")
+    tracer.shutdown()
+    assert root is UNSAMPLED_SPAN and child is UNSAMPLED_SPAN
+    assert exporter.spans == []
+
+
+def test_span_records_errors(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(JsonLinesExporter(str(path)), flush_interval=0.01)
+    with pytest.raises(ValueError):
+        with tracer.span("agent.create", agent_name="ceo"):
+            raise ValueError("bad config")
+    tracer.shutdown()
+
+    record = json.loads(path.read_text().strip())
+    assert record["name"] == "agent.create"
+    assert record["attributes"] == {"agent_name": "ceo"}
+    assert record["error"] == "ValueError: bad config"
+
+
+def test_otlp_span_encoding():
+    exporter = CollectingExporter()
+    tracer = Tracer(exporter, flush_interval=0.01)
+    with tracer.span("llm.completion", prompt_tokens=12, ttft_ms=250.5, hedged=False, model=None):
+        pass
+    tracer.shutdown()
+
+    otlp = OTLPHttpExporter("http://collector:4318/v1/traces", "roundtable-backend")
+    encoded = otlp._span(exporter.spans[0])
+    otlp.shutdown()
+    assert len(encoded["traceId"]) == 32 and len(encoded["spanId"]) == 16
+    assert "parentSpanId" not in encoded
+    assert encoded["status"] == {"code": 1}
+    assert {attribute["key"]: attribute["value"] for attribute in encoded["attributes"]} == {
+        "prompt_tokens": {"intValue": "12"},
+        "ttft_ms": {"doubleValue": 250.5},
+        "hedged": {"boolValue": False}
+    }
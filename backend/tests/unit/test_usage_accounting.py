@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.ag2_wrapper import add_pending_usage, pop_pending_usage, usage_delta
+
+
+def test_usage_delta_reports_the_latest_completion():
+    before = {"total_cost": 0.01, "gpt-4o": {"cost": 0.01, "prompt_tokens": 100, "completion_tokens": 20}}
+    after = {"total_cost": 0.015, "gpt-4o": {"cost": 0.015, "prompt_tokens": 160, "completion_tokens": 31}}
+    delta = usage_delta(before, after)
+    assert delta.pop("cost") == pytest.approx(0.005)
+    assert delta == {"model": "gpt-4o", "prompt_tokens": 60, "completion_tokens": 11}
+    # Cached completions leave the actual usage unchanged
+    assert usage_delta(after, after) == {}
+    assert usage_delta(None, None) == {}
+
+
+def test_pending_usage_sums_completions_of_one_reply():
+    agent = SimpleNamespace()
+    add_pending_usage(agent, {
+        "prompt_tokens": 50, "completion_tokens": 10, "cost": 0.001, "model": "gpt-4o",
+        "provider": "azure", "ttft_ms": 400.0, "latency_ms": 450.0
+    })
+    add_pending_usage(agent, {
+        "prompt_tokens": 70, "completion_tokens": 5, "cost": 0.002, "model": "gpt-4o",
+        "provider": "azure", "ttft_ms": 300.0, "latency_ms": 320.0
+    })
+    usage = pop_pending_usage(agent)
+    assert usage["prompt_tokens"] == 120
+    assert usage["completion_tokens"] == 15
+    assert usage["latency_ms"] == 770.0
+    assert usage["ttft_ms"] == 400.0  # first completion of the reply
+
+    # Popped usage is not attached to the agent's next message again
+    assert pop_pending_usage(agent)["prompt_tokens"] is None
+    assert pop_pending_usage(None)["model"] is None